@@ -0,0 +1,306 @@
+"""
+Ejecución sin interfaz gráfica del orquestador: recorre un pipeline declarativo
+(compilación -> generación del contexto -> especialistas) con el motor de task_engine.py,
+sin importar tkinter. Pensado para CI y agentes de compilación.
+
+Uso:
+  python cli.py                                   # build, process y los seis especialistas
+  python cli.py pipeline.json                     # pipeline declarado en un archivo JSON
+  python cli.py --steps build,process --clean
+  python cli.py --steps specialists --specialists dba,qa --jobs 2 --output dba=./guia_dba.md
+  python cli.py --steps process,batch --batch-targets "./src/main/java/com/app/**.java" --batch-parallel 8
+
+Ejemplo de pipeline.json (todas las claves son opcionales; los argumentos de la línea de comandos
+tienen prioridad sobre el archivo):
+  {
+    "steps": ["build", "process", "specialists"],
+    "project_path": "./gemini-tools-core",
+    "specialists": {"dba": "./ia_consultas/guide_dba.md", "qa": "./ia_consultas/guide_qa.md"},
+    "concurrency": 2,
+    "timeout": 600,
+    "no_cache": false,
+    "stream": false,
+    "trace": "trazas/ci.json"
+  }
+
+Códigos de salida: 0 si todos los pasos terminan bien, 1 si alguno falla, 2 si el pipeline
+es inválido y 130 si se interrumpe con Ctrl+C.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+
+from task_engine import (
+    SPECIALISTS, DEFAULT_SPECIALIST_CONCURRENCY, DEFAULT_PROJECT_PATH, DEFAULT_ANALYZER_PATH,
+    DEFAULT_READER_THREADS, DEFAULT_PROCESS_JVM_OPTIONS, DEFAULT_ANALYSIS_JVM_OPTIONS, DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_MAX_FILE_KB, DEFAULT_MAX_TOTAL_KB, DEFAULT_SHARD_TOKENS, DEFAULT_FAN_OUT, DEFAULT_BATCH_PARALLEL,
+    BATCH_REPORT_FILE,
+    JOB_DONE, JOB_FINISHED_STATES, JobScheduler, TaskEngine, parse_jvm_options, format_trace_summary,
+)
+
+# Pasos disponibles, en el orden en que se ejecutan por defecto
+STEP_BUILD = "build"
+STEP_PROCESS = "process"
+STEP_ANALYZE = "analyze"
+STEP_BATCH = "batch"
+STEP_SPECIALISTS = "specialists"
+STEPS = (STEP_BUILD, STEP_PROCESS, STEP_ANALYZE, STEP_BATCH, STEP_SPECIALISTS)
+DEFAULT_STEPS = [STEP_BUILD, STEP_PROCESS, STEP_SPECIALISTS]
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+# Intervalo de espera entre comprobaciones del planificador (permite interrumpir con Ctrl+C)
+WAIT_INTERVAL_SECONDS = 0.5
+
+SPECIALIST_KEYS = [key for key, _, _, _ in SPECIALISTS]
+
+
+class PipelineError(Exception):
+    """Configuración de pipeline inválida (archivo o argumentos)."""
+
+
+class ConsoleLog:
+    """Receptor de log para el motor: escribe cada mensaje completo en stdout o stderr."""
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __call__(self, message, is_error=False):
+        stream = sys.stderr if is_error else sys.stdout
+        with self._lock:
+            print(message, file=stream, flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Orquestador Java/Maven sin interfaz gráfica.")
+    parser.add_argument("pipeline", nargs="?", help="Archivo JSON con la definición del pipeline.")
+    parser.add_argument("--steps", help=f"Pasos separados por comas ({', '.join(STEPS)}).")
+    parser.add_argument("--specialists", help=f"Especialistas separados por comas ({', '.join(SPECIALIST_KEYS)}) o 'all'.")
+    parser.add_argument("--output", action="append", default=[], metavar="CLAVE=RUTA",
+                        help="Ruta de destino de un especialista (se puede repetir).")
+    parser.add_argument("--jobs", type=int, help="Especialistas en paralelo.")
+    parser.add_argument("--project", help="Ruta base del proyecto para generar el contexto.")
+    parser.add_argument("--analyzer-output", help="Archivo de salida/a corregir del paso 'analyze'.")
+    parser.add_argument("--batch-targets", help="Carpeta o patrón glob de archivos .java del paso 'batch'.")
+    parser.add_argument("--batch-parallel", type=int,
+                        help=f"Correcciones en paralelo del paso 'batch' (por defecto {DEFAULT_BATCH_PARALLEL}).")
+    parser.add_argument("--batch-report", help=f"Informe del paso 'batch' (por defecto {BATCH_REPORT_FILE}).")
+    parser.add_argument("--shard-tokens", type=int,
+                        help=f"Tokens por fragmento del map-reduce de los especialistas (0 = desactivado; por defecto {DEFAULT_SHARD_TOKENS}).")
+    parser.add_argument("--fan-out", type=int, help=f"Fragmentos analizados en paralelo (por defecto {DEFAULT_FAN_OUT}).")
+    parser.add_argument("--timeout", type=float, help=f"Tiempo límite de cada tarea en segundos (0 = sin límite; por defecto {DEFAULT_COMMAND_TIMEOUT}).")
+    parser.add_argument("--reader-threads", type=int, help="Hilos de lectura de la generación del contexto.")
+    parser.add_argument("--max-file-kb", type=int, help=f"Tamaño máximo de cada archivo del contexto en KB (0 = sin límite; por defecto {DEFAULT_MAX_FILE_KB}).")
+    parser.add_argument("--max-total-kb", type=int, help="Tamaño máximo total del contexto en KB (0 = sin límite).")
+    parser.add_argument("--ignore-file", help="Archivo de exclusiones con sintaxis .gitignore (por defecto .contextignore en el proyecto).")
+    parser.add_argument("--no-gitignore", action="store_true", default=None, help="No aplicar los .gitignore del proyecto.")
+    parser.add_argument("--process-jvm-options", help="Opciones JVM del paso 'process' (p. ej. \"-Xmx2g\").")
+    parser.add_argument("--analysis-jvm-options", help="Opciones JVM del análisis y los especialistas.")
+    parser.add_argument("--clean", action="store_true", default=None, help="Compilación completa con 'mvn clean install'.")
+    parser.add_argument("--no-cache", action="store_true", default=None, help="Omitir la caché de respuestas de Gemini.")
+    parser.add_argument("--stream", action="store_true", default=None, help="Mostrar las respuestas a medida que se generan.")
+    parser.add_argument("--no-patch", action="store_true", default=None,
+                        help="Corregir los .java regenerando el archivo completo en lugar de aplicar un parche.")
+    parser.add_argument("--trace", nargs="?", const="", default=None, metavar="ARCHIVO",
+                        help="Registrar los tiempos de cada etapa y guardar la traza (Chrome trace) al terminar.")
+    parser.add_argument("--keep-going", action="store_true", default=None,
+                        help="Continuar con los pasos siguientes aunque uno falle.")
+    return parser.parse_args(argv)
+
+
+def _split(value):
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+def load_pipeline(args):
+    """
+    Combina el archivo de pipeline (si se indica) con los argumentos de la línea de comandos.
+    Lanza PipelineError si la definición es inválida.
+    """
+    spec = {}
+    if args.pipeline:
+        try:
+            with open(args.pipeline, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, ValueError) as e:
+            raise PipelineError(f"No se pudo leer el pipeline {args.pipeline}: {e}")
+        if not isinstance(spec, dict):
+            raise PipelineError("El pipeline debe ser un objeto JSON.")
+
+    def option(arg_value, key, default):
+        if arg_value is not None:
+            return arg_value
+        return spec.get(key, default)
+
+    steps = _split(option(args.steps, "steps", DEFAULT_STEPS))
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown or not steps:
+        raise PipelineError(f"Pasos desconocidos: {', '.join(unknown) or '(ninguno)'}. Disponibles: {', '.join(STEPS)}.")
+
+    # Especialistas: lista de claves o diccionario {clave: ruta}
+    defaults = {key: path for key, _, _, path in SPECIALISTS}
+    selected = option(args.specialists, "specialists", "all")
+    if isinstance(selected, dict):
+        targets = dict(selected)
+    elif selected == "all" or selected == ["all"]:
+        targets = dict(defaults)
+    else:
+        targets = {key: defaults.get(key) for key in _split(selected)}
+    for item in args.output:
+        key, sep, path = item.partition("=")
+        if not sep or not path:
+            raise PipelineError(f"--output debe tener la forma CLAVE=RUTA: {item}")
+        targets[key.strip()] = path.strip()
+    unknown = [key for key in targets if key not in defaults]
+    if unknown:
+        raise PipelineError(f"Especialistas desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(SPECIALIST_KEYS)}.")
+
+    try:
+        pipeline = {
+            "steps": steps,
+            "specialists": targets,
+            "concurrency": max(1, int(option(args.jobs, "concurrency", DEFAULT_SPECIALIST_CONCURRENCY))),
+            "project_path": option(args.project, "project_path", DEFAULT_PROJECT_PATH),
+            "analyzer_output": option(args.analyzer_output, "analyzer_output", DEFAULT_ANALYZER_PATH),
+            "batch_targets": option(args.batch_targets, "batch_targets", "") or "",
+            "batch_parallel": max(1, int(option(args.batch_parallel, "batch_parallel", DEFAULT_BATCH_PARALLEL))),
+            "batch_report": option(args.batch_report, "batch_report", BATCH_REPORT_FILE) or BATCH_REPORT_FILE,
+            "shard_tokens": max(0, int(option(args.shard_tokens, "shard_tokens", DEFAULT_SHARD_TOKENS))),
+            "fan_out": max(1, int(option(args.fan_out, "fan_out", DEFAULT_FAN_OUT))),
+            "timeout": max(0.0, float(option(args.timeout, "timeout", DEFAULT_COMMAND_TIMEOUT))),
+            "reader_threads": max(1, int(option(args.reader_threads, "reader_threads", DEFAULT_READER_THREADS))),
+            "max_file_kb": max(0, int(option(args.max_file_kb, "max_file_kb", DEFAULT_MAX_FILE_KB))),
+            "max_total_kb": max(0, int(option(args.max_total_kb, "max_total_kb", DEFAULT_MAX_TOTAL_KB))),
+            "ignore_file": option(args.ignore_file, "ignore_file", "") or "",
+            "no_gitignore": bool(option(args.no_gitignore, "no_gitignore", False)),
+            "process_jvm_options": parse_jvm_options(option(args.process_jvm_options, "process_jvm_options", DEFAULT_PROCESS_JVM_OPTIONS)),
+            "analysis_jvm_options": parse_jvm_options(option(args.analysis_jvm_options, "analysis_jvm_options", DEFAULT_ANALYSIS_JVM_OPTIONS)),
+            "clean": bool(option(args.clean, "clean", False)),
+            "no_cache": bool(option(args.no_cache, "no_cache", False)),
+            "stream": bool(option(args.stream, "stream", False)),
+            "no_patch": bool(option(args.no_patch, "no_patch", False)),
+            "keep_going": bool(option(args.keep_going, "keep_going", False)),
+            # true/"" = traza en la carpeta por defecto; una cadena no vacía es la ruta del archivo
+            "trace": option(args.trace, "trace", None),
+        }
+    except (TypeError, ValueError) as e:
+        raise PipelineError(f"Valor inválido en el pipeline: {e}")
+    return pipeline
+
+
+def run_specialists(engine, targets, concurrency, log):
+    """Ejecuta los especialistas indicados en paralelo con el JobScheduler. Devuelve True si todos terminan bien."""
+    roles = {key: (class_name, role_name) for key, class_name, role_name, _ in SPECIALISTS}
+
+    reported = set()
+    report_lock = threading.Lock()
+
+    def on_change(job):
+        # El planificador puede notificar el mismo estado final más de una vez
+        with report_lock:
+            if job.status not in JOB_FINISHED_STATES or job.job_id in reported:
+                return
+            reported.add(job.job_id)
+        symbol = "✅" if job.status == JOB_DONE else "❌"
+        log(f"{symbol} {job.role_name}: {job.status} ({job.elapsed():.1f} s)", job.status != JOB_DONE)
+
+    scheduler = JobScheduler(engine.run_scheduled_job, on_change, concurrency)
+    jobs = []
+    try:
+        for key, path in targets.items():
+            class_name, role_name = roles[key]
+            jobs.append(scheduler.submit(class_name, role_name, path))
+        while not scheduler.wait_idle(WAIT_INTERVAL_SECONDS):
+            pass
+    except KeyboardInterrupt:
+        scheduler.cancel_all()
+        scheduler.wait_idle(10)
+        raise
+    return all(job.status == JOB_DONE for job in jobs)
+
+
+def run_pipeline(pipeline, log=None):
+    """
+    Ejecuta los pasos del pipeline en orden. Un paso fallido detiene el pipeline salvo con keep_going.
+    Devuelve el código de salida.
+    """
+    log = log or ConsoleLog()
+    engine = TaskEngine(on_log=log)
+    engine.project_path = pipeline["project_path"]
+    engine.reader_threads = pipeline["reader_threads"]
+    engine.max_file_kb = pipeline["max_file_kb"]
+    engine.max_total_kb = pipeline["max_total_kb"]
+    engine.ignore_file = pipeline["ignore_file"]
+    engine.use_gitignore = not pipeline["no_gitignore"]
+    engine.process_jvm_options = pipeline["process_jvm_options"]
+    engine.analysis_jvm_options = pipeline["analysis_jvm_options"]
+    engine.clean_build = pipeline["clean"]
+    engine.bypass_cache = pipeline["no_cache"]
+    engine.stream = pipeline["stream"]
+    engine.patch_mode = not pipeline["no_patch"]
+    engine.command_timeout = pipeline["timeout"]
+    engine.shard_tokens = pipeline["shard_tokens"]
+    engine.fan_out = pipeline["fan_out"]
+    engine.batch_parallel = pipeline["batch_parallel"]
+    engine.trace = pipeline["trace"] not in (None, False)
+
+    steps = {
+        STEP_BUILD: engine.build_project,
+        STEP_PROCESS: engine.run_file_processor,
+        STEP_ANALYZE: lambda: engine.run_ai_analyzer(pipeline["analyzer_output"]),
+        STEP_BATCH: lambda: engine.run_batch_correction(pipeline["batch_targets"], pipeline["batch_report"]),
+        STEP_SPECIALISTS: lambda: run_specialists(engine, pipeline["specialists"], pipeline["concurrency"], log),
+    }
+
+    results = []
+    exit_code = EXIT_OK
+    try:
+        for step in pipeline["steps"]:
+            log(f"\n--- Paso: {step} ---")
+            start = time.perf_counter()
+            with engine.span(f"paso {step}"):
+                success = bool(steps[step]())
+            results.append((step, success, time.perf_counter() - start))
+            if not success:
+                exit_code = EXIT_FAILED
+                if not pipeline["keep_going"]:
+                    break
+    except KeyboardInterrupt:
+        log("Pipeline interrumpido por el usuario.", True)
+        exit_code = EXIT_INTERRUPTED
+
+    log("\n--- Resumen del pipeline ---")
+    for step, success, seconds in results:
+        log(f"{'✅' if success else '❌'} {step}: {'OK' if success else 'ERROR'} ({seconds:.1f} s)", not success)
+    skipped = pipeline["steps"][len(results):]
+    if skipped:
+        log(f"Pasos no ejecutados: {', '.join(skipped)}")
+
+    if engine.trace:
+        trace_path = pipeline["trace"] if isinstance(pipeline["trace"], str) and pipeline["trace"] else None
+        path, rows = engine.export_trace(trace_path)
+        if path:
+            log(f"\n🧭 Traza guardada en: {path}")
+            for line in format_trace_summary(rows):
+                log(line)
+    return exit_code
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        pipeline = load_pipeline(args)
+    except PipelineError as e:
+        print(f"❌ ERROR: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    return run_pipeline(pipeline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,78 +2,64 @@ package com.myproject.core;
 
 import java.io.*;
 import java.net.HttpURLConnection;
-import java.net.URL;
+import java.net.URI;
 import java.nio.charset.StandardCharsets;
 
 /**
  * AIAnalyzer: Corrige y analiza archivos usando la API Gemini (v1beta).
  * * Este analizador se conecta al modelo Gemini para recibir código corregido.
  * La clave se espera en la variable de entorno "GEMINI_API_KEY".
+ * La URL base de la API puede cambiarse con "GEMINI_API_BASE_URL" (p. ej. para usar un servidor simulado).
  */
-public class AIAnalyzer {
+public class AIAnalyzer implements WorkerJob {
 
-    private static final String API_URL =
-        "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent";
-    private static final int TIMEOUT_MS = 60000;
+    static final String MODEL = "gemini-2.5-flash";
+    private static final String DEFAULT_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta";
+
+    /** Prefijo de las líneas de texto parcial que se imprimen en modo streaming. */
+    public static final String STREAM_PREFIX = "[STREAM] ";
+
+    private static final String SSE_DATA = "data:";
+
+    // Partes fijas del mensaje de usuario; el contexto y el archivo se escriben entre ellas sin concatenarlos
+    private static final String USER_CONTEXT_HEADER = "Contexto del proyecto:\n";
+    private static final String USER_FILE_HEADER = "\n\nArchivo a corregir:\n";
+
+    // La instrucción del sistema pide solo el código para asegurar que sea ejecutable
+    static final String FULL_FILE_INSTRUCTION =
+        "Actúa como un ingeniero de software experimentado. Analiza el contexto completo del proyecto y el archivo proporcionado para encontrar y aplicar las correcciones necesarias. Tu respuesta DEBE ser SOLAMENTE el código completo corregido, sin explicaciones ni bloques de marcado.";
+
+    /** Respuesta del modo parche cuando el archivo no necesita correcciones. */
+    public static final String NO_CHANGES = "SIN CAMBIOS";
+
+    // Modo parche (PatchCorrector): solo las líneas que cambian, en diff unificado
+    static final String PATCH_INSTRUCTION =
+        "Actúa como un ingeniero de software experimentado. Analiza el contexto completo del proyecto y el archivo proporcionado para encontrar y aplicar las correcciones necesarias. Tu respuesta DEBE ser SOLAMENTE un diff unificado del archivo (fragmentos que empiezan por '@@ -inicio,líneas +inicio,líneas @@', con líneas de contexto que empiezan por un espacio, eliminadas por '-' y añadidas por '+'), con 3 líneas de contexto sin modificar alrededor de cada cambio copiadas exactamente del archivo, sin explicaciones ni bloques de marcado. Si no hay nada que corregir, responde exactamente: " + NO_CHANGES;
+
+    private final ResponseCache cache;
 
     /**
-     * Escapa una cadena para su inclusión segura como valor en un payload JSON.
-     * SE CORRIGEN ERRORES DE SINTAXIS EN LAS SECUENCIAS DE ESCAPE (\n, \r, \t).
-     * @param value La cadena a escapar.
-     * @return La cadena escapada.
+     * Recibe los fragmentos de texto a medida que llegan en modo streaming.
      */
-    private String escapeJsonString(String value) {
-        if (value == null) return "";
-        // Debe ir primero para no escapar los backslashes que ya son de escape
-        return value.replace("\\", "\\\\") 
-                        .replace("\"", "\\\"")
-                        // Correcciones de sintaxis para los caracteres de control
-                        .replace("\n", "\\n")
-                        .replace("\r", "\\r")
-                        .replace("\t", "\\t");
+    public interface ChunkListener {
+        void onChunk(String text) throws IOException;
+    }
+
+    public AIAnalyzer() {
+        this(null);
     }
 
     /**
-     * Extrae el texto generado desde la respuesta JSON de la API de Gemini
-     * y realiza la decodificación de las secuencias de escape JSON.
-     * SE CORRIGEN ERRORES DE SINTAXIS Y SE USA EL DESESCAPE COMPLETO (Unicode y directo).
-     * @param jsonResponse La respuesta JSON completa.
-     * @return El texto extraído y decodificado.
+     * @param cache Caché de respuestas a consultar antes de llamar a la API, o null para no usarla.
      */
-    private String extractTextFromGeminiResponse(String jsonResponse) {
-        String searchKey = "\"text\": \"";
-        int startIndex = jsonResponse.indexOf(searchKey);
-        if (startIndex == -1) {
-            System.err.println("Advertencia: No se encontró el campo 'text' en la respuesta.");
-            return "ERROR DE RESPUESTA: " + jsonResponse;
-        }
-
-        startIndex += searchKey.length();
-        int endIndex = startIndex;
-        // Búsqueda simple de la comilla de cierre que no esté escapada
-        while (endIndex < jsonResponse.length()) {
-            char current = jsonResponse.charAt(endIndex);
-            // Comprobamos que el carácter actual sea una comilla y que el anterior no sea una barra invertida (escape)
-            if (current == '"' && jsonResponse.charAt(endIndex - 1) != '\\') break;
-            endIndex++;
-        }
-
-        if (endIndex >= jsonResponse.length()) {
-            return "ERROR DE PARSEO: Se encontró 'text', pero no la comilla de cierre.";
-        }
-
-        String extractedText = jsonResponse.substring(startIndex, endIndex);
-        
-        // Decodificación de secuencias de escape JSON
-        return extractedText.replace("\\n", "\n") 
-                            .replace("\\\"", "\"") 
-                            .replace("\\r", "\r") 
-                            .replace("\\t", "\t") 
-                            // Decodificar los caracteres Unicode para < y > (genéricos)
-                            .replace("\\u003c", "<") 
-                            .replace("\\u003e", ">") 
-                            // El escape de backslash debe ser el último
-                            .replace("\\\\", "\\"); 
+    public AIAnalyzer(ResponseCache cache) {
+        this.cache = cache;
+    }
+
+    private static String apiBaseUrl() {
+        String value = System.getenv("GEMINI_API_BASE_URL");
+        if (value == null || value.isBlank()) return DEFAULT_API_BASE_URL;
+        return value.endsWith("/") ? value.substring(0, value.length() - 1) : value;
     }
 
     /**
@@ -84,102 +70,270 @@ public class AIAnalyzer {
      * @throws IOException Si ocurre un error de red o I/O.
      */
     public String analyze(String context, String fileToFix) throws IOException {
+        return analyze(context, fileToFix, null);
+    }
+
+    /**
+     * Igual que {@link #analyze(String, String)}, pero si se indica un listener usa el endpoint
+     * de generación en streaming ({@code streamGenerateContent?alt=sse}) y le entrega cada
+     * fragmento de texto en cuanto llega. Una respuesta en caché se entrega como un único fragmento.
+     * @param listener Receptor de los fragmentos, o null para esperar la respuesta completa.
+     */
+    public String analyze(String context, String fileToFix, ChunkListener listener) throws IOException {
+        return analyze(FULL_FILE_INSTRUCTION, context, fileToFix, listener);
+    }
+
+    /**
+     * Igual que {@link #analyze(String, String, ChunkListener)}, con otra instrucción del sistema
+     * (p. ej. {@link #PATCH_INSTRUCTION}). La instrucción forma parte de la clave de la caché.
+     */
+    String analyze(String systemInstruction, String context, String fileToFix, ChunkListener listener) throws IOException {
+        try (Trace.Span span = Trace.span("AIAnalyzer.analyze")) {
+            span.arg("streaming", listener != null);
+            return request(systemInstruction, context, fileToFix, listener);
+        }
+    }
+
+    private String request(String systemInstruction, String context, String fileToFix, ChunkListener listener) throws IOException {
+        // Consulta de la caché: una respuesta guardada evita la llamada a la API
+        String cacheKey = null;
+        if (cache == null) {
+            System.out.println("[CACHE] BYPASS");
+        } else {
+            String cached;
+            try (Trace.Span span = Trace.span("cache_consulta")) {
+                cacheKey = ResponseCache.key(MODEL, systemInstruction, context, fileToFix);
+                cached = cache.get(cacheKey);
+                span.arg("resultado", cached != null ? "HIT" : "MISS");
+            }
+            if (cached != null) {
+                System.out.println("[CACHE] HIT " + cacheKey.substring(0, 12));
+                if (listener != null) listener.onChunk(cached);
+                return cached;
+            }
+            System.out.println("[CACHE] MISS " + cacheKey.substring(0, 12));
+        }
+
         String apiKey = System.getenv("GEMINI_API_KEY");
         if (apiKey == null || apiKey.isEmpty()) {
             throw new IllegalStateException("❌ La variable de entorno GEMINI_API_KEY no está configurada.");
         }
 
-        // Construcción del prompt (usando \n para mejor legibilidad)
-        String userQuery = String.format(
-            "Contexto del proyecto:\n%s\n\nArchivo a corregir:\n%s",
-            context, fileToFix
-        );
-
-        // La instrucción del sistema pide solo el código para asegurar que sea ejecutable
-        String systemInstruction =
-            "Actúa como un ingeniero de software experimentado. Analiza el contexto completo del proyecto y el archivo proporcionado para encontrar y aplicar las correcciones necesarias. Tu respuesta DEBE ser SOLAMENTE el código completo corregido, sin explicaciones ni bloques de marcado.";
-
-        // ✅ ESTRUCTURA JSON CORREGIDA: Se usa 'systemInstruction' y 'role':'user' (crucial para la API)
-        String jsonInputString = String.format(
-            "{"
-          + "\"systemInstruction\":{\"parts\":[{\"text\":\"%s\"}]}," 
-          + "\"contents\":[{\"role\":\"user\",\"parts\":[{\"text\":\"%s\"}]}]" 
-          + "}",
-            escapeJsonString(systemInstruction),
-            escapeJsonString(userQuery)
-        );
-
-        // Conexión
-        URL url = new URL(API_URL + "?key=" + apiKey);
-        HttpURLConnection connection = (HttpURLConnection) url.openConnection();
-        connection.setRequestMethod("POST");
-        connection.setRequestProperty("Content-Type", "application/json; charset=UTF-8");
-        connection.setDoOutput(true);
-        connection.setConnectTimeout(TIMEOUT_MS);
-        connection.setReadTimeout(TIMEOUT_MS);
-
-        try (OutputStream os = connection.getOutputStream()) {
-            byte[] input = jsonInputString.getBytes(StandardCharsets.UTF_8);
-            os.write(input);
-        }
-
-        int responseCode = connection.getResponseCode();
-        if (responseCode != HttpURLConnection.HTTP_OK) {
-            InputStream errorStream = connection.getErrorStream();
-            String errorResponse = null;
-            if (errorStream != null) {
-                try (BufferedReader errorBr = new BufferedReader(
-                        new InputStreamReader(errorStream, StandardCharsets.UTF_8))) {
-                    StringBuilder sb = new StringBuilder();
-                    String line;
-                    while ((line = errorBr.readLine()) != null) sb.append(line);
-                    errorResponse = sb.toString();
+        // El cuerpo JSON ('systemInstruction' y 'role':'user') no se construye en memoria: se calcula
+        // su longitud y se codifica por fragmentos a medida que se envía
+        String[] userParts = {USER_CONTEXT_HEADER, context, USER_FILE_HEADER, fileToFix};
+        long payloadBytes;
+        try (Trace.Span span = Trace.span("construir_payload")) {
+            payloadBytes = GeminiJson.requestLength(systemInstruction, userParts);
+            span.arg("bytes", payloadBytes);
+        }
+
+        // Conexión: cliente compartido con reutilización de conexiones, límite de peticiones y reintentos
+        String endpoint = listener != null
+            ? ":streamGenerateContent?alt=sse&key="
+            : ":generateContent?key=";
+        URI uri = URI.create(apiBaseUrl() + "/models/" + MODEL + endpoint + apiKey);
+        GeminiHttpClient http = GeminiHttpClient.forOptions(CliOptions.current());
+
+        long startNanos = System.nanoTime();
+        String result;
+        // Espera de red: desde el envío (con sus reintentos) hasta recibir la cabecera de la respuesta
+        GeminiHttpClient.Response response;
+        try (Trace.Span span = Trace.span("espera_red")) {
+            response = http.post(uri, GeminiJson.requestChunks(systemInstruction, userParts), payloadBytes);
+            span.arg("http", response.status())
+                .arg("intentos", response.attempts())
+                .arg("espera_limite_ms", response.throttledMillis());
+        }
+        try (response) {
+            if (response.status() != HttpURLConnection.HTTP_OK) {
+                String errorResponse = new String(response.body().readAllBytes(), StandardCharsets.UTF_8);
+                throw new IOException(String.format(
+                    "❌ Error %d al llamar a la API de Gemini (%d intentos). Detalles: %s",
+                    response.status(), response.attempts(),
+                    errorResponse.isEmpty() ? "No hay detalles." : errorResponse
+                ));
+            }
+
+            try (Trace.Span span = Trace.span("leer_respuesta")) {
+                if (listener != null) {
+                    result = readStreamedResponse(response.body(), listener, startNanos);
+                } else {
+                    try (Reader reader = new InputStreamReader(response.body(), StandardCharsets.UTF_8)) {
+                        GeminiJson.TextReader textReader = new GeminiJson.TextReader(reader);
+                        result = readText(textReader);
+                        span.arg("caracteres_json", textReader.charsRead());
+                    }
                 }
+                span.arg("caracteres_texto", result.length());
             }
-            throw new IOException(String.format(
-                "❌ Error %d (%s) al llamar a la API de Gemini. Detalles: %s",
-                responseCode, connection.getResponseMessage(),
-                errorResponse != null ? errorResponse : "No hay detalles."
-            ));
         }
 
-        StringBuilder responseBuilder = new StringBuilder();
+        // Las respuestas que no se pudieron interpretar no se guardan
+        if (cache != null && !result.startsWith("ERROR DE ")) {
+            try (Trace.Span span = Trace.span("cache_escritura")) {
+                cache.put(cacheKey, result);
+            }
+        }
+        return result;
+    }
+
+    /**
+     * Extrae el texto de todas las partes de la respuesta, decodificado.
+     * Si no hay texto o el JSON no es válido devuelve un mensaje "ERROR DE ...", que se escribe en la salida
+     * en lugar del código corregido.
+     */
+    private static String readText(GeminiJson.TextReader response) throws IOException {
+        StringBuilder text = new StringBuilder();
+        try {
+            if (!response.readInto(text)) {
+                System.err.println("Advertencia: No se encontró el campo 'text' en la respuesta.");
+                return "ERROR DE RESPUESTA: " + response.head();
+            }
+        } catch (GeminiJson.MalformedJsonException e) {
+            return "ERROR DE PARSEO: " + e.getMessage();
+        }
+        return text.toString();
+    }
+
+    /**
+     * Lee una respuesta Server-Sent Events: cada evento {@code data: {...}} es un fragmento
+     * JSON con la siguiente parte del texto generado.
+     */
+    private String readStreamedResponse(InputStream body, ChunkListener listener, long startNanos) throws IOException {
+        StringBuilder result = new StringBuilder();
+        StringBuilder event = new StringBuilder();
+        boolean first = true;
         try (BufferedReader br = new BufferedReader(
-                new InputStreamReader(connection.getInputStream(), StandardCharsets.UTF_8))) {
+                new InputStreamReader(body, StandardCharsets.UTF_8))) {
             String line;
-            while ((line = br.readLine()) != null) responseBuilder.append(line);
+            while ((line = br.readLine()) != null) {
+                if (line.startsWith(SSE_DATA)) {
+                    event.append(line.substring(SSE_DATA.length()).trim());
+                    continue;
+                }
+                // Una línea vacía cierra el evento
+                if (!line.isEmpty() || event.length() == 0) continue;
+                first = emitChunk(event.toString(), listener, result, first, startNanos);
+                event.setLength(0);
+            }
+            if (event.length() > 0) emitChunk(event.toString(), listener, result, first, startNanos);
+        }
+        if (result.length() == 0) {
+            // Igual que en modo normal, el error queda escrito en la salida
+            String error = "ERROR DE RESPUESTA: la respuesta en streaming no contenía texto.";
+            listener.onChunk(error);
+            return error;
         }
+        return result.toString();
+    }
 
-        return extractTextFromGeminiResponse(responseBuilder.toString());
+    private boolean emitChunk(String json, ChunkListener listener, StringBuilder result, boolean first, long startNanos) throws IOException {
+        StringBuilder chunk = new StringBuilder();
+        try {
+            // Sin texto: p. ej. el evento final solo con metadatos
+            if (!new GeminiJson.TextReader(new StringReader(json)).readInto(chunk)) return first;
+        } catch (GeminiJson.MalformedJsonException e) {
+            System.err.println("Advertencia: fragmento de streaming inválido: " + json);
+            return first;
+        }
+        String text = chunk.toString();
+        if (first) {
+            System.out.println("⏱️  Primer fragmento recibido en " + (System.nanoTime() - startNanos) / 1_000_000 + " ms");
+        }
+        result.append(text);
+        listener.onChunk(text);
+        return false;
     }
 
-    public static void main(String[] args) throws Exception {
-        if (args.length < 2) {
-            System.out.println("Uso: java -cp <classpath> com.myproject.core.AIAnalyzer <contexto.txt> <archivo.java>");
+    /**
+     * Listener que escribe cada fragmento en un archivo (volcándolo al disco al momento) y lo
+     * muestra por la salida estándar, línea a línea, con el prefijo {@link #STREAM_PREFIX}.
+     * Debe cerrarse al terminar para escribir la última línea incompleta.
+     */
+    public static class StreamWriter implements ChunkListener, Closeable {
+        private final Writer file;
+        private final StringBuilder pendingLine = new StringBuilder();
+
+        public StreamWriter(java.nio.file.Path output) throws IOException {
+            this.file = java.nio.file.Files.newBufferedWriter(output, StandardCharsets.UTF_8);
+        }
+
+        @Override
+        public void onChunk(String text) throws IOException {
+            file.write(text);
+            file.flush();
+
+            pendingLine.append(text);
+            int newline;
+            while ((newline = pendingLine.indexOf("\n")) != -1) {
+                System.out.println(STREAM_PREFIX + pendingLine.substring(0, newline));
+                pendingLine.delete(0, newline + 1);
+            }
+            System.out.flush();
+        }
+
+        @Override
+        public void close() throws IOException {
+            if (pendingLine.length() > 0) {
+                System.out.println(STREAM_PREFIX + pendingLine);
+                pendingLine.setLength(0);
+            }
+            file.close();
+        }
+    }
+
+    @Override
+    public int run(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp <classpath> com.myproject.core.AIAnalyzer <contexto.txt|contexto.ctx> <archivo.java> [--stream] [--no-patch] [--no-cache] [--cache-dir=DIR] [--cache-max-mb=N] [--trace] [--rpm=N] [--max-concurrent=N] [--retries=N] [--http-timeout=S]");
             System.out.println("Asegúrate de configurar la variable de entorno GEMINI_API_KEY.");
-            return;
+            return 1;
         }
 
         // Se utilizan clases de java.nio.file para facilitar la lectura de archivos
-        String context = new String(java.nio.file.Files.readAllBytes(
-            java.nio.file.Paths.get(args[0])), StandardCharsets.UTF_8);
+        // El contexto puede ser de texto o comprimido (ContextArchive)
+        String context = ContextArchive.readText(java.nio.file.Paths.get(options.positional(0)));
         String fileToFix = new String(java.nio.file.Files.readAllBytes(
-            java.nio.file.Paths.get(args[1])), StandardCharsets.UTF_8);
+            java.nio.file.Paths.get(options.positional(1))), StandardCharsets.UTF_8);
 
-        AIAnalyzer analyzer = new AIAnalyzer();
+        AIAnalyzer analyzer = new AIAnalyzer(ResponseCache.fromOptions(options));
+        // Modo parche salvo --no-patch: el modelo devuelve un diff que se aplica localmente
+        PatchCorrector corrector = PatchCorrector.fromOptions(analyzer, options);
+        // Opciones visibles para Trace (--trace) durante esta ejecución
+        CliOptions.setCurrent(options);
         try {
             System.out.println("⚙️  Analizando y corrigiendo el archivo. Esto puede tardar unos segundos...");
-            String result = analyzer.analyze(context, fileToFix);
             java.nio.file.Path outputPath =
-                java.nio.file.Paths.get(args[1].replace(".java", "-corregido.java"));
-            java.nio.file.Files.writeString(outputPath, result, StandardCharsets.UTF_8);
+                java.nio.file.Paths.get(options.positional(1).replace(".java", "-corregido.java"));
+            if (options.getBoolean("stream")) {
+                // El archivo de salida se va escribiendo a medida que llega el texto
+                try (StreamWriter writer = new StreamWriter(outputPath)) {
+                    corrector.correct(context, fileToFix, writer);
+                }
+            } else {
+                String result = corrector.correct(context, fileToFix);
+                // Cancelada en el worker: no se escribe la salida
+                if (Thread.currentThread().isInterrupted()) throw new InterruptedIOException("Corrección cancelada");
+                java.nio.file.Files.writeString(outputPath, result, StandardCharsets.UTF_8);
+            }
             System.out.println("✅ Archivo corregido generado en: " + outputPath);
+            return 0;
         } catch (IllegalStateException e) {
             System.err.println(e.getMessage());
             System.err.println("Por favor, configura la variable de entorno GEMINI_API_KEY.");
+            return 1;
         } catch (Exception e) {
             System.err.println("❌ Error durante el proceso de análisis y corrección.");
             e.printStackTrace();
+            return 1;
+        } finally {
+            CliOptions.clearCurrent();
         }
     }
+
+    public static void main(String[] args) throws Exception {
+        System.exit(new AIAnalyzer().run(args));
+    }
 }
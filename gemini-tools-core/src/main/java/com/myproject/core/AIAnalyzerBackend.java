@@ -6,21 +6,23 @@ package com.myproject.core;
 public class AIAnalyzerBackend extends Especialista {
 
     public AIAnalyzerBackend(String contextFilePath, String targetFilePath) throws Exception {
-        super.runAnalysis(contextFilePath, targetFilePath, "Desarrollador Backend (Spring)");
+        super.runAnalysis(contextFilePath, targetFilePath, "Desarrollador Backend (Spring)", ContextProfile.BACKEND);
     }
 
     // ===============================================
     // 🔥 MÉTODO PRINCIPAL REQUERIDO: FIX
     // ===============================================
     public static void main(String[] args) {
-        if (args.length < 2) {
-            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerBackend <archivo_contexto> <archivo_destino>");
+        CliOptions options = CliOptions.parse(args);
+        CliOptions.setCurrent(options);
+        if (options.positionalCount() < 2) {
+            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerBackend <archivo_contexto> <archivo_destino> [--no-cache] [--no-patch] [--max-context-tokens=N] [--full-context] [--shard-tokens=N] [--fan-out=N]");
             System.exit(1);
             return;
         }
 
         try {
-            new AIAnalyzerBackend(args[0], args[1]); 
+            new AIAnalyzerBackend(options.positional(0), options.positional(1)); 
         } catch (Exception e) {
             System.err.println("❌ ERROR: Falló la ejecución de AIAnalyzerBackend.");
             e.printStackTrace();
@@ -6,21 +6,23 @@ package com.myproject.core;
 public class AIAnalyzerDevOps extends Especialista {
 
     public AIAnalyzerDevOps(String contextFilePath, String targetFilePath) throws Exception {
-        super.runAnalysis(contextFilePath, targetFilePath, "Ingeniero DevOps (CI/CD)");
+        super.runAnalysis(contextFilePath, targetFilePath, "Ingeniero DevOps (CI/CD)", ContextProfile.DEVOPS);
     }
 
     // ===============================================
     // 🔥 MÉTODO PRINCIPAL REQUERIDO: FIX
     // ===============================================
     public static void main(String[] args) {
-        if (args.length < 2) {
-            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerDevOps <archivo_contexto> <archivo_destino>");
+        CliOptions options = CliOptions.parse(args);
+        CliOptions.setCurrent(options);
+        if (options.positionalCount() < 2) {
+            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerDevOps <archivo_contexto> <archivo_destino> [--no-cache] [--no-patch] [--max-context-tokens=N] [--full-context] [--shard-tokens=N] [--fan-out=N]");
             System.exit(1);
             return;
         }
 
         try {
-            new AIAnalyzerDevOps(args[0], args[1]); 
+            new AIAnalyzerDevOps(options.positional(0), options.positional(1)); 
         } catch (Exception e) {
             System.err.println("❌ ERROR: Falló la ejecución de AIAnalyzerDevOps.");
             e.printStackTrace();
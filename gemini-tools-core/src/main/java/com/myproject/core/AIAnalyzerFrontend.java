@@ -6,21 +6,23 @@ package com.myproject.core;
 public class AIAnalyzerFrontend extends Especialista {
 
     public AIAnalyzerFrontend(String contextFilePath, String targetFilePath) throws Exception {
-        super.runAnalysis(contextFilePath, targetFilePath, "Desarrollador Frontend (UI/UX)");
+        super.runAnalysis(contextFilePath, targetFilePath, "Desarrollador Frontend (UI/UX)", ContextProfile.FRONTEND);
     }
 
     // ===============================================
     // 🔥 MÉTODO PRINCIPAL REQUERIDO: FIX
     // ===============================================
     public static void main(String[] args) {
-        if (args.length < 2) {
-            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerFrontend <archivo_contexto> <archivo_destino>");
+        CliOptions options = CliOptions.parse(args);
+        CliOptions.setCurrent(options);
+        if (options.positionalCount() < 2) {
+            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerFrontend <archivo_contexto> <archivo_destino> [--no-cache] [--no-patch] [--max-context-tokens=N] [--full-context] [--shard-tokens=N] [--fan-out=N]");
             System.exit(1);
             return;
         }
 
         try {
-            new AIAnalyzerFrontend(args[0], args[1]); 
+            new AIAnalyzerFrontend(options.positional(0), options.positional(1)); 
         } catch (Exception e) {
             System.err.println("❌ ERROR: Falló la ejecución de AIAnalyzerFrontend.");
             e.printStackTrace();
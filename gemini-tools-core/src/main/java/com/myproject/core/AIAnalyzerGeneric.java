@@ -6,21 +6,23 @@ package com.myproject.core;
 public class AIAnalyzerGeneric extends Especialista {
 
     public AIAnalyzerGeneric(String contextFilePath, String targetFilePath) throws Exception {
-        super.runAnalysis(contextFilePath, targetFilePath, "Analizador Genérico (SOLID)");
+        super.runAnalysis(contextFilePath, targetFilePath, "Analizador Genérico (SOLID)", ContextProfile.GENERIC);
     }
 
     // ===============================================
     // 🔥 MÉTODO PRINCIPAL REQUERIDO: FIX
     // ===============================================
     public static void main(String[] args) {
-        if (args.length < 2) {
-            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerGeneric <archivo_contexto> <archivo_destino>");
+        CliOptions options = CliOptions.parse(args);
+        CliOptions.setCurrent(options);
+        if (options.positionalCount() < 2) {
+            System.err.println("Uso: java -cp <jar> com.myproject.core.AIAnalyzerGeneric <archivo_contexto> <archivo_destino> [--no-cache] [--no-patch] [--max-context-tokens=N] [--full-context] [--shard-tokens=N] [--fan-out=N]");
             System.exit(1);
             return;
         }
 
         try {
-            new AIAnalyzerGeneric(args[0], args[1]); 
+            new AIAnalyzerGeneric(options.positional(0), options.positional(1)); 
         } catch (Exception e) {
             System.err.println("❌ ERROR: Falló la ejecución de AIAnalyzerGeneric.");
             e.printStackTrace();
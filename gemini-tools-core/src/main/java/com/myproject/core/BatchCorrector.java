@@ -0,0 +1,263 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.io.UncheckedIOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.nio.file.attribute.BasicFileAttributes;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+
+/**
+ * BatchCorrector: corrige varios archivos .java en una sola ejecución.
+ * Los destinos se indican con un directorio (se recorre de forma recursiva), un patrón glob relativo
+ * a su primer directorio sin comodines (p. ej. {@code src/main/java/com/app/**.java}) o un único archivo.
+ * El contexto se carga una vez y las correcciones se envían en paralelo, hasta {@code --parallel=N} a la vez
+ * (los límites de {@link GeminiHttpClient} se siguen aplicando). Cada archivo genera su
+ * {@code -corregido.java} (en modo parche, ver {@link PatchCorrector}) y al terminar se escribe un informe en Markdown ({@code --report=ruta}) con el
+ * resultado y la latencia de cada archivo.
+ */
+public class BatchCorrector implements WorkerJob {
+
+    public static final int DEFAULT_PARALLEL = 4;
+    public static final String DEFAULT_REPORT = "correccion-lote.md";
+
+    private static final String JAVA_EXTENSION = ".java";
+    private static final String CORRECTED_SUFFIX = "-corregido.java";
+
+    private final PatchCorrector corrector;
+    private final int parallel;
+
+    /**
+     * Instancia para ejecutar el lote desde la línea de comandos o el worker JVM ({@link #run(String[])}),
+     * que crea su propio corrector a partir de los argumentos.
+     */
+    public BatchCorrector() {
+        this(null, DEFAULT_PARALLEL);
+    }
+
+    public BatchCorrector(PatchCorrector corrector, int parallel) {
+        this.corrector = corrector;
+        this.parallel = Math.max(1, parallel);
+    }
+
+    /**
+     * Resultado de la corrección de un archivo.
+     */
+    public static class Result {
+        public final Path target;
+        public final Path output;
+        public final long millis;
+        public final String error;
+
+        Result(Path target, Path output, long millis, String error) {
+            this.target = target;
+            this.output = output;
+            this.millis = millis;
+            this.error = error;
+        }
+
+        public boolean ok() {
+            return error == null;
+        }
+    }
+
+    /**
+     * Ruta del archivo corregido de un destino (misma convención que la corrección individual).
+     */
+    public static Path correctedPath(Path target) {
+        String name = target.getFileName().toString();
+        return target.resolveSibling(name.substring(0, name.length() - JAVA_EXTENSION.length()) + CORRECTED_SUFFIX);
+    }
+
+    /**
+     * Resuelve los archivos .java a corregir, en orden alfabético. Se omiten las salidas
+     * {@code -corregido.java} de ejecuciones anteriores y los directorios excluidos del contexto.
+     * @param spec Directorio, patrón glob o archivo.
+     */
+    public static List<Path> resolveTargets(String spec) throws IOException {
+        String normalized = spec.replace('\\', '/');
+        Path base;
+        PathMatcher matcher;
+        int wildcard = firstWildcard(normalized);
+        if (wildcard >= 0) {
+            int slash = normalized.lastIndexOf('/', wildcard);
+            base = Paths.get(slash >= 0 ? normalized.substring(0, Math.max(1, slash)) : ".");
+            matcher = FileSystems.getDefault().getPathMatcher("glob:" + normalized.substring(slash + 1));
+        } else {
+            base = Paths.get(spec);
+            if (Files.isRegularFile(base)) return List.of(base);
+            matcher = null;
+        }
+        if (!Files.isDirectory(base)) throw new NoSuchFileException(base.toString(), null, "no es un directorio");
+
+        List<Path> targets = new ArrayList<>();
+        Path root = base;
+        Files.walkFileTree(root, new SimpleFileVisitor<Path>() {
+            @Override
+            public FileVisitResult preVisitDirectory(Path dir, BasicFileAttributes attrs) {
+                if (!dir.equals(root) && ProjectWalker.EXCLUDED_DIRS.contains(dir.getFileName().toString())) {
+                    return FileVisitResult.SKIP_SUBTREE;
+                }
+                return FileVisitResult.CONTINUE;
+            }
+
+            @Override
+            public FileVisitResult visitFile(Path file, BasicFileAttributes attrs) {
+                String name = file.getFileName().toString();
+                if (name.endsWith(JAVA_EXTENSION) && !name.endsWith(CORRECTED_SUFFIX)
+                        && (matcher == null || matcher.matches(root.relativize(file)))) {
+                    targets.add(file);
+                }
+                return FileVisitResult.CONTINUE;
+            }
+        });
+        return new AlphabeticalPathSorter().sort(targets);
+    }
+
+    private static int firstWildcard(String spec) {
+        for (int i = 0; i < spec.length(); i++) {
+            if ("*?[{".indexOf(spec.charAt(i)) >= 0) return i;
+        }
+        return -1;
+    }
+
+    /**
+     * Corrige los archivos con el mismo contexto, hasta {@code parallel} a la vez.
+     * @return Resultados en el orden de los destinos.
+     */
+    public List<Result> correct(String context, List<Path> targets) throws InterruptedException {
+        ExecutorService pool = Executors.newFixedThreadPool(Math.min(parallel, Math.max(1, targets.size())));
+        try {
+            List<Future<Result>> futures = new ArrayList<>(targets.size());
+            for (int i = 0; i < targets.size(); i++) {
+                Path target = targets.get(i);
+                int index = i + 1;
+                futures.add(pool.submit(() -> correctOne(context, target, index, targets.size())));
+            }
+            List<Result> results = new ArrayList<>(targets.size());
+            for (int i = 0; i < futures.size(); i++) {
+                try {
+                    results.add(futures.get(i).get());
+                } catch (ExecutionException e) {
+                    results.add(new Result(targets.get(i), null, 0, String.valueOf(e.getCause())));
+                }
+            }
+            return results;
+        } finally {
+            pool.shutdownNow();
+        }
+    }
+
+    private Result correctOne(String context, Path target, int index, int total) {
+        Path output = correctedPath(target);
+        long start = System.nanoTime();
+        String error = null;
+        try (Trace.Span span = Trace.span("corregir_archivo")) {
+            span.arg("archivo", target.toString());
+            String fileToFix = Files.readString(target, StandardCharsets.UTF_8);
+            String result = corrector.correct(context, fileToFix);
+            if (result.startsWith("ERROR DE ")) {
+                error = result.length() > 200 ? result.substring(0, 200) + "..." : result;
+            } else if (Thread.currentThread().isInterrupted()) {
+                error = "Corrección cancelada";
+            } else {
+                Files.writeString(output, result, StandardCharsets.UTF_8);
+            }
+            span.arg("ok", error == null);
+        } catch (IOException | UncheckedIOException | IllegalStateException e) {
+            error = e.getMessage();
+        }
+        long millis = (System.nanoTime() - start) / 1_000_000;
+        if (error == null) {
+            System.out.println(String.format("✅ [%d/%d] %s -> %s (%.1f s)", index, total, target, output.getFileName(), millis / 1000.0));
+        } else {
+            System.err.println(String.format("❌ [%d/%d] %s: %s", index, total, target, firstLine(error)));
+        }
+        return new Result(target, error == null ? output : null, millis, error);
+    }
+
+    /**
+     * Escribe el informe del lote en Markdown: totales y una fila por archivo.
+     */
+    public static void writeReport(Path report, List<Result> results, long totalMillis) throws IOException {
+        long ok = results.stream().filter(Result::ok).count();
+        StringBuilder text = new StringBuilder();
+        text.append("# Informe de corrección por lotes\n\n")
+            .append(String.format("- Archivos: %d%n- Correctos: %d%n- Con error: %d%n- Tiempo total: %.1f s%n%n",
+                    results.size(), ok, results.size() - ok, totalMillis / 1000.0))
+            .append("| Archivo | Resultado | Latencia (s) | Salida / Error |\n")
+            .append("|---|---|---:|---|\n");
+        for (Result result : results) {
+            text.append("| ").append(result.target)
+                .append(" | ").append(result.ok() ? "✅ OK" : "❌ Error")
+                .append(" | ").append(String.format("%.1f", result.millis / 1000.0))
+                .append(" | ").append(result.ok() ? result.output.toString() : firstLine(result.error).replace("|", "\\|"))
+                .append(" |\n");
+        }
+        Files.writeString(report, text.toString(), StandardCharsets.UTF_8);
+    }
+
+    private static String firstLine(String text) {
+        if (text == null) return "";
+        int newline = text.indexOf('\n');
+        return newline >= 0 ? text.substring(0, newline) : text;
+    }
+
+    /**
+     * Corrige el lote indicado en los argumentos.
+     * @return 0 si todos los archivos se corrigieron, 1 en caso contrario.
+     */
+    @Override
+    public int run(String[] args) {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp <jar> com.myproject.core.BatchCorrector <contexto.txt|contexto.ctx> <directorio|patrón|archivo.java> [--parallel=N] [--report=ruta.md] [--no-patch] [--no-cache] [--trace] [--rpm=N] [--max-concurrent=N] [--retries=N] [--http-timeout=S]");
+            return 1;
+        }
+        CliOptions.setCurrent(options);
+        try {
+            List<Path> targets = resolveTargets(options.positional(1));
+            if (targets.isEmpty()) {
+                System.err.println("❌ ERROR: No se encontraron archivos .java en: " + options.positional(1));
+                return 1;
+            }
+
+            String context;
+            try (Trace.Span span = Trace.span("leer_contexto")) {
+                context = ContextArchive.readText(Paths.get(options.positional(0)));
+                span.arg("caracteres", context.length());
+            }
+            int parallel = options.getInt("parallel", DEFAULT_PARALLEL);
+            System.out.println(String.format("⚙️  Corrigiendo %d archivos (%d en paralelo) con un contexto de ~%,d tokens...",
+                    targets.size(), Math.min(parallel, targets.size()), ContextSelector.estimateTokens(context.length())));
+
+            long start = System.nanoTime();
+            AIAnalyzer analyzer = new AIAnalyzer(ResponseCache.fromOptions(options));
+            BatchCorrector corrector = new BatchCorrector(PatchCorrector.fromOptions(analyzer, options), parallel);
+            List<Result> results = corrector.correct(context, targets);
+            long totalMillis = (System.nanoTime() - start) / 1_000_000;
+
+            Path report = Paths.get(options.get("report", DEFAULT_REPORT));
+            writeReport(report, results, totalMillis);
+            long failed = results.stream().filter(result -> !result.ok()).count();
+            System.out.println(String.format("📊 Lote terminado en %.1f s: %d correctos, %d con error. Informe: %s",
+                    totalMillis / 1000.0, results.size() - failed, failed, report));
+            return failed > 0 ? 1 : 0;
+        } catch (Exception e) {
+            System.err.println("❌ ERROR: Falló la corrección por lotes: " + e.getMessage());
+            e.printStackTrace();
+            return 1;
+        } finally {
+            CliOptions.clearCurrent();
+        }
+    }
+
+    public static void main(String[] args) {
+        System.exit(new BatchCorrector().run(args));
+    }
+}
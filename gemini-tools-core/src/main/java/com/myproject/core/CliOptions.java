@@ -0,0 +1,86 @@
+package com.myproject.core;
+
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Argumentos de línea de comandos de las herramientas: parámetros posicionales
+ * seguidos de opciones con el formato {@code --clave=valor} o {@code --bandera}.
+ */
+public class CliOptions {
+
+    /** Opciones de la ejecución en curso, visibles desde las clases que no reciben los argumentos. */
+    private static final InheritableThreadLocal<CliOptions> CURRENT = new InheritableThreadLocal<>();
+
+    private final List<String> positional = new ArrayList<>();
+    private final Map<String, String> options = new HashMap<>();
+
+    public static CliOptions parse(String[] args) {
+        CliOptions result = new CliOptions();
+        for (String arg : args) {
+            if (arg.startsWith("--")) {
+                int eq = arg.indexOf('=');
+                if (eq > 2) {
+                    result.options.put(arg.substring(2, eq), arg.substring(eq + 1));
+                } else {
+                    result.options.put(arg.substring(2), "true");
+                }
+            } else {
+                result.positional.add(arg);
+            }
+        }
+        return result;
+    }
+
+    /**
+     * Establece las opciones de la ejecución en curso para el hilo actual (y los hilos que cree).
+     */
+    public static void setCurrent(CliOptions options) {
+        CURRENT.set(options);
+    }
+
+    public static void clearCurrent() {
+        CURRENT.remove();
+    }
+
+    /**
+     * Opciones de la ejecución en curso, o unas opciones vacías si no se establecieron.
+     */
+    public static CliOptions current() {
+        CliOptions options = CURRENT.get();
+        return options != null ? options : new CliOptions();
+    }
+
+    public int positionalCount() {
+        return positional.size();
+    }
+
+    public String positional(int index) {
+        return positional.get(index);
+    }
+
+    public boolean has(String key) {
+        return options.containsKey(key);
+    }
+
+    public String get(String key, String defaultValue) {
+        return options.getOrDefault(key, defaultValue);
+    }
+
+    public boolean getBoolean(String key) {
+        return Boolean.parseBoolean(options.getOrDefault(key, "false"));
+    }
+
+    public int getInt(String key, int defaultValue) {
+        String value = options.get(key);
+        if (value == null) return defaultValue;
+        try {
+            return Integer.parseInt(value.trim());
+        } catch (NumberFormatException e) {
+            System.err.println("Advertencia: valor inválido para --" + key + ": " + value + " (se usa " + defaultValue + ")");
+            return defaultValue;
+        }
+    }
+}
@@ -0,0 +1,416 @@
+package com.myproject.core;
+
+import java.io.*;
+import java.nio.ByteBuffer;
+import java.nio.channels.Channels;
+import java.nio.channels.FileChannel;
+import java.nio.channels.WritableByteChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.*;
+import java.util.zip.DataFormatException;
+import java.util.zip.Deflater;
+import java.util.zip.Inflater;
+
+/**
+ * ContextArchive: contexto compactado en formato binario comprimido e indexado ({@value #EXTENSION}).
+ *
+ * Cada archivo del proyecto se guarda comprimido por separado (Deflate) y la cabecera apunta a un
+ * índice con, por archivo: ruta relativa, posición y longitud comprimida, longitud original, mtime,
+ * tamaño y hash SHA-256. Así se puede leer una sola sección sin recorrer el resto, seleccionar por
+ * perfil con solo el índice y copiar secciones sin descomprimirlas en las actualizaciones incrementales.
+ * Las secciones se leen bajo demanda con lecturas posicionales (sin mapear el archivo en memoria,
+ * para que en Windows se pueda reemplazar aunque otro proceso lo tenga abierto).
+ *
+ * Estructura:
+ * <pre>
+ * "GCTX" | versión (int) | posición del índice (long) | número de entradas (int)
+ * secciones comprimidas...
+ * índice: raíz (UTF) y, por entrada, ruta (UTF), posición (long), longitud comprimida (int),
+ *         longitud original (int), mtime (long), tamaño (long), SHA-256 (32 bytes)
+ * </pre>
+ * {@link #exportText} produce el formato de texto de {@link FileProcessor} (secciones con cabecera
+ * {@code // ===== Archivo: ... =====} separadas por un salto de línea).
+ */
+public class ContextArchive implements Closeable {
+
+    public static final String EXTENSION = ".ctx";
+
+    private static final byte[] MAGIC = {'G', 'C', 'T', 'X'};
+    private static final int VERSION = 1;
+    private static final int HEADER_BYTES = MAGIC.length + 4 + 8 + 4;
+    private static final int HASH_BYTES = 32;
+    private static final int BUFFER_SIZE = 64 * 1024;
+
+    /**
+     * Entrada del índice.
+     */
+    public static class Entry {
+        public final String path;
+        final long offset;
+        final int compressedLength;
+        public final int rawLength;
+        public final long mtime;
+        public final long size;
+        final byte[] hash;
+
+        Entry(String path, long offset, int compressedLength, int rawLength, long mtime, long size, byte[] hash) {
+            this.path = path;
+            this.offset = offset;
+            this.compressedLength = compressedLength;
+            this.rawLength = rawLength;
+            this.mtime = mtime;
+            this.size = size;
+            this.hash = hash;
+        }
+
+        public String hashHex() {
+            StringBuilder hex = new StringBuilder(hash.length * 2);
+            for (byte b : hash) hex.append(String.format("%02x", b));
+            return hex.toString();
+        }
+
+        /** Cabecera de la sección en el formato de texto. */
+        public String header() {
+            return FileProcessor.sectionHeader(Paths.get(path));
+        }
+    }
+
+    private final Path file;
+    private final FileChannel channel;
+    private final String root;
+    private final List<Entry> entries;
+    private final Map<String, Entry> byPath = new HashMap<>();
+
+    private ContextArchive(Path file, FileChannel channel, String root, List<Entry> entries) {
+        this.file = file;
+        this.channel = channel;
+        this.root = root;
+        this.entries = Collections.unmodifiableList(entries);
+        for (Entry entry : entries) byPath.put(entry.path, entry);
+    }
+
+    /**
+     * Indica si la ruta usa la extensión del formato comprimido (para elegir el formato al escribir).
+     */
+    public static boolean isArchivePath(Path file) {
+        return file.getFileName().toString().endsWith(EXTENSION);
+    }
+
+    /**
+     * Indica si el archivo es un contexto comprimido (por su firma, no por la extensión).
+     */
+    public static boolean isArchive(Path file) {
+        if (!Files.isRegularFile(file)) return false;
+        try (InputStream in = Files.newInputStream(file)) {
+            return Arrays.equals(in.readNBytes(MAGIC.length), MAGIC);
+        } catch (IOException e) {
+            return false;
+        }
+    }
+
+    /**
+     * Abre el archivo y lee solo la cabecera y el índice.
+     */
+    public static ContextArchive open(Path file) throws IOException {
+        FileChannel channel = FileChannel.open(file, StandardOpenOption.READ);
+        try {
+            ByteBuffer header = ByteBuffer.allocate(HEADER_BYTES);
+            readFully(channel, header, 0);
+            header.flip();
+            byte[] magic = new byte[MAGIC.length];
+            header.get(magic);
+            if (!Arrays.equals(magic, MAGIC)) throw new IOException("No es un contexto comprimido: " + file);
+            int version = header.getInt();
+            if (version != VERSION) throw new IOException("Versión de contexto no soportada (" + version + "): " + file);
+            long indexOffset = header.getLong();
+            int count = header.getInt();
+            if (indexOffset < HEADER_BYTES || indexOffset > channel.size()) {
+                throw new IOException("Índice de contexto inválido: " + file);
+            }
+
+            DataInputStream in = new DataInputStream(new BufferedInputStream(
+                    Channels.newInputStream(channel.position(indexOffset)), BUFFER_SIZE));
+            String root = in.readUTF();
+            List<Entry> entries = new ArrayList<>(count);
+            for (int i = 0; i < count; i++) {
+                String path = in.readUTF();
+                long offset = in.readLong();
+                int compressedLength = in.readInt();
+                int rawLength = in.readInt();
+                long mtime = in.readLong();
+                long size = in.readLong();
+                byte[] hash = new byte[HASH_BYTES];
+                in.readFully(hash);
+                entries.add(new Entry(path, offset, compressedLength, rawLength, mtime, size, hash));
+            }
+            return new ContextArchive(file, channel, root, entries);
+        } catch (IOException | RuntimeException e) {
+            channel.close();
+            if (e instanceof EOFException) throw new IOException("Contexto comprimido truncado: " + file, e);
+            throw e;
+        }
+    }
+
+    public Path getFile() {
+        return file;
+    }
+
+    /** Raíz absoluta del proyecto del que se generó el contexto. */
+    public String getRoot() {
+        return root;
+    }
+
+    public List<Entry> entries() {
+        return entries;
+    }
+
+    /** Entrada de una ruta relativa, o null si no está. */
+    public Entry find(String path) {
+        return byPath.get(path);
+    }
+
+    public long rawBytes() {
+        long total = 0;
+        for (Entry entry : entries) total += entry.rawLength;
+        return total;
+    }
+
+    public long compressedBytes() {
+        long total = 0;
+        for (Entry entry : entries) total += entry.compressedLength;
+        return total;
+    }
+
+    /**
+     * Contenido original de un archivo (descomprime solo su sección).
+     */
+    public byte[] read(Entry entry) throws IOException {
+        ByteBuffer compressed = ByteBuffer.allocate(entry.compressedLength);
+        readFully(channel, compressed, entry.offset);
+        Inflater inflater = new Inflater();
+        try {
+            inflater.setInput(compressed.array());
+            byte[] content = new byte[entry.rawLength];
+            int total = 0;
+            while (total < content.length) {
+                int n = inflater.inflate(content, total, content.length - total);
+                if (n == 0 && (inflater.finished() || inflater.needsInput())) {
+                    throw new IOException("Sección truncada en el contexto comprimido: " + entry.path);
+                }
+                total += n;
+            }
+            return content;
+        } catch (DataFormatException e) {
+            throw new IOException("Sección corrupta en el contexto comprimido: " + entry.path, e);
+        } finally {
+            inflater.end();
+        }
+    }
+
+    /**
+     * Sección completa en el formato de texto: cabecera y contenido.
+     */
+    public String sectionText(Entry entry) throws IOException {
+        return entry.header() + new String(read(entry), StandardCharsets.UTF_8);
+    }
+
+    /**
+     * Escribe el contexto completo en el formato de texto de {@link FileProcessor}.
+     */
+    public void exportText(OutputStream out) throws IOException {
+        boolean first = true;
+        for (Entry entry : entries) {
+            if (!first) out.write('\n');
+            first = false;
+            out.write(entry.header().getBytes(StandardCharsets.UTF_8));
+            out.write(read(entry));
+        }
+    }
+
+    /**
+     * Contexto completo en el formato de texto.
+     */
+    public String toText() throws IOException {
+        StringBuilder text = new StringBuilder((int) Math.min(Integer.MAX_VALUE - 8, rawBytes() + entries.size() * 64L));
+        for (Entry entry : entries) {
+            if (text.length() > 0) text.append('\n');
+            text.append(sectionText(entry));
+        }
+        return text.toString();
+    }
+
+    /**
+     * Copia la sección comprimida tal cual (para las actualizaciones incrementales).
+     */
+    void transferCompressed(Entry entry, WritableByteChannel out) throws IOException {
+        long copied = 0;
+        while (copied < entry.compressedLength) {
+            long n = channel.transferTo(entry.offset + copied, entry.compressedLength - copied, out);
+            if (n <= 0) throw new IOException("El contexto comprimido está truncado: " + file);
+            copied += n;
+        }
+    }
+
+    @Override
+    public void close() throws IOException {
+        channel.close();
+    }
+
+    /**
+     * Lee un contexto en el formato de texto, tanto si el archivo es de texto como si es comprimido.
+     */
+    public static String readText(Path file) throws IOException {
+        if (!isArchive(file)) return new String(Files.readAllBytes(file), StandardCharsets.UTF_8);
+        try (ContextArchive archive = open(file)) {
+            return archive.toText();
+        }
+    }
+
+    private static void readFully(FileChannel channel, ByteBuffer buffer, long position) throws IOException {
+        while (buffer.hasRemaining()) {
+            int n = channel.read(buffer, position + buffer.position());
+            if (n < 0) throw new EOFException();
+        }
+    }
+
+    private static MessageDigest newDigest() {
+        try {
+            return MessageDigest.getInstance("SHA-256");
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException("SHA-256 no disponible", e);
+        }
+    }
+
+    /**
+     * Escritura de un contexto comprimido. Se escribe en un archivo temporal que sustituye al destino
+     * al llamar a {@link #commit()}; si se cierra sin confirmar, el temporal se descarta.
+     */
+    public static class Builder implements Closeable {
+        private final Path output;
+        private final Path temp;
+        private final FileChannel channel;
+        private final String root;
+        private final List<Entry> entries = new ArrayList<>();
+        private final Deflater deflater = new Deflater(Deflater.DEFAULT_COMPRESSION);
+        private final MessageDigest digest = newDigest();
+        private final byte[] buffer = new byte[BUFFER_SIZE];
+        private boolean committed;
+
+        public Builder(Path output, String root) throws IOException {
+            this.output = output;
+            this.temp = output.resolveSibling(output.getFileName() + ".tmp");
+            this.root = root;
+            this.channel = FileChannel.open(temp, StandardOpenOption.CREATE,
+                    StandardOpenOption.TRUNCATE_EXISTING, StandardOpenOption.WRITE);
+            channel.position(HEADER_BYTES);
+        }
+
+        /**
+         * Comprime y añade el contenido de un archivo.
+         */
+        public Entry add(String path, byte[] content, long mtime, long size) throws IOException {
+            long offset = channel.position();
+            deflater.reset();
+            deflater.setInput(content);
+            deflater.finish();
+            long compressed = 0;
+            while (!deflater.finished()) {
+                int n = deflater.deflate(buffer);
+                writeFully(ByteBuffer.wrap(buffer, 0, n));
+                compressed += n;
+            }
+            return append(new Entry(path, offset, (int) compressed, content.length, mtime, size, digest.digest(content)));
+        }
+
+        /**
+         * Copia una sección de otro contexto comprimido sin descomprimirla.
+         * @param mtime mtime actual del archivo (puede haber cambiado sin cambiar el contenido).
+         */
+        public Entry copy(ContextArchive source, Entry entry, long mtime) throws IOException {
+            long offset = channel.position();
+            source.transferCompressed(entry, channel);
+            return append(new Entry(entry.path, offset, entry.compressedLength, entry.rawLength, mtime, entry.size, entry.hash));
+        }
+
+        private Entry append(Entry entry) {
+            entries.add(entry);
+            return entry;
+        }
+
+        public List<Entry> entries() {
+            return entries;
+        }
+
+        /**
+         * Escribe el índice y la cabecera y sustituye el destino.
+         */
+        public void commit() throws IOException {
+            long indexOffset = channel.position();
+            DataOutputStream out = new DataOutputStream(new BufferedOutputStream(Channels.newOutputStream(channel), BUFFER_SIZE));
+            out.writeUTF(root);
+            for (Entry entry : entries) {
+                out.writeUTF(entry.path);
+                out.writeLong(entry.offset);
+                out.writeInt(entry.compressedLength);
+                out.writeInt(entry.rawLength);
+                out.writeLong(entry.mtime);
+                out.writeLong(entry.size);
+                out.write(entry.hash);
+            }
+            out.flush();
+
+            ByteBuffer header = ByteBuffer.allocate(HEADER_BYTES);
+            header.put(MAGIC).putInt(VERSION).putLong(indexOffset).putInt(entries.size());
+            header.flip();
+            channel.position(0);
+            writeFully(header);
+            channel.close();
+            Files.move(temp, output, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+            committed = true;
+        }
+
+        private void writeFully(ByteBuffer bytes) throws IOException {
+            while (bytes.hasRemaining()) channel.write(bytes);
+        }
+
+        @Override
+        public void close() throws IOException {
+            deflater.end();
+            if (!committed) {
+                channel.close();
+                Files.deleteIfExists(temp);
+            }
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 1) {
+            System.out.println("Uso: java -cp <jar> com.myproject.core.ContextArchive <contexto" + EXTENSION + "> [salida.txt]");
+            System.out.println("Sin salida muestra el índice; con salida exporta el contexto en el formato de texto.");
+            return;
+        }
+
+        Path input = Paths.get(options.positional(0));
+        try (ContextArchive archive = open(input)) {
+            if (options.positionalCount() >= 2) {
+                Path output = Paths.get(options.positional(1));
+                try (OutputStream out = new BufferedOutputStream(Files.newOutputStream(output), BUFFER_SIZE)) {
+                    archive.exportText(out);
+                }
+                System.out.println("✅ Contexto exportado en formato de texto en: " + output);
+                return;
+            }
+            for (Entry entry : archive.entries()) {
+                System.out.println(String.format("  %-60s %,10d -> %,9d bytes", entry.path, entry.rawLength, entry.compressedLength));
+            }
+            long raw = archive.rawBytes();
+            System.out.println(String.format("📊 %d archivos, %,d bytes originales, %,d comprimidos (%.1f%%), archivo de %,d bytes",
+                    archive.entries().size(), raw, archive.compressedBytes(),
+                    raw == 0 ? 0.0 : archive.compressedBytes() * 100.0 / raw, Files.size(input)));
+        }
+    }
+}
@@ -0,0 +1,82 @@
+package com.myproject.core;
+
+import java.util.Locale;
+
+/**
+ * Perfil de selección de contexto de un rol especialista.
+ * Define qué secciones del contexto compactado interesan al rol: los patrones preferidos
+ * (en orden de prioridad) se incluyen primero, los excluidos nunca se envían y el resto
+ * solo entra si queda presupuesto de tokens.
+ * Los patrones se comparan, sin distinguir mayúsculas, contra la ruta relativa de cada archivo.
+ */
+public class ContextProfile {
+
+    /** Presupuesto de tokens por defecto para el contexto de un especialista sin map-reduce (y de las correcciones). */
+    public static final int DEFAULT_MAX_TOKENS = 120_000;
+
+    public static final ContextProfile DBA = new ContextProfile("DBA",
+            new String[] {"database", "repository", "dao", "entity", "model", "perfil", ".sql", "schema", "migration", "pom.xml", "application"},
+            new String[] {".css", ".html", ".js", "frontend", "static/", "templates/"});
+
+    public static final ContextProfile QA = new ContextProfile("QA",
+            new String[] {"test", "controller", "service", "readme", "pom.xml"},
+            new String[] {".css", "static/"});
+
+    public static final ContextProfile BACKEND = new ContextProfile("Backend",
+            new String[] {"controller", "service", "repository", "entity", "model", "config", ".java", "pom.xml", "application"},
+            new String[] {".css", ".html", ".js", "static/", "templates/"});
+
+    public static final ContextProfile FRONTEND = new ContextProfile("Frontend",
+            new String[] {"frontend", "static/", "templates/", ".html", ".css", ".js", ".php", "controller", ".json"},
+            new String[] {"repository", "dao", "database", ".sql", "migration"});
+
+    public static final ContextProfile DEVOPS = new ContextProfile("DevOps",
+            new String[] {"pom.xml", "dockerfile", "docker-compose", ".yml", ".yaml", ".github", "jenkins", "readme", ".py", "application"},
+            new String[] {".css", ".html"});
+
+    /** Perfil genérico: sin exclusiones, prioriza código fuente frente a datos y documentación. */
+    public static final ContextProfile GENERIC = new ContextProfile("Genérico",
+            new String[] {".java", ".py", ".php", "pom.xml"},
+            new String[0]);
+
+    private final String name;
+    private final String[] preferred;
+    private final String[] excluded;
+
+    public ContextProfile(String name, String[] preferred, String[] excluded) {
+        this.name = name;
+        this.preferred = preferred;
+        this.excluded = excluded;
+    }
+
+    public String getName() {
+        return name;
+    }
+
+    /**
+     * Busca un perfil predefinido por su nombre, sin distinguir mayúsculas.
+     * @return null si no existe.
+     */
+    public static ContextProfile forName(String name) {
+        for (ContextProfile profile : new ContextProfile[] {DBA, QA, BACKEND, FRONTEND, DEVOPS, GENERIC}) {
+            if (profile.name.equalsIgnoreCase(name)) return profile;
+        }
+        return null;
+    }
+
+    /**
+     * Prioridad de un archivo para este perfil: 0 es la más alta; los archivos que no
+     * coinciden con ningún patrón preferido reciben {@code preferred.length}.
+     * @return -1 si el archivo está excluido.
+     */
+    public int priority(String relativePath) {
+        String value = relativePath.replace('\\', '/').toLowerCase(Locale.ROOT);
+        for (String pattern : excluded) {
+            if (value.contains(pattern)) return -1;
+        }
+        for (int i = 0; i < preferred.length; i++) {
+            if (value.contains(preferred[i])) return i;
+        }
+        return preferred.length;
+    }
+}
@@ -0,0 +1,216 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.Comparator;
+import java.util.List;
+
+/**
+ * ContextSelector: construye, a partir del contexto compactado por {@link FileProcessor},
+ * un subconjunto adaptado a un rol y acotado por un presupuesto de tokens.
+ *
+ * Indexa las secciones del contexto (cabeceras {@code // ===== Archivo: ... =====}), las ordena
+ * por la prioridad que les asigna el {@link ContextProfile} y las incluye mientras quepan en el
+ * presupuesto. El resultado conserva el orden y el formato original de las secciones.
+ * Los tokens se estiman como un token cada {@value #CHARS_PER_TOKEN} caracteres.
+ * Con un {@link ContextArchive} la selección se hace solo con el índice y únicamente se
+ * descomprimen las secciones elegidas (el tamaño se estima con los bytes de cada archivo).
+ */
+public class ContextSelector {
+
+    static final int CHARS_PER_TOKEN = 4;
+
+    private static final String HEADER_START = "\n" + FileProcessor.SECTION_MARKER;
+    private static final String HEADER_END = " =====";
+
+    /**
+     * Sección del contexto: rango [start, end) del texto, sin el salto de línea separador.
+     */
+    public static class Section {
+        public final String path;
+        final int start;
+        final int end;
+
+        Section(String path, int start, int end) {
+            this.path = path;
+            this.start = start;
+            this.end = end;
+        }
+
+        public int estimatedTokens() {
+            return estimateTokens(end - start);
+        }
+    }
+
+    /**
+     * Resultado de la selección.
+     */
+    public static class Selection {
+        public final String text;
+        public final List<String> paths;
+        public final int totalSections;
+        public final int estimatedTokens;
+        public final int totalTokens;
+
+        Selection(String text, List<String> paths, int totalSections, int estimatedTokens, int totalTokens) {
+            this.text = text;
+            this.paths = paths;
+            this.totalSections = totalSections;
+            this.estimatedTokens = estimatedTokens;
+            this.totalTokens = totalTokens;
+        }
+
+        public String summary() {
+            return String.format("%d de %d secciones, ~%,d tokens estimados (contexto completo: ~%,d)",
+                    paths.size(), totalSections, estimatedTokens, totalTokens);
+        }
+    }
+
+    public static int estimateTokens(int chars) {
+        return (chars + CHARS_PER_TOKEN - 1) / CHARS_PER_TOKEN;
+    }
+
+    /**
+     * Localiza las secciones del contexto compactado.
+     */
+    public static List<Section> index(String context) {
+        List<Integer> starts = new ArrayList<>();
+        int position = context.indexOf(HEADER_START);
+        while (position != -1) {
+            starts.add(position);
+            position = context.indexOf(HEADER_START, position + HEADER_START.length());
+        }
+
+        List<Section> sections = new ArrayList<>(starts.size());
+        for (int i = 0; i < starts.size(); i++) {
+            int start = starts.get(i);
+            // Las secciones se separan con un salto de línea que no pertenece a ninguna de ellas
+            int end = i + 1 < starts.size() ? starts.get(i + 1) - 1 : context.length();
+            int nameStart = start + HEADER_START.length();
+            int lineEnd = context.indexOf('\n', nameStart);
+            int nameEnd = context.lastIndexOf(HEADER_END, lineEnd == -1 ? context.length() : lineEnd);
+            String path = nameEnd > nameStart ? context.substring(nameStart, nameEnd) : "";
+            sections.add(new Section(path, start, Math.max(start, end)));
+        }
+        return sections;
+    }
+
+    /**
+     * Selecciona las secciones relevantes para el perfil dentro del presupuesto.
+     * @param pinnedFileName Nombre de archivo que se incluye siempre (p. ej. el archivo a corregir), o null.
+     */
+    public Selection select(String context, ContextProfile profile, int maxTokens, String pinnedFileName) {
+        List<Section> sections = index(context);
+        int totalTokens = estimateTokens(context.length());
+        if (sections.isEmpty()) {
+            // Contexto sin cabeceras: no hay nada que seleccionar
+            List<String> paths = new ArrayList<>();
+            return new Selection(context, paths, 0, totalTokens, totalTokens);
+        }
+
+        List<String> sectionPaths = new ArrayList<>(sections.size());
+        int[] tokens = new int[sections.size()];
+        for (int i = 0; i < sections.size(); i++) {
+            sectionPaths.add(sections.get(i).path);
+            tokens[i] = sections.get(i).estimatedTokens();
+        }
+        boolean[] selected = choose(sectionPaths, tokens, profile, maxTokens, pinnedFileName);
+
+        StringBuilder text = new StringBuilder();
+        List<String> paths = new ArrayList<>();
+        for (int i = 0; i < sections.size(); i++) {
+            if (!selected[i]) continue;
+            Section section = sections.get(i);
+            if (!paths.isEmpty()) text.append('\n');
+            text.append(context, section.start, section.end);
+            paths.add(section.path);
+        }
+        return new Selection(text.toString(), paths, sections.size(), estimateTokens(text.length()), totalTokens);
+    }
+
+    /**
+     * Igual que {@link #select(String, ContextProfile, int, String)} sobre un contexto comprimido:
+     * solo se leen y descomprimen las secciones seleccionadas.
+     */
+    public Selection select(ContextArchive archive, ContextProfile profile, int maxTokens, String pinnedFileName) throws IOException {
+        List<ContextArchive.Entry> entries = archive.entries();
+        List<String> sectionPaths = new ArrayList<>(entries.size());
+        int[] tokens = new int[entries.size()];
+        long totalChars = 0;
+        for (int i = 0; i < entries.size(); i++) {
+            ContextArchive.Entry entry = entries.get(i);
+            sectionPaths.add(entry.path);
+            int chars = entry.header().length() + entry.rawLength;
+            tokens[i] = estimateTokens(chars);
+            totalChars += chars + 1;
+        }
+        int totalTokens = estimateTokens((int) Math.min(Integer.MAX_VALUE - CHARS_PER_TOKEN, totalChars));
+        boolean[] selected = choose(sectionPaths, tokens, profile, maxTokens, pinnedFileName);
+
+        StringBuilder text = new StringBuilder();
+        List<String> paths = new ArrayList<>();
+        for (int i = 0; i < entries.size(); i++) {
+            if (!selected[i]) continue;
+            if (!paths.isEmpty()) text.append('\n');
+            text.append(archive.sectionText(entries.get(i)));
+            paths.add(entries.get(i).path);
+        }
+        return new Selection(text.toString(), paths, entries.size(), estimateTokens(text.length()), totalTokens);
+    }
+
+    /**
+     * Elige las secciones por prioridad del perfil mientras quepan en el presupuesto;
+     * la sección fijada se incluye siempre.
+     */
+    private static boolean[] choose(List<String> paths, int[] tokens, ContextProfile profile, int maxTokens, String pinnedFileName) {
+        List<Integer> candidates = new ArrayList<>();
+        int[] priorities = new int[paths.size()];
+        for (int i = 0; i < paths.size(); i++) {
+            priorities[i] = isPinned(paths.get(i), pinnedFileName) ? -2 : profile.priority(paths.get(i));
+            if (priorities[i] != -1) candidates.add(i);
+        }
+        candidates.sort(Comparator.<Integer>comparingInt(i -> priorities[i]).thenComparingInt(i -> i));
+
+        boolean[] selected = new boolean[paths.size()];
+        long used = 0;
+        for (int i : candidates) {
+            if (priorities[i] == -2 || used + tokens[i] <= maxTokens) {
+                selected[i] = true;
+                used += tokens[i];
+            }
+        }
+        return selected;
+    }
+
+    private static boolean isPinned(String sectionPath, String pinnedFileName) {
+        if (pinnedFileName == null) return false;
+        String path = sectionPath.replace('\\', '/');
+        return path.equals(pinnedFileName) || path.endsWith("/" + pinnedFileName);
+    }
+
+    public static void main(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp <jar> com.myproject.core.ContextSelector <contexto.txt|contexto.ctx> <DBA|QA|Backend|Frontend|DevOps|Genérico> [--max-context-tokens=N]");
+            return;
+        }
+
+        ContextProfile profile = ContextProfile.forName(options.positional(1));
+        if (profile == null) {
+            System.err.println("❌ ERROR: Perfil desconocido: " + options.positional(1));
+            return;
+        }
+        int maxTokens = options.getInt("max-context-tokens", ContextProfile.DEFAULT_MAX_TOKENS);
+        Selection selection;
+        if (ContextArchive.isArchive(Paths.get(options.positional(0)))) {
+            try (ContextArchive archive = ContextArchive.open(Paths.get(options.positional(0)))) {
+                selection = new ContextSelector().select(archive, profile, maxTokens, null);
+            }
+        } else {
+            selection = new ContextSelector().select(ContextArchive.readText(Paths.get(options.positional(0))), profile, maxTokens, null);
+        }
+        for (String path : selection.paths) System.out.println("  " + path);
+        System.out.println("📊 Perfil " + profile.getName() + ": " + selection.summary());
+    }
+}
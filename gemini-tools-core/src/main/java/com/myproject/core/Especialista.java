@@ -1,6 +1,7 @@
 package com.myproject.core;
 
 import java.io.IOException;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Files;
 import java.nio.file.Path;
 import java.nio.file.Paths;
@@ -18,20 +19,43 @@ public abstract class Especialista {
      * @param role Nombre del rol para el mensaje de salida y la guía.
      */
     protected void runAnalysis(String contextFilePath, String targetFilePath, String role) throws Exception {
+        runAnalysis(contextFilePath, targetFilePath, role, null);
+    }
+
+    /**
+     * Igual que {@link #runAnalysis(String, String, String)}, pero enviando a la IA solo las secciones
+     * del contexto relevantes para el perfil del rol (ver {@link ContextSelector}).
+     * Las opciones {@code --max-context-tokens=N} y {@code --full-context} ajustan o desactivan la selección.
+     * Si el contexto de una guía supera {@code --shard-tokens=N}, se analiza por fragmentos en paralelo
+     * ({@code --fan-out=N}) y se combina en una guía final (ver {@link MapReduceAnalyzer}); en ese caso la
+     * selección no recorta el contexto a {@link ContextProfile#DEFAULT_MAX_TOKENS}.
+     * Con {@code --trace} se emiten los tiempos de cada etapa (ver {@link Trace}).
+     * @param profile Perfil de selección del rol, o null para enviar el contexto completo.
+     */
+    protected void runAnalysis(String contextFilePath, String targetFilePath, String role, ContextProfile profile) throws Exception {
+        try (Trace.Span span = Trace.span("Especialista.runAnalysis")) {
+            span.arg("rol", role).arg("destino", targetFilePath);
+            execute(contextFilePath, targetFilePath, role, profile);
+        } finally {
+            Trace.resources("memoria_jvm");
+        }
+    }
+
+    private void execute(String contextFilePath, String targetFilePath, String role, ContextProfile profile) throws Exception {
         System.out.println("Iniciando análisis real de IA para el rol: " + role);
         System.out.println("Ruta del contexto: " + contextFilePath);
         System.out.println("Ruta de destino (Input): " + targetFilePath);
 
-        // --- 1. Leer el contexto del proyecto ---
-        String context;
-        try {
-            context = new String(Files.readAllBytes(Paths.get(contextFilePath)));
-        } catch (IOException e) {
-            throw new Exception("Error al leer el archivo de contexto en: " + contextFilePath, e);
-        }
+        // --- 1. Leer el contexto del proyecto y seleccionar las secciones relevantes para el rol ---
+        CliOptions options = CliOptions.current();
+        String targetName = Paths.get(targetFilePath).getFileName().toString();
+        String context = loadContext(Paths.get(contextFilePath), profile, options, targetName);
 
         // --- 2. Lógica de la IA (IMPLEMENTACIÓN REAL DE LA LLAMADA A GEMINI) ---
-        AIAnalyzer analyzer = new AIAnalyzer();
+        // Las opciones de la ejecución (p. ej. --no-cache) determinan el uso de la caché de respuestas
+        AIAnalyzer analyzer = new AIAnalyzer(ResponseCache.fromOptions(options));
+        // Con --stream el texto se escribe en el archivo y se muestra a medida que llega
+        boolean streaming = options.getBoolean("stream");
         String resultContent;
         Path targetPath = Paths.get(targetFilePath);
         String fileName = targetPath.getFileName().toString();
@@ -42,11 +66,6 @@ public abstract class Especialista {
             Path originalFilePath = targetPath;
             String fileToFix = new String(Files.readAllBytes(originalFilePath));
             
-            System.out.println("⚙️  Analizando y corrigiendo el código como " + role + "...");
-            // Usar AIAnalyzer para obtener el código corregido.
-            // La respuesta de la API será el código completo corregido.
-            resultContent = analyzer.analyze(context, fileToFix);
-            
             // 3. Determinar la ruta final para el código corregido
             // Aplica la convención de sufijo (-corregido.java)
             int lastDot = fileName.lastIndexOf('.');
@@ -54,6 +73,11 @@ public abstract class Especialista {
             String ext = fileName.substring(lastDot);
             targetPath = targetPath.getParent().resolve(baseName + "-corregido" + ext);
 
+            System.out.println("⚙️  Analizando y corrigiendo el código como " + role + "...");
+            // Modo parche (salvo --no-patch): la IA devuelve un diff que se aplica aquí; si no se aplica
+            // limpiamente, la respuesta de la API será el código completo corregido.
+            resultContent = correct(PatchCorrector.fromOptions(analyzer, options), context, fileToFix, targetPath, streaming);
+
         } else {
             // Caso 2: Generación de Guía/Reporte (.md, .txt, etc.)
             
@@ -64,20 +88,130 @@ public abstract class Especialista {
             );
             
             System.out.println("⚙️  Generando guía de aprendizaje de IA para el rol: " + role + "...");
-            // Se usa el contexto del proyecto y el prompt de la tarea como el "archivo a corregir" 
-            // para enviar la instrucción completa a Gemini.
-            resultContent = analyzer.analyze(context, taskPrompt); 
+            MapReduceAnalyzer mapReduce = MapReduceAnalyzer.fromOptions(analyzer, options);
+            if (mapReduce.needsSharding(context)) {
+                // El contexto no cabe en una petición: análisis por fragmentos y guía combinada
+                resultContent = analyzeSharded(mapReduce, context, taskPrompt, targetPath, streaming);
+            } else {
+                // Se usa el contexto del proyecto y el prompt de la tarea como el "archivo a corregir"
+                // para enviar la instrucción completa a Gemini.
+                resultContent = analyze(analyzer, context, taskPrompt, targetPath, streaming);
+            }
             
             // targetPath ya es el original (e.g., guide_dba.md)
         }
         
         // --- 4. Escribir el archivo ---
-        try {
+        // Una tarea cancelada en el worker no escribe su salida: otra ejecución puede estar usando el archivo
+        if (Thread.currentThread().isInterrupted()) {
+            throw new InterruptedException("Análisis cancelado; no se escribe " + targetPath);
+        }
+        if (streaming) {
+            // En modo streaming el archivo ya se escribió a medida que llegaba el texto
+            System.out.println("✅ El contenido real (código corregido o guía de IA) fue escrito exitosamente en: " + targetPath.toString());
+            return;
+        }
+        try (Trace.Span span = Trace.span("escribir_salida")) {
             // Escribir el contenido real (código corregido o guía de IA generada)
-            Files.write(targetPath, resultContent.getBytes("UTF-8"));
+            byte[] output = resultContent.getBytes("UTF-8");
+            span.arg("bytes", output.length);
+            Files.write(targetPath, output);
             System.out.println("✅ El contenido real (código corregido o guía de IA) fue escrito exitosamente en: " + targetPath.toString());
         } catch (IOException e) {
             throw new Exception("Error al escribir el archivo de destino en: " + targetPath.toString(), e);
         }
     }
+
+    /**
+     * Lee el contexto (texto o comprimido) y, si hay perfil, deja solo las secciones relevantes.
+     * Con un contexto comprimido la selección usa el índice y solo se descomprimen las secciones elegidas.
+     * Para una guía con el map-reduce activo ({@code --shard-tokens} mayor que 0) la selección solo descarta
+     * las secciones excluidas por el perfil y no aplica presupuesto salvo que se indique {@code --max-context-tokens}:
+     * un contexto que no cabe en una petición se divide en fragmentos en lugar de perder archivos. La corrección
+     * de un .java usa una sola petición y mantiene el presupuesto por defecto.
+     */
+    private String loadContext(Path contextPath, ContextProfile profile, CliOptions options, String targetName) throws Exception {
+        boolean select = profile != null && !options.getBoolean("full-context");
+        boolean sharding = !targetName.toLowerCase().endsWith(".java")
+                && options.getInt("shard-tokens", MapReduceAnalyzer.DEFAULT_SHARD_TOKENS) > 0;
+        int maxTokens = options.getInt("max-context-tokens", sharding ? Integer.MAX_VALUE : ContextProfile.DEFAULT_MAX_TOKENS);
+
+        if (ContextArchive.isArchive(contextPath)) {
+            try (ContextArchive archive = ContextArchive.open(contextPath)) {
+                if (select) {
+                    try (Trace.Span span = Trace.span("seleccionar_contexto")) {
+                        ContextSelector.Selection selection = new ContextSelector().select(archive, profile, maxTokens, targetName);
+                        span.arg("secciones", archive.entries().size()).arg("caracteres_salida", selection.text.length());
+                        System.out.println("📊 Contexto para el perfil " + profile.getName() + ": " + selection.summary());
+                        return selection.text;
+                    }
+                }
+                String context;
+                try (Trace.Span span = Trace.span("leer_contexto")) {
+                    context = archive.toText();
+                    span.arg("bytes", Files.size(contextPath)).arg("caracteres", context.length());
+                }
+                System.out.println(String.format("📊 Contexto completo: ~%,d tokens estimados", ContextSelector.estimateTokens(context.length())));
+                return context;
+            } catch (IOException e) {
+                throw new Exception("Error al leer el archivo de contexto en: " + contextPath, e);
+            }
+        }
+
+        String context;
+        try (Trace.Span span = Trace.span("leer_contexto")) {
+            byte[] bytes = Files.readAllBytes(contextPath);
+            span.arg("bytes", bytes.length);
+            context = new String(bytes, StandardCharsets.UTF_8);
+        } catch (IOException e) {
+            throw new Exception("Error al leer el archivo de contexto en: " + contextPath, e);
+        }
+
+        if (select) {
+            try (Trace.Span span = Trace.span("seleccionar_contexto")) {
+                ContextSelector.Selection selection = new ContextSelector().select(context, profile, maxTokens, targetName);
+                span.arg("caracteres_entrada", context.length()).arg("caracteres_salida", selection.text.length());
+                System.out.println("📊 Contexto para el perfil " + profile.getName() + ": " + selection.summary());
+                return selection.text;
+            }
+        }
+        System.out.println(String.format("📊 Contexto completo: ~%,d tokens estimados", ContextSelector.estimateTokens(context.length())));
+        return context;
+    }
+
+    /**
+     * Igual que {@link #analyze}, pero por map-reduce; en streaming solo se escribe de forma progresiva la guía final.
+     */
+    private String analyzeSharded(MapReduceAnalyzer mapReduce, String context, String prompt, Path targetPath, boolean streaming) throws Exception {
+        if (!streaming) return mapReduce.analyze(context, prompt, null);
+        try (AIAnalyzer.StreamWriter writer = new AIAnalyzer.StreamWriter(targetPath)) {
+            return mapReduce.analyze(context, prompt, writer);
+        } catch (IOException e) {
+            throw new Exception("Error al escribir el archivo de destino en: " + targetPath.toString(), e);
+        }
+    }
+
+    /**
+     * Igual que {@link #analyze}, para la corrección de un archivo .java con {@link PatchCorrector}.
+     */
+    private String correct(PatchCorrector corrector, String context, String fileToFix, Path targetPath, boolean streaming) throws Exception {
+        if (!streaming) return corrector.correct(context, fileToFix);
+        try (AIAnalyzer.StreamWriter writer = new AIAnalyzer.StreamWriter(targetPath)) {
+            return corrector.correct(context, fileToFix, writer);
+        } catch (IOException e) {
+            throw new Exception("Error al escribir el archivo de destino en: " + targetPath.toString(), e);
+        }
+    }
+
+    /**
+     * Llama a la IA; en modo streaming escribe el archivo de destino de forma progresiva.
+     */
+    private String analyze(AIAnalyzer analyzer, String context, String prompt, Path targetPath, boolean streaming) throws Exception {
+        if (!streaming) return analyzer.analyze(context, prompt);
+        try (AIAnalyzer.StreamWriter writer = new AIAnalyzer.StreamWriter(targetPath)) {
+            return analyzer.analyze(context, prompt, writer);
+        } catch (IOException e) {
+            throw new Exception("Error al escribir el archivo de destino en: " + targetPath.toString(), e);
+        }
+    }
 }
@@ -1,54 +1,176 @@
 package com.myproject.core;
 
 import java.io.*;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.*;
-import java.util.stream.Collectors;
+import java.util.Iterator;
+import java.util.List;
 
 /**
  * FileProcessor: compacta la estructura de un proyecto en un solo archivo de texto.
+ * Cada archivo se copia directamente al archivo de salida a medida que se lee,
+ * por lo que la memoria usada no depende del tamaño total del proyecto.
+ * Con más de un hilo, los archivos se leen en paralelo ({@link ParallelFileReader})
+ * y se escriben en el orden determinado por el {@link PathSorter}.
+ * Si la salida tiene la extensión {@value ContextArchive#EXTENSION}, se genera el formato comprimido
+ * e indexado de {@link ContextArchive} en lugar del texto.
+ * La selección de archivos (directorios excluidos, .gitignore, binarios y presupuestos de tamaño)
+ * la hace {@link ProjectWalker}.
  */
-public class FileProcessor {
+public class FileProcessor implements WorkerJob {
+
+    /** Prefijo de la cabecera que precede a cada archivo dentro del contexto. */
+    public static final String SECTION_MARKER = "// ===== Archivo: ";
+
+    static final int BUFFER_SIZE = 64 * 1024;
+
+    private final PathSorter sorter;
+    private final int threads;
+    private final ProjectWalker walker;
+
+    public FileProcessor() {
+        this(new AlphabeticalPathSorter(), 1);
+    }
+
+    public FileProcessor(PathSorter sorter, int threads) {
+        this(sorter, threads, new ProjectWalker());
+    }
+
+    public FileProcessor(PathSorter sorter, int threads, ProjectWalker walker) {
+        this.sorter = sorter;
+        this.threads = Math.max(1, threads);
+        this.walker = walker;
+    }
+
+    public int getThreads() {
+        return threads;
+    }
+
+    public ProjectWalker getWalker() {
+        return walker;
+    }
+
+    /**
+     * Cabecera de sección para un archivo, tal como aparece en el contexto compactado.
+     * @param relativePath Ruta relativa a la raíz del proyecto.
+     */
+    public static String sectionHeader(Path relativePath) {
+        return "\n" + SECTION_MARKER + relativePath.toString() + " =====\n";
+    }
+
+    /**
+     * Lista los archivos del proyecto que forman parte del contexto, en orden determinista.
+     * @param root Raíz del proyecto.
+     * @return Rutas ordenadas según el PathSorter configurado.
+     */
+    public List<Path> listProjectFiles(Path root) throws IOException {
+        return walker.list(root, sorter);
+    }
+
+    /**
+     * Ordena archivos del proyecto según el PathSorter configurado (mismo orden que {@link #listProjectFiles}).
+     */
+    public List<Path> sortFiles(List<Path> files) {
+        return sorter.sort(files);
+    }
 
     public void compactProject(String projectPath, String outputFilePath) throws IOException {
         Path root = Paths.get(projectPath);
-        String result = Files.walk(root)
-                .filter(Files::isRegularFile)
-                .filter(path -> !path.toString().contains("target"))
-                .filter(path -> !path.toString().contains(".git"))
-                .filter(path -> !path.toString().contains("node_modules"))
-                .filter(
-                    path -> path.toString().endsWith(".java") || 
-                        path.toString().endsWith(".xml") || 
-                        path.toString().endsWith(".md") || 
-                        path.toString().endsWith(".json") ||
-                        path.toString().endsWith(".php") ||
-                        path.toString().endsWith(".py") ||
-                        path.toString().endsWith(".txt") ||
-                        path.toString().endsWith(".csv")
-                ).map(
-                    path -> {
-                        try {
-                            Path relativePath = root.relativize(path);
-                            return "\n// ===== Archivo: " + relativePath.toString() + " =====\n"
-                                    + Files.readString(path);
-                        } catch (IOException e) {
-                            System.err.println("Error al leer el archivo " + path.toString() + ": " + e.getMessage());
-                            return "";
-                        }
-                })
-                .collect(Collectors.joining("\n"));
-
-        Files.writeString(Paths.get(outputFilePath), result);
+        List<Path> files = listProjectFiles(root);
+        walker.printSummary();
+
+        if (ContextArchive.isArchivePath(Paths.get(outputFilePath))) {
+            writeArchive(root, files, Paths.get(outputFilePath));
+            System.out.println("✅ Proyecto compactado en: " + outputFilePath);
+            return;
+        }
+
+        try (OutputStream out = new BufferedOutputStream(Files.newOutputStream(Paths.get(outputFilePath)), BUFFER_SIZE)) {
+            if (threads > 1) {
+                writeParallel(root, files, out);
+            } else {
+                writeSequential(root, files, out);
+            }
+        }
         System.out.println("✅ Proyecto compactado en: " + outputFilePath);
     }
 
-    public static void main(String[] args) throws Exception {
-        if (args.length < 2) {
-            System.out.println("Uso: java -cp target/ourcrud-java-1.0-SNAPSHOT-jar-with-dependencies.jar com.myproject.core.FileProcessor <ruta_proyecto> <salida.txt>");
-            return;
+    private void writeSequential(Path root, List<Path> files, OutputStream out) throws IOException {
+        boolean first = true;
+        for (Path path : files) {
+            // Las secciones se separan con un salto de línea, igual que el formato original
+            if (!first) out.write('\n');
+            first = false;
+
+            if (!Files.isReadable(path)) {
+                System.err.println("Error al leer el archivo " + path.toString() + ": sin permisos de lectura");
+                continue;
+            }
+            out.write(sectionHeader(root.relativize(path)).getBytes(StandardCharsets.UTF_8));
+            try {
+                Files.copy(path, out);
+            } catch (IOException e) {
+                System.err.println("Error al leer el archivo " + path.toString() + ": " + e.getMessage());
+            }
+        }
+    }
+
+    private void writeParallel(Path root, List<Path> files, OutputStream out) throws IOException {
+        try (ParallelFileReader reader = new ParallelFileReader(threads)) {
+            Iterator<ParallelFileReader.FileContent> contents = reader.read(files);
+            boolean first = true;
+            while (contents.hasNext()) {
+                ParallelFileReader.FileContent content = contents.next();
+                if (!first) out.write('\n');
+                first = false;
+
+                if (content.error != null) {
+                    System.err.println("Error al leer el archivo " + content.path.toString() + ": " + content.error.getMessage());
+                    continue;
+                }
+                out.write(sectionHeader(root.relativize(content.path)).getBytes(StandardCharsets.UTF_8));
+                out.write(content.bytes);
+            }
+        }
+    }
+
+    private void writeArchive(Path root, List<Path> files, Path output) throws IOException {
+        String rootKey = root.toAbsolutePath().normalize().toString();
+        long rawBytes = 0;
+        try (ContextArchive.Builder archive = new ContextArchive.Builder(output, rootKey);
+             ParallelFileReader reader = new ParallelFileReader(threads)) {
+            Iterator<ParallelFileReader.FileContent> contents = reader.read(files);
+            while (contents.hasNext()) {
+                ParallelFileReader.FileContent content = contents.next();
+                if (content.error != null) {
+                    System.err.println("Error al leer el archivo " + content.path.toString() + ": " + content.error.getMessage());
+                    continue;
+                }
+                long mtime = Files.getLastModifiedTime(content.path).toMillis();
+                archive.add(root.relativize(content.path).toString(), content.bytes, mtime, content.bytes.length);
+                rawBytes += content.bytes.length;
+            }
+            archive.commit();
+        }
+        System.out.println(String.format("📊 %,d bytes de código comprimidos en %,d bytes", rawBytes, Files.size(output)));
+    }
+
+    @Override
+    public int run(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp target/ourcrud-java-1.0-SNAPSHOT-jar-with-dependencies.jar com.myproject.core.FileProcessor <ruta_proyecto> <salida.txt|salida.ctx> [--threads=N]"
+                    + " [--max-file-kb=N] [--max-total-kb=N] [--ignore-file=ruta] [--no-gitignore]");
+            return 1;
         }
 
-        FileProcessor processor = new FileProcessor();
-        processor.compactProject(args[0], args[1]);
+        FileProcessor processor = new FileProcessor(new AlphabeticalPathSorter(),
+                options.getInt("threads", ParallelFileReader.defaultThreads()), ProjectWalker.fromOptions(options));
+        processor.compactProject(options.positional(0), options.positional(1));
+        return 0;
+    }
+
+    public static void main(String[] args) throws Exception {
+        System.exit(new FileProcessor().run(args));
     }
 }
@@ -1,38 +1,65 @@
 package com.myproject.core;
 
 import java.io.*;
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.*;
 import java.util.*;
+import java.util.stream.Collectors;
+import java.util.stream.Stream;
 
 /**
  * Clase que recorre recursivamente un directorio y genera un archivo
  * con toda la estructura y contenido de sus archivos.
+ * Los archivos se leen en paralelo y se escriben en el orden del {@link PathSorter}.
  */
 public class FileStructureReader {
 
+    private final PathSorter sorter;
+    private final int threads;
+
+    public FileStructureReader() {
+        this(new AlphabeticalPathSorter(), ParallelFileReader.defaultThreads());
+    }
+
+    public FileStructureReader(PathSorter sorter, int threads) {
+        this.sorter = sorter;
+        this.threads = threads;
+    }
+
     public void compactProject(String sourceDir, String outputFile) throws IOException {
-        List<Path> fileList = new ArrayList<>();
         Path rootPath = Paths.get(sourceDir).toAbsolutePath();
 
-        Files.walk(rootPath)
-            .filter(Files::isRegularFile)
-            .forEach(fileList::add);
+        List<Path> fileList;
+        try (Stream<Path> walk = Files.walk(rootPath)) {
+            fileList = sorter.sort(walk.filter(Files::isRegularFile).collect(Collectors.toList()));
+        }
 
-        try (BufferedWriter writer = new BufferedWriter(new FileWriter(outputFile))) {
+        try (BufferedWriter writer = new BufferedWriter(new FileWriter(outputFile));
+             ParallelFileReader reader = new ParallelFileReader(threads)) {
             writer.write("### Proyecto compactado: " + rootPath);
             writer.newLine();
             writer.newLine();
 
-            for (Path file : fileList) {
+            Iterator<ParallelFileReader.FileContent> contents = reader.read(fileList);
+            while (contents.hasNext()) {
+                ParallelFileReader.FileContent content = contents.next();
+                Path file = content.path;
                 writer.write("=== Archivo: " + rootPath.relativize(file) + " ===");
                 writer.newLine();
                 writer.newLine();
 
                 try {
-                    List<String> lines = Files.readAllLines(file);
-                    for (String line : lines) {
-                        writer.write(line);
-                        writer.newLine();
+                    if (content.error != null) throw content.error;
+                    // Misma semántica que Files.readAllLines: UTF-8 estricto, error si hay bytes inválidos
+                    String text = StandardCharsets.UTF_8.newDecoder()
+                            .decode(ByteBuffer.wrap(content.bytes)).toString();
+                    try (BufferedReader lines = new BufferedReader(new StringReader(text))) {
+                        String line;
+                        while ((line = lines.readLine()) != null) {
+                            writer.write(line);
+                            writer.newLine();
+                        }
                     }
                 } catch (IOException e) {
                     writer.write("[ERROR] No se pudo leer el archivo: " + file.toString());
@@ -50,16 +77,18 @@ public class FileStructureReader {
 
     // Método main para ejecución directa
     public static void main(String[] args) {
-        if (args.length < 2) {
-            System.out.println("Uso: java -cp <jar> com.myproject.core.FileStructureReader <ruta_proyecto> <archivo_salida>");
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp <jar> com.myproject.core.FileStructureReader <ruta_proyecto> <archivo_salida> [--threads=N]");
             return;
         }
 
-        String sourceDir = args[0];
-        String outputFile = args[1];
+        String sourceDir = options.positional(0);
+        String outputFile = options.positional(1);
+        int threads = options.getInt("threads", ParallelFileReader.defaultThreads());
 
         try {
-            new FileStructureReader().compactProject(sourceDir, outputFile);
+            new FileStructureReader(new AlphabeticalPathSorter(), threads).compactProject(sourceDir, outputFile);
         } catch (IOException e) {
             e.printStackTrace();
         }
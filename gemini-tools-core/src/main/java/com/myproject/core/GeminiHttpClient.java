@@ -0,0 +1,218 @@
+package com.myproject.core;
+
+import java.io.Closeable;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InterruptedIOException;
+import java.net.URI;
+import java.net.http.HttpClient;
+import java.net.http.HttpRequest;
+import java.net.http.HttpResponse;
+import java.time.Duration;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.Semaphore;
+import java.util.concurrent.ThreadLocalRandom;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
+
+/**
+ * Capa HTTP compartida para las llamadas a la API de Gemini.
+ * <ul>
+ *   <li>Un único {@link HttpClient} por JVM: reutiliza las conexiones (keep-alive) y negocia HTTP/2 cuando
+ *       el servidor lo admite.</li>
+ *   <li>Limitador por cubo de fichas ({@code --rpm=N} peticiones por minuto; 0 lo desactiva) y un máximo de
+ *       peticiones simultáneas ({@code --max-concurrent=N}). Las llamadas con la misma configuración comparten
+ *       limitador, de modo que los especialistas que corren en paralelo en el worker reparten la cuota.</li>
+ *   <li>Reintentos ({@code --retries=N}) ante 429, 500, 502, 503, 504 y errores de red, con espera exponencial
+ *       con jitter (o la indicada por {@code Retry-After}). Un 429 pausa el limitador para todos los hilos.</li>
+ * </ul>
+ * {@code --http-timeout=S} limita la espera hasta recibir la cabecera de cada respuesta.
+ */
+public class GeminiHttpClient {
+
+    public static final int DEFAULT_RPM = 60;
+    public static final int DEFAULT_MAX_CONCURRENT = 4;
+    public static final int DEFAULT_RETRIES = 4;
+    public static final int DEFAULT_TIMEOUT_SECONDS = 60;
+
+    private static final Duration CONNECT_TIMEOUT = Duration.ofSeconds(10);
+    private static final long BACKOFF_BASE_MS = 1000;
+    private static final long BACKOFF_MAX_MS = 30000;
+    private static final int[] RETRYABLE_STATUS = {429, 500, 502, 503, 504};
+
+    /** Cliente compartido; se crea al primer uso. */
+    private static final class Shared {
+        static final HttpClient CLIENT = HttpClient.newBuilder()
+            .version(HttpClient.Version.HTTP_2)
+            .connectTimeout(CONNECT_TIMEOUT)
+            .build();
+    }
+
+    private static final Map<String, GeminiHttpClient> INSTANCES = new ConcurrentHashMap<>();
+
+    private final TokenBucket rateLimiter;
+    private final Semaphore concurrency;
+    private final int retries;
+    private final Duration timeout;
+
+    GeminiHttpClient(int rpm, int maxConcurrent, int retries, int timeoutSeconds) {
+        int permits = Math.max(1, maxConcurrent);
+        this.rateLimiter = rpm > 0 ? new TokenBucket(rpm, permits) : null;
+        this.concurrency = new Semaphore(permits, true);
+        this.retries = Math.max(0, retries);
+        this.timeout = Duration.ofSeconds(Math.max(1, timeoutSeconds));
+    }
+
+    /**
+     * Cliente con la configuración de las opciones indicadas; se reutiliza para las mismas opciones.
+     */
+    public static GeminiHttpClient forOptions(CliOptions options) {
+        int rpm = options.getInt("rpm", DEFAULT_RPM);
+        int maxConcurrent = options.getInt("max-concurrent", DEFAULT_MAX_CONCURRENT);
+        int retries = options.getInt("retries", DEFAULT_RETRIES);
+        int timeoutSeconds = options.getInt("http-timeout", DEFAULT_TIMEOUT_SECONDS);
+        String key = rpm + "/" + maxConcurrent + "/" + retries + "/" + timeoutSeconds;
+        return INSTANCES.computeIfAbsent(key, k -> new GeminiHttpClient(rpm, maxConcurrent, retries, timeoutSeconds));
+    }
+
+    /**
+     * Respuesta en curso. Ocupa una de las plazas de concurrencia hasta que se cierra,
+     * así que debe cerrarse tras leer el cuerpo.
+     */
+    public final class Response implements Closeable {
+        private final HttpResponse<InputStream> response;
+        private final int attempts;
+        private final long throttledNanos;
+        private final AtomicBoolean closed = new AtomicBoolean();
+
+        private Response(HttpResponse<InputStream> response, int attempts, long throttledNanos) {
+            this.response = response;
+            this.attempts = attempts;
+            this.throttledNanos = throttledNanos;
+        }
+
+        public int status() {
+            return response.statusCode();
+        }
+
+        public InputStream body() {
+            return response.body();
+        }
+
+        /** Número de intentos realizados (1 si no hubo reintentos). */
+        public int attempts() {
+            return attempts;
+        }
+
+        /** Milisegundos esperados por el limitador y por las esperas entre reintentos. */
+        public long throttledMillis() {
+            return throttledNanos / 1_000_000;
+        }
+
+        @Override
+        public void close() throws IOException {
+            if (!closed.compareAndSet(false, true)) return;
+            try {
+                response.body().close();
+            } finally {
+                concurrency.release();
+            }
+        }
+    }
+
+    /**
+     * Envía un POST con cuerpo JSON, reintentando los fallos transitorios.
+     * Las respuestas con error no reintentable (o el último intento) se devuelven tal cual para que
+     * quien llama lea el detalle del error.
+     * @param body Fragmentos del cuerpo; se recorren de nuevo en cada intento.
+     * @param contentLength Longitud total en bytes de los fragmentos.
+     * @throws IOException Si el último intento falla por un error de red.
+     */
+    public Response post(URI uri, Iterable<byte[]> body, long contentLength) throws IOException {
+        HttpRequest request = HttpRequest.newBuilder(uri)
+            .timeout(timeout)
+            .header("Content-Type", "application/json; charset=UTF-8")
+            .POST(HttpRequest.BodyPublishers.fromPublisher(HttpRequest.BodyPublishers.ofByteArrays(body), contentLength))
+            .build();
+
+        long throttled = 0;
+        int maxAttempts = retries + 1;
+        try {
+            for (int attempt = 1; ; attempt++) {
+                if (rateLimiter != null) throttled += rateLimiter.acquire();
+                concurrency.acquire();
+                HttpResponse<InputStream> response;
+                try {
+                    response = Shared.CLIENT.send(request, HttpResponse.BodyHandlers.ofInputStream());
+                } catch (IOException e) {
+                    concurrency.release();
+                    if (attempt >= maxAttempts) throw e;
+                    long delay = backoffMillis(attempt);
+                    System.out.println(String.format("[HTTP] Error de red (%s): reintento %d/%d en %.1f s",
+                            e.getClass().getSimpleName(), attempt, retries, delay / 1000.0));
+                    throttled += sleep(delay);
+                    continue;
+                } catch (InterruptedException e) {
+                    concurrency.release();
+                    throw e;
+                }
+
+                int status = response.statusCode();
+                if (!isRetryable(status) || attempt >= maxAttempts) {
+                    return new Response(response, attempt, throttled);
+                }
+                // Se descarta el cuerpo del error para liberar la conexión
+                try (InputStream errorBody = response.body()) {
+                    errorBody.readAllBytes();
+                } catch (IOException e) {
+                    // La conexión se cierra y no se reutiliza
+                } finally {
+                    concurrency.release();
+                }
+                long delay = Math.max(backoffMillis(attempt), retryAfterMillis(response));
+                if (status == 429 && rateLimiter != null) rateLimiter.pause(TimeUnit.MILLISECONDS.toNanos(delay));
+                System.out.println(String.format("[HTTP] %d: reintento %d/%d en %.1f s", status, attempt, retries, delay / 1000.0));
+                throttled += sleep(delay);
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new InterruptedIOException("Petición a la API de Gemini interrumpida");
+        }
+    }
+
+    private static boolean isRetryable(int status) {
+        for (int retryable : RETRYABLE_STATUS) {
+            if (status == retryable) return true;
+        }
+        return false;
+    }
+
+    /**
+     * Espera exponencial con jitter: un valor aleatorio entre la mitad y el total de
+     * base * 2^(intento-1), con un máximo de {@link #BACKOFF_MAX_MS}. El jitter evita que los
+     * hilos que recibieron un 429 a la vez vuelvan a llamar todos en el mismo instante.
+     */
+    static long backoffMillis(int attempt) {
+        long ceiling = Math.min(BACKOFF_MAX_MS, BACKOFF_BASE_MS << Math.min(attempt - 1, 20));
+        return ceiling / 2 + ThreadLocalRandom.current().nextLong(ceiling / 2 + 1);
+    }
+
+    /**
+     * Espera indicada por la cabecera Retry-After (en segundos), o 0 si no la hay.
+     */
+    private static long retryAfterMillis(HttpResponse<?> response) {
+        String value = response.headers().firstValue("Retry-After").orElse(null);
+        if (value == null) return 0;
+        try {
+            return Math.min(BACKOFF_MAX_MS, Math.round(Double.parseDouble(value.trim()) * 1000));
+        } catch (NumberFormatException e) {
+            return 0; // Formato de fecha HTTP: se usa la espera exponencial
+        }
+    }
+
+    private static long sleep(long millis) throws InterruptedException {
+        Thread.sleep(millis);
+        return TimeUnit.MILLISECONDS.toNanos(millis);
+    }
+}
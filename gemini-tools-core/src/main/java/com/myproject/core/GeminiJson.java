@@ -0,0 +1,441 @@
+package com.myproject.core;
+
+import java.io.BufferedWriter;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.OutputStreamWriter;
+import java.io.Reader;
+import java.io.UncheckedIOException;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayDeque;
+import java.util.Deque;
+import java.util.Iterator;
+import java.util.NoSuchElementException;
+
+/**
+ * Codificación y lectura en streaming del JSON de la API de Gemini.
+ * La petición se escribe directamente en el flujo de salida, escapando el texto en una sola pasada y
+ * sin construir el cuerpo en memoria; su longitud en bytes se calcula sin codificarla. La respuesta se
+ * recorre carácter a carácter y solo se conserva el texto de las partes de los candidatos.
+ */
+public final class GeminiJson {
+
+    private static final int WRITE_BUFFER_CHARS = 64 * 1024;
+    private static final int CHUNK_BYTES = 64 * 1024;
+    private static final int CHUNK_CHARS = 16 * 1024;
+
+    private static final String REQUEST_START = "{\"systemInstruction\":{\"parts\":[{\"text\":\"";
+    private static final String REQUEST_MIDDLE = "\"}]},\"contents\":[{\"role\":\"user\",\"parts\":[{\"text\":\"";
+    private static final String REQUEST_END = "\"}]}]}";
+    private static final char[] HEX = "0123456789abcdef".toCharArray();
+
+    private GeminiJson() {}
+
+    // ---------------------------------------------------------------
+    // Petición
+    // ---------------------------------------------------------------
+
+    /**
+     * Escribe el cuerpo de una petición generateContent con la instrucción del sistema y un único
+     * mensaje de usuario formado por la concatenación de userText. No cierra el flujo.
+     */
+    public static void writeRequest(OutputStream out, String systemInstruction, String... userText) throws IOException {
+        Writer writer = new BufferedWriter(new OutputStreamWriter(out, StandardCharsets.UTF_8), WRITE_BUFFER_CHARS);
+        writer.write(REQUEST_START);
+        writeEscaped(writer, systemInstruction);
+        writer.write(REQUEST_MIDDLE);
+        for (String part : userText) writeEscaped(writer, part);
+        writer.write(REQUEST_END);
+        writer.flush();
+    }
+
+    /**
+     * El mismo cuerpo que {@link #writeRequest}, como fragmentos de unos 64 KB que se codifican a medida
+     * que se piden (para los publicadores de java.net.http). Cada recorrido vuelve a empezar desde el
+     * principio, lo que permite reenviar el cuerpo en un reintento.
+     */
+    public static Iterable<byte[]> requestChunks(String systemInstruction, String... userText) {
+        String[] texts = new String[userText.length + 4];
+        boolean[] escaped = new boolean[texts.length];
+        texts[0] = REQUEST_START;
+        texts[1] = systemInstruction;
+        escaped[1] = true;
+        texts[2] = REQUEST_MIDDLE;
+        for (int i = 0; i < userText.length; i++) {
+            texts[3 + i] = userText[i];
+            escaped[3 + i] = true;
+        }
+        texts[texts.length - 1] = REQUEST_END;
+        return () -> new ChunkIterator(texts, escaped);
+    }
+
+    /**
+     * Longitud en bytes (UTF-8) del cuerpo que escribe {@link #writeRequest}, sin codificarlo.
+     */
+    public static long requestLength(String systemInstruction, String... userText) {
+        long length = REQUEST_START.length() + REQUEST_MIDDLE.length() + REQUEST_END.length();
+        length += escapedLength(systemInstruction);
+        for (String part : userText) length += escapedLength(part);
+        return length;
+    }
+
+    /**
+     * Escapa un texto como contenido de una cadena JSON en una sola pasada, escribiendo los tramos
+     * que no necesitan escape directamente desde la cadena original.
+     */
+    static void writeEscaped(Writer out, String value) throws IOException {
+        if (value == null) return;
+        writeEscaped(out, value, 0, value.length());
+    }
+
+    /**
+     * Escapa el tramo [from, to) de value; to no debe partir un par sustituto.
+     */
+    private static void writeEscaped(Writer out, String value, int from, int to) throws IOException {
+        int runStart = from;
+        for (int i = from; i < to; i++) {
+            char c = value.charAt(i);
+            String escape = simpleEscape(c);
+            boolean unicode = escape == null && needsUnicodeEscape(value, i, c);
+            if (escape == null && !unicode) {
+                if (Character.isHighSurrogate(c)) i++; // Par válido: se copia tal cual
+                continue;
+            }
+            if (i > runStart) out.write(value, runStart, i - runStart);
+            if (escape != null) {
+                out.write(escape);
+            } else {
+                out.write('\\');
+                out.write('u');
+                out.write(HEX[(c >> 12) & 0xF]);
+                out.write(HEX[(c >> 8) & 0xF]);
+                out.write(HEX[(c >> 4) & 0xF]);
+                out.write(HEX[c & 0xF]);
+            }
+            runStart = i + 1;
+        }
+        if (runStart < to) out.write(value, runStart, to - runStart);
+    }
+
+    /**
+     * Versión en memoria de {@link #writeEscaped}, para textos pequeños.
+     */
+    public static String escape(String value) {
+        java.io.StringWriter out = new java.io.StringWriter(value == null ? 0 : value.length() + 16);
+        try {
+            writeEscaped(out, value);
+        } catch (IOException e) {
+            throw new IllegalStateException(e); // StringWriter no lanza IOException
+        }
+        return out.toString();
+    }
+
+    /**
+     * Bytes UTF-8 que ocupa el texto una vez escapado.
+     */
+    static long escapedLength(String value) {
+        if (value == null) return 0;
+        long bytes = 0;
+        int length = value.length();
+        for (int i = 0; i < length; i++) {
+            char c = value.charAt(i);
+            String escape = simpleEscape(c);
+            if (escape != null) {
+                bytes += escape.length();
+            } else if (needsUnicodeEscape(value, i, c)) {
+                bytes += 6;
+            } else if (c < 0x80) {
+                bytes += 1;
+            } else if (c < 0x800) {
+                bytes += 2;
+            } else if (Character.isHighSurrogate(c)) {
+                bytes += 4; // Par sustituto válido: un único punto de código de 4 bytes
+                i++;
+            } else {
+                bytes += 3;
+            }
+        }
+        return bytes;
+    }
+
+    private static String simpleEscape(char c) {
+        switch (c) {
+            case '"': return "\\\"";
+            case '\\': return "\\\\";
+            case '\n': return "\\n";
+            case '\r': return "\\r";
+            case '\t': return "\\t";
+            case '\b': return "\\b";
+            case '\f': return "\\f";
+            default: return null;
+        }
+    }
+
+    /**
+     * Caracteres de control y sustitutos sin pareja: se escriben como \\uXXXX para que el cuerpo
+     * sea JSON válido y su codificación UTF-8 no dependa del tratamiento de entradas mal formadas.
+     */
+    private static boolean needsUnicodeEscape(String value, int i, char c) {
+        if (c < 0x20) return true;
+        if (Character.isHighSurrogate(c)) {
+            return i + 1 >= value.length() || !Character.isLowSurrogate(value.charAt(i + 1));
+        }
+        return Character.isLowSurrogate(c);
+    }
+
+    /**
+     * Recorrido de {@link #requestChunks}: escribe cada tramo en un buffer reutilizado y devuelve su copia.
+     */
+    private static final class ChunkIterator implements Iterator<byte[]> {
+        private final String[] texts;
+        private final boolean[] escaped;
+        private final ByteArrayOutputStream bytes = new ByteArrayOutputStream(CHUNK_BYTES + 1024);
+        private final Writer writer = new OutputStreamWriter(bytes, StandardCharsets.UTF_8);
+        private int segment;
+        private int position;
+
+        ChunkIterator(String[] texts, boolean[] escaped) {
+            this.texts = texts;
+            this.escaped = escaped;
+        }
+
+        @Override
+        public boolean hasNext() {
+            return segment < texts.length;
+        }
+
+        @Override
+        public byte[] next() {
+            if (!hasNext()) throw new NoSuchElementException();
+            bytes.reset();
+            try {
+                while (segment < texts.length && bytes.size() < CHUNK_BYTES) {
+                    String text = texts[segment] == null ? "" : texts[segment];
+                    int end = Math.min(text.length(), position + CHUNK_CHARS);
+                    if (end < text.length() && Character.isHighSurrogate(text.charAt(end - 1))) end++;
+                    if (escaped[segment]) {
+                        writeEscaped(writer, text, position, end);
+                    } else {
+                        writer.write(text, position, end - position);
+                    }
+                    writer.flush();
+                    position = end;
+                    if (position >= text.length()) {
+                        segment++;
+                        position = 0;
+                    }
+                }
+            } catch (IOException e) {
+                throw new UncheckedIOException(e); // ByteArrayOutputStream no lanza IOException
+            }
+            return bytes.toByteArray();
+        }
+    }
+
+    // ---------------------------------------------------------------
+    // Respuesta
+    // ---------------------------------------------------------------
+
+    /**
+     * Lector incremental de una respuesta (o de un evento de streaming) de generateContent.
+     * Concatena, en orden, el texto de todas las partes de los candidatos
+     * ({@code candidates[].content.parts[].text}), decodificando todas las secuencias de escape,
+     * incluidas las \\uXXXX. El resto de cadenas se recorren sin guardarlas.
+     */
+    public static final class TextReader {
+
+        /** Caracteres iniciales de la respuesta que se conservan para los mensajes de error. */
+        public static final int HEAD_CHARS = 2048;
+        private static final int BUFFER_CHARS = 16 * 1024;
+
+        private final Reader in;
+        private final char[] buffer = new char[BUFFER_CHARS];
+        private int position;
+        private int limit;
+        private long charsRead;
+        private final StringBuilder head = new StringBuilder();
+        private final StringBuilder key = new StringBuilder();
+
+        /** Clave bajo la que se abrió cada contenedor (los elementos de un array heredan la del array). */
+        private final Deque<String> path = new ArrayDeque<>();
+        private int candidatesDepth;
+        private int partsDepth;
+
+        public TextReader(Reader in) {
+            this.in = in;
+        }
+
+        /**
+         * Lee el documento completo y añade a out el texto encontrado.
+         * @return true si había al menos una parte de texto.
+         * @throws MalformedJsonException Si el JSON está mal formado.
+         * @throws IOException Si falla la lectura del flujo.
+         */
+        public boolean readInto(StringBuilder out) throws IOException {
+            boolean found = false;
+            // Pila de contenedores: true = array, false = objeto
+            Deque<Boolean> containers = new ArrayDeque<>();
+            String pendingKey = null;
+            while (true) {
+                int c = nextSignificant();
+                if (c == -1) {
+                    if (!containers.isEmpty()) throw error("fin de documento inesperado");
+                    return found;
+                }
+                boolean inObject = Boolean.FALSE.equals(containers.peek());
+                switch (c) {
+                    case '{':
+                    case '[':
+                        String containerKey = inObject ? pendingKey : path.peek();
+                        enter(containerKey);
+                        containers.push(c == '[');
+                        pendingKey = null;
+                        break;
+                    case '}':
+                    case ']':
+                        if (containers.isEmpty()) throw error("cierre inesperado '" + (char) c + "'");
+                        containers.pop();
+                        leave();
+                        pendingKey = null;
+                        break;
+                    case '"':
+                        if (inObject && pendingKey == null) {
+                            // Clave del objeto
+                            key.setLength(0);
+                            readString(key);
+                            if (nextSignificant() != ':') throw error("se esperaba ':'");
+                            pendingKey = key.toString();
+                        } else {
+                            boolean isText = inObject && "text".equals(pendingKey) && partsDepth > 0 && candidatesDepth > 0;
+                            readString(isText ? out : null);
+                            found |= isText;
+                            pendingKey = null;
+                        }
+                        break;
+                    default:
+                        skipLiteral();
+                        pendingKey = null;
+                }
+            }
+        }
+
+        /** Número de caracteres leídos de la respuesta. */
+        public long charsRead() {
+            return charsRead;
+        }
+
+        /** Primeros {@link #HEAD_CHARS} caracteres de la respuesta. */
+        public String head() {
+            return head.toString();
+        }
+
+        private void enter(String containerKey) {
+            String name = containerKey == null ? "" : containerKey;
+            path.push(name);
+            if ("candidates".equals(name)) candidatesDepth++;
+            if ("parts".equals(name)) partsDepth++;
+        }
+
+        private void leave() {
+            String name = path.pop();
+            if ("candidates".equals(name)) candidatesDepth--;
+            if ("parts".equals(name)) partsDepth--;
+        }
+
+        /**
+         * Lee una cadena tras su comilla de apertura; si out es null solo la recorre.
+         */
+        private void readString(StringBuilder out) throws IOException {
+            while (true) {
+                // Copiar de golpe el tramo del buffer sin comillas ni escapes
+                if (position == limit && !fill()) throw error("cadena sin cerrar");
+                int start = position;
+                while (position < limit) {
+                    char c = buffer[position];
+                    if (c == '"' || c == '\\') break;
+                    position++;
+                }
+                if (out != null && position > start) out.append(buffer, start, position - start);
+                if (position == limit) continue;
+
+                char c = buffer[position++];
+                if (c == '"') return;
+                int escaped = read();
+                char decoded;
+                switch (escaped) {
+                    case 'n': decoded = '\n'; break;
+                    case 'r': decoded = '\r'; break;
+                    case 't': decoded = '\t'; break;
+                    case 'b': decoded = '\b'; break;
+                    case 'f': decoded = '\f'; break;
+                    case '"': case '\\': case '/': decoded = (char) escaped; break;
+                    case 'u':
+                        int code = 0;
+                        for (int i = 0; i < 4; i++) {
+                            int digit = Character.digit(read(), 16);
+                            if (digit < 0) throw error("secuencia \\u inválida");
+                            code = code * 16 + digit;
+                        }
+                        decoded = (char) code;
+                        break;
+                    case -1: throw error("cadena sin cerrar");
+                    default: throw error("secuencia de escape inválida '\\" + (char) escaped + "'");
+                }
+                if (out != null) out.append(decoded);
+            }
+        }
+
+        private void skipLiteral() throws IOException {
+            while (true) {
+                if (position == limit && !fill()) return;
+                char c = buffer[position];
+                if (c == ',' || c == '}' || c == ']' || c == ':' || Character.isWhitespace(c)) return;
+                position++;
+            }
+        }
+
+        /**
+         * Siguiente carácter significativo: omite espacios y comas.
+         */
+        private int nextSignificant() throws IOException {
+            int c;
+            do {
+                c = read();
+            } while (c == ',' || (c != -1 && Character.isWhitespace(c)));
+            return c;
+        }
+
+        private int read() throws IOException {
+            if (position == limit && !fill()) return -1;
+            return buffer[position++];
+        }
+
+        private boolean fill() throws IOException {
+            int count = in.read(buffer, 0, buffer.length);
+            if (count <= 0) {
+                position = limit = 0;
+                return false;
+            }
+            if (head.length() < HEAD_CHARS) head.append(buffer, 0, Math.min(count, HEAD_CHARS - head.length()));
+            charsRead += count;
+            position = 0;
+            limit = count;
+            return true;
+        }
+
+        private MalformedJsonException error(String message) {
+            return new MalformedJsonException("JSON de respuesta inválido en el carácter " + (charsRead - limit + position) + ": " + message);
+        }
+    }
+
+    /**
+     * La respuesta no es un JSON válido (a diferencia de los errores de red, que son IOException normales).
+     */
+    public static class MalformedJsonException extends IOException {
+        public MalformedJsonException(String message) {
+            super(message);
+        }
+    }
+}
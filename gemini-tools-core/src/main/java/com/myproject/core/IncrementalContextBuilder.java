@@ -0,0 +1,534 @@
+package com.myproject.core;
+
+import java.io.*;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.*;
+
+/**
+ * IncrementalContextBuilder: mantiene actualizado el contexto compactado releyendo
+ * solo los archivos que han cambiado desde la última ejecución.
+ *
+ * Junto al archivo de contexto se guarda un manifiesto ({@code <salida>.manifest}) con,
+ * por cada archivo: ruta relativa, mtime, tamaño, hash SHA-256 y la posición (offset/longitud)
+ * de su sección en el contexto. Las secciones sin cambios se copian tal cual desde el contexto
+ * anterior (transferencia a nivel de canal, sin decodificar), y si no cambió nada la ejecución
+ * se omite por completo. El formato de salida es idéntico al de {@link FileProcessor}.
+ * Los archivos modificados se leen en paralelo con {@link ParallelFileReader} según
+ * los hilos configurados en el {@link FileProcessor}.
+ *
+ * Si la salida tiene la extensión {@value ContextArchive#EXTENSION} se usa el formato comprimido de
+ * {@link ContextArchive}: su índice ya contiene mtime, tamaño y hash de cada archivo, así que no hay
+ * manifiesto aparte, y las secciones sin cambios se copian comprimidas.
+ *
+ * Con una lista de archivos modificados ({@code --changed-list=<archivo>}, p. ej. la que genera el modo
+ * vigilancia del orquestador) solo se examinan esos archivos: el resto de entradas del índice se dan por
+ * válidas sin recorrer el proyecto ni consultar su mtime. Solo se aplica al formato comprimido.
+ */
+public class IncrementalContextBuilder implements WorkerJob {
+
+    private static final String MANIFEST_SUFFIX = ".manifest";
+    private static final String ROOT_KEY = "# root=";
+    private static final String SIZE_KEY = "# size=";
+    private static final byte[] SEPARATOR = "\n".getBytes(StandardCharsets.UTF_8);
+
+    private final FileProcessor processor;
+
+    private int reused;
+    private int reread;
+    private int removed;
+
+    public IncrementalContextBuilder() {
+        this(new FileProcessor());
+    }
+
+    public IncrementalContextBuilder(FileProcessor processor) {
+        this.processor = processor;
+    }
+
+    /**
+     * Entrada del manifiesto para un archivo del proyecto.
+     */
+    static class Entry {
+        final String path;
+        long mtime;
+        final long size;
+        final String hash;
+        long offset;
+        long length;
+
+        Entry(String path, long mtime, long size, String hash, long offset, long length) {
+            this.path = path;
+            this.mtime = mtime;
+            this.size = size;
+            this.hash = hash;
+            this.offset = offset;
+            this.length = length;
+        }
+
+        String toLine() {
+            return path + "\t" + mtime + "\t" + size + "\t" + hash + "\t" + offset + "\t" + length;
+        }
+
+        static Entry fromLine(String line) {
+            String[] f = line.split("\t");
+            return new Entry(f[0], Long.parseLong(f[1]), Long.parseLong(f[2]), f[3],
+                    Long.parseLong(f[4]), Long.parseLong(f[5]));
+        }
+    }
+
+    /**
+     * Contenido de una sección en el nuevo contexto: o bien un rango del contexto anterior,
+     * o bien el archivo del proyecto, que se copia al escribir.
+     */
+    private static class Section {
+        Entry entry;
+        final Path source; // null si se reutiliza el rango del contexto anterior
+        final long previousOffset;
+
+        Section(Entry entry, Path source, long previousOffset) {
+            this.entry = entry;
+            this.source = source;
+            this.previousOffset = previousOffset;
+        }
+    }
+
+    public static Path manifestPath(Path outputFile) {
+        return outputFile.resolveSibling(outputFile.getFileName() + MANIFEST_SUFFIX);
+    }
+
+    /**
+     * Actualiza el contexto del proyecto de forma incremental.
+     * @return true si el contexto se reescribió, false si no había cambios.
+     */
+    public boolean update(String projectPath, String outputFilePath) throws IOException {
+        return update(projectPath, outputFilePath, null);
+    }
+
+    /**
+     * Actualiza el contexto del proyecto de forma incremental.
+     * @param changedPaths Rutas relativas a la raíz que pueden haber cambiado (creadas, modificadas o
+     *                     eliminadas), o null para revisar el proyecto completo. Se ignora si no hay un
+     *                     contexto comprimido anterior de la misma raíz.
+     * @return true si el contexto se reescribió, false si no había cambios.
+     */
+    public boolean update(String projectPath, String outputFilePath, Set<String> changedPaths) throws IOException {
+        Path root = Paths.get(projectPath);
+        Path output = Paths.get(outputFilePath);
+        if (ContextArchive.isArchivePath(output)) return updateArchive(root, output, changedPaths);
+        Path manifest = manifestPath(output);
+        String rootKey = root.toAbsolutePath().normalize().toString();
+
+        Map<String, Entry> previous = loadManifest(manifest, rootKey, output);
+        List<Path> files = processor.listProjectFiles(root);
+
+        List<Section> sections = new ArrayList<>(files.size());
+        boolean changed = previous.size() != files.size();
+        boolean manifestDirty = false;
+        reused = 0;
+        reread = 0;
+
+        for (Path file : files) {
+            String relative = root.relativize(file).toString();
+            Entry old = previous.get(relative);
+            long mtime;
+            long size;
+            try {
+                mtime = Files.getLastModifiedTime(file).toMillis();
+                size = Files.size(file);
+            } catch (IOException e) {
+                System.err.println("Error al leer el archivo " + file + ": " + e.getMessage());
+                changed = true;
+                continue;
+            }
+
+            if (old != null && old.mtime == mtime && old.size == size) {
+                sections.add(new Section(old, null, old.offset));
+                reused++;
+                continue;
+            }
+
+            String hash;
+            try {
+                hash = old != null ? sha256(file) : null;
+            } catch (IOException e) {
+                System.err.println("Error al leer el archivo " + file + ": " + e.getMessage());
+                changed = true;
+                continue;
+            }
+            if (old != null && old.hash.equals(hash)) {
+                // Solo cambió el mtime: la sección anterior sigue siendo válida
+                old.mtime = mtime;
+                sections.add(new Section(old, null, old.offset));
+                reused++;
+                manifestDirty = true;
+                continue;
+            }
+
+            // El hash definitivo y la longitud se calculan al copiar el archivo al contexto
+            sections.add(new Section(new Entry(relative, mtime, size, hash, 0, 0), file, -1));
+            reread++;
+            changed = true;
+        }
+
+        Set<String> current = new HashSet<>();
+        for (Section section : sections) current.add(section.entry.path);
+        removed = 0;
+        for (String path : previous.keySet()) {
+            if (!current.contains(path)) removed++;
+        }
+        changed |= removed > 0;
+
+        if (!changed && Files.exists(output)) {
+            if (manifestDirty) writeManifest(manifest, rootKey, sections, Files.size(output));
+            return false;
+        }
+
+        writeContext(output, sections);
+        sections.removeIf(section -> section.entry == null);
+        writeManifest(manifest, rootKey, sections, Files.size(output));
+        return true;
+    }
+
+    /**
+     * Actualización del formato comprimido: las secciones sin cambios se copian del archivo anterior.
+     * @param changedPaths Rutas relativas modificadas (null = revisar todos los archivos).
+     * @return true si el contenido cambió.
+     */
+    private boolean updateArchive(Path root, Path output, Set<String> changedPaths) throws IOException {
+        String rootKey = root.toAbsolutePath().normalize().toString();
+        ContextArchive previous = openPreviousArchive(output, rootKey);
+        try {
+            Set<String> changedOnly = previous != null ? normalize(root, changedPaths) : null;
+            List<Path> files = changedOnly != null
+                    ? listFromIndex(root, previous, changedOnly)
+                    : processor.listProjectFiles(root);
+            reused = 0;
+            reread = 0;
+            removed = 0;
+
+            // Plan de escritura, en orden: entrada anterior a copiar, o null si el archivo se relee
+            List<String> paths = new ArrayList<>(files.size());
+            List<ContextArchive.Entry> plan = new ArrayList<>(files.size());
+            List<Long> mtimes = new ArrayList<>(files.size());
+            List<Path> changedFiles = new ArrayList<>();
+            boolean changed = previous == null || previous.entries().size() != files.size();
+            boolean mtimeChanged = false;
+
+            for (Path file : files) {
+                String relative = root.relativize(file).toString();
+                ContextArchive.Entry old = previous != null ? previous.find(relative) : null;
+                if (old != null && changedOnly != null && !changedOnly.contains(relative)) {
+                    // Fuera de la lista de cambios: la entrada del índice se da por válida
+                    paths.add(relative);
+                    plan.add(old);
+                    mtimes.add(old.mtime);
+                    reused++;
+                    continue;
+                }
+                long mtime;
+                long size;
+                try {
+                    mtime = Files.getLastModifiedTime(file).toMillis();
+                    size = Files.size(file);
+                    if (old != null && (old.mtime != mtime || old.size != size)
+                            && (old.size != size || !old.hashHex().equals(sha256(file)))) {
+                        old = null;
+                    }
+                } catch (IOException e) {
+                    System.err.println("Error al leer el archivo " + file + ": " + e.getMessage());
+                    changed = true;
+                    continue;
+                }
+
+                paths.add(relative);
+                plan.add(old);
+                mtimes.add(mtime);
+                if (old == null) {
+                    changedFiles.add(file);
+                    reread++;
+                    changed = true;
+                } else {
+                    // Con el mismo hash solo se actualiza el mtime del índice
+                    mtimeChanged |= old.mtime != mtime;
+                    reused++;
+                }
+            }
+
+            if (previous != null) {
+                Set<String> current = new HashSet<>(paths);
+                for (ContextArchive.Entry entry : previous.entries()) {
+                    if (!current.contains(entry.path)) removed++;
+                }
+                changed |= removed > 0;
+            }
+            if (!changed && !mtimeChanged) return false;
+
+            try (ContextArchive.Builder archive = new ContextArchive.Builder(output, rootKey);
+                 ParallelFileReader reader = new ParallelFileReader(processor.getThreads())) {
+                Iterator<ParallelFileReader.FileContent> contents = reader.read(changedFiles);
+                for (int i = 0; i < plan.size(); i++) {
+                    ContextArchive.Entry old = plan.get(i);
+                    if (old != null) {
+                        archive.copy(previous, old, mtimes.get(i));
+                        continue;
+                    }
+                    ParallelFileReader.FileContent content = contents.next();
+                    if (content.error != null) {
+                        System.err.println("Error al leer el archivo " + content.path + ": " + content.error.getMessage());
+                        continue;
+                    }
+                    archive.add(paths.get(i), content.bytes, mtimes.get(i), content.bytes.length);
+                }
+                // El anterior se cierra antes de reemplazarlo
+                if (previous != null) previous.close();
+                archive.commit();
+            }
+            return changed;
+        } finally {
+            if (previous != null) previous.close();
+        }
+    }
+
+    /**
+     * Archivos del proyecto según el índice anterior más los de la lista de cambios que existen y forman
+     * parte del contexto, sin recorrer el árbol de directorios.
+     */
+    private List<Path> listFromIndex(Path root, ContextArchive previous, Set<String> changedPaths) {
+        List<Path> files = new ArrayList<>(previous.entries().size() + changedPaths.size());
+        for (ContextArchive.Entry entry : previous.entries()) {
+            if (!changedPaths.contains(entry.path)) files.add(root.resolve(entry.path));
+        }
+        for (String path : changedPaths) {
+            Path file = root.resolve(path);
+            if (processor.getWalker().accepts(root, file)) files.add(file);
+        }
+        Map<Path, Long> indexSizes = new HashMap<>();
+        for (ContextArchive.Entry entry : previous.entries()) indexSizes.put(root.resolve(entry.path), entry.size);
+        return processor.getWalker().limitTotal(processor.sortFiles(files), file -> {
+            Long size = indexSizes.get(file);
+            if (size != null && !changedPaths.contains(root.relativize(file).toString())) return size;
+            try {
+                return Files.size(file);
+            } catch (IOException e) {
+                return 0;
+            }
+        });
+    }
+
+    /**
+     * Rutas relativas con el mismo formato que las del índice, o null si no hay lista.
+     */
+    private static Set<String> normalize(Path root, Set<String> paths) {
+        if (paths == null) return null;
+        Set<String> normalized = new HashSet<>();
+        for (String path : paths) {
+            normalized.add(root.relativize(root.resolve(path).normalize()).toString());
+        }
+        return normalized;
+    }
+
+    /**
+     * Lee una lista de rutas relativas (una por línea, UTF-8).
+     */
+    static Set<String> readChangedList(Path listFile) throws IOException {
+        Set<String> paths = new LinkedHashSet<>();
+        for (String line : Files.readAllLines(listFile, StandardCharsets.UTF_8)) {
+            if (!line.isBlank()) paths.add(line.strip());
+        }
+        return paths;
+    }
+
+    /**
+     * Abre el contexto comprimido anterior si existe y pertenece a la misma raíz; si no, null
+     * (regeneración completa).
+     */
+    private static ContextArchive openPreviousArchive(Path output, String rootKey) {
+        if (!ContextArchive.isArchive(output)) return null;
+        try {
+            ContextArchive archive = ContextArchive.open(output);
+            if (archive.getRoot().equals(rootKey)) return archive;
+            archive.close();
+        } catch (IOException e) {
+            System.err.println("Advertencia: contexto comprimido inválido, se regenera completo: " + e.getMessage());
+        }
+        return null;
+    }
+
+    public int getReused() {
+        return reused;
+    }
+
+    public int getReread() {
+        return reread;
+    }
+
+    public int getRemoved() {
+        return removed;
+    }
+
+    private void writeContext(Path output, List<Section> sections) throws IOException {
+        Path temp = output.resolveSibling(output.getFileName() + ".tmp");
+        boolean hasPrevious = Files.exists(output);
+
+        List<Path> changedFiles = new ArrayList<>();
+        for (Section section : sections) {
+            if (section.source != null) changedFiles.add(section.source);
+        }
+
+        try (FileChannel out = FileChannel.open(temp, StandardOpenOption.CREATE,
+                    StandardOpenOption.TRUNCATE_EXISTING, StandardOpenOption.WRITE);
+             FileChannel in = hasPrevious ? FileChannel.open(output, StandardOpenOption.READ) : null;
+             ParallelFileReader reader = new ParallelFileReader(processor.getThreads())) {
+
+            Iterator<ParallelFileReader.FileContent> contents = reader.read(changedFiles);
+            boolean first = true;
+            for (Section section : sections) {
+                if (!first) writeFully(out, SEPARATOR);
+                first = false;
+
+                long offset = out.position();
+                if (section.source != null) {
+                    section.entry = writeSection(section.entry, contents.next(), out);
+                    if (section.entry == null) continue;
+                } else {
+                    long copied = 0;
+                    while (copied < section.entry.length) {
+                        long n = in.transferTo(section.previousOffset + copied, section.entry.length - copied, out);
+                        if (n <= 0) throw new IOException("El contexto anterior está truncado: " + output);
+                        copied += n;
+                    }
+                }
+                section.entry.offset = offset;
+            }
+        }
+        Files.move(temp, output, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+    }
+
+    /**
+     * Escribe la cabecera y el contenido de un archivo modificado.
+     * @return Entrada del manifiesto con el hash y la longitud reales de la sección,
+     *         o null si el archivo no se pudo leer (la sección se omite).
+     */
+    private Entry writeSection(Entry entry, ParallelFileReader.FileContent content, FileChannel out) throws IOException {
+        if (content.error != null) {
+            System.err.println("Error al leer el archivo " + content.path + ": " + content.error.getMessage());
+            return null;
+        }
+        byte[] header = FileProcessor.sectionHeader(Paths.get(entry.path)).getBytes(StandardCharsets.UTF_8);
+        writeFully(out, header);
+        writeFully(out, content.bytes);
+        String hash = toHex(newDigest().digest(content.bytes));
+        return new Entry(entry.path, entry.mtime, entry.size, hash, 0, header.length + (long) content.bytes.length);
+    }
+
+    private static void writeFully(FileChannel channel, byte[] bytes) throws IOException {
+        ByteBuffer buffer = ByteBuffer.wrap(bytes);
+        while (buffer.hasRemaining()) channel.write(buffer);
+    }
+
+    /**
+     * Carga el manifiesto anterior. Si no existe, pertenece a otra raíz o no coincide con el
+     * contexto en disco, devuelve un mapa vacío (regeneración completa).
+     */
+    private Map<String, Entry> loadManifest(Path manifest, String rootKey, Path output) {
+        Map<String, Entry> entries = new LinkedHashMap<>();
+        if (!Files.exists(manifest) || !Files.exists(output)) return entries;
+
+        try (BufferedReader reader = Files.newBufferedReader(manifest, StandardCharsets.UTF_8)) {
+            String rootLine = reader.readLine();
+            String sizeLine = reader.readLine();
+            if (rootLine == null || sizeLine == null
+                    || !rootLine.equals(ROOT_KEY + rootKey)
+                    || Long.parseLong(sizeLine.substring(SIZE_KEY.length())) != Files.size(output)) {
+                return entries;
+            }
+            String line;
+            while ((line = reader.readLine()) != null) {
+                if (line.isEmpty()) continue;
+                Entry entry = Entry.fromLine(line);
+                entries.put(entry.path, entry);
+            }
+        } catch (IOException | RuntimeException e) {
+            System.err.println("Advertencia: manifiesto inválido, se regenera el contexto completo: " + e.getMessage());
+            entries.clear();
+        }
+        return entries;
+    }
+
+    private void writeManifest(Path manifest, String rootKey, List<Section> sections, long outputSize) throws IOException {
+        try (BufferedWriter writer = Files.newBufferedWriter(manifest, StandardCharsets.UTF_8)) {
+            writer.write(ROOT_KEY + rootKey);
+            writer.newLine();
+            writer.write(SIZE_KEY + outputSize);
+            writer.newLine();
+            for (Section section : sections) {
+                writer.write(section.entry.toLine());
+                writer.newLine();
+            }
+        }
+    }
+
+    /**
+     * Calcula el SHA-256 de un archivo leyéndolo por bloques.
+     */
+    static String sha256(Path file) throws IOException {
+        MessageDigest digest = newDigest();
+        byte[] buffer = new byte[FileProcessor.BUFFER_SIZE];
+        try (InputStream in = Files.newInputStream(file)) {
+            int n;
+            while ((n = in.read(buffer)) != -1) digest.update(buffer, 0, n);
+        }
+        return toHex(digest.digest());
+    }
+
+    private static MessageDigest newDigest() {
+        try {
+            return MessageDigest.getInstance("SHA-256");
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException("SHA-256 no disponible", e);
+        }
+    }
+
+    private static String toHex(byte[] digest) {
+        StringBuilder hex = new StringBuilder(digest.length * 2);
+        for (byte b : digest) hex.append(String.format("%02x", b));
+        return hex.toString();
+    }
+
+    @Override
+    public int run(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        if (options.positionalCount() < 2) {
+            System.out.println("Uso: java -cp <jar> com.myproject.core.IncrementalContextBuilder <ruta_proyecto> <salida.txt|salida.ctx> [--threads=N] [--changed-list=archivo]"
+                    + " [--max-file-kb=N] [--max-total-kb=N] [--ignore-file=ruta] [--no-gitignore]");
+            return 1;
+        }
+
+        ProjectWalker walker = ProjectWalker.fromOptions(options);
+        IncrementalContextBuilder builder = new IncrementalContextBuilder(new FileProcessor(
+                new AlphabeticalPathSorter(), options.getInt("threads", ParallelFileReader.defaultThreads()), walker));
+        String outputFile = options.positional(1);
+        Set<String> changedPaths = options.has("changed-list")
+                ? readChangedList(Paths.get(options.get("changed-list", ""))) : null;
+        boolean rewritten = builder.update(options.positional(0), outputFile, changedPaths);
+        walker.printSummary();
+        if (rewritten) {
+            System.out.println("✅ Contexto actualizado en: " + outputFile);
+        } else {
+            System.out.println("✅ Sin cambios en el proyecto; se conserva el contexto en: " + outputFile);
+        }
+        System.out.println("Archivos reutilizados: " + builder.getReused()
+                + " | Archivos releídos: " + builder.getReread()
+                + " | Archivos eliminados: " + builder.getRemoved());
+        return 0;
+    }
+
+    public static void main(String[] args) throws Exception {
+        System.exit(new IncrementalContextBuilder().run(args));
+    }
+}
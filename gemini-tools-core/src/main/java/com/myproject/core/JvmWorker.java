@@ -0,0 +1,303 @@
+package com.myproject.core;
+
+import java.io.*;
+import java.lang.reflect.InvocationTargetException;
+import java.net.InetAddress;
+import java.net.ServerSocket;
+import java.net.Socket;
+import java.nio.charset.StandardCharsets;
+import java.security.MessageDigest;
+import java.util.Arrays;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.atomic.AtomicBoolean;
+
+/**
+ * JvmWorker: proceso JVM de larga duración que ejecuta las tareas del orquestador
+ * (FileProcessor, AIAnalyzer y especialistas) sin pagar el arranque de la JVM en cada ejecución.
+ * Solo se ejecutan las clases que implementan {@link WorkerJob} y los especialistas; cualquier otra
+ * clase se rechaza para que el orquestador la lance en un proceso independiente.
+ *
+ * Protocolo (una conexión TCP local por tarea, texto UTF-8 por líneas):
+ *   Token:     {@code <token>}, el valor de la variable de entorno {@value #TOKEN_ENV} con la que se inició
+ *              el worker; si no coincide se responde {@code DENIED} y se cierra la conexión.
+ *   Petición:  {@code <clase>\t<arg1>\t<arg2>...}
+ *   Respuesta: {@code OUT <línea>} / {@code ERR <línea>} por cada línea de salida de la tarea
+ *              y una línea final {@code EXIT <código>}, o solo {@code UNSUPPORTED} si la clase
+ *              no puede ejecutarse en el worker.
+ * Mientras la tarea se ejecuta, el cliente puede enviar {@code CANCEL}; esa línea o el cierre de la conexión
+ * interrumpen el hilo de la tarea, de modo que deja de llamar a la API y no escribe su salida.
+ * La petición {@code PING} responde {@code PONG} y sirve como comprobación de salud.
+ */
+public class JvmWorker {
+
+    public static final int DEFAULT_PORT = 5055;
+
+    /** Variable de entorno con el token que deben presentar los clientes (uno por arranque del worker). */
+    public static final String TOKEN_ENV = "JVM_WORKER_TOKEN";
+
+    private static final String CANCEL = "CANCEL";
+
+    private static final PrintStream ORIGINAL_OUT = System.out;
+    private static final PrintStream ORIGINAL_ERR = System.err;
+
+    // Destino de System.out / System.err para el hilo actual (y los hilos que cree la tarea)
+    private static final InheritableThreadLocal<OutputStream> JOB_OUT = new InheritableThreadLocal<>();
+    private static final InheritableThreadLocal<OutputStream> JOB_ERR = new InheritableThreadLocal<>();
+
+    private final int port;
+    private final byte[] token;
+    private final ExecutorService jobs = Executors.newCachedThreadPool(runnable -> {
+        Thread thread = new Thread(runnable, "jvm-worker-job");
+        thread.setDaemon(true);
+        return thread;
+    });
+
+    public JvmWorker(int port, String token) {
+        this.port = port;
+        this.token = token.getBytes(StandardCharsets.UTF_8);
+    }
+
+    /**
+     * OutputStream que enruta los bytes al destino de la tarea que se ejecuta en el hilo actual.
+     * Fuera de una tarea, escribe en la salida original de la JVM.
+     */
+    private static class RoutingOutputStream extends OutputStream {
+        private final InheritableThreadLocal<OutputStream> target;
+        private final OutputStream fallback;
+
+        RoutingOutputStream(InheritableThreadLocal<OutputStream> target, OutputStream fallback) {
+            this.target = target;
+            this.fallback = fallback;
+        }
+
+        private OutputStream current() {
+            OutputStream out = target.get();
+            return out != null ? out : fallback;
+        }
+
+        @Override
+        public void write(int b) throws IOException {
+            current().write(b);
+        }
+
+        @Override
+        public void write(byte[] b, int off, int len) throws IOException {
+            current().write(b, off, len);
+        }
+
+        @Override
+        public void flush() throws IOException {
+            current().flush();
+        }
+    }
+
+    /**
+     * Acumula bytes hasta cada salto de línea y los envía al cliente con el prefijo indicado.
+     */
+    private static class LineEmitter extends OutputStream {
+        private final String prefix;
+        private final Writer client;
+        private final ByteArrayOutputStream line = new ByteArrayOutputStream();
+
+        LineEmitter(String prefix, Writer client) {
+            this.prefix = prefix;
+            this.client = client;
+        }
+
+        @Override
+        public synchronized void write(int b) throws IOException {
+            if (b == '\n') {
+                emit();
+            } else if (b != '\r') {
+                line.write(b);
+            }
+        }
+
+        @Override
+        public synchronized void write(byte[] b, int off, int len) throws IOException {
+            for (int i = off; i < off + len; i++) {
+                write(b[i]);
+            }
+        }
+
+        @Override
+        public synchronized void flush() throws IOException {
+            client.flush();
+        }
+
+        synchronized void close(boolean emitPending) throws IOException {
+            if (emitPending && line.size() > 0) emit();
+        }
+
+        private void emit() throws IOException {
+            String text = line.toString(StandardCharsets.UTF_8);
+            line.reset();
+            synchronized (client) {
+                client.write(prefix + text + "\n");
+                client.flush();
+            }
+        }
+    }
+
+    /**
+     * Inicia el servidor y atiende peticiones hasta que el proceso termine.
+     */
+    public void serve() throws IOException {
+        System.setOut(new PrintStream(new RoutingOutputStream(JOB_OUT, ORIGINAL_OUT), true, StandardCharsets.UTF_8));
+        System.setErr(new PrintStream(new RoutingOutputStream(JOB_ERR, ORIGINAL_ERR), true, StandardCharsets.UTF_8));
+
+        try (ServerSocket server = new ServerSocket(port, 50, InetAddress.getLoopbackAddress())) {
+            ORIGINAL_OUT.println("✅ JvmWorker escuchando en " + server.getInetAddress().getHostAddress() + ":" + port);
+            while (!server.isClosed()) {
+                Socket socket = server.accept();
+                jobs.submit(() -> handle(socket));
+            }
+        }
+    }
+
+    private void handle(Socket socket) {
+        try (Socket client = socket;
+             BufferedReader reader = new BufferedReader(new InputStreamReader(client.getInputStream(), StandardCharsets.UTF_8));
+             Writer writer = new BufferedWriter(new OutputStreamWriter(client.getOutputStream(), StandardCharsets.UTF_8))) {
+
+            String presented = reader.readLine();
+            if (presented == null) return;
+            if (!MessageDigest.isEqual(token, presented.trim().getBytes(StandardCharsets.UTF_8))) {
+                ORIGINAL_ERR.println("[WORKER] Petición rechazada: token no válido (" + client.getRemoteSocketAddress() + ")");
+                writer.write("DENIED\n");
+                writer.flush();
+                return;
+            }
+
+            String request = reader.readLine();
+            if (request == null || request.isBlank()) return;
+            if ("PING".equals(request.trim())) {
+                writer.write("PONG\n");
+                writer.flush();
+                return;
+            }
+
+            String[] parts = request.split("\t", -1);
+            Class<?> jobClass = loadJobClass(parts[0]);
+            if (jobClass == null) {
+                writer.write("UNSUPPORTED\n");
+                writer.flush();
+                return;
+            }
+            LineEmitter out = new LineEmitter("OUT ", writer);
+            LineEmitter err = new LineEmitter("ERR ", writer);
+            AtomicBoolean finished = new AtomicBoolean();
+            Thread jobThread = Thread.currentThread();
+            Thread watcher = new Thread(() -> watchCancel(reader, jobThread, finished, parts[0]), "jvm-worker-cancel");
+            watcher.setDaemon(true);
+            watcher.start();
+            JOB_OUT.set(out);
+            JOB_ERR.set(err);
+            int exitCode;
+            try {
+                exitCode = runJob(jobClass, Arrays.copyOfRange(parts, 1, parts.length));
+            } finally {
+                synchronized (finished) {
+                    finished.set(true);
+                }
+                // El hilo vuelve al pool: se descarta una cancelación que llegó al terminar
+                Thread.interrupted();
+                JOB_OUT.remove();
+                JOB_ERR.remove();
+                out.close(true);
+                err.close(true);
+            }
+
+            synchronized (writer) {
+                writer.write("EXIT " + exitCode + "\n");
+                writer.flush();
+            }
+        } catch (IOException e) {
+            ORIGINAL_ERR.println("[WORKER] Conexión interrumpida: " + e.getMessage());
+        }
+    }
+
+    /**
+     * Espera una línea {@code CANCEL} o el cierre de la conexión mientras la tarea sigue en curso
+     * e interrumpe su hilo. Termina sin efecto cuando la conexión se cierra tras acabar la tarea.
+     */
+    private static void watchCancel(BufferedReader reader, Thread jobThread, AtomicBoolean finished, String className) {
+        try {
+            String line;
+            do {
+                line = reader.readLine();
+            } while (line != null && !CANCEL.equals(line.trim()));
+        } catch (IOException e) {
+            // Conexión cerrada por el cliente: equivale a cancelar
+        }
+        synchronized (finished) {
+            if (finished.get()) return;
+            ORIGINAL_ERR.println("[WORKER] Tarea cancelada por el cliente: " + className);
+            jobThread.interrupt();
+        }
+    }
+
+    /**
+     * Carga la clase pedida si puede ejecutarse en el worker: un {@link WorkerJob} o un especialista.
+     * @return La clase, o null si no existe o no cumple el contrato.
+     */
+    private static Class<?> loadJobClass(String className) {
+        try {
+            Class<?> jobClass = Class.forName(className);
+            if (WorkerJob.class.isAssignableFrom(jobClass) || Especialista.class.isAssignableFrom(jobClass)) {
+                return jobClass;
+            }
+            ORIGINAL_ERR.println("[WORKER] " + className + " no implementa WorkerJob; se ejecutará en un proceso independiente.");
+        } catch (ClassNotFoundException | LinkageError e) {
+            ORIGINAL_ERR.println("[WORKER] Clase no encontrada: " + className);
+        }
+        return null;
+    }
+
+    /**
+     * Ejecuta una tarea dentro de esta JVM.
+     * Los especialistas se instancian directamente para evitar el System.exit de su main.
+     * @return Código de salida equivalente al del proceso independiente.
+     */
+    private int runJob(Class<?> jobClass, String[] args) {
+        try {
+            if (Especialista.class.isAssignableFrom(jobClass)) {
+                CliOptions options = CliOptions.parse(args);
+                if (options.positionalCount() < 2) {
+                    System.err.println("Uso: " + jobClass.getName() + " <archivo_contexto> <archivo_destino>");
+                    return 1;
+                }
+                CliOptions.setCurrent(options);
+                try {
+                    jobClass.getConstructor(String.class, String.class)
+                            .newInstance(options.positional(0), options.positional(1));
+                } finally {
+                    CliOptions.clearCurrent();
+                }
+                return 0;
+            }
+            WorkerJob job = (WorkerJob) jobClass.getConstructor().newInstance();
+            return job.run(args);
+        } catch (Exception e) {
+            if (Thread.currentThread().isInterrupted()) {
+                System.err.println("❌ Tarea cancelada: " + jobClass.getName());
+                return 1;
+            }
+            Throwable cause = e instanceof InvocationTargetException ? e.getCause() : e;
+            System.err.println("❌ ERROR: Falló la ejecución de " + jobClass.getName() + ": " + cause);
+            cause.printStackTrace();
+            return 1;
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        int port = args.length > 0 ? Integer.parseInt(args[0]) : DEFAULT_PORT;
+        String token = System.getenv(TOKEN_ENV);
+        if (token == null || token.isBlank()) {
+            System.err.println("❌ ERROR: Falta la variable de entorno " + TOKEN_ENV + " con el token de los clientes.");
+            System.exit(1);
+        }
+        new JvmWorker(port, token.trim()).serve();
+    }
+}
@@ -0,0 +1,223 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.function.IntFunction;
+
+/**
+ * Análisis map-reduce para contextos que no caben en una sola petición al modelo.
+ * El contexto se divide en fragmentos alineados con los archivos ({@link #shard}); cada fragmento se
+ * analiza con el prompt del rol (fase map, hasta {@code --fan-out=N} peticiones en paralelo) y los
+ * informes parciales se combinan en una petición final (fase reduce) en una sola guía. Si los informes
+ * parciales tampoco caben en una petición, se combinan por grupos en varias rondas.
+ * El tamaño máximo de cada fragmento se fija con {@code --shard-tokens=N} (0 desactiva el modo).
+ */
+public class MapReduceAnalyzer {
+
+    public static final int DEFAULT_SHARD_TOKENS = 200_000;
+    public static final int DEFAULT_FAN_OUT = 4;
+
+    private static final String CONTINUATION = " (continuación)";
+
+    private final AIAnalyzer analyzer;
+    private final int shardTokens;
+    private final int fanOut;
+
+    public MapReduceAnalyzer(AIAnalyzer analyzer, int shardTokens, int fanOut) {
+        this.analyzer = analyzer;
+        this.shardTokens = Math.max(0, shardTokens);
+        this.fanOut = Math.max(1, fanOut);
+    }
+
+    public static MapReduceAnalyzer fromOptions(AIAnalyzer analyzer, CliOptions options) {
+        return new MapReduceAnalyzer(analyzer,
+                options.getInt("shard-tokens", DEFAULT_SHARD_TOKENS),
+                options.getInt("fan-out", DEFAULT_FAN_OUT));
+    }
+
+    /**
+     * Indica si el contexto supera el tamaño de un fragmento y debe analizarse por partes.
+     */
+    public boolean needsSharding(String context) {
+        return shardTokens > 0 && ContextSelector.estimateTokens(context.length()) > shardTokens;
+    }
+
+    /**
+     * Divide el contexto en fragmentos de como máximo {@code shardTokens} tokens estimados, sin partir
+     * archivos salvo los que por sí solos superan ese tamaño: estos se cortan por líneas y cada trozo
+     * siguiente repite la cabecera del archivo marcada como continuación.
+     */
+    public static List<String> shard(String context, int shardTokens) {
+        int maxChars = Math.max(1, shardTokens) * ContextSelector.CHARS_PER_TOKEN;
+        List<String> shards = new ArrayList<>();
+        List<ContextSelector.Section> sections = ContextSelector.index(context);
+        StringBuilder current = new StringBuilder();
+        // El texto previo a la primera sección (si lo hay) va con ella
+        int from = 0;
+        for (int i = 0; i <= sections.size(); i++) {
+            int to = i < sections.size() ? sections.get(i).end : context.length();
+            if (i == sections.size() && from >= to) break;
+            String piece = context.substring(from, to);
+            from = Math.min(context.length(), to + 1); // se omite el salto de línea separador
+            String path = i < sections.size() ? sections.get(i).path : "";
+
+            if (current.length() > 0 && current.length() + 1 + piece.length() > maxChars) {
+                shards.add(current.toString());
+                current.setLength(0);
+            }
+            if (piece.length() <= maxChars) {
+                if (current.length() > 0) current.append('\n');
+                current.append(piece);
+                continue;
+            }
+            // Archivo mayor que un fragmento: se corta por líneas
+            List<String> parts = splitLines(piece, maxChars, path);
+            for (int p = 0; p < parts.size() - 1; p++) shards.add(parts.get(p));
+            current.append(parts.get(parts.size() - 1));
+        }
+        if (current.length() > 0 || shards.isEmpty()) shards.add(current.toString());
+        return shards;
+    }
+
+    private static List<String> splitLines(String section, int maxChars, String path) {
+        String header = "\n" + FileProcessor.SECTION_MARKER + path + CONTINUATION + " =====\n";
+        int budget = Math.max(1, maxChars - header.length());
+        List<String> parts = new ArrayList<>();
+        int start = 0;
+        while (start < section.length()) {
+            int limit = Math.min(section.length(), start + (parts.isEmpty() ? maxChars : budget));
+            int end = limit;
+            if (limit < section.length()) {
+                int newline = section.lastIndexOf('\n', limit - 1);
+                if (newline > start) end = newline + 1;
+            }
+            String part = section.substring(start, end);
+            parts.add(parts.isEmpty() ? part : header + part);
+            start = end;
+        }
+        return parts;
+    }
+
+    /**
+     * Genera la guía del rol por map-reduce.
+     * @param taskPrompt Instrucción del rol (la misma que en el análisis de una sola petición).
+     * @param listener Receptor del texto de la fase reduce en modo streaming, o null.
+     */
+    public String analyze(String context, String taskPrompt, AIAnalyzer.ChunkListener listener) throws IOException {
+        List<String> shards;
+        try (Trace.Span span = Trace.span("dividir_contexto")) {
+            shards = shard(context, shardTokens);
+            span.arg("fragmentos", shards.size()).arg("tokens_fragmento", shardTokens);
+        }
+        System.out.println(String.format("⚙️  Map-reduce: %d fragmentos de hasta ~%,d tokens, %d en paralelo",
+                shards.size(), shardTokens, Math.min(fanOut, shards.size())));
+
+        int shardCount = shards.size();
+        List<String> partials = map(shards, i -> shardPrompt(taskPrompt, i, shardCount));
+        int round = 1;
+        // Si los informes parciales no caben en una petición se combinan por grupos
+        while (partials.size() > 1 && needsSharding(joinReports(partials, 0, partials.size()))) {
+            List<String> groups = groupReports(partials);
+            if (groups.size() >= partials.size()) break; // cada informe ocupa un fragmento: no se puede agrupar más
+            System.out.println(String.format("⚙️  Reduce intermedio (ronda %d): %d informes en %d grupos",
+                    round++, partials.size(), groups.size()));
+            partials = map(groups, i -> reducePrompt(taskPrompt));
+        }
+
+        try (Trace.Span span = Trace.span("reduce")) {
+            span.arg("informes", partials.size());
+            System.out.println("⚙️  Combinando " + partials.size() + " informes parciales en la guía final...");
+            String reports = joinReports(partials, 0, partials.size());
+            return listener != null
+                    ? analyzer.analyze(reports, reducePrompt(taskPrompt), listener)
+                    : analyzer.analyze(reports, reducePrompt(taskPrompt));
+        }
+    }
+
+    /**
+     * Fase map: analiza cada entrada en paralelo (hasta fanOut a la vez) con el prompt de su posición
+     * y devuelve los resultados en orden.
+     */
+    private List<String> map(List<String> inputs, IntFunction<String> promptFor) throws IOException {
+        int total = inputs.size();
+        // Los hilos del pool se crean desde este hilo y heredan sus opciones y su salida (worker JVM)
+        ExecutorService pool = Executors.newFixedThreadPool(Math.min(fanOut, total));
+        try {
+            List<Future<String>> futures = new ArrayList<>(total);
+            for (int i = 0; i < total; i++) {
+                int index = i;
+                String input = inputs.get(i);
+                String prompt = promptFor.apply(i);
+                futures.add(pool.submit(() -> mapOne(input, prompt, index, total)));
+            }
+            List<String> results = new ArrayList<>(total);
+            for (int i = 0; i < total; i++) {
+                try {
+                    results.add(futures.get(i).get());
+                } catch (ExecutionException e) {
+                    Throwable cause = e.getCause();
+                    throw new IOException(String.format("Falló el fragmento %d/%d: %s", i + 1, total, cause.getMessage()), cause);
+                } catch (InterruptedException e) {
+                    Thread.currentThread().interrupt();
+                    throw new IOException("Análisis map-reduce interrumpido", e);
+                }
+            }
+            return results;
+        } finally {
+            pool.shutdownNow();
+        }
+    }
+
+    private String mapOne(String input, String prompt, int index, int total) throws IOException {
+        try (Trace.Span span = Trace.span("map")) {
+            span.arg("fragmento", index + 1).arg("caracteres", input.length());
+            String result = analyzer.analyze(input, prompt);
+            if (result.startsWith("ERROR DE ")) throw new IOException(result);
+            System.out.println(String.format("✅ Fragmento %d/%d analizado (%,d caracteres)", index + 1, total, result.length()));
+            return result;
+        }
+    }
+
+    private static String shardPrompt(String taskPrompt, int index, int total) {
+        return taskPrompt + "\n\nEste contexto es el fragmento " + (index + 1) + " de " + total + " del proyecto. "
+                + "Analiza solo los archivos incluidos y devuelve notas parciales en Markdown, con hallazgos concretos "
+                + "(archivo y recomendación); se combinarán después con las de los demás fragmentos.";
+    }
+
+    private static String reducePrompt(String taskPrompt) {
+        return taskPrompt + "\n\nEl contexto anterior no es el código del proyecto: son informes parciales generados por "
+                + "fragmentos del mismo proyecto. Combínalos en una única guía coherente, sin repetir recomendaciones "
+                + "y conservando las referencias concretas a archivos.";
+    }
+
+    /**
+     * Agrupa informes consecutivos en textos que caben en un fragmento.
+     */
+    private List<String> groupReports(List<String> reports) {
+        int maxChars = shardTokens * ContextSelector.CHARS_PER_TOKEN;
+        List<String> groups = new ArrayList<>();
+        int start = 0;
+        while (start < reports.size()) {
+            int end = start + 1;
+            while (end < reports.size() && joinReports(reports, start, end + 1).length() <= maxChars) end++;
+            groups.add(joinReports(reports, start, end));
+            start = end;
+        }
+        return groups;
+    }
+
+    private static String joinReports(List<String> reports, int from, int to) {
+        StringBuilder text = new StringBuilder();
+        for (int i = from; i < to; i++) {
+            if (text.length() > 0) text.append("\n\n");
+            text.append("## Informe parcial ").append(i - from + 1).append(" de ").append(to - from).append("\n\n")
+                .append(reports.get(i));
+        }
+        return text.toString();
+    }
+}
@@ -0,0 +1,109 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayDeque;
+import java.util.Iterator;
+import java.util.List;
+import java.util.NoSuchElementException;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+
+/**
+ * Lee archivos en paralelo sobre un pool acotado de hilos y los entrega en el
+ * mismo orden de la lista de entrada, para que la salida siga siendo determinista.
+ * Como máximo se mantienen en memoria {@code threads * WINDOW_FACTOR} archivos leídos por adelantado.
+ */
+public class ParallelFileReader implements AutoCloseable {
+
+    private static final int WINDOW_FACTOR = 4;
+
+    private final int threads;
+    private final ExecutorService pool;
+
+    /**
+     * Contenido leído de un archivo, o el error producido al leerlo.
+     */
+    public static class FileContent {
+        public final Path path;
+        public final byte[] bytes;
+        public final IOException error;
+
+        FileContent(Path path, byte[] bytes, IOException error) {
+            this.path = path;
+            this.bytes = bytes;
+            this.error = error;
+        }
+    }
+
+    public ParallelFileReader(int threads) {
+        this.threads = Math.max(1, threads);
+        this.pool = this.threads > 1 ? Executors.newFixedThreadPool(this.threads, runnable -> {
+            Thread thread = new Thread(runnable, "parallel-file-reader");
+            thread.setDaemon(true);
+            return thread;
+        }) : null;
+    }
+
+    /**
+     * Número de hilos por defecto: los procesadores disponibles, con un máximo de 8.
+     */
+    public static int defaultThreads() {
+        return Math.min(8, Runtime.getRuntime().availableProcessors());
+    }
+
+    public int getThreads() {
+        return threads;
+    }
+
+    /**
+     * Devuelve un iterador que entrega los archivos en el orden de {@code files}
+     * mientras los siguientes se leen en segundo plano.
+     */
+    public Iterator<FileContent> read(List<Path> files) {
+        return new Iterator<>() {
+            private final ArrayDeque<Future<FileContent>> window = new ArrayDeque<>();
+            private int next = 0;
+
+            @Override
+            public boolean hasNext() {
+                return !window.isEmpty() || next < files.size();
+            }
+
+            @Override
+            public FileContent next() {
+                if (!hasNext()) throw new NoSuchElementException();
+                if (pool == null) return load(files.get(next++));
+
+                while (next < files.size() && window.size() < threads * WINDOW_FACTOR) {
+                    Path path = files.get(next++);
+                    window.add(pool.submit(() -> load(path)));
+                }
+                try {
+                    return window.poll().get();
+                } catch (InterruptedException e) {
+                    Thread.currentThread().interrupt();
+                    throw new IllegalStateException("Lectura paralela interrumpida", e);
+                } catch (ExecutionException e) {
+                    throw new IllegalStateException("Error inesperado en la lectura paralela", e.getCause());
+                }
+            }
+        };
+    }
+
+    private static FileContent load(Path path) {
+        try {
+            return new FileContent(path, Files.readAllBytes(path), null);
+        } catch (IOException e) {
+            return new FileContent(path, null, e);
+        }
+    }
+
+    @Override
+    public void close() {
+        if (pool != null) pool.shutdownNow();
+    }
+}
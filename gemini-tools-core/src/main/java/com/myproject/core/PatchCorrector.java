@@ -0,0 +1,95 @@
+package com.myproject.core;
+
+import java.io.IOException;
+
+/**
+ * Corrección de archivos .java en modo parche: el modelo devuelve solo un diff unificado con las líneas
+ * que cambian ({@link AIAnalyzer#PATCH_INSTRUCTION}) y el parche se aplica localmente con {@link UnifiedDiff}.
+ * Si el parche no se aplica limpiamente se vuelve a pedir el archivo completo, como en el modo original.
+ * Cada corrección registra con el prefijo {@code [PATCH]} los tokens de salida y la latencia frente a los
+ * estimados para regenerar el archivo completo. {@code --no-patch} desactiva el modo.
+ * Con un receptor de streaming ({@code --stream}) tampoco se usa: el archivo completo se muestra a medida
+ * que llega, en lugar de un diff que solo puede entregarse al final.
+ */
+public class PatchCorrector {
+
+    public static final String PREFIX = "[PATCH] ";
+
+    private final AIAnalyzer analyzer;
+    private final boolean enabled;
+
+    public PatchCorrector(AIAnalyzer analyzer, boolean enabled) {
+        this.analyzer = analyzer;
+        this.enabled = enabled;
+    }
+
+    public static PatchCorrector fromOptions(AIAnalyzer analyzer, CliOptions options) {
+        boolean enabled = !options.getBoolean("no-patch");
+        System.out.println(PREFIX + (enabled
+                ? "Corrección en modo parche: el modelo devuelve un diff que se aplica localmente."
+                : "Modo parche desactivado (--no-patch): se pide el archivo completo."));
+        return new PatchCorrector(analyzer, enabled);
+    }
+
+    /**
+     * Corrige el archivo y devuelve su código completo corregido.
+     */
+    public String correct(String context, String fileToFix) throws IOException {
+        return correct(context, fileToFix, null);
+    }
+
+    /**
+     * Igual que {@link #correct(String, String)}. Con listener se pide el archivo completo aunque el modo parche
+     * esté activo, para entregarlo a medida que llega.
+     * @param listener Receptor del código corregido en modo streaming, o null.
+     */
+    public String correct(String context, String fileToFix, AIAnalyzer.ChunkListener listener) throws IOException {
+        if (!enabled) return analyzer.analyze(context, fileToFix, listener);
+        if (listener != null) {
+            System.out.println(PREFIX + "Con --stream no se usa el modo parche: el archivo completo se muestra a medida que llega.");
+            return analyzer.analyze(context, fileToFix, listener);
+        }
+
+        String patch;
+        long patchMillis;
+        try (Trace.Span span = Trace.span("parche")) {
+            long start = System.nanoTime();
+            patch = analyzer.analyze(AIAnalyzer.PATCH_INSTRUCTION, context, fileToFix, null);
+            patchMillis = (System.nanoTime() - start) / 1_000_000;
+            span.arg("caracteres", patch.length());
+        }
+        if (patch.startsWith("ERROR DE ")) return patch;
+
+        String corrected;
+        try (Trace.Span span = Trace.span("aplicar_parche")) {
+            corrected = patch.strip().equals(AIAnalyzer.NO_CHANGES) ? fileToFix : UnifiedDiff.apply(fileToFix, patch);
+            span.arg("caracteres", corrected.length());
+        } catch (UnifiedDiff.PatchException e) {
+            System.out.println(String.format("⚠️  %sEl parche no se aplica (%s); se regenera el archivo completo.", PREFIX, e.getMessage()));
+            long start = System.nanoTime();
+            String result = analyzer.analyze(context, fileToFix);
+            long fullMillis = (System.nanoTime() - start) / 1_000_000;
+            System.out.println(String.format("📊 %sRegeneración completa: ~%,d tokens de salida en %.1f s (más ~%,d tokens y %.1f s del parche descartado)",
+                    PREFIX, ContextSelector.estimateTokens(result.length()), fullMillis / 1000.0,
+                    ContextSelector.estimateTokens(patch.length()), patchMillis / 1000.0));
+            return result;
+        }
+
+        logSavings(patch, corrected, patchMillis);
+        return corrected;
+    }
+
+    /**
+     * Muestra los tokens de salida y la latencia del parche frente a los estimados para el archivo completo.
+     * La latencia sin parche se estima escalando la medida por la proporción de tokens de salida, que es
+     * lo que domina el tiempo de generación.
+     */
+    private static void logSavings(String patch, String corrected, long patchMillis) {
+        int patchTokens = Math.max(1, ContextSelector.estimateTokens(patch.length()));
+        int fullTokens = ContextSelector.estimateTokens(corrected.length());
+        double saved = fullTokens > 0 ? 100.0 * (fullTokens - patchTokens) / fullTokens : 0;
+        double estimatedFullSeconds = patchMillis / 1000.0 * fullTokens / patchTokens;
+        System.out.println(String.format("📊 %sParche aplicado: ~%,d tokens de salida frente a ~%,d del archivo completo (%.0f%% menos); %.1f s frente a ~%.1f s estimados",
+                PREFIX, patchTokens, fullTokens, saved, patchMillis / 1000.0, estimatedFullSeconds));
+    }
+}
@@ -0,0 +1,380 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.nio.file.attribute.BasicFileAttributes;
+import java.util.*;
+import java.util.function.ToLongFunction;
+import java.util.regex.Pattern;
+
+/**
+ * ProjectWalker: recorre el proyecto y selecciona los archivos que forman parte del contexto.
+ * <ul>
+ *   <li>Los directorios excluidos ({@link #EXCLUDED_DIRS}) se descartan al llegar a ellos, sin recorrer
+ *       su contenido. Se compara el nombre completo del directorio: {@code targeting/} no se excluye.</li>
+ *   <li>Se respetan los {@code .gitignore} del proyecto (también los de subdirectorios) y un archivo de
+ *       exclusiones propio con la misma sintaxis ({@code --ignore-file}, por defecto
+ *       {@value #DEFAULT_IGNORE_FILE} en la raíz si existe).</li>
+ *   <li>Se omiten los archivos binarios: los que tienen un byte nulo en los primeros
+ *       {@value #BINARY_SNIFF_BYTES} bytes.</li>
+ *   <li>Presupuestos de tamaño por archivo ({@code --max-file-kb}) y total ({@code --max-total-kb});
+ *       al agotar el total se omiten los archivos restantes según el orden del {@link PathSorter}.</li>
+ * </ul>
+ */
+public class ProjectWalker {
+
+    public static final Set<String> EXCLUDED_DIRS = Set.of("target", ".git", "node_modules");
+    public static final String GITIGNORE = ".gitignore";
+    public static final String DEFAULT_IGNORE_FILE = ".contextignore";
+    public static final int DEFAULT_MAX_FILE_KB = 1024;
+    public static final int DEFAULT_MAX_TOTAL_KB = 0; // 0 = sin límite
+
+    static final int BINARY_SNIFF_BYTES = 8192;
+
+    private static final String[] INCLUDED_EXTENSIONS = {
+        ".java", ".xml", ".md", ".json", ".php", ".py", ".txt", ".csv"
+    };
+
+    private final boolean useGitignore;
+    private final String ignoreFile;
+    private final long maxFileBytes;
+    private final long maxTotalBytes;
+
+    // Estadísticas del último recorrido
+    private int prunedDirs;
+    private int ignoredFiles;
+    private int binaryFiles;
+    private int largeFiles;
+    private int overBudgetFiles;
+
+    public ProjectWalker() {
+        this(true, null, DEFAULT_MAX_FILE_KB * 1024L, DEFAULT_MAX_TOTAL_KB * 1024L);
+    }
+
+    /**
+     * @param useGitignore Respetar los {@code .gitignore} del proyecto.
+     * @param ignoreFile Archivo de exclusiones adicional (relativo a la raíz o absoluto), o null para
+     *                   usar {@value #DEFAULT_IGNORE_FILE} si existe.
+     * @param maxFileBytes Tamaño máximo de cada archivo (0 = sin límite).
+     * @param maxTotalBytes Tamaño máximo del conjunto de archivos (0 = sin límite).
+     */
+    public ProjectWalker(boolean useGitignore, String ignoreFile, long maxFileBytes, long maxTotalBytes) {
+        this.useGitignore = useGitignore;
+        this.ignoreFile = ignoreFile;
+        this.maxFileBytes = Math.max(0, maxFileBytes);
+        this.maxTotalBytes = Math.max(0, maxTotalBytes);
+    }
+
+    /**
+     * Configuración a partir de {@code --no-gitignore}, {@code --ignore-file=ruta},
+     * {@code --max-file-kb=N} y {@code --max-total-kb=N}.
+     */
+    public static ProjectWalker fromOptions(CliOptions options) {
+        return new ProjectWalker(
+                !options.getBoolean("no-gitignore"),
+                options.get("ignore-file", null),
+                options.getInt("max-file-kb", DEFAULT_MAX_FILE_KB) * 1024L,
+                options.getInt("max-total-kb", DEFAULT_MAX_TOTAL_KB) * 1024L);
+    }
+
+    /**
+     * Indica si el nombre de un archivo tiene una de las extensiones del contexto.
+     */
+    public static boolean hasIncludedExtension(Path path) {
+        String name = path.getFileName().toString();
+        for (String extension : INCLUDED_EXTENSIONS) {
+            if (name.endsWith(extension)) return true;
+        }
+        return false;
+    }
+
+    /**
+     * Lista los archivos del contexto, ordenados con el sorter indicado y recortados al presupuesto total.
+     * @return Rutas con la raíz como prefijo (igual que {@link Files#walk}).
+     */
+    public List<Path> list(Path root, PathSorter sorter) throws IOException {
+        resetStats();
+        Map<Path, Long> sizes = new HashMap<>();
+        Deque<List<IgnoreRule>> rules = new ArrayDeque<>();
+
+        Files.walkFileTree(root, new SimpleFileVisitor<Path>() {
+            @Override
+            public FileVisitResult preVisitDirectory(Path dir, BasicFileAttributes attrs) {
+                if (!dir.equals(root)) {
+                    if (EXCLUDED_DIRS.contains(dir.getFileName().toString()) || isIgnored(rules, dir, true)) {
+                        prunedDirs++;
+                        return FileVisitResult.SKIP_SUBTREE;
+                    }
+                }
+                rules.addLast(loadRules(root, dir));
+                return FileVisitResult.CONTINUE;
+            }
+
+            @Override
+            public FileVisitResult postVisitDirectory(Path dir, IOException e) {
+                rules.removeLast();
+                return FileVisitResult.CONTINUE;
+            }
+
+            @Override
+            public FileVisitResult visitFile(Path file, BasicFileAttributes attrs) {
+                long size = attrs.size();
+                if (attrs.isSymbolicLink()) {
+                    // Igual que Files.walk + Files.isRegularFile: se siguen los enlaces a archivos
+                    try {
+                        BasicFileAttributes target = Files.readAttributes(file, BasicFileAttributes.class);
+                        if (!target.isRegularFile()) return FileVisitResult.CONTINUE;
+                        size = target.size();
+                    } catch (IOException e) {
+                        return FileVisitResult.CONTINUE;
+                    }
+                } else if (!attrs.isRegularFile()) {
+                    return FileVisitResult.CONTINUE;
+                }
+                if (hasIncludedExtension(file) && acceptsFile(rules, file, size)) sizes.put(file, size);
+                return FileVisitResult.CONTINUE;
+            }
+
+            @Override
+            public FileVisitResult visitFileFailed(Path file, IOException e) {
+                System.err.println("Advertencia: no se pudo recorrer " + file + ": " + e.getMessage());
+                return FileVisitResult.CONTINUE;
+            }
+        });
+
+        return limitTotal(sorter.sort(new ArrayList<>(sizes.keySet())), sizes::get);
+    }
+
+    /**
+     * Comprueba un único archivo con las mismas reglas que {@link #list}, salvo el presupuesto total
+     * (véase {@link #limitTotal}). Se usa para aplicar una lista de cambios sin recorrer el proyecto.
+     */
+    public boolean accepts(Path root, Path file) {
+        if (!hasIncludedExtension(file) || !Files.isRegularFile(file)) return false;
+        Path relative = root.relativize(file);
+        Deque<List<IgnoreRule>> rules = new ArrayDeque<>();
+        Path dir = root;
+        rules.addLast(loadRules(root, dir));
+        for (int i = 0; i < relative.getNameCount() - 1; i++) {
+            dir = dir.resolve(relative.getName(i));
+            if (EXCLUDED_DIRS.contains(dir.getFileName().toString()) || isIgnored(rules, dir, true)) return false;
+            rules.addLast(loadRules(root, dir));
+        }
+        try {
+            return acceptsFile(rules, file, Files.size(file));
+        } catch (IOException e) {
+            return false;
+        }
+    }
+
+    /**
+     * Recorta una lista ya ordenada al presupuesto total: se conservan los archivos mientras quepan.
+     */
+    public List<Path> limitTotal(List<Path> sortedFiles, ToLongFunction<Path> size) {
+        if (maxTotalBytes == 0) return sortedFiles;
+        List<Path> kept = new ArrayList<>(sortedFiles.size());
+        long total = 0;
+        for (Path file : sortedFiles) {
+            long bytes = size.applyAsLong(file);
+            if (total + bytes > maxTotalBytes) {
+                overBudgetFiles++;
+                continue;
+            }
+            total += bytes;
+            kept.add(file);
+        }
+        return kept;
+    }
+
+    /**
+     * Muestra cuántos archivos y directorios se descartaron en el último recorrido (nada si ninguno).
+     */
+    public void printSummary() {
+        if (prunedDirs + ignoredFiles + binaryFiles + largeFiles + overBudgetFiles == 0) return;
+        StringBuilder summary = new StringBuilder("📊 Omitidos: ")
+                .append(prunedDirs).append(" directorios excluidos, ")
+                .append(ignoredFiles).append(" archivos ignorados, ")
+                .append(binaryFiles).append(" binarios, ")
+                .append(largeFiles).append(" de más de ").append(maxFileBytes / 1024).append(" KB");
+        if (maxTotalBytes > 0) {
+            summary.append(", ").append(overBudgetFiles).append(" por superar el total de ")
+                    .append(maxTotalBytes / 1024).append(" KB");
+        }
+        System.out.println(summary);
+    }
+
+    private void resetStats() {
+        prunedDirs = 0;
+        ignoredFiles = 0;
+        binaryFiles = 0;
+        largeFiles = 0;
+        overBudgetFiles = 0;
+    }
+
+    private boolean acceptsFile(Deque<List<IgnoreRule>> rules, Path file, long size) {
+        if (isIgnored(rules, file, false)) {
+            ignoredFiles++;
+            return false;
+        }
+        if (maxFileBytes > 0 && size > maxFileBytes) {
+            largeFiles++;
+            return false;
+        }
+        if (isBinary(file)) {
+            binaryFiles++;
+            return false;
+        }
+        return true;
+    }
+
+    /**
+     * Un archivo es binario si tiene un byte nulo al principio (mismo criterio que git).
+     * Los archivos que no se pueden leer no se descartan aquí: el error se muestra al leerlos.
+     */
+    static boolean isBinary(Path file) {
+        try (InputStream in = Files.newInputStream(file)) {
+            byte[] head = in.readNBytes(BINARY_SNIFF_BYTES);
+            for (byte b : head) {
+                if (b == 0) return true;
+            }
+            return false;
+        } catch (IOException e) {
+            return false;
+        }
+    }
+
+    /**
+     * Reglas que aporta un directorio: su {@code .gitignore} y, en la raíz, el archivo de exclusiones
+     * propio (que se evalúa después y por tanto tiene prioridad).
+     */
+    private List<IgnoreRule> loadRules(Path root, Path dir) {
+        List<IgnoreRule> rules = new ArrayList<>();
+        if (useGitignore) readRules(dir, dir.resolve(GITIGNORE), rules);
+        if (dir.equals(root)) {
+            Path custom = ignoreFile != null ? root.resolve(ignoreFile) : root.resolve(DEFAULT_IGNORE_FILE);
+            if (ignoreFile != null && !Files.isRegularFile(custom)) {
+                System.err.println("Advertencia: no se encontró el archivo de exclusiones " + custom);
+            }
+            readRules(root, custom, rules);
+        }
+        return rules;
+    }
+
+    private static void readRules(Path base, Path file, List<IgnoreRule> rules) {
+        if (!Files.isRegularFile(file)) return;
+        try {
+            for (String line : Files.readAllLines(file, StandardCharsets.UTF_8)) {
+                IgnoreRule rule = IgnoreRule.parse(base, line);
+                if (rule != null) rules.add(rule);
+            }
+        } catch (IOException e) {
+            System.err.println("Advertencia: no se pudo leer " + file + ": " + e.getMessage());
+        }
+    }
+
+    /**
+     * Aplica las reglas de la raíz al directorio más profundo; gana la última que coincide.
+     */
+    private static boolean isIgnored(Deque<List<IgnoreRule>> rules, Path path, boolean directory) {
+        boolean ignored = false;
+        for (List<IgnoreRule> level : rules) {
+            for (IgnoreRule rule : level) {
+                if (rule.matches(path, directory)) ignored = !rule.negate;
+            }
+        }
+        return ignored;
+    }
+
+    /**
+     * Patrón con la sintaxis de {@code .gitignore}: comentarios con {@code #}, negación con {@code !},
+     * {@code /} final solo para directorios, patrones con {@code /} anclados al directorio del archivo,
+     * y comodines {@code *}, {@code ?}, {@code [...]} y {@code **}.
+     */
+    static final class IgnoreRule {
+        final Path base;
+        final Pattern pattern;
+        final boolean negate;
+        final boolean directoryOnly;
+        final boolean anchored;
+
+        private IgnoreRule(Path base, Pattern pattern, boolean negate, boolean directoryOnly, boolean anchored) {
+            this.base = base;
+            this.pattern = pattern;
+            this.negate = negate;
+            this.directoryOnly = directoryOnly;
+            this.anchored = anchored;
+        }
+
+        /**
+         * @return La regla, o null si la línea está vacía o es un comentario.
+         */
+        static IgnoreRule parse(Path base, String line) {
+            String text = line.stripTrailing();
+            if (text.isEmpty() || text.startsWith("#")) return null;
+            boolean negate = text.startsWith("!");
+            if (negate) text = text.substring(1);
+            else if (text.startsWith("\\#") || text.startsWith("\\!")) text = text.substring(1);
+            boolean directoryOnly = text.endsWith("/");
+            if (directoryOnly) text = text.substring(0, text.length() - 1);
+            boolean anchored = text.contains("/");
+            if (text.startsWith("/")) text = text.substring(1);
+            if (text.isEmpty()) return null;
+            return new IgnoreRule(base, Pattern.compile(globToRegex(text)), negate, directoryOnly, anchored);
+        }
+
+        boolean matches(Path path, boolean directory) {
+            if (directoryOnly && !directory) return false;
+            if (!path.startsWith(base) || path.equals(base)) return false;
+            String subject = anchored
+                    ? base.relativize(path).toString().replace('\\', '/')
+                    : path.getFileName().toString();
+            return pattern.matcher(subject).matches();
+        }
+
+        static String globToRegex(String glob) {
+            StringBuilder regex = new StringBuilder(glob.length() + 16);
+            for (int i = 0; i < glob.length(); i++) {
+                char c = glob.charAt(i);
+                switch (c) {
+                    case '*':
+                        if (i + 1 < glob.length() && glob.charAt(i + 1) == '*') {
+                            i++;
+                            if (i + 1 < glob.length() && glob.charAt(i + 1) == '/') {
+                                i++;
+                                regex.append("(?:.*/)?");  // "**/": cero o más directorios
+                            } else {
+                                regex.append(".*");
+                            }
+                        } else {
+                            regex.append("[^/]*");
+                        }
+                        break;
+                    case '?':
+                        regex.append("[^/]");
+                        break;
+                    case '[': {
+                        int close = glob.indexOf(']', i + 2);
+                        if (close < 0) {
+                            regex.append("\\[");
+                            break;
+                        }
+                        String body = glob.substring(i + 1, close);
+                        if (body.startsWith("!")) body = "^" + body.substring(1);
+                        regex.append('[').append(body.replace("\\", "\\\\")).append(']');
+                        i = close;
+                        break;
+                    }
+                    case '\\':
+                        if (i + 1 < glob.length()) regex.append(Pattern.quote(String.valueOf(glob.charAt(++i))));
+                        break;
+                    default:
+                        if (".^$+{}()|".indexOf(c) >= 0) regex.append('\\');
+                        regex.append(c);
+                }
+            }
+            return regex.toString();
+        }
+    }
+}
@@ -0,0 +1,139 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.*;
+import java.nio.file.attribute.FileTime;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+import java.util.ArrayList;
+import java.util.Comparator;
+import java.util.List;
+import java.util.stream.Collectors;
+import java.util.stream.Stream;
+
+/**
+ * Caché en disco de respuestas de Gemini.
+ * La clave es el SHA-256 de (modelo, instrucción del sistema, contexto, prompt); cada respuesta
+ * se guarda en un archivo propio. Al superar el tamaño máximo se eliminan las entradas usadas
+ * hace más tiempo (LRU según la fecha de modificación, que se actualiza en cada acierto).
+ */
+public class ResponseCache {
+
+    public static final String DEFAULT_DIR = ".gemini_cache";
+    public static final long DEFAULT_MAX_MB = 256;
+
+    private static final String EXTENSION = ".txt";
+
+    private final Path directory;
+    private final long maxBytes;
+
+    public ResponseCache(Path directory, long maxBytes) {
+        this.directory = directory;
+        this.maxBytes = maxBytes;
+    }
+
+    /**
+     * Crea la caché según las opciones {@code --cache-dir} y {@code --cache-max-mb}.
+     * @return null si se indicó {@code --no-cache}.
+     */
+    public static ResponseCache fromOptions(CliOptions options) {
+        if (options.getBoolean("no-cache")) return null;
+        Path directory = Paths.get(options.get("cache-dir", DEFAULT_DIR));
+        long maxMb = options.getInt("cache-max-mb", (int) DEFAULT_MAX_MB);
+        return new ResponseCache(directory, maxMb * 1024 * 1024);
+    }
+
+    /**
+     * Calcula la clave de caché. Cada parte se precede de su longitud para evitar colisiones
+     * entre combinaciones distintas que concatenadas producirían el mismo texto.
+     */
+    public static String key(String model, String systemInstruction, String context, String prompt) {
+        try {
+            MessageDigest digest = MessageDigest.getInstance("SHA-256");
+            for (String part : new String[] {model, systemInstruction, context, prompt}) {
+                byte[] bytes = (part == null ? "" : part).getBytes(StandardCharsets.UTF_8);
+                digest.update((bytes.length + ":").getBytes(StandardCharsets.UTF_8));
+                digest.update(bytes);
+            }
+            StringBuilder hex = new StringBuilder();
+            for (byte b : digest.digest()) hex.append(String.format("%02x", b));
+            return hex.toString();
+        } catch (NoSuchAlgorithmException e) {
+            throw new IllegalStateException("SHA-256 no disponible", e);
+        }
+    }
+
+    /**
+     * Devuelve la respuesta guardada para la clave, o null si no existe.
+     */
+    public String get(String key) {
+        Path entry = directory.resolve(key + EXTENSION);
+        if (!Files.isRegularFile(entry)) return null;
+        try {
+            String value = Files.readString(entry, StandardCharsets.UTF_8);
+            Files.setLastModifiedTime(entry, FileTime.fromMillis(System.currentTimeMillis()));
+            return value;
+        } catch (IOException e) {
+            System.err.println("Advertencia: no se pudo leer la entrada de caché " + entry + ": " + e.getMessage());
+            return null;
+        }
+    }
+
+    /**
+     * Guarda una respuesta y aplica la política de expulsión por tamaño.
+     */
+    public void put(String key, String value) {
+        try {
+            Files.createDirectories(directory);
+            Path entry = directory.resolve(key + EXTENSION);
+            Path temp = Files.createTempFile(directory, key, ".tmp");
+            Files.writeString(temp, value, StandardCharsets.UTF_8);
+            Files.move(temp, entry, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
+            evict();
+        } catch (IOException e) {
+            System.err.println("Advertencia: no se pudo guardar la respuesta en caché: " + e.getMessage());
+        }
+    }
+
+    /**
+     * Elimina las entradas menos usadas recientemente hasta quedar por debajo del tamaño máximo.
+     */
+    private void evict() throws IOException {
+        List<Path> entries;
+        try (Stream<Path> files = Files.list(directory)) {
+            entries = files.filter(path -> path.toString().endsWith(EXTENSION)).collect(Collectors.toList());
+        }
+
+        long total = 0;
+        List<CachedFile> files = new ArrayList<>();
+        for (Path entry : entries) {
+            try {
+                CachedFile file = new CachedFile(entry, Files.getLastModifiedTime(entry).toMillis(), Files.size(entry));
+                files.add(file);
+                total += file.size;
+            } catch (IOException ignored) {
+                // La entrada pudo ser eliminada por otro proceso
+            }
+        }
+        if (total <= maxBytes) return;
+
+        files.sort(Comparator.comparingLong(file -> file.lastUsed));
+        for (CachedFile file : files) {
+            if (total <= maxBytes) break;
+            if (Files.deleteIfExists(file.path)) total -= file.size;
+        }
+    }
+
+    private static class CachedFile {
+        final Path path;
+        final long lastUsed;
+        final long size;
+
+        CachedFile(Path path, long lastUsed, long size) {
+            this.path = path;
+            this.lastUsed = lastUsed;
+            this.size = size;
+        }
+    }
+}
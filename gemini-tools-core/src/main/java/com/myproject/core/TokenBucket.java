@@ -0,0 +1,69 @@
+package com.myproject.core;
+
+import java.util.concurrent.TimeUnit;
+
+/**
+ * Limitador de peticiones por cubo de fichas: se reponen {@code permitsPerMinute} fichas por minuto
+ * de forma continua, hasta un máximo de {@code burst}. Cada petición consume una ficha y, si no hay,
+ * espera a que se reponga. Es seguro entre hilos, así que varios especialistas en la misma JVM
+ * comparten la cuota.
+ */
+public class TokenBucket {
+
+    private final double capacity;
+    private final double refillPerNano;
+    private double tokens;
+    private long lastRefill;
+    private long pausedUntil;
+
+    public TokenBucket(int permitsPerMinute, int burst) {
+        if (permitsPerMinute <= 0) throw new IllegalArgumentException("permitsPerMinute debe ser positivo");
+        this.capacity = Math.max(1, burst);
+        this.refillPerNano = permitsPerMinute / (double) TimeUnit.MINUTES.toNanos(1);
+        this.tokens = capacity;
+        this.lastRefill = System.nanoTime();
+    }
+
+    /**
+     * Espera hasta obtener una ficha.
+     * @return Nanosegundos esperados.
+     */
+    public long acquire() throws InterruptedException {
+        long waited = 0;
+        while (true) {
+            long wait;
+            synchronized (this) {
+                long now = System.nanoTime();
+                refill(now);
+                if (now < pausedUntil) {
+                    wait = pausedUntil - now;
+                } else if (tokens >= 1) {
+                    tokens -= 1;
+                    return waited;
+                } else {
+                    wait = (long) Math.ceil((1 - tokens) / refillPerNano);
+                }
+            }
+            TimeUnit.NANOSECONDS.sleep(wait);
+            waited += wait;
+        }
+    }
+
+    /**
+     * Detiene la entrega de fichas durante el tiempo indicado y vacía el cubo, p. ej. tras un 429
+     * del servidor, para que el resto de hilos no sigan agotando la cuota.
+     */
+    public synchronized void pause(long nanos) {
+        long now = System.nanoTime();
+        refill(now);
+        pausedUntil = Math.max(pausedUntil, now + nanos);
+        tokens = Math.min(tokens, 0);
+    }
+
+    private void refill(long now) {
+        // Durante una pausa no se acumulan fichas
+        long from = Math.max(lastRefill, pausedUntil);
+        if (now > from) tokens = Math.min(capacity, tokens + (now - from) * refillPerNano);
+        lastRefill = Math.max(lastRefill, now);
+    }
+}
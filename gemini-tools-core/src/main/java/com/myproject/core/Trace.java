@@ -0,0 +1,168 @@
+package com.myproject.core;
+
+import java.io.IOException;
+import java.lang.management.ManagementFactory;
+import java.lang.management.MemoryPoolMXBean;
+import java.lang.management.MemoryType;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.time.Instant;
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * Trazas de tiempos por etapa.
+ * Con la opción {@code --trace} de la ejecución actual ({@link CliOptions#current()}), cada tramo se
+ * imprime al cerrarse como una línea {@code [TRACE] {...}} con el formato de evento de Chrome trace
+ * (ts y dur en microsegundos desde la época), que el orquestador de Python recoge en el archivo de traza.
+ * Sin la opción, los tramos no hacen nada.
+ *
+ * Uso:
+ * <pre>
+ * try (Trace.Span span = Trace.span("leer_contexto")) {
+ *     ...
+ *     span.arg("bytes", size);
+ * }
+ * </pre>
+ */
+public final class Trace {
+
+    /** Prefijo de las líneas de evento en la salida estándar. */
+    public static final String PREFIX = "[TRACE] ";
+
+    private static final String CATEGORY = "java";
+    private static final Path PROC_STATUS = Paths.get("/proc/self/status");
+
+    private Trace() {}
+
+    public static boolean enabled() {
+        return CliOptions.current().getBoolean("trace");
+    }
+
+    /**
+     * Abre un tramo que se mide hasta su cierre.
+     */
+    public static Span span(String name) {
+        return new Span(name, enabled());
+    }
+
+    /**
+     * Emite un evento de contador con el uso de memoria de la JVM: heap usado y pico de heap
+     * (suma de los pools de heap) y, en Linux, el pico de memoria residente del proceso (VmHWM).
+     */
+    public static void resources(String name) {
+        if (!enabled()) return;
+        long heapUsed = 0;
+        long heapPeak = 0;
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() != MemoryType.HEAP) continue;
+            heapUsed += pool.getUsage().getUsed();
+            heapPeak += pool.getPeakUsage().getUsed();
+        }
+        Map<String, Object> args = new LinkedHashMap<>();
+        args.put("heap_usado_kb", heapUsed / 1024);
+        args.put("heap_pico_kb", heapPeak / 1024);
+        long rssPeak = peakRssKb();
+        if (rssPeak >= 0) args.put("rss_pico_kb", rssPeak);
+        emit(name, "C", nowMicros(), -1, args);
+    }
+
+    /**
+     * Pico de memoria residente del proceso en KB, o -1 si no está disponible (fuera de Linux).
+     */
+    static long peakRssKb() {
+        if (!Files.isReadable(PROC_STATUS)) return -1;
+        try {
+            for (String line : Files.readAllLines(PROC_STATUS)) {
+                if (line.startsWith("VmHWM:")) {
+                    return Long.parseLong(line.substring(6).replace("kB", "").trim());
+                }
+            }
+        } catch (IOException | NumberFormatException e) {
+            // Sin datos de memoria: el evento se emite sin ellos
+        }
+        return -1;
+    }
+
+    private static long nowMicros() {
+        Instant now = Instant.now();
+        return now.getEpochSecond() * 1_000_000L + now.getNano() / 1_000;
+    }
+
+    private static void emit(String name, String phase, long ts, long dur, Map<String, Object> args) {
+        StringBuilder json = new StringBuilder(128);
+        json.append("{\"name\":\"").append(escape(name))
+            .append("\",\"cat\":\"").append(CATEGORY)
+            .append("\",\"ph\":\"").append(phase)
+            .append("\",\"ts\":").append(ts);
+        if (dur >= 0) json.append(",\"dur\":").append(dur);
+        json.append(",\"pid\":").append(ProcessHandle.current().pid())
+            .append(",\"tid\":").append(Thread.currentThread().getId())
+            .append(",\"args\":{");
+        boolean first = true;
+        for (Map.Entry<String, Object> entry : args.entrySet()) {
+            if (!first) json.append(',');
+            first = false;
+            json.append('"').append(escape(entry.getKey())).append("\":");
+            Object value = entry.getValue();
+            if (value instanceof Number || value instanceof Boolean) {
+                json.append(value);
+            } else {
+                json.append('"').append(escape(String.valueOf(value))).append('"');
+            }
+        }
+        json.append("}}");
+        System.out.println(PREFIX + json);
+    }
+
+    private static String escape(String value) {
+        StringBuilder out = new StringBuilder(value.length());
+        for (int i = 0; i < value.length(); i++) {
+            char c = value.charAt(i);
+            switch (c) {
+                case '"': out.append("\\\""); break;
+                case '\\': out.append("\\\\"); break;
+                case '\n': out.append("\\n"); break;
+                case '\r': out.append("\\r"); break;
+                case '\t': out.append("\\t"); break;
+                default:
+                    if (c < 0x20) out.append(String.format("\\u%04x", (int) c));
+                    else out.append(c);
+            }
+        }
+        return out.toString();
+    }
+
+    /**
+     * Tramo en curso; se emite al cerrarse con los argumentos añadidos.
+     */
+    public static final class Span implements AutoCloseable {
+        private final String name;
+        private final boolean enabled;
+        private final long startMicros;
+        private final long startNanos;
+        private final Map<String, Object> args = new LinkedHashMap<>();
+
+        private Span(String name, boolean enabled) {
+            this.name = name;
+            this.enabled = enabled;
+            this.startMicros = enabled ? nowMicros() : 0;
+            this.startNanos = enabled ? System.nanoTime() : 0;
+        }
+
+        /**
+         * Añade un argumento al evento (tamaños, estados...).
+         */
+        public Span arg(String key, Object value) {
+            if (enabled) args.put(key, value);
+            return this;
+        }
+
+        @Override
+        public void close() {
+            if (!enabled) return;
+            emit(name, "X", startMicros, (System.nanoTime() - startNanos) / 1_000, args);
+        }
+    }
+}
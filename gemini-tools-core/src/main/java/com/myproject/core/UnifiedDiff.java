@@ -0,0 +1,183 @@
+package com.myproject.core;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+
+/**
+ * Aplica un parche en formato diff unificado (el que devuelve el modelo en modo parche) a un único archivo.
+ * Los números de línea de las cabeceras {@code @@ -a,b +c,d @@} solo orientan la búsqueda: cada fragmento
+ * se localiza por sus líneas de contexto y eliminadas (primero de forma exacta y después ignorando los
+ * espacios finales), empezando por la posición indicada. Los recuentos de líneas de la cabecera no se
+ * validan porque el modelo los calcula mal con frecuencia. Un fragmento que no aparece en el archivo invalida
+ * el parche completo.
+ */
+public final class UnifiedDiff {
+
+    private static final Pattern HUNK_HEADER = Pattern.compile("^@@ -(\\d+)(?:,\\d+)? \\+\\d+(?:,\\d+)? @@.*");
+    private static final String FENCE = "```";
+
+    /**
+     * El parche no es válido o no se aplica limpiamente al archivo.
+     */
+    public static class PatchException extends Exception {
+        public PatchException(String message) {
+            super(message);
+        }
+    }
+
+    /**
+     * Fragmento del parche: posición orientativa (base 1) y líneas antes y después del cambio.
+     */
+    static final class Hunk {
+        final int oldStart;
+        final List<String> before = new ArrayList<>();
+        final List<String> after = new ArrayList<>();
+
+        Hunk(int oldStart) {
+            this.oldStart = oldStart;
+        }
+    }
+
+    private UnifiedDiff() {
+    }
+
+    /**
+     * Aplica el parche al texto original y devuelve el texto resultante, con el mismo separador de línea
+     * y el mismo salto de línea final que el original.
+     * @throws PatchException Si el parche no tiene fragmentos o alguno no coincide con el archivo.
+     */
+    public static String apply(String original, String diff) throws PatchException {
+        List<Hunk> hunks = parse(diff);
+        if (hunks.isEmpty()) throw new PatchException("la respuesta no contiene fragmentos '@@' de diff unificado");
+
+        String separator = original.contains("\r\n") ? "\r\n" : "\n";
+        boolean trailingNewline = original.endsWith("\n");
+        List<String> lines = splitLines(original);
+
+        int offset = 0;      // desplazamiento acumulado por los fragmentos ya aplicados
+        int minPosition = 0; // los fragmentos se aplican en orden y no se solapan
+        for (int h = 0; h < hunks.size(); h++) {
+            Hunk hunk = hunks.get(h);
+            int expected = Math.max(minPosition, Math.min(lines.size(), hunk.oldStart - 1 + offset));
+            int position;
+            if (hunk.before.isEmpty()) {
+                // Inserción pura: @@ -N,0 +M,k @@ inserta después de la línea N
+                position = Math.max(minPosition, Math.min(lines.size(), hunk.oldStart + offset));
+            } else {
+                position = find(lines, hunk.before, expected, minPosition, false);
+                if (position < 0) position = find(lines, hunk.before, expected, minPosition, true);
+                if (position < 0) {
+                    throw new PatchException(String.format("el fragmento %d/%d (línea %d) no coincide con el archivo: \"%s\"",
+                            h + 1, hunks.size(), hunk.oldStart, hunk.before.get(0).trim()));
+                }
+            }
+            List<String> target = lines.subList(position, position + hunk.before.size());
+            target.clear();
+            target.addAll(hunk.after);
+            offset += hunk.after.size() - hunk.before.size();
+            minPosition = position + hunk.after.size();
+        }
+
+        String result = String.join(separator, lines);
+        return trailingNewline && !lines.isEmpty() ? result + separator : result;
+    }
+
+    /**
+     * Interpreta el texto del parche. Se ignoran las cabeceras de archivo ({@code ---}, {@code +++},
+     * {@code diff}, {@code index}), el resto del texto anterior al primer fragmento y las marcas de bloque
+     * de código ({@code ```}).
+     * Una línea vacía dentro de un fragmento se toma como una línea de contexto vacía.
+     */
+    static List<Hunk> parse(String diff) throws PatchException {
+        List<Hunk> hunks = new ArrayList<>();
+        Hunk current = null;
+        for (String line : splitLines(diff)) {
+            Matcher header = HUNK_HEADER.matcher(line);
+            if (header.matches()) {
+                current = new Hunk(Integer.parseInt(header.group(1)));
+                hunks.add(current);
+                continue;
+            }
+            if (line.startsWith(FENCE)) {
+                current = null;
+                continue;
+            }
+            // Fuera de un fragmento todo lo demás (cabeceras y explicaciones) se ignora; dentro, "--- x" es
+            // la eliminación de la línea "-- x"
+            if (current == null || line.startsWith("\\")) continue; // "\ No newline at end of file"
+            if (line.isEmpty()) {
+                current.before.add("");
+                current.after.add("");
+                continue;
+            }
+            String text = line.substring(1);
+            switch (line.charAt(0)) {
+                case ' ':
+                    current.before.add(text);
+                    current.after.add(text);
+                    break;
+                case '-':
+                    current.before.add(text);
+                    break;
+                case '+':
+                    current.after.add(text);
+                    break;
+                default:
+                    throw new PatchException("línea no válida en el fragmento " + hunks.size() + ": \"" + line + "\"");
+            }
+        }
+        // Las líneas vacías finales de un fragmento suelen ser el separador con el texto siguiente
+        for (Hunk hunk : hunks) {
+            while (!hunk.before.isEmpty() && !hunk.after.isEmpty()
+                    && hunk.before.get(hunk.before.size() - 1).isEmpty() && hunk.after.get(hunk.after.size() - 1).isEmpty()) {
+                hunk.before.remove(hunk.before.size() - 1);
+                hunk.after.remove(hunk.after.size() - 1);
+            }
+        }
+        return hunks;
+    }
+
+    /**
+     * Busca el bloque en el archivo, alternando hacia delante y hacia atrás desde la posición esperada.
+     * @return Índice de la primera línea del bloque, o -1 si no aparece.
+     */
+    private static int find(List<String> lines, List<String> block, int expected, int minPosition, boolean ignoreTrailingSpace) {
+        int last = lines.size() - block.size();
+        for (int distance = 0; expected + distance <= last || expected - distance >= minPosition; distance++) {
+            int forward = expected + distance;
+            if (forward <= last && forward >= minPosition && matchesAt(lines, block, forward, ignoreTrailingSpace)) return forward;
+            int backward = expected - distance;
+            if (distance > 0 && backward >= minPosition && backward <= last && matchesAt(lines, block, backward, ignoreTrailingSpace)) return backward;
+        }
+        return -1;
+    }
+
+    private static boolean matchesAt(List<String> lines, List<String> block, int position, boolean ignoreTrailingSpace) {
+        for (int i = 0; i < block.size(); i++) {
+            String actual = lines.get(position + i);
+            String expected = block.get(i);
+            if (ignoreTrailingSpace ? !actual.stripTrailing().equals(expected.stripTrailing()) : !actual.equals(expected)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    /**
+     * Divide en líneas sin separadores; un salto de línea final no genera una línea vacía adicional.
+     */
+    private static List<String> splitLines(String text) {
+        List<String> lines = new ArrayList<>();
+        int start = 0;
+        while (start < text.length()) {
+            int newline = text.indexOf('\n', start);
+            int end = newline < 0 ? text.length() : newline;
+            int contentEnd = end > start && text.charAt(end - 1) == '\r' ? end - 1 : end;
+            lines.add(text.substring(start, contentEnd));
+            start = end + 1;
+        }
+        return lines;
+    }
+}
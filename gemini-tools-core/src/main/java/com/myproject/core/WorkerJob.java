@@ -0,0 +1,17 @@
+package com.myproject.core;
+
+/**
+ * Contrato de las tareas que {@link JvmWorker} puede ejecutar dentro de su JVM.
+ * La clase debe tener un constructor público sin argumentos. {@link #run(String[])} recibe los mismos
+ * argumentos que el {@code main} de la clase y devuelve su código de salida en lugar de llamar a
+ * {@code System.exit}, que terminaría el worker compartido. Las clases que no lo implementan se
+ * ejecutan en un proceso independiente.
+ */
+public interface WorkerJob {
+
+    /**
+     * Ejecuta la tarea con los argumentos de línea de comandos.
+     * @return Código de salida equivalente al del proceso independiente (0 si terminó correctamente).
+     */
+    int run(String[] args) throws Exception;
+}
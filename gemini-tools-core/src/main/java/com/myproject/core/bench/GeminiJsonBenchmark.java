@@ -0,0 +1,262 @@
+package com.myproject.core.bench;
+
+import java.io.BufferedReader;
+import java.io.ByteArrayInputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.lang.management.ManagementFactory;
+import java.nio.charset.StandardCharsets;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+
+import com.myproject.core.CliOptions;
+import com.myproject.core.GeminiJson;
+import com.myproject.core.WorkerJob;
+
+/**
+ * Benchmark del JSON de la API de Gemini: compara la codificación de la petición y la lectura de la
+ * respuesta de {@link GeminiJson} con el método anterior (cadena de String.replace + String.format y
+ * respuesta completa en memoria). Mide el rendimiento (MB/s) y los bytes asignados en el heap por el
+ * hilo (com.sun.management.ThreadMXBean, disponible en HotSpot/OpenJDK).
+ *
+ * Uso: java -cp <jar> com.myproject.core.bench.GeminiJsonBenchmark [--context-mb=N] [--parts=N] [--iterations=N]
+ */
+public class GeminiJsonBenchmark implements WorkerJob {
+
+    private static final int DEFAULT_CONTEXT_MB = 50;
+    private static final int DEFAULT_PARTS = 200;
+    private static final int DEFAULT_ITERATIONS = 3;
+
+    private static final String SYSTEM_INSTRUCTION =
+        "Actúa como un ingeniero de software experimentado. Tu respuesta DEBE ser SOLAMENTE el código completo corregido.";
+    private static final String USER_CONTEXT_HEADER = "Contexto del proyecto:\n";
+    private static final String USER_FILE_HEADER = "\n\nArchivo a corregir:\n";
+
+    private static final Pattern TEXT_FIELD = Pattern.compile("\"text\"\\s*:\\s*\"");
+
+    /** Descarta lo escrito y cuenta los bytes. */
+    private static class CountingOutputStream extends OutputStream {
+        long count;
+
+        @Override
+        public void write(int b) {
+            count++;
+        }
+
+        @Override
+        public void write(byte[] b, int off, int len) {
+            count += len;
+        }
+    }
+
+    /**
+     * Código fuente sintético con comillas, barras, tabuladores, caracteres no ASCII y emojis.
+     */
+    static String generateSource(long chars) {
+        String[] lines = {
+            "package com.example.modulo;\n",
+            "\tpublic String saludo(String nombre) {\n",
+            "\t\treturn \"Hola, \" + nombre + \"\\n\"; // Ruta: C:\\proyectos\\app\r\n",
+            "\t\t// Configuración: año, señal, acción ✅ 🚀\n",
+            "\t}\n",
+        };
+        StringBuilder source = new StringBuilder((int) Math.min(chars + 128, Integer.MAX_VALUE - 8));
+        for (int i = 0; source.length() < chars; i++) source.append(lines[i % lines.length]);
+        return source.toString();
+    }
+
+    /**
+     * Respuesta de generateContent con el texto repartido en varias partes, escapado como lo hace la API
+     * (incluidas secuencias \\uXXXX para los caracteres no ASCII).
+     */
+    static String generateResponse(String text, int parts) {
+        StringBuilder json = new StringBuilder(text.length() * 2);
+        json.append("{\"candidates\":[{\"content\":{\"parts\":[");
+        int step = Math.max(1, text.length() / Math.max(1, parts));
+        for (int start = 0; start < text.length(); start += step) {
+            if (start > 0) json.append(',');
+            int end = Math.min(text.length(), start + step);
+            // No partir pares sustitutos entre dos partes
+            if (end < text.length() && Character.isHighSurrogate(text.charAt(end - 1))) end++;
+            json.append("{\"text\":\"");
+            for (int i = start; i < end; i++) {
+                char c = text.charAt(i);
+                switch (c) {
+                    case '"': json.append("\\\""); break;
+                    case '\\': json.append("\\\\"); break;
+                    case '\n': json.append("\\n"); break;
+                    case '\r': json.append("\\r"); break;
+                    case '\t': json.append("\\t"); break;
+                    default:
+                        if (c < 0x20 || c > 0x7E) json.append(String.format("\\u%04x", (int) c));
+                        else json.append(c);
+                }
+            }
+            json.append("\"}");
+            start = end - step;
+        }
+        json.append("],\"role\":\"model\"},\"finishReason\":\"STOP\"}],");
+        json.append("\"usageMetadata\":{\"promptTokenCount\":1,\"totalTokenCount\":2},\"modelVersion\":\"bench\"}");
+        return json.toString();
+    }
+
+    // ---------------------------------------------------------------
+    // Implementación anterior (referencia)
+    // ---------------------------------------------------------------
+
+    private static String legacyEscape(String value) {
+        return value.replace("\\", "\\\\")
+                    .replace("\"", "\\\"")
+                    .replace("\n", "\\n")
+                    .replace("\r", "\\r")
+                    .replace("\t", "\\t");
+    }
+
+    private static long legacyRequest(String context, String fileToFix, OutputStream out) throws IOException {
+        String userQuery = String.format("Contexto del proyecto:\n%s\n\nArchivo a corregir:\n%s", context, fileToFix);
+        String json = String.format(
+            "{\"systemInstruction\":{\"parts\":[{\"text\":\"%s\"}]},"
+          + "\"contents\":[{\"role\":\"user\",\"parts\":[{\"text\":\"%s\"}]}]}",
+            legacyEscape(SYSTEM_INSTRUCTION), legacyEscape(userQuery));
+        byte[] input = json.getBytes(StandardCharsets.UTF_8);
+        out.write(input);
+        return input.length;
+    }
+
+    private static String legacyResponse(byte[] body) throws IOException {
+        StringBuilder responseBuilder = new StringBuilder();
+        try (BufferedReader br = new BufferedReader(
+                new InputStreamReader(new ByteArrayInputStream(body), StandardCharsets.UTF_8))) {
+            String line;
+            while ((line = br.readLine()) != null) responseBuilder.append(line);
+        }
+        String json = responseBuilder.toString();
+        Matcher matcher = TEXT_FIELD.matcher(json);
+        StringBuilder text = new StringBuilder();
+        while (matcher.find()) {
+            int i = matcher.end();
+            while (true) {
+                char current = json.charAt(i++);
+                if (current == '"') break;
+                if (current != '\\') {
+                    text.append(current);
+                    continue;
+                }
+                char escaped = json.charAt(i++);
+                switch (escaped) {
+                    case 'n': text.append('\n'); break;
+                    case 'r': text.append('\r'); break;
+                    case 't': text.append('\t'); break;
+                    case 'b': text.append('\b'); break;
+                    case 'f': text.append('\f'); break;
+                    case 'u':
+                        text.append((char) Integer.parseInt(json.substring(i, i + 4), 16));
+                        i += 4;
+                        break;
+                    default: text.append(escaped);
+                }
+            }
+            matcher.region(i, json.length());
+        }
+        return text.toString();
+    }
+
+    // ---------------------------------------------------------------
+    // Medición
+    // ---------------------------------------------------------------
+
+    private static long allocatedBytes() {
+        java.lang.management.ThreadMXBean bean = ManagementFactory.getThreadMXBean();
+        if (bean instanceof com.sun.management.ThreadMXBean) {
+            return ((com.sun.management.ThreadMXBean) bean).getCurrentThreadAllocatedBytes();
+        }
+        return -1;
+    }
+
+    private interface Task {
+        long run() throws IOException;
+    }
+
+    /**
+     * Ejecuta la tarea varias veces (más una de calentamiento) e informa del mejor tiempo y de la
+     * asignación media por iteración.
+     */
+    private static long measure(String label, long inputBytes, int iterations, Task task) throws IOException {
+        long result = task.run(); // Calentamiento
+        long bestNanos = Long.MAX_VALUE;
+        long allocated = 0;
+        for (int i = 0; i < iterations; i++) {
+            System.gc();
+            long allocatedBefore = allocatedBytes();
+            long start = System.nanoTime();
+            result = task.run();
+            bestNanos = Math.min(bestNanos, System.nanoTime() - start);
+            allocated += allocatedBytes() - allocatedBefore;
+        }
+        double seconds = bestNanos / 1e9;
+        String allocation = allocatedBytes() < 0
+            ? "asignación no disponible"
+            : String.format("%,9.1f MB asignados/iteración", allocated / (double) iterations / 1e6);
+        System.out.println(String.format("✅ %-36s %8.1f ms -> %8.1f MB/s, %s",
+                label, seconds * 1000, inputBytes / 1e6 / Math.max(seconds, 1e-9), allocation));
+        return result;
+    }
+
+    @Override
+    public int run(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        int contextMb = options.getInt("context-mb", DEFAULT_CONTEXT_MB);
+        int parts = options.getInt("parts", DEFAULT_PARTS);
+        int iterations = Math.max(1, options.getInt("iterations", DEFAULT_ITERATIONS));
+
+        System.out.println("⚙️  Generando un contexto de " + contextMb + " MB...");
+        String context = generateSource(contextMb * 1_000_000L);
+        String fileToFix = generateSource(20_000);
+        long contextBytes = context.getBytes(StandardCharsets.UTF_8).length;
+
+        System.out.println("--- Petición (" + String.format("%.1f", contextBytes / 1e6) + " MB de contexto) ---");
+        long legacyBytes = measure("String.replace + String.format", contextBytes, iterations,
+                () -> legacyRequest(context, fileToFix, new CountingOutputStream()));
+        String[] userParts = {USER_CONTEXT_HEADER, context, USER_FILE_HEADER, fileToFix};
+        long streamedBytes = measure("GeminiJson.writeRequest", contextBytes, iterations, () -> {
+            long expected = GeminiJson.requestLength(SYSTEM_INSTRUCTION, userParts);
+            CountingOutputStream out = new CountingOutputStream();
+            GeminiJson.writeRequest(out, SYSTEM_INSTRUCTION, userParts);
+            if (out.count != expected) {
+                throw new IllegalStateException("requestLength=" + expected + " pero se escribieron " + out.count + " bytes");
+            }
+            return out.count;
+        });
+        // El método anterior no escapaba los caracteres de control restantes: los tamaños coinciden
+        // mientras el contexto no los contenga
+        System.out.println("Cuerpo: " + legacyBytes + " bytes (anterior), " + streamedBytes + " bytes (streaming)");
+
+        System.out.println("--- Respuesta (" + parts + " partes) ---");
+        String responseText = generateSource(contextMb * 1_000_000L / 4);
+        byte[] body = generateResponse(responseText, parts).getBytes(StandardCharsets.UTF_8);
+        String[] legacyText = new String[1];
+        measure("readLine + expresión regular", body.length, iterations, () -> {
+            legacyText[0] = legacyResponse(body);
+            return legacyText[0].length();
+        });
+        String[] streamedText = new String[1];
+        measure("GeminiJson.TextReader", body.length, iterations, () -> {
+            StringBuilder text = new StringBuilder();
+            new GeminiJson.TextReader(new InputStreamReader(new ByteArrayInputStream(body), StandardCharsets.UTF_8))
+                .readInto(text);
+            streamedText[0] = text.toString();
+            return streamedText[0].length();
+        });
+        if (!responseText.equals(streamedText[0]) || !responseText.equals(legacyText[0])) {
+            System.out.println("❌ ERROR: el texto decodificado no coincide con el original.");
+            return 1;
+        }
+        System.out.println("✅ Texto decodificado idéntico al original (" + responseText.length() + " caracteres).");
+        return 0;
+    }
+
+    public static void main(String[] args) throws Exception {
+        System.exit(new GeminiJsonBenchmark().run(args));
+    }
+}
@@ -0,0 +1,81 @@
+package com.myproject.core;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+
+import java.io.IOException;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.List;
+import org.junit.jupiter.api.Test;
+
+/**
+ * Pruebas del modo parche: aplicación del diff, regeneración completa si no se aplica y streaming.
+ */
+class PatchCorrectorTest {
+
+    private static final String ORIGINAL = "a\nb\nc\n";
+
+    /**
+     * Analizador sin red: devuelve las respuestas indicadas en orden y registra la instrucción de cada petición.
+     */
+    private static final class ScriptedAnalyzer extends AIAnalyzer {
+        final Deque<String> responses = new ArrayDeque<>();
+        final List<String> instructions = new ArrayList<>();
+
+        ScriptedAnalyzer(String... responses) {
+            this.responses.addAll(List.of(responses));
+        }
+
+        @Override
+        String analyze(String systemInstruction, String context, String fileToFix, ChunkListener listener) throws IOException {
+            instructions.add(systemInstruction);
+            String response = responses.removeFirst();
+            if (listener != null) listener.onChunk(response);
+            return response;
+        }
+    }
+
+    @Test
+    void aplicaElParcheSinPedirElArchivoCompleto() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer("@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n");
+        assertEquals("a\nB\nc\n", new PatchCorrector(analyzer, true).correct("", ORIGINAL));
+        assertEquals(List.of(AIAnalyzer.PATCH_INSTRUCTION), analyzer.instructions);
+    }
+
+    @Test
+    void sinCambiosDevuelveElOriginal() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer(AIAnalyzer.NO_CHANGES);
+        assertEquals(ORIGINAL, new PatchCorrector(analyzer, true).correct("", ORIGINAL));
+    }
+
+    @Test
+    void siElParcheNoSeAplicaRegeneraElArchivoCompleto() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer("@@ -1 +1 @@\n-zzz\n+y\n", "a\nB\nc\n");
+        assertEquals("a\nB\nc\n", new PatchCorrector(analyzer, true).correct("", ORIGINAL));
+        assertEquals(List.of(AIAnalyzer.PATCH_INSTRUCTION, AIAnalyzer.FULL_FILE_INSTRUCTION), analyzer.instructions);
+    }
+
+    @Test
+    void unErrorDeLaApiNoSeTomaComoParche() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer("ERROR DE API: 500");
+        assertEquals("ERROR DE API: 500", new PatchCorrector(analyzer, true).correct("", ORIGINAL));
+        assertEquals(1, analyzer.instructions.size());
+    }
+
+    @Test
+    void conStreamingSePideElArchivoCompleto() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer("a\nB\nc\n");
+        StringBuilder streamed = new StringBuilder();
+        assertEquals("a\nB\nc\n", new PatchCorrector(analyzer, true).correct("", ORIGINAL, streamed::append));
+        assertEquals("a\nB\nc\n", streamed.toString());
+        assertEquals(List.of(AIAnalyzer.FULL_FILE_INSTRUCTION), analyzer.instructions);
+    }
+
+    @Test
+    void sinModoParcheSePideElArchivoCompleto() throws Exception {
+        ScriptedAnalyzer analyzer = new ScriptedAnalyzer("a\nB\nc\n");
+        assertEquals("a\nB\nc\n", new PatchCorrector(analyzer, false).correct("", ORIGINAL));
+        assertEquals(List.of(AIAnalyzer.FULL_FILE_INSTRUCTION), analyzer.instructions);
+    }
+}
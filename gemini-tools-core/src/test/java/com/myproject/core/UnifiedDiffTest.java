@@ -0,0 +1,93 @@
+package com.myproject.core;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+import org.junit.jupiter.api.Test;
+
+/**
+ * Pruebas de la aplicación de parches en diff unificado (modo parche de la corrección).
+ */
+class UnifiedDiffTest {
+
+    @Test
+    void aplicaUnFragmentoEnSuPosicion() throws Exception {
+        String diff = "@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n";
+        assertEquals("a\nB\nc\n", UnifiedDiff.apply("a\nb\nc\n", diff));
+    }
+
+    @Test
+    void localizaElFragmentoAunqueLaCabeceraIndiqueOtraLinea() throws Exception {
+        String original = "x1\nx2\nx3\nx4\nx5\na\nb\nc\n";
+        String diff = "@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n";
+        assertEquals("x1\nx2\nx3\nx4\nx5\na\nB\nc\n", UnifiedDiff.apply(original, diff));
+    }
+
+    @Test
+    void ignoraRecuentosErroneosEnLaCabecera() throws Exception {
+        String diff = "@@ -2,7 +2,1 @@\n b\n-c\n+C\n";
+        assertEquals("a\nb\nC\n", UnifiedDiff.apply("a\nb\nc\n", diff));
+    }
+
+    @Test
+    void acumulaElDesplazamientoEntreFragmentos() throws Exception {
+        String original = "1\n2\n3\n4\n5\n6\n7\n8\n9\n10\n";
+        String diff = "@@ -2,2 +2,3 @@\n 2\n+2a\n 3\n@@ -8,2 +9,2 @@\n 8\n-9\n+nueve\n";
+        assertEquals("1\n2\n2a\n3\n4\n5\n6\n7\n8\nnueve\n10\n", UnifiedDiff.apply(original, diff));
+    }
+
+    @Test
+    void toleraEspaciosFinalesDistintos() throws Exception {
+        String original = "int x = 1;   \nreturn x;\n";
+        String diff = "@@ -1,2 +1,2 @@\n-int x = 1;\n+int x = 2;\n return x;\n";
+        assertEquals("int x = 2;\nreturn x;\n", UnifiedDiff.apply(original, diff));
+    }
+
+    @Test
+    void respetaLaFaltaDeSaltoDeLineaFinal() throws Exception {
+        String diff = "@@ -1,2 +1,2 @@\n a\n-b\n\\ No newline at end of file\n+c\n\\ No newline at end of file\n";
+        assertEquals("a\nc", UnifiedDiff.apply("a\nb", diff));
+    }
+
+    @Test
+    void conservaLosSaltosDeLineaCrlf() throws Exception {
+        String diff = "@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n";
+        assertEquals("a\r\nB\r\nc\r\n", UnifiedDiff.apply("a\r\nb\r\nc\r\n", diff));
+    }
+
+    @Test
+    void insercionPuraDespuesDeLaLineaIndicada() throws Exception {
+        String diff = "@@ -2,0 +3 @@\n+insertada\n";
+        assertEquals("a\nb\ninsertada\nc\n", UnifiedDiff.apply("a\nb\nc\n", diff));
+    }
+
+    @Test
+    void lineaVaciaDentroDelFragmentoEsContexto() throws Exception {
+        String diff = "@@ -1,3 +1,3 @@\n a\n\n-b\n+B\n";
+        assertEquals("a\n\nB\n", UnifiedDiff.apply("a\n\nb\n", diff));
+    }
+
+    @Test
+    void ignoraCabecerasDeArchivoYBloquesDeCodigo() throws Exception {
+        String diff = "Este es el parche:\n```diff\n--- a/App.java\n+++ b/App.java\n@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n```\n";
+        assertEquals("a\nB\nc\n", UnifiedDiff.apply("a\nb\nc\n", diff));
+    }
+
+    @Test
+    void fragmentoQueNoCoincideInvalidaElParche() {
+        String diff = "@@ -1,3 +1,3 @@\n a\n-b\n+B\n c\n@@ -3 +3 @@\n-zzz\n+y\n";
+        assertThrows(UnifiedDiff.PatchException.class, () -> UnifiedDiff.apply("a\nb\nc\n", diff));
+    }
+
+    @Test
+    void respuestaSinFragmentosNoEsUnParche() {
+        assertThrows(UnifiedDiff.PatchException.class, () -> UnifiedDiff.apply("a\n", "Aquí está el archivo corregido."));
+        assertThrows(UnifiedDiff.PatchException.class, () -> UnifiedDiff.apply("a\n", ""));
+    }
+
+    @Test
+    void lineaNoValidaEnUnFragmento() {
+        String diff = "@@ -1,2 +1,2 @@\n a\n*b\n";
+        assertThrows(UnifiedDiff.PatchException.class, () -> UnifiedDiff.apply("a\nb\n", diff));
+    }
+}
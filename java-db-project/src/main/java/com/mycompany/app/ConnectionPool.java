@@ -0,0 +1,111 @@
+package com.mycompany.app;
+
+import java.sql.Connection;
+import java.sql.DriverManager;
+import java.sql.SQLException;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.BlockingQueue;
+
+/**
+ * Pool pequeño y de tamaño fijo de conexiones JDBC.
+ * Las conexiones se abren al crear el pool y se reutilizan entre cargas; si una conexión
+ * se cierra o deja de ser válida, se reabre al prestarla.
+ */
+public class ConnectionPool implements AutoCloseable {
+
+    private static final int VALIDATION_TIMEOUT_SECONDS = 2;
+
+    private final String url;
+    private final String username;
+    private final String password;
+    private final BlockingQueue<Connection> idle;
+    private final List<Connection> all = new ArrayList<>();
+
+    public ConnectionPool(String url, String username, String password, int size) throws SQLException {
+        this.url = url;
+        this.username = username;
+        this.password = password;
+        int poolSize = Math.max(1, size);
+        this.idle = new ArrayBlockingQueue<>(poolSize);
+        try {
+            for (int i = 0; i < poolSize; i++) {
+                Connection connection = open();
+                all.add(connection);
+                idle.add(connection);
+            }
+        } catch (SQLException e) {
+            close();
+            throw e;
+        }
+        System.out.println("[DB] Pool de conexiones creado con " + poolSize + " conexiones.");
+    }
+
+    private Connection open() throws SQLException {
+        return DriverManager.getConnection(url, username, password);
+    }
+
+    public int size() {
+        synchronized (all) {
+            return all.size();
+        }
+    }
+
+    /**
+     * Toma una conexión libre, esperando si todas están en uso.
+     */
+    public Connection borrow() throws SQLException, InterruptedException {
+        Connection connection = idle.take();
+        try {
+            if (connection.isClosed() || !connection.isValid(VALIDATION_TIMEOUT_SECONDS)) {
+                Connection replacement = open();
+                synchronized (all) {
+                    all.remove(connection);
+                    all.add(replacement);
+                }
+                // La conexión no válida puede seguir abierta en el driver: se libera antes de reemplazarla
+                try {
+                    connection.close();
+                } catch (SQLException e) {
+                    System.err.println("[ERROR] Error al cerrar una conexión no válida del pool: " + e.getMessage());
+                }
+                connection = replacement;
+            }
+            return connection;
+        } catch (SQLException e) {
+            // La conexión no se pudo reponer: se devuelve al pool para no reducir su tamaño
+            idle.offer(connection);
+            throw e;
+        }
+    }
+
+    /**
+     * Devuelve una conexión al pool restaurando el modo auto-commit.
+     */
+    public void release(Connection connection) {
+        try {
+            if (!connection.isClosed() && !connection.getAutoCommit()) {
+                connection.setAutoCommit(true);
+            }
+        } catch (SQLException e) {
+            System.err.println("[ERROR] No se pudo restaurar la conexión del pool: " + e.getMessage());
+        }
+        idle.offer(connection);
+    }
+
+    @Override
+    public void close() {
+        synchronized (all) {
+            for (Connection connection : all) {
+                try {
+                    connection.close();
+                } catch (SQLException e) {
+                    System.err.println("[ERROR] Error al cerrar una conexión del pool: " + e.getMessage());
+                }
+            }
+            all.clear();
+        }
+        idle.clear();
+    }
+}
@@ -1,11 +1,14 @@
 package com.mycompany.app;
 
 import java.io.IOException;
+import java.io.UncheckedIOException;
 import java.nio.file.Files;
+import java.nio.file.Path;
 import java.nio.file.Paths;
 import java.sql.Connection;
 import java.sql.SQLException;
 import java.util.ArrayList;
+import java.util.Iterator;
 import java.util.List;
 import java.util.Map;
 import java.util.HashMap;
@@ -20,6 +23,12 @@ import com.mycompany.app.Perfil;
  */
 public class Controller {
 
+    // Expresiones compiladas una sola vez (antes se compilaban en cada bloque/perfil)
+    static final Pattern PROFILE_PATTERN = Pattern.compile("\\{[^{}]+\\}");
+    static final Pattern FIELD_PATTERN = Pattern.compile("\"([^\"]+)\"\\s*:\\s*(\\[[^\\]]*\\]|\"[^\"]*\"|\\w+)");
+    private static final Pattern NON_ALPHANUMERIC = Pattern.compile("[^a-zA-Z0-9\\s]");
+    private static final Pattern WHITESPACE = Pattern.compile("\\s+");
+
     private final Database repository;
     private Connection connection;
 
@@ -28,38 +37,53 @@ public class Controller {
     }
 
     /**
-     * Lee el archivo JSON y simula el parseo para extraer los perfiles.
+     * Lee el archivo JSON y extrae los perfiles con el lector incremental {@link PerfilJsonReader}.
+     * Para archivos grandes es preferible {@link #openProfiles(String)}, que no los carga en una lista.
      */
     public List<Perfil> readFile(String filePath) {
+        List<Perfil> perfiles = new ArrayList<>();
+        try (PerfilJsonReader reader = openProfiles(filePath)) {
+            reader.forEachRemaining(perfiles::add);
+            System.out.println("[DATA] Perfiles extraídos exitosamente. Total: " + perfiles.size());
+            return perfiles;
+        } catch (IOException | UncheckedIOException e) {
+            System.err.println("[ERROR] No se pudo leer el archivo: " + e.getMessage());
+            return new ArrayList<>();
+        }
+    }
+
+    /**
+     * Abre un lector incremental de perfiles sobre el archivo JSON; si no existe, se busca
+     * en la ruta alternativa del proyecto (src/main/java/resources/).
+     */
+    public PerfilJsonReader openProfiles(String filePath) throws IOException {
+        Path path = Paths.get(filePath);
+        Path alternative = Paths.get("src/main/java/resources/" + filePath);
+        if (!Files.exists(path) && Files.exists(alternative)) {
+            path = alternative;
+            System.out.println("[FILE] Se usa la ruta alternativa: " + path);
+        }
+        PerfilJsonReader reader = PerfilJsonReader.open(path);
+        System.out.println("[FILE] Archivo '" + path + "' abierto para lectura incremental.");
+        return reader;
+    }
+
+    /**
+     * Parseo original: carga el archivo completo y lo recorre con expresiones regulares.
+     * No admite objetos anidados; se conserva como referencia para el benchmark del lector incremental.
+     * @deprecated Usar {@link #readFile(String)} u {@link #openProfiles(String)}.
+     */
+    @Deprecated
+    public List<Perfil> readFileRegex(String filePath) {
         List<Perfil> perfiles = new ArrayList<>();
         try {
             String jsonContent = new String(Files.readAllBytes(Paths.get(filePath))); 
             System.out.println("[FILE] Archivo '" + filePath + "' leído con éxito.");
-            Pattern profilePattern = Pattern.compile("\\{[^{}]+\\}");
-            Matcher profileMatcher = profilePattern.matcher(jsonContent);
+            Matcher profileMatcher = PROFILE_PATTERN.matcher(jsonContent);
+            Matcher fieldMatcher = FIELD_PATTERN.matcher("");
 
             while (profileMatcher.find()) {
-                String profileBlock = profileMatcher.group();
-                Map<String, String> data = new HashMap<>();
-
-                Pattern fieldPattern = Pattern.compile("\"([^\"]+)\"\\s*:\\s*(\\[[^\\]]*\\]|\"[^\"]*\"|\\w+)");
-                Matcher fieldMatcher = fieldPattern.matcher(profileBlock);
-
-                while (fieldMatcher.find()) {
-                    String key = fieldMatcher.group(1).trim();
-                    String value = fieldMatcher.group(2).trim();
-                    if (value.startsWith("\"") && value.endsWith("\"")) {
-                        value = value.substring(1, value.length() - 1);
-                    }
-                    data.put(key, value);
-                }
-
-                String cargo = data.getOrDefault("cargo", "N/A");
-                String nivel = data.getOrDefault("nivel_recomendado", "N/A");
-                String rol = data.getOrDefault("rol_principal", "N/A");
-                String herramientas = data.getOrDefault("herramientas_clave", "[]").replace('[', '(').replace(']', ')');
-                boolean fundamental = Boolean.parseBoolean(data.getOrDefault("es_fundamental", "false"));
-                perfiles.add(new Perfil(cargo, nivel, rol, herramientas, fundamental));
+                perfiles.add(parseProfile(profileMatcher.group(), fieldMatcher));
             }
             System.out.println("[DATA] Perfiles extraídos exitosamente. Total: " + perfiles.size());
             return perfiles;
@@ -76,6 +100,40 @@ public class Controller {
         }
     }
 
+    /**
+     * Convierte un bloque JSON de perfil en un {@link Perfil}.
+     * @param fieldMatcher Matcher de {@link #FIELD_PATTERN} reutilizado entre bloques.
+     */
+    static Perfil parseProfile(String profileBlock, Matcher fieldMatcher) {
+        Map<String, String> data = new HashMap<>();
+        fieldMatcher.reset(profileBlock);
+
+        while (fieldMatcher.find()) {
+            String key = fieldMatcher.group(1).trim();
+            String value = fieldMatcher.group(2).trim();
+            if (value.startsWith("\"") && value.endsWith("\"")) {
+                value = value.substring(1, value.length() - 1);
+            }
+            data.put(key, value);
+        }
+
+        String cargo = data.getOrDefault("cargo", "N/A");
+        String nivel = data.getOrDefault("nivel_recomendado", "N/A");
+        String rol = data.getOrDefault("rol_principal", "N/A");
+        String herramientas = data.getOrDefault("herramientas_clave", "[]").replace('[', '(').replace(']', ')');
+        boolean fundamental = Boolean.parseBoolean(data.getOrDefault("es_fundamental", "false"));
+        return new Perfil(cargo, nivel, rol, herramientas, fundamental);
+    }
+
+    /**
+     * Limpia la lista de herramientas para la columna herramientas_clave:
+     * solo letras, dígitos y espacios simples.
+     */
+    static String normalizeTools(String herramientas) {
+        String sinEspeciales = NON_ALPHANUMERIC.matcher(herramientas).replaceAll(" ").trim();
+        return WHITESPACE.matcher(sinEspeciales).replaceAll(" ");
+    }
+
     /**
      * Configura, **crea la base de datos si es necesario** y establece la conexión real.
      * @return true si la conexión fue exitosa, false si falló.
@@ -104,6 +162,21 @@ public class Controller {
         }
     }
     
+    /**
+     * Configura una URL JDBC arbitraria (sin crear la base de datos) y establece la conexión.
+     * @return true si la conexión fue exitosa, false si falló.
+     */
+    public boolean databaseConfigUrl(String jdbcUrl, String username, String password) {
+        repository.configUrl(jdbcUrl, username, password);
+        try {
+            this.connection = repository.getConnection();
+            return true;
+        } catch (SQLException e) {
+            System.err.println("[CRÍTICO] ERROR DE CONEXIÓN JDBC a " + jdbcUrl + ": " + e.getMessage());
+            return false;
+        }
+    }
+
     /**
      * Genera y ejecuta el SQL para crear la tabla usando snake_case.
      */
@@ -135,9 +208,7 @@ public class Controller {
         int count = 0;
         for (Perfil p : perfiles) {
             String rolClean = p.rolPrincipal.replace("'", "''"); 
-            String herramientasClean = p.herramientasClave.replace("'", "''");
-            String herramientasSinEspeciales = herramientasClean.replaceAll("[^a-zA-Z0-9\\s]", " ").trim();
-            herramientasSinEspeciales = herramientasSinEspeciales.replaceAll("\\s+", " ");
+            String herramientasSinEspeciales = normalizeTools(p.herramientasClave);
             String sql = String.format(
                 "INSERT INTO perfiles_tecnicos (cargo, nivel_recomendado, rol_principal, herramientas_clave, es_fundamental) " +
                 "VALUES ('%s', '%s', '%s', '%s', %s);",
@@ -153,6 +224,45 @@ public class Controller {
         System.out.println("[DB] Se han generado y ejecutado " + count + " sentencias INSERT.");
     }
 
+    /**
+     * Inserta los perfiles en bloque: sentencia preparada con batching JDBC, commits cada
+     * {@code commitEvery} filas y un pool de {@code poolSize} conexiones.
+     * Si la carga falla, las filas ya confirmadas siguen en la tabla y se informa de cuántas son.
+     * @return Número de filas insertadas, o -1 si la carga falló.
+     */
+    public int databaseBulkInsert(String dbType, List<Perfil> perfiles, int batchSize, int commitEvery, int poolSize) {
+        return databaseBulkInsert(dbType, perfiles.iterator(), batchSize, commitEvery, poolSize);
+    }
+
+    /**
+     * Igual que {@link #databaseBulkInsert(String, List, int, int, int)}, pero consumiendo los perfiles
+     * a medida que se leen (p. ej. de {@link #openProfiles(String)}), sin cargarlos todos en memoria.
+     */
+    public int databaseBulkInsert(String dbType, Iterator<Perfil> perfiles, int batchSize, int commitEvery, int poolSize) {
+        if (connection == null) return -1;
+        if (!"mysql".equalsIgnoreCase(dbType)) return -1;
+        System.out.println("\n[DB] Carga masiva de perfiles (lote: " + batchSize
+                + ", commit cada: " + commitEvery + ", conexiones: " + poolSize + ")");
+        repository.logSqlToFile("-- Carga masiva con sentencia preparada:\n" + PerfilBulkLoader.INSERT_SQL + ";");
+
+        long start = System.nanoTime();
+        try (ConnectionPool pool = repository.createPool(poolSize)) {
+            int inserted = new PerfilBulkLoader(pool, batchSize, commitEvery).load(perfiles);
+            double seconds = (System.nanoTime() - start) / 1e9;
+            System.out.println(String.format("[DB] Se han insertado %d filas en %.2f s (%.0f filas/s).",
+                    inserted, seconds, inserted / Math.max(seconds, 1e-9)));
+            return inserted;
+        } catch (PerfilBulkLoader.BulkLoadException e) {
+            System.err.println("[ERROR] Fallo en la carga masiva. Detalle: " + e.getMessage());
+            System.err.println("[ERROR] La carga es parcial: " + e.getCommitted()
+                    + " filas se confirmaron antes del error y siguen en perfiles_tecnicos.");
+            return -1;
+        } catch (SQLException | UncheckedIOException e) {
+            System.err.println("[ERROR] Fallo en la carga masiva. Detalle: " + e.getMessage());
+            return -1;
+        }
+    }
+
     /**
      * Cierra la conexión de la base de datos.
      */
@@ -27,10 +27,14 @@ public class Database {
         this.host = host;
         this.username = user;
         this.password = pass;
-        this.databaseUrl = "jdbc:mysql://" + host + ":3306/" + dbName + "?useSSL=false&allowPublicKeyRetrieval=true&serverTimezone=UTC";
+        // rewriteBatchedStatements: el driver envía cada lote de la carga masiva como un único INSERT multi-fila
+        this.databaseUrl = "jdbc:mysql://" + host + ":3306/" + dbName + "?useSSL=false&allowPublicKeyRetrieval=true&serverTimezone=UTC&rewriteBatchedStatements=true";
         this.isConfigured = true;
         System.out.println("\n[DB] Configuración de la base de datos MySQL (JDBC REAL) completada. DB: " + dbName);
+        initSqlLog();
+    }
 
+    private void initSqlLog() {
         try {
             Files.createDirectories(Paths.get("sql_output"));
             Files.write(Paths.get(SQL_LOG_PATH), ("-- Archivo de log SQL generado el " + new java.util.Date() + " --\n\n").getBytes(), StandardOpenOption.CREATE, StandardOpenOption.TRUNCATE_EXISTING);
@@ -40,6 +44,30 @@ public class Database {
         }
     }
 
+    /**
+     * Configura una URL JDBC arbitraria (p. ej. una base de datos embebida para pruebas y benchmarks).
+     * No crea la base de datos: se asume que la URL ya apunta a una existente.
+     */
+    public void configUrl(String jdbcUrl, String user, String pass) {
+        this.databaseUrl = jdbcUrl;
+        this.username = user;
+        this.password = pass;
+        this.dbName = jdbcUrl;
+        this.isConfigured = true;
+        System.out.println("\n[DB] Configuración JDBC completada. URL: " + jdbcUrl);
+        initSqlLog();
+    }
+
+    /**
+     * Crea un pool de conexiones con la configuración actual.
+     */
+    public ConnectionPool createPool(int size) throws SQLException {
+        if (!isConfigured) {
+            throw new IllegalStateException("La base de datos no ha sido configurada.");
+        }
+        return new ConnectionPool(databaseUrl, username, password, size);
+    }
+
     /**
      * Intenta conectarse al servidor y crear la base de datos si no existe.
      */
@@ -94,7 +122,7 @@ public class Database {
     /**
      * Método auxiliar para guardar el SQL
      */
-    private void logSqlToFile(String sql) {
+    void logSqlToFile(String sql) {
         try {
             Files.write(Paths.get(SQL_LOG_PATH), (sql + "\n\n").getBytes(), StandardOpenOption.APPEND);
             System.out.println("[FILE] Comando SQL guardado en: " + SQL_LOG_PATH);
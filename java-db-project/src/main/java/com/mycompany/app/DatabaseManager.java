@@ -1,8 +1,12 @@
 // ===== Archivo: src\main\java\com\mycompany\app\DatabaseManager.java (CORRECCIÓN) =====
 package com.mycompany.app;
 
+import java.io.IOException;
+import java.util.Collections;
 import java.util.List;
 
+import com.myproject.core.CliOptions;
+
 // --- Imports de clases del mismo paquete (NECESARIO) ---
 import com.mycompany.app.Database;
 import com.mycompany.app.Controller;
@@ -14,8 +18,11 @@ import com.mycompany.app.Perfil;
 public class DatabaseManager {
     
     public static void main(String[] args) {
+        // Opciones: [archivo.json] [--bulk] [--batch-size=N] [--commit-every=N] [--pool-size=N]
+        CliOptions options = CliOptions.parse(args);
+
         // En un proyecto Maven/IDE, el archivo data.json debe estar en la raíz
-        final String filePath = "data.json"; 
+        final String filePath = options.positionalCount() > 0 ? options.positional(0) : "data.json";
 
         // Parámetros de conexión REALES
         final String HOSTNAME = "localhost";
@@ -30,6 +37,30 @@ public class DatabaseManager {
         Database database = new Database();
         Controller controller = new Controller(database);
         
+        if (options.getBoolean("bulk")) {
+            // Carga masiva: los perfiles pasan del lector incremental a los lotes de inserción
+            // sin cargarse en memoria, sea cual sea el tamaño del archivo
+            if (controller.databaseConfig(DBNAME, HOSTNAME, USER, PASSWORD)) {
+                try (PerfilJsonReader perfiles = controller.openProfiles(filePath)) {
+                    controller.databaseCreate("mysql", Collections.emptyList());
+                    int inserted = controller.databaseBulkInsert("mysql", perfiles,
+                            options.getInt("batch-size", PerfilBulkLoader.DEFAULT_BATCH_SIZE),
+                            options.getInt("commit-every", PerfilBulkLoader.DEFAULT_COMMIT_EVERY),
+                            options.getInt("pool-size", PerfilBulkLoader.DEFAULT_POOL_SIZE));
+                    if (inserted == 0) System.out.println("[INFO] No se encontraron perfiles para insertar.");
+                    if (inserted < 0) {
+                        System.err.println("[ERROR] La carga masiva no terminó y la tabla puede contener una carga parcial;"
+                                + " al repetirla la tabla se vuelve a crear.");
+                    }
+                } catch (IOException e) {
+                    System.err.println("[ERROR] No se pudo leer el archivo: " + e.getMessage());
+                }
+            }
+            controller.databaseClose();
+            System.out.println("--- FIN DEL FLUJO ---");
+            return;
+        }
+
         // 1. Lectura del archivo JSON
         List<Perfil> perfilesArray = controller.readFile(filePath);
 
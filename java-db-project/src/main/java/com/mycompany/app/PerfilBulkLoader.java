@@ -0,0 +1,234 @@
+package com.mycompany.app;
+
+import java.io.UncheckedIOException;
+import java.sql.Connection;
+import java.sql.PreparedStatement;
+import java.sql.SQLException;
+import java.util.ArrayList;
+import java.util.Iterator;
+import java.util.List;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+
+/**
+ * Carga masiva de perfiles: sentencia preparada con batching JDBC y commits cada N filas.
+ * Los perfiles se consumen de un iterador (p. ej. {@link PerfilJsonReader}) y se agrupan en lotes;
+ * si el pool tiene varias conexiones, los lotes se reparten entre ellas a través de una cola acotada,
+ * de modo que en memoria solo hay unos pocos lotes a la vez. En ese caso cada conexión usa su propia
+ * transacción y los id autoincrementales no siguen necesariamente el orden del archivo.
+ * Como se confirma cada {@code commitEvery} filas, una carga que falla puede dejar en la tabla los lotes
+ * ya confirmados; {@link BulkLoadException#getCommitted()} indica cuántas filas son.
+ */
+public class PerfilBulkLoader {
+
+    static final String INSERT_SQL =
+        "INSERT INTO perfiles_tecnicos (cargo, nivel_recomendado, rol_principal, herramientas_clave, es_fundamental) " +
+        "VALUES (?, ?, ?, ?, ?)";
+
+    public static final int DEFAULT_BATCH_SIZE = 500;
+    public static final int DEFAULT_COMMIT_EVERY = 5000;
+    public static final int DEFAULT_POOL_SIZE = 4;
+
+    /** Marca de fin de la cola de lotes (se compara por identidad). */
+    private static final List<Perfil> END = new ArrayList<>();
+    private static final long OFFER_TIMEOUT_MS = 100;
+
+    private final ConnectionPool pool;
+    private final int batchSize;
+    private final int commitEvery;
+
+    /**
+     * La carga falló. Las filas confirmadas antes del error (en cualquiera de las conexiones) siguen en la tabla.
+     */
+    public static class BulkLoadException extends SQLException {
+        private final int committed;
+
+        BulkLoadException(Exception cause, int committed) {
+            super(cause.getMessage(), cause);
+            this.committed = committed;
+        }
+
+        /** Filas confirmadas antes del error. */
+        public int getCommitted() {
+            return committed;
+        }
+    }
+
+    public PerfilBulkLoader(ConnectionPool pool, int batchSize, int commitEvery) {
+        this.pool = pool;
+        this.batchSize = Math.max(1, batchSize);
+        this.commitEvery = Math.max(this.batchSize, commitEvery);
+    }
+
+    /**
+     * Inserta todos los perfiles de la lista.
+     * @return Número de filas insertadas.
+     */
+    public int load(List<Perfil> perfiles) throws SQLException {
+        return load(perfiles.iterator());
+    }
+
+    /**
+     * Inserta los perfiles a medida que el iterador los produce.
+     * @return Número de filas insertadas.
+     * @throws BulkLoadException Si la carga falla, con el número de filas que quedaron confirmadas.
+     */
+    public int load(Iterator<Perfil> perfiles) throws SQLException {
+        AtomicInteger committed = new AtomicInteger();
+        try {
+            return pool.size() <= 1 ? loadSequential(perfiles, committed) : loadParallel(perfiles, committed);
+        } catch (SQLException | UncheckedIOException e) {
+            throw new BulkLoadException(e, committed.get());
+        }
+    }
+
+    private int loadParallel(Iterator<Perfil> perfiles, AtomicInteger committed) throws SQLException {
+        int workers = pool.size();
+        BlockingQueue<List<Perfil>> queue = new ArrayBlockingQueue<>(workers * 2);
+        ExecutorService executor = Executors.newFixedThreadPool(workers);
+        try {
+            List<Future<Integer>> results = new ArrayList<>();
+            for (int i = 0; i < workers; i++) {
+                results.add(executor.submit(() -> consume(queue, committed)));
+            }
+
+            List<Perfil> batch = new ArrayList<>(batchSize);
+            while (perfiles.hasNext()) {
+                batch.add(perfiles.next());
+                if (batch.size() == batchSize) {
+                    enqueue(queue, batch, results);
+                    batch = new ArrayList<>(batchSize);
+                }
+            }
+            if (!batch.isEmpty()) enqueue(queue, batch, results);
+            for (int i = 0; i < workers; i++) enqueue(queue, END, results);
+
+            int inserted = 0;
+            for (Future<Integer> result : results) inserted += result.get();
+            return inserted;
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Carga masiva interrumpida", e);
+        } catch (ExecutionException e) {
+            if (e.getCause() instanceof SQLException) throw (SQLException) e.getCause();
+            throw new SQLException("Error inesperado en la carga masiva", e.getCause());
+        } finally {
+            executor.shutdownNow();
+        }
+    }
+
+    /**
+     * Encola un lote; mientras la cola está llena comprueba si algún consumidor falló,
+     * para no bloquear al productor indefinidamente.
+     */
+    private static void enqueue(BlockingQueue<List<Perfil>> queue, List<Perfil> batch, List<Future<Integer>> results)
+            throws InterruptedException, ExecutionException {
+        while (!queue.offer(batch, OFFER_TIMEOUT_MS, TimeUnit.MILLISECONDS)) {
+            for (Future<Integer> result : results) {
+                if (result.isDone()) result.get();
+            }
+        }
+    }
+
+    private int loadSequential(Iterator<Perfil> perfiles, AtomicInteger committed) throws SQLException {
+        Connection connection = borrow();
+        try (PreparedStatement statement = connection.prepareStatement(INSERT_SQL)) {
+            connection.setAutoCommit(false);
+            int inserted = 0;
+            int pending = 0;
+            int uncommitted = 0;
+            while (perfiles.hasNext()) {
+                addToBatch(statement, perfiles.next());
+                if (++pending == batchSize) {
+                    statement.executeBatch();
+                    inserted += pending;
+                    uncommitted += pending;
+                    pending = 0;
+                    if (uncommitted >= commitEvery) {
+                        connection.commit();
+                        committed.addAndGet(uncommitted);
+                        uncommitted = 0;
+                    }
+                }
+            }
+            if (pending > 0) {
+                statement.executeBatch();
+                inserted += pending;
+                uncommitted += pending;
+            }
+            connection.commit();
+            committed.addAndGet(uncommitted);
+            return inserted;
+        } catch (SQLException e) {
+            rollback(connection, e);
+            throw e;
+        } finally {
+            pool.release(connection);
+        }
+    }
+
+    private int consume(BlockingQueue<List<Perfil>> queue, AtomicInteger committed) throws SQLException {
+        Connection connection = borrow();
+        try (PreparedStatement statement = connection.prepareStatement(INSERT_SQL)) {
+            connection.setAutoCommit(false);
+            int inserted = 0;
+            int uncommitted = 0;
+            List<Perfil> batch;
+            while ((batch = queue.take()) != END) {
+                for (Perfil p : batch) addToBatch(statement, p);
+                statement.executeBatch();
+                inserted += batch.size();
+                uncommitted += batch.size();
+                if (uncommitted >= commitEvery) {
+                    connection.commit();
+                    committed.addAndGet(uncommitted);
+                    uncommitted = 0;
+                }
+            }
+            connection.commit();
+            committed.addAndGet(uncommitted);
+            return inserted;
+        } catch (SQLException e) {
+            rollback(connection, e);
+            throw e;
+        } catch (InterruptedException e) {
+            SQLException error = new SQLException("Carga masiva interrumpida", e);
+            rollback(connection, error);
+            throw error;
+        } finally {
+            pool.release(connection);
+        }
+    }
+
+    private Connection borrow() throws SQLException {
+        try {
+            return pool.borrow();
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Espera de conexión interrumpida", e);
+        }
+    }
+
+    private static void addToBatch(PreparedStatement statement, Perfil p) throws SQLException {
+        statement.setString(1, p.cargo);
+        statement.setString(2, p.nivelRecomendado);
+        statement.setString(3, p.rolPrincipal);
+        statement.setString(4, Controller.normalizeTools(p.herramientasClave));
+        statement.setBoolean(5, p.esFundamental);
+        statement.addBatch();
+    }
+
+    private static void rollback(Connection connection, SQLException cause) {
+        try {
+            connection.rollback();
+        } catch (SQLException rollbackError) {
+            cause.addSuppressed(rollbackError);
+        }
+    }
+}
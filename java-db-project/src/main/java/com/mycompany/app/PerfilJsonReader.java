@@ -0,0 +1,277 @@
+package com.mycompany.app;
+
+import java.io.Closeable;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.Reader;
+import java.io.UncheckedIOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayDeque;
+import java.util.ArrayList;
+import java.util.Deque;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.NoSuchElementException;
+
+/**
+ * Lector incremental de perfiles desde un JSON.
+ * Recorre el documento carácter a carácter sin cargarlo entero: los objetos y arrays contenedores
+ * (p. ej. el objeto raíz y el array "perfiles") solo se atraviesan, y cada objeto que aparece como
+ * elemento de un array se lee completo y se convierte en un {@link Perfil}. La memoria usada depende
+ * del tamaño de un perfil, no del archivo. Los objetos anidados dentro de un perfil se leen sin error.
+ */
+public class PerfilJsonReader implements Iterator<Perfil>, Closeable {
+
+    private static final int BUFFER_SIZE = 64 * 1024;
+    private static final String[] PROFILE_KEYS = {
+        "cargo", "nivel_recomendado", "rol_principal", "herramientas_clave", "es_fundamental"
+    };
+
+    private final Reader reader;
+    private final char[] buffer = new char[BUFFER_SIZE];
+    private int position;
+    private int limit;
+    private long offset;
+
+    /** Contenedores abiertos que se atraviesan sin materializar: true = array, false = objeto. */
+    private final Deque<Boolean> containers = new ArrayDeque<>();
+    private final StringBuilder text = new StringBuilder();
+    private Perfil next;
+    private boolean finished;
+
+    public PerfilJsonReader(Reader reader) {
+        this.reader = reader;
+    }
+
+    public static PerfilJsonReader open(Path file) throws IOException {
+        return new PerfilJsonReader(new InputStreamReader(Files.newInputStream(file), StandardCharsets.UTF_8));
+    }
+
+    @Override
+    public boolean hasNext() {
+        if (next == null && !finished) {
+            try {
+                next = advance();
+            } catch (IOException e) {
+                throw new UncheckedIOException(e);
+            }
+        }
+        return next != null;
+    }
+
+    @Override
+    public Perfil next() {
+        if (!hasNext()) throw new NoSuchElementException();
+        Perfil perfil = next;
+        next = null;
+        return perfil;
+    }
+
+    @Override
+    public void close() throws IOException {
+        reader.close();
+    }
+
+    /**
+     * Avanza por el documento hasta el siguiente objeto de perfil.
+     * @return El perfil, o null al llegar al final del documento.
+     */
+    private Perfil advance() throws IOException {
+        while (true) {
+            int c = nextSignificant();
+            switch (c) {
+                case -1:
+                    finished = true;
+                    if (!containers.isEmpty()) throw error("fin de archivo inesperado");
+                    return null;
+                case '{':
+                    if (Boolean.TRUE.equals(containers.peek())) {
+                        Perfil perfil = toPerfil(readObject());
+                        if (perfil != null) return perfil;
+                    } else {
+                        containers.push(false);
+                    }
+                    break;
+                case '[':
+                    containers.push(true);
+                    break;
+                case '}':
+                case ']':
+                    if (containers.isEmpty()) throw error("cierre inesperado '" + (char) c + "'");
+                    containers.pop();
+                    break;
+                case '"':
+                    readString();
+                    break;
+                default:
+                    readLiteral(c);
+            }
+        }
+    }
+
+    // ---------------------------------------------------------------
+    // Lectura de valores completos (solo dentro de un perfil)
+    // ---------------------------------------------------------------
+
+    private Object readValue(int first) throws IOException {
+        switch (first) {
+            case '{': return readObject();
+            case '[': return readArray();
+            case '"': return readString();
+            case -1: throw error("fin de archivo inesperado");
+            default: return readLiteral(first);
+        }
+    }
+
+    private Map<String, Object> readObject() throws IOException {
+        Map<String, Object> object = new LinkedHashMap<>();
+        while (true) {
+            int c = nextSignificant();
+            if (c == '}') return object;
+            if (c != '"') throw error("se esperaba una clave o '}'");
+            String key = readString();
+            object.put(key, readValue(nextSignificant()));
+        }
+    }
+
+    private List<Object> readArray() throws IOException {
+        List<Object> array = new ArrayList<>();
+        while (true) {
+            int c = nextSignificant();
+            if (c == ']') return array;
+            array.add(readValue(c));
+        }
+    }
+
+    private String readString() throws IOException {
+        text.setLength(0);
+        while (true) {
+            int c = read();
+            if (c == -1) throw error("cadena sin cerrar");
+            if (c == '"') return text.toString();
+            if (c != '\\') {
+                text.append((char) c);
+                continue;
+            }
+            int escaped = read();
+            switch (escaped) {
+                case 'n': text.append('\n'); break;
+                case 'r': text.append('\r'); break;
+                case 't': text.append('\t'); break;
+                case 'b': text.append('\b'); break;
+                case 'f': text.append('\f'); break;
+                case 'u':
+                    int code = 0;
+                    for (int i = 0; i < 4; i++) {
+                        int digit = Character.digit(read(), 16);
+                        if (digit < 0) throw error("secuencia \\u inválida");
+                        code = code * 16 + digit;
+                    }
+                    text.append((char) code);
+                    break;
+                case -1: throw error("cadena sin cerrar");
+                default: text.append((char) escaped); // \" \\ \/
+            }
+        }
+    }
+
+    /**
+     * Lee un literal (número, true, false o null) hasta el siguiente delimitador.
+     */
+    private String readLiteral(int first) throws IOException {
+        text.setLength(0);
+        text.append((char) first);
+        int c;
+        while ((c = peek()) != -1 && !isDelimiter(c)) {
+            text.append((char) read());
+        }
+        return text.toString();
+    }
+
+    private static boolean isDelimiter(int c) {
+        return c == ',' || c == ':' || c == '}' || c == ']' || c == '"' || Character.isWhitespace(c);
+    }
+
+    /**
+     * Siguiente carácter significativo: omite espacios y los separadores ',' y ':'.
+     */
+    private int nextSignificant() throws IOException {
+        int c;
+        do {
+            c = read();
+        } while (c != -1 && (c == ',' || c == ':' || Character.isWhitespace(c)));
+        return c;
+    }
+
+    private int peek() throws IOException {
+        if (position == limit) {
+            limit = reader.read(buffer, 0, buffer.length);
+            position = 0;
+            if (limit <= 0) {
+                limit = 0;
+                return -1;
+            }
+        }
+        return buffer[position];
+    }
+
+    private int read() throws IOException {
+        int c = peek();
+        if (c != -1) {
+            position++;
+            offset++;
+        }
+        return c;
+    }
+
+    private IOException error(String message) {
+        return new IOException("JSON inválido en el carácter " + offset + ": " + message);
+    }
+
+    // ---------------------------------------------------------------
+    // Conversión a Perfil (mismos valores por defecto que el parseo original)
+    // ---------------------------------------------------------------
+
+    private static Perfil toPerfil(Map<String, Object> data) {
+        boolean isProfile = false;
+        for (String key : PROFILE_KEYS) {
+            if (data.containsKey(key)) {
+                isProfile = true;
+                break;
+            }
+        }
+        if (!isProfile) return null;
+
+        String cargo = asText(data.get("cargo"), "N/A");
+        String nivel = asText(data.get("nivel_recomendado"), "N/A");
+        String rol = asText(data.get("rol_principal"), "N/A");
+        String herramientas = toolsText(data.get("herramientas_clave"));
+        boolean fundamental = Boolean.parseBoolean(asText(data.get("es_fundamental"), "false"));
+        return new Perfil(cargo, nivel, rol, herramientas, fundamental);
+    }
+
+    private static String asText(Object value, String defaultValue) {
+        return value instanceof String ? (String) value : defaultValue;
+    }
+
+    /**
+     * Representa la lista de herramientas como {@code ("a", "b")}, el formato que producía el parseo original.
+     */
+    private static String toolsText(Object value) {
+        if (value instanceof String) return (String) value;
+        StringBuilder tools = new StringBuilder("(");
+        if (value instanceof List) {
+            boolean first = true;
+            for (Object item : (List<?>) value) {
+                if (!first) tools.append(", ");
+                first = false;
+                tools.append('"').append(item).append('"');
+            }
+        }
+        return tools.append(')').toString();
+    }
+}
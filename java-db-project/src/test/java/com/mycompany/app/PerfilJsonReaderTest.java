@@ -0,0 +1,108 @@
+package com.mycompany.app;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+import java.io.StringReader;
+import java.io.UncheckedIOException;
+import java.util.ArrayList;
+import java.util.List;
+import org.junit.jupiter.api.Test;
+
+/**
+ * Pruebas del lector incremental de perfiles.
+ */
+class PerfilJsonReaderTest {
+
+    private static List<Perfil> readAll(String json) {
+        List<Perfil> perfiles = new ArrayList<>();
+        new PerfilJsonReader(new StringReader(json)).forEachRemaining(perfiles::add);
+        return perfiles;
+    }
+
+    @Test
+    void leeLosCamposDeUnPerfil() {
+        List<Perfil> perfiles = readAll("{\"perfiles\": [{\"cargo\": \"Backend\", \"nivel_recomendado\": \"Senior\","
+                + " \"rol_principal\": \"APIs\", \"herramientas_clave\": [\"Java\", \"SQL\"], \"es_fundamental\": true}]}");
+        assertEquals(1, perfiles.size());
+        Perfil perfil = perfiles.get(0);
+        assertEquals("Backend", perfil.cargo);
+        assertEquals("Senior", perfil.nivelRecomendado);
+        assertEquals("APIs", perfil.rolPrincipal);
+        assertEquals("(\"Java\", \"SQL\")", perfil.herramientasClave);
+        assertTrue(perfil.esFundamental);
+    }
+
+    @Test
+    void camposAusentesTomanLosValoresPorDefecto() {
+        Perfil perfil = readAll("{\"perfiles\":[{\"cargo\":\"QA\"}]}").get(0);
+        assertEquals("N/A", perfil.nivelRecomendado);
+        assertEquals("N/A", perfil.rolPrincipal);
+        assertEquals("()", perfil.herramientasClave);
+        assertFalse(perfil.esFundamental);
+    }
+
+    @Test
+    void decodificaLasSecuenciasDeEscape() {
+        Perfil perfil = readAll("{\"perfiles\":[{\"cargo\":\"Ingenier\\u00eda de datos\","
+                + " \"rol_principal\":\"Dise\\u00F1o \\\"API\\\"\\tde\\\\servicios\\/web\\n\"}]}").get(0);
+        assertEquals("Ingeniería de datos", perfil.cargo);
+        assertEquals("Diseño \"API\"\tde\\servicios/web\n", perfil.rolPrincipal);
+    }
+
+    @Test
+    void secuenciaUnicodeInvalidaEsUnError() {
+        assertThrows(UncheckedIOException.class, () -> readAll("{\"perfiles\":[{\"cargo\":\"\\u00zz\"}]}"));
+    }
+
+    @Test
+    void losObjetosAnidadosNoSonPerfiles() {
+        List<Perfil> perfiles = readAll("{\"version\": 2, \"meta\": {\"autor\": \"x\", \"etiquetas\": [\"a\", {\"b\": null}]},"
+                + " \"perfiles\": [{\"cargo\": \"A\", \"detalles\": {\"equipo\": {\"tam\": 5}, \"extra\": [{\"cargo\": \"interno\"}]}},"
+                + " {\"otro\": 1}, {\"cargo\": \"B\"}]}");
+        assertEquals(2, perfiles.size());
+        assertEquals("A", perfiles.get(0).cargo);
+        assertEquals("B", perfiles.get(1).cargo);
+    }
+
+    @Test
+    void arrayDePerfilesVacio() {
+        assertTrue(readAll("{\"perfiles\": []}").isEmpty());
+        assertTrue(readAll("{}").isEmpty());
+    }
+
+    @Test
+    void entradaTruncadaEsUnError() {
+        assertThrows(UncheckedIOException.class, () -> readAll("{\"perfiles\":[{\"cargo\":\"A\"}"));
+        assertThrows(UncheckedIOException.class, () -> readAll("{\"perfiles\":[{\"cargo\":\"A\"},{\"cargo\":\"B\""));
+        assertThrows(UncheckedIOException.class, () -> readAll("{\"perfiles\":[{\"cargo\":\"A"));
+    }
+
+    @Test
+    void losPerfilesLeidosAntesDelErrorSeEntregan() {
+        PerfilJsonReader reader = new PerfilJsonReader(new StringReader("{\"perfiles\":[{\"cargo\":\"A\"},{\"cargo\":"));
+        assertEquals("A", reader.next().cargo);
+        assertThrows(UncheckedIOException.class, reader::hasNext);
+    }
+
+    @Test
+    void cierreInesperadoEsUnError() {
+        assertThrows(UncheckedIOException.class, () -> readAll("{\"perfiles\":[]}]"));
+    }
+
+    @Test
+    void leeDocumentosMayoresQueElBufer() {
+        StringBuilder json = new StringBuilder("{\"perfiles\":[");
+        int count = 5000;
+        for (int i = 0; i < count; i++) {
+            if (i > 0) json.append(',');
+            json.append("{\"cargo\":\"Cargo ").append(i).append(" \\u00e1\",\"herramientas_clave\":[\"Git\"],\"es_fundamental\":false}");
+        }
+        json.append("]}");
+        List<Perfil> perfiles = readAll(json.toString());
+        assertEquals(count, perfiles.size());
+        assertEquals("Cargo " + (count - 1) + " á", perfiles.get(count - 1).cargo);
+    }
+}
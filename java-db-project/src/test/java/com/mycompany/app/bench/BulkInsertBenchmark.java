@@ -0,0 +1,114 @@
+package com.mycompany.app.bench;
+
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.sql.Connection;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Statement;
+import java.util.ArrayList;
+import java.util.List;
+
+import com.mycompany.app.Controller;
+import com.mycompany.app.Database;
+import com.mycompany.app.Perfil;
+import com.mycompany.app.PerfilBulkLoader;
+import com.myproject.core.CliOptions;
+
+/**
+ * Benchmark de inserción de perfiles: compara la inserción fila a fila ({@code databaseInsert})
+ * con la carga masiva en lotes ({@code databaseBulkInsert}) sobre la misma base de datos.
+ * Por defecto usa una base H2 en memoria en modo MySQL como sustituta del servidor real;
+ * con {@code --url} puede apuntarse a un MySQL local.
+ *
+ * Uso (desde java-db-project): mvn test-compile exec:java@bench -Dbench.main=com.mycompany.app.bench.BulkInsertBenchmark
+ *      -Dexec.args="[--rows=N] [--batch-size=N] [--commit-every=N] [--pool-size=N] [--url=JDBC] [--user=U] [--password=P] [--skip-baseline]"
+ */
+public class BulkInsertBenchmark {
+
+    static final String DEFAULT_URL = "jdbc:h2:mem:perfiles_bench;MODE=MySQL;DB_CLOSE_DELAY=-1";
+    private static final String[] LEVELS = {"Senior", "Mid", "Junior", "Senior/Mid/Junior"};
+
+    /**
+     * Genera perfiles sintéticos con textos de longitud similar a los de data.json
+     * (incluye apóstrofos para ejercitar el escape de la ruta fila a fila).
+     */
+    static List<Perfil> generate(int rows) {
+        List<Perfil> perfiles = new ArrayList<>(rows);
+        for (int i = 0; i < rows; i++) {
+            perfiles.add(new Perfil(
+                "Desarrollador " + i,
+                LEVELS[i % LEVELS.length],
+                "Responsable del módulo " + i + ": diseño de APIs REST, integración con la base de datos y revisión de código del equipo's backlog.",
+                "(\"Java 17\", \"Spring Boot\", \"Maven\", \"JUnit 5\", \"Docker\")",
+                i % 2 == 0
+            ));
+        }
+        return perfiles;
+    }
+
+    private static long countRows(Database database) throws SQLException {
+        Connection connection = database.getConnection();
+        try (Statement statement = connection.createStatement();
+             ResultSet result = statement.executeQuery("SELECT COUNT(*) FROM perfiles_tecnicos")) {
+            result.next();
+            return result.getLong(1);
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        int rows = options.getInt("rows", 10_000);
+        int batchSize = options.getInt("batch-size", PerfilBulkLoader.DEFAULT_BATCH_SIZE);
+        int commitEvery = options.getInt("commit-every", PerfilBulkLoader.DEFAULT_COMMIT_EVERY);
+        int poolSize = options.getInt("pool-size", PerfilBulkLoader.DEFAULT_POOL_SIZE);
+        String url = options.get("url", DEFAULT_URL);
+
+        List<Perfil> perfiles = generate(rows);
+        Database database = new Database();
+        Controller controller = new Controller(database);
+        if (!controller.databaseConfigUrl(url, options.get("user", "sa"), options.get("password", ""))) {
+            System.exit(1);
+            return;
+        }
+
+        PrintStream console = System.out;
+        // La salida por consola de cada sentencia se descarta para medir solo la inserción
+        PrintStream quiet = new PrintStream(OutputStream.nullOutputStream());
+        console.println("⚙️  Benchmark de inserción: " + rows + " perfiles en " + url);
+
+        try {
+            if (!options.getBoolean("skip-baseline")) {
+                System.setOut(quiet);
+                controller.databaseCreate("mysql", perfiles);
+                long start = System.nanoTime();
+                controller.databaseInsert("mysql", perfiles);
+                double seconds = (System.nanoTime() - start) / 1e9;
+                System.setOut(console);
+                report("Fila a fila (Statement + log SQL por fila)", countRows(database), seconds);
+            }
+
+            System.setOut(quiet);
+            controller.databaseCreate("mysql", perfiles);
+            long start = System.nanoTime();
+            int inserted = controller.databaseBulkInsert("mysql", perfiles, batchSize, commitEvery, poolSize);
+            double seconds = (System.nanoTime() - start) / 1e9;
+            System.setOut(console);
+            if (inserted < 0) {
+                System.err.println("❌ ERROR: La carga masiva falló.");
+                System.exit(1);
+                return;
+            }
+            report(String.format("Carga masiva (lote %d, commit cada %d, %d conexiones)", batchSize, commitEvery, poolSize),
+                    countRows(database), seconds);
+        } finally {
+            System.setOut(console);
+            controller.databaseClose();
+        }
+    }
+
+    private static void report(String label, long rows, double seconds) {
+        System.out.println(String.format("✅ %-60s %8d filas en %8.3f s -> %,12.0f filas/s",
+                label, rows, seconds, rows / Math.max(seconds, 1e-9)));
+    }
+}
@@ -0,0 +1,129 @@
+package com.mycompany.app.bench;
+
+import java.io.BufferedWriter;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.lang.management.ManagementFactory;
+import java.lang.management.MemoryPoolMXBean;
+import java.lang.management.MemoryType;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.util.List;
+
+import com.mycompany.app.Controller;
+import com.mycompany.app.Database;
+import com.mycompany.app.Perfil;
+import com.mycompany.app.PerfilJsonReader;
+import com.myproject.core.CliOptions;
+
+/**
+ * Benchmark de lectura de perfiles: genera un JSON con la forma de data.json (por defecto
+ * 1.000.000 de perfiles) y mide el rendimiento y el pico de heap del lector incremental
+ * {@link PerfilJsonReader}. Con {@code --legacy} mide también el parseo original por expresiones
+ * regulares, que carga el archivo entero (solo si no supera {@code --legacy-max-mb}).
+ *
+ * Uso (desde java-db-project): mvn test-compile exec:java@bench -Dbench.main=com.mycompany.app.bench.PerfilParserBenchmark
+ *      -Dexec.args="[--profiles=N] [--file=RUTA] [--keep] [--legacy] [--legacy-max-mb=N]"
+ */
+public class PerfilParserBenchmark {
+
+    private static final int DEFAULT_PROFILES = 1_000_000;
+    private static final int DEFAULT_LEGACY_MAX_MB = 256;
+
+    /**
+     * Escribe el conjunto de datos de forma incremental (no se construye en memoria).
+     */
+    static void generate(Path file, int profiles) throws IOException {
+        try (BufferedWriter writer = Files.newBufferedWriter(file, StandardCharsets.UTF_8)) {
+            writer.write("{\n  \"titulo\": \"Perfiles generados para el benchmark\",\n  \"perfiles\": [\n");
+            for (int i = 0; i < profiles; i++) {
+                if (i > 0) writer.write(",\n");
+                writer.write("    {\n");
+                writer.write("      \"cargo\": \"Desarrollador " + i + "\",\n");
+                writer.write("      \"nivel_recomendado\": \"Senior/Mid/Junior\",\n");
+                writer.write("      \"rol_principal\": \"Diseñar y mantener APIs REST, integrar la base de datos y revisar el código del módulo " + i + ".\",\n");
+                writer.write("      \"herramientas_clave\": [\"Java 17\", \"Spring Boot\", \"Maven\", \"JUnit 5\"],\n");
+                writer.write("      \"es_fundamental\": " + (i % 2 == 0) + "\n");
+                writer.write("    }");
+            }
+            writer.write("\n  ]\n}\n");
+        }
+    }
+
+    private static void resetPeakHeap() {
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() == MemoryType.HEAP) pool.resetPeakUsage();
+        }
+    }
+
+    private static long peakHeapBytes() {
+        long peak = 0;
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() == MemoryType.HEAP) peak += pool.getPeakUsage().getUsed();
+        }
+        return peak;
+    }
+
+    private static void report(String label, long profiles, long bytes, double seconds, long peakHeap) {
+        System.out.println(String.format("✅ %-28s %,10d perfiles en %7.2f s -> %,10.0f perfiles/s, %7.1f MB/s, pico de heap %,8.1f MB",
+                label, profiles, seconds, profiles / Math.max(seconds, 1e-9),
+                bytes / 1e6 / Math.max(seconds, 1e-9), peakHeap / 1e6));
+    }
+
+    @SuppressWarnings("deprecation")
+    public static void main(String[] args) throws Exception {
+        CliOptions options = CliOptions.parse(args);
+        int profiles = options.getInt("profiles", DEFAULT_PROFILES);
+        Path file = options.has("file")
+                ? Paths.get(options.get("file", ""))
+                : Files.createTempFile("perfiles-bench", ".json");
+        boolean keep = options.getBoolean("keep") || options.has("file");
+
+        try {
+            if (!options.has("file") || !Files.exists(file)) {
+                System.out.println("⚙️  Generando " + profiles + " perfiles en " + file + "...");
+                generate(file, profiles);
+            }
+            long bytes = Files.size(file);
+            System.out.println(String.format("Archivo: %s (%.1f MB)", file, bytes / 1e6));
+
+            // Lector incremental: los perfiles se cuentan y se descartan, como en la carga masiva
+            System.gc();
+            resetPeakHeap();
+            long start = System.nanoTime();
+            long count = 0;
+            try (PerfilJsonReader reader = PerfilJsonReader.open(file)) {
+                while (reader.hasNext()) {
+                    reader.next();
+                    count++;
+                }
+            }
+            report("Lector incremental", count, bytes, (System.nanoTime() - start) / 1e9, peakHeapBytes());
+
+            if (options.getBoolean("legacy")) {
+                long maxBytes = options.getInt("legacy-max-mb", DEFAULT_LEGACY_MAX_MB) * 1024L * 1024L;
+                if (bytes > maxBytes) {
+                    System.out.println("⚠️  Se omite el parseo por expresiones regulares: el archivo supera --legacy-max-mb.");
+                    return;
+                }
+                PrintStream console = System.out;
+                System.gc();
+                resetPeakHeap();
+                start = System.nanoTime();
+                System.setOut(new PrintStream(OutputStream.nullOutputStream()));
+                List<Perfil> perfiles;
+                try {
+                    perfiles = new Controller(new Database()).readFileRegex(file.toString());
+                } finally {
+                    System.setOut(console);
+                }
+                report("Expresiones regulares", perfiles.size(), bytes, (System.nanoTime() - start) / 1e9, peakHeapBytes());
+            }
+        } finally {
+            if (!keep) Files.deleteIfExists(file);
+        }
+    }
+}
@@ -2,33 +2,42 @@ import tkinter as tk
 from tkinter import scrolledtext, ttk, filedialog, messagebox
 import subprocess
 import threading
-import sys
 import os
 import time
+import itertools
+import queue
+import mmap
 
-# --- Constantes del Proyecto ---
-JAVA_CMD = "java"
-JAR_PATH = os.path.join(".", "launcher-app", "target", "ourcrud-java-all-1.0-SNAPSHOT.jar")
-CONTEXT_FILE = os.path.join(".", "contexto.txt")
+from task_engine import (
+    JAVA_CMD, JAR_PATH, JVM_WORKER_CLASS, WORKER_TOKEN_ENV, WORKER_TOKEN_FILE,
+    SPECIALISTS, DEFAULT_SPECIALIST_CONCURRENCY,
+    DEFAULT_PROCESS_JVM_OPTIONS, DEFAULT_ANALYSIS_JVM_OPTIONS, DEFAULT_READER_THREADS,
+    DEFAULT_PROJECT_PATH, DEFAULT_ANALYZER_PATH, DEFAULT_COMMAND_TIMEOUT, JOB_RUNNING, JOB_FINISHED_STATES,
+    DEFAULT_MAX_FILE_KB, DEFAULT_MAX_TOTAL_KB, DEFAULT_SHARD_TOKENS, DEFAULT_FAN_OUT, DEFAULT_BATCH_PARALLEL,
+    JobScheduler, TaskEngine, parse_jvm_options, format_trace_summary, new_worker_token,
+)
 
-# Clases de Funcionalidad Base
-FILE_PROCESSOR_CLASS = "com.myproject.core.FileProcessor"
-AI_ANALYZER_CLASS = "com.myproject.core.AIAnalyzer"
+# Pipeline del log: intervalo de vaciado de la cola, máximo de mensajes por lote y líneas retenidas
+LOG_FLUSH_INTERVAL_MS = 50
+LOG_MAX_BATCH = 2000
+LOG_MAX_LINES = 5000
 
-# Clases de Especialistas (extienden de Especialista.java)
-AI_ANALYZER_DB_CLASS = "com.myproject.core.AIAnalyzerDB"
-AI_ANALYZER_QA_CLASS = "com.myproject.core.AIAnalyzerQA"
-AI_ANALYZER_BACKEND_CLASS = "com.myproject.core.AIAnalyzerBackend" 
-AI_ANALYZER_FRONTEND_CLASS = "com.myproject.core.AIAnalyzerFrontend"
-AI_ANALYZER_DEVOPS_CLASS = "com.myproject.core.AIAnalyzerDevOps"
-AI_ANALYZER_GENERIC_CLASS = "com.myproject.core.AIAnalyzerGeneric"
+# Modo vigilancia: espera tras editar la ruta del proyecto antes de reiniciar la vigilancia
+WATCH_RESTART_DELAY_MS = 1000
+
+# Visor de resultados: tamaño aproximado de página (se ajusta al siguiente salto de línea)
+VIEWER_PAGE_BYTES = 64 * 1024
 
 
 # ====================================
 # VENTANA FLOTANTE DE CONSOLA
 # ====================================
 class ConsoleWindow(tk.Toplevel):
-    """Ventana flotante para mostrar el registro de actividad (log)."""
+    """
+    Ventana flotante para mostrar el registro de actividad (log).
+    Los mensajes se encolan desde cualquier hilo y un único callback periódico de Tk
+    los inserta por lotes, con un solo desplazamiento por lote y un límite de líneas retenidas.
+    """
     def __init__(self, master):
         super().__init__(master)
         self.title("Registro de Actividad y Resultados")
@@ -46,15 +55,84 @@ class ConsoleWindow(tk.Toplevel):
         # Configuración de tags de color
         self.output_text.tag_config('info', foreground='#e0e0e0')
         self.output_text.tag_config('error', foreground='#ff6b6b')
+        self.output_text.tag_config('link', foreground='#6bb6ff', underline=True)
+        self.output_text.tag_bind('link', '<Enter>', lambda e: self.output_text.config(cursor="hand2"))
+        self.output_text.tag_bind('link', '<Leave>', lambda e: self.output_text.config(cursor=""))
+
+        # Cola de mensajes pendientes (segura entre hilos) y callback periódico de vaciado
+        self._pending = queue.SimpleQueue()
+        self._link_ids = itertools.count(1)
+        self._flush_job = self.after(LOG_FLUSH_INTERVAL_MS, self._flush)
 
     def log(self, message, is_error=False):
-        """Añade un mensaje al área de texto."""
-        self.output_text.config(state=tk.NORMAL)
-        tag = 'error' if is_error else 'info'
-        
-        self.output_text.insert(tk.END, message + "\n", tag)
-        self.output_text.see(tk.END)
-        self.output_text.config(state=tk.DISABLED)
+        """Encola un mensaje para el área de texto. Puede llamarse desde cualquier hilo."""
+        self._pending.put((message, 'error' if is_error else 'info'))
+
+    def log_batch(self, entries):
+        """Encola de una vez un lote de mensajes [(message, is_error), ...]. Puede llamarse desde cualquier hilo."""
+        self._pending.put([(message, 'error' if is_error else 'info') for message, is_error in entries])
+
+    def log_link(self, message, callback):
+        """Encola un enlace: al hacer clic sobre el texto se invoca callback (en el hilo de Tkinter)."""
+        self._pending.put((message, ('link', f"link{next(self._link_ids)}"), callback))
+
+    def is_idle(self):
+        """Indica si no quedan mensajes encolados por insertar en el área de texto."""
+        return self._pending.empty()
+
+    def wait_until_idle(self, timeout=None):
+        """
+        Procesa los eventos de Tk hasta que la cola de mensajes queda vacía y sus mensajes insertados.
+        Debe llamarse desde el hilo de Tkinter. Devuelve False si se agota timeout (segundos).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_idle():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            self.update()
+            time.sleep(0.001)
+        # El último lote extraído se inserta en la misma llamada; update() aplica el redibujado pendiente
+        self.update()
+        return True
+
+    def _flush(self):
+        """Inserta en una sola llamada los mensajes pendientes y recorta el historial."""
+        chunks = []
+        count = 0
+        try:
+            while count < LOG_MAX_BATCH:
+                item = self._pending.get_nowait()
+                # Un elemento de la cola es un mensaje o un lote de mensajes del supervisor de procesos
+                for message, tag, *link in (item if isinstance(item, list) else [item]):
+                    count += 1
+                    if link:
+                        self.output_text.tag_bind(tag[1], '<Button-1>', lambda e, callback=link[0]: callback())
+                    # Agrupar mensajes consecutivos con el mismo tag en un único fragmento
+                    if chunks and chunks[-1][1] == tag:
+                        chunks[-1][0].append(message)
+                    else:
+                        chunks.append(([message], tag))
+        except queue.Empty:
+            pass
+
+        if chunks:
+            insert_args = []
+            for messages, tag in chunks:
+                insert_args.extend(("\n".join(messages) + "\n", tag))
+
+            self.output_text.config(state=tk.NORMAL)
+            self.output_text.insert(tk.END, *insert_args)
+            line_count = int(self.output_text.index("end-1c").split(".")[0])
+            if line_count > LOG_MAX_LINES:
+                self.output_text.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+            self.output_text.config(state=tk.DISABLED)
+            self.output_text.see(tk.END)
+
+        self._flush_job = self.after(LOG_FLUSH_INTERVAL_MS, self._flush)
+
+    def destroy(self):
+        self.after_cancel(self._flush_job)
+        super().destroy()
 
     def hide_window(self):
         """Oculta la ventana y actualiza el estado."""
@@ -68,6 +146,140 @@ class ConsoleWindow(tk.Toplevel):
         self.focus_set()
 
 
+# ====================================
+# VISOR PAGINADO DE RESULTADOS
+# ====================================
+class ResultViewerWindow(tk.Toplevel):
+    """
+    Visor de archivos generados (guías, código corregido) que mapea el archivo en memoria
+    y solo decodifica y muestra la página visible. Permite buscar texto en todo el archivo.
+    """
+    def __init__(self, master, file_path):
+        super().__init__(master)
+        self.title(f"Visor de Resultados - {os.path.basename(file_path)}")
+        self.geometry("900x600")
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._page_starts = [0]   # Offsets de inicio de página, calculados bajo demanda
+        self._page = 0
+        self._search_pos = 0
+
+        toolbar = ttk.Frame(self, padding="5")
+        toolbar.pack(fill=tk.X)
+        ttk.Button(toolbar, text="◀ Anterior", command=lambda: self.show_page(self._page - 1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Siguiente ▶", command=lambda: self.show_page(self._page + 1)).pack(side=tk.LEFT, padx=2)
+        self.page_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.page_var).pack(side=tk.LEFT, padx=10)
+
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=2)
+        search_entry.bind('<Return>', lambda e: self.search_next())
+        ttk.Button(toolbar, text="Buscar", command=self.search_next).pack(side=tk.LEFT, padx=2)
+
+        self.text = scrolledtext.ScrolledText(self, wrap=tk.NONE, font=('Consolas', 9))
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self.text.tag_config('match', background='#ffd54f')
+
+        self.show_page(0)
+
+    def _page_end(self, start):
+        """Fin de la página que empieza en start: primer salto de línea tras VIEWER_PAGE_BYTES."""
+        if start + VIEWER_PAGE_BYTES >= len(self._data):
+            return len(self._data)
+        newline = self._data.find(b"\n", start + VIEWER_PAGE_BYTES)
+        return len(self._data) if newline == -1 else newline + 1
+
+    def _page_of(self, offset):
+        """Índice de la página que contiene offset, extendiendo el índice de páginas si hace falta."""
+        while True:
+            last_start = self._page_starts[-1]
+            end = self._page_end(last_start)
+            if offset < end or end >= len(self._data):
+                break
+            self._page_starts.append(end)
+        for index in range(len(self._page_starts) - 1, -1, -1):
+            if self._page_starts[index] <= offset:
+                return index
+        return 0
+
+    def show_page(self, page, highlight=None):
+        """Muestra la página indicada; highlight es un rango (inicio, fin) en bytes a resaltar."""
+        if page < 0:
+            return
+        while page >= len(self._page_starts):
+            end = self._page_end(self._page_starts[-1])
+            if end >= len(self._data):
+                return
+            self._page_starts.append(end)
+
+        self._page = page
+        start = self._page_starts[page]
+        end = self._page_end(start)
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", self._data[start:end].decode('utf-8', errors='replace'))
+        if highlight:
+            prefix = self._data[start:highlight[0]].decode('utf-8', errors='replace')
+            match = self._data[highlight[0]:highlight[1]].decode('utf-8', errors='replace')
+            index = f"1.0+{len(prefix)}c"
+            self.text.tag_add('match', index, f"{index}+{len(match)}c")
+            self.text.see(index)
+        self.text.config(state=tk.DISABLED)
+
+        more = "" if end >= len(self._data) else " (hay más)"
+        self.page_var.set(f"Página {page + 1}{more} - {len(self._data):,} bytes")
+
+    def search_next(self):
+        """Busca la siguiente aparición del texto (en todo el archivo, sin cargarlo completo)."""
+        query = self.search_var.get().encode('utf-8')
+        if not query:
+            return
+        found = self._data.find(query, self._search_pos)
+        if found == -1 and self._search_pos > 0:
+            found = self._data.find(query, 0)   # Volver a empezar desde el principio
+        if found == -1:
+            self.page_var.set(f"Sin resultados para '{self.search_var.get()}'")
+            return
+        self._search_pos = found + len(query)
+        self.show_page(self._page_of(found), highlight=(found, found + len(query)))
+
+    def destroy(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+        super().destroy()
+
+
+# ====================================
+# RESUMEN DE LA TRAZA
+# ====================================
+class TraceSummaryWindow(tk.Toplevel):
+    """Tabla con el tiempo total, máximo, bytes y pico de memoria de cada etapa de una ejecución trazada."""
+    COLUMNS = (("etapa", "Etapa", 200), ("origen", "Origen", 70), ("llamadas", "Llamadas", 70),
+               ("total", "Total (ms)", 90), ("max", "Máx (ms)", 90), ("bytes", "Bytes", 100), ("rss", "Pico RSS (MB)", 100))
+
+    def __init__(self, master, trace_path, rows):
+        super().__init__(master)
+        self.title(f"Resumen de la traza - {os.path.basename(trace_path)}")
+        self.geometry("760x360")
+
+        ttk.Label(self, text=f"Traza completa (chrome://tracing o ui.perfetto.dev): {trace_path}", padding="5").pack(fill=tk.X)
+        tree = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS], show="headings")
+        for column, heading, width in self.COLUMNS:
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor="w" if column in ("etapa", "origen") else "e")
+        for row in rows:
+            rss = f"{row['rss_kb'] / 1024:.1f}" if row["rss_kb"] is not None else "-"
+            tree.insert("", tk.END, values=(row["name"], row["cat"], row["count"], f"{row['total_ms']:.1f}",
+                                            f"{row['max_ms']:.1f}", f"{row['bytes']:,}" if row["bytes"] else "-", rss))
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+
 # ====================================
 # APLICACIÓN PRINCIPAL (ORQUESTADOR)
 # ====================================
@@ -76,21 +288,56 @@ class OrchestratorApp(tk.Tk):
         super().__init__()
         self.title("Orquestador Java/Maven (GUI)")
         self.api_process = None 
+        self.worker_process = None
         
         # Inicializar la consola flotante antes de crear widgets, para que log_output funcione
         self.console_window = ConsoleWindow(self) 
         
-        # Variables de Configuración Base
-        self.project_path_var = tk.StringVar(value="./gemini-tools-core")
-        self.analyzer_path_var = tk.StringVar(value="./bbdd.txt")
+        # Motor de tareas (sin interfaz): la GUI solo recoge la configuración y muestra la salida
+        self.engine = TaskEngine(on_log=self._append_log, on_result=self._add_result_link, on_log_batch=self._append_log_batch)
 
-        # Variables de Ruta Individuales para Especialistas
-        self.dba_path_var = tk.StringVar(value="./ia_consultas/guide_dba.md")
-        self.qa_path_var = tk.StringVar(value="./ia_consultas/guide_qa.md")
-        self.backend_path_var = tk.StringVar(value="./ia_consultas/guide_backend.md")
-        self.frontend_path_var = tk.StringVar(value="./ia_consultas/guide_frontend.md")
-        self.devops_path_var = tk.StringVar(value="./ia_consultas/guide_devops.md")
-        self.generic_path_var = tk.StringVar(value="./ia_consultas/guide_solid.md")
+        # Variables de Configuración Base
+        self.project_path_var = tk.StringVar(value=DEFAULT_PROJECT_PATH)
+        self.analyzer_path_var = tk.StringVar(value=DEFAULT_ANALYZER_PATH)
+        # Corrección por lotes: carpeta o patrón glob de archivos .java y correcciones en paralelo
+        self.batch_targets_var = tk.StringVar(value="")
+        self.batch_parallel_var = tk.IntVar(value=DEFAULT_BATCH_PARALLEL)
+
+        # Opciones JVM por tarea (se aplican al lanzar un proceso 'java' dedicado)
+        self.process_jvm_options_var = tk.StringVar(value=DEFAULT_PROCESS_JVM_OPTIONS)
+        self.analysis_jvm_options_var = tk.StringVar(value=DEFAULT_ANALYSIS_JVM_OPTIONS)
+        self.reader_threads_var = tk.IntVar(value=DEFAULT_READER_THREADS)
+        # Selección de archivos del contexto: presupuestos en KB (0 = sin límite), exclusiones y .gitignore
+        self.max_file_kb_var = tk.IntVar(value=DEFAULT_MAX_FILE_KB)
+        self.max_total_kb_var = tk.IntVar(value=DEFAULT_MAX_TOTAL_KB)
+        self.ignore_file_var = tk.StringVar(value="")
+        self.use_gitignore_var = tk.BooleanVar(value=True)
+        # Forzar 'mvn clean install' completo en lugar de la compilación incremental con caché
+        self.clean_build_var = tk.BooleanVar(value=False)
+
+        # Variables de Ruta Individuales para Especialistas (por clave de SPECIALISTS)
+        self.specialist_path_vars = {key: tk.StringVar(value=path) for key, _, _, path in SPECIALISTS}
+
+        # Planificador de trabajos concurrentes de especialistas
+        self.concurrency_var = tk.IntVar(value=DEFAULT_SPECIALIST_CONCURRENCY)
+        # Tiempo límite de cada tarea en segundos (0 = sin límite)
+        self.timeout_var = tk.IntVar(value=DEFAULT_COMMAND_TIMEOUT)
+        # Omitir la caché de respuestas de Gemini (fuerza una llamada nueva a la API)
+        self.bypass_cache_var = tk.BooleanVar(value=False)
+        # Mostrar la respuesta de Gemini a medida que se genera
+        self.stream_var = tk.BooleanVar(value=True)
+        # Corregir los .java pidiendo solo un parche (diff) en lugar del archivo completo
+        self.patch_var = tk.BooleanVar(value=True)
+        # Registrar los tiempos de cada etapa y exportarlos al terminar la ejecución
+        self.trace_var = tk.BooleanVar(value=False)
+        # Map-reduce de los especialistas: tamaño de fragmento en tokens (0 = desactivado) y fragmentos en paralelo
+        self.shard_tokens_var = tk.IntVar(value=DEFAULT_SHARD_TOKENS)
+        self.fan_out_var = tk.IntVar(value=DEFAULT_FAN_OUT)
+        # Modo vigilancia: mantiene el contexto al día mientras se editan los archivos del proyecto
+        self.watch_var = tk.BooleanVar(value=False)
+        self._watch_restart_id = None
+        self.project_path_var.trace_add("write", self._on_project_path_change)
+        self.scheduler = JobScheduler(self.engine.run_scheduled_job, self._on_job_change, self.concurrency_var.get())
 
         self.create_widgets()
         # Mostrar la consola al inicio (opcional, puede ser .withdraw() para empezar oculta)
@@ -127,7 +374,34 @@ class OrchestratorApp(tk.Tk):
         self.btn_browse_analyzer = ttk.Button(input_frame, text="Buscar Archivo", command=lambda: self.browse_file_path(self.analyzer_path_var), width=15)
         self.btn_browse_analyzer.grid(row=1, column=2, sticky="e", padx=5)
 
-        input_frame.grid_columnconfigure(1, weight=1) 
+        # Input 3 y 4: Opciones JVM por tipo de tarea (heap, GC...)
+        ttk.Label(input_frame, text="Opciones JVM - Procesar Archivos (Ej: -Xmx2g -XX:+UseG1GC):").grid(row=2, column=0, sticky="w", pady=5)
+        ttk.Entry(input_frame, textvariable=self.process_jvm_options_var).grid(row=2, column=1, columnspan=2, sticky="ew", padx=5)
+        ttk.Label(input_frame, text="Opciones JVM - Análisis IA y Especialistas:").grid(row=3, column=0, sticky="w", pady=5)
+        ttk.Entry(input_frame, textvariable=self.analysis_jvm_options_var).grid(row=3, column=1, columnspan=2, sticky="ew", padx=5)
+
+        # Input 5: Hilos de lectura en paralelo del FileProcessor
+        ttk.Label(input_frame, text="Hilos de lectura (Procesar Archivos):").grid(row=4, column=0, sticky="w", pady=5)
+        ttk.Spinbox(input_frame, from_=1, to=64, width=5, textvariable=self.reader_threads_var).grid(row=4, column=1, sticky="w", padx=5)
+
+        # Input 6: Límites de tamaño del contexto (KB, 0 = sin límite)
+        ttk.Label(input_frame, text="Límite por archivo / total del contexto (KB, 0 = sin límite):").grid(row=5, column=0, sticky="w", pady=5)
+        limits_frame = ttk.Frame(input_frame)
+        limits_frame.grid(row=5, column=1, sticky="w", padx=5)
+        ttk.Spinbox(limits_frame, from_=0, to=1048576, increment=256, width=8, textvariable=self.max_file_kb_var).pack(side=tk.LEFT)
+        ttk.Spinbox(limits_frame, from_=0, to=10485760, increment=1024, width=10, textvariable=self.max_total_kb_var).pack(side=tk.LEFT, padx=5)
+
+        # Input 7: Archivo de exclusiones (sintaxis .gitignore, relativo a la ruta del proyecto)
+        ttk.Label(input_frame, text="Archivo de exclusiones (vacío = .contextignore):").grid(row=6, column=0, sticky="w", pady=5)
+        ttk.Entry(input_frame, textvariable=self.ignore_file_var).grid(row=6, column=1, sticky="ew", padx=5)
+        ttk.Checkbutton(input_frame, text="Respetar .gitignore", variable=self.use_gitignore_var).grid(row=6, column=2, sticky="w", padx=5)
+
+        # Input 8: Corrección por lotes (carpeta o patrón glob, p. ej. ./src/main/java/com/app/**.java)
+        ttk.Label(input_frame, text="Corrección por lotes - carpeta o patrón de archivos .java:").grid(row=7, column=0, sticky="w", pady=5)
+        ttk.Entry(input_frame, textvariable=self.batch_targets_var).grid(row=7, column=1, sticky="ew", padx=5)
+        ttk.Button(input_frame, text="Buscar Carpeta", command=lambda: self.browse_directory(self.batch_targets_var), width=15).grid(row=7, column=2, sticky="e", padx=5)
+
+        input_frame.grid_columnconfigure(1, weight=1)
         
         # ------------------------------------
         # 1B. Configuración de Rutas Especialistas (2 COLUMNAS)
@@ -135,11 +409,7 @@ class OrchestratorApp(tk.Tk):
         specialist_input_frame = ttk.LabelFrame(main_frame, text="Rutas de Archivo - Roles Especialistas", padding="10")
         specialist_input_frame.pack(fill=tk.X, pady=10)
 
-        specialists_config = [
-            ("DBA", self.dba_path_var), ("QA", self.qa_path_var),
-            ("Backend (Spring)", self.backend_path_var), ("Frontend (UI/UX)", self.frontend_path_var),
-            ("DevOps (CI/CD)", self.devops_path_var), ("Genérico (SOLID)", self.generic_path_var),
-        ]
+        specialists_config = [(role_name, self.specialist_path_vars[key]) for key, _, role_name, _ in SPECIALISTS]
         
         num_cols = 3 
         items_per_col = (len(specialists_config) + 1) // 2
@@ -166,12 +436,19 @@ class OrchestratorApp(tk.Tk):
         # Fila 1: Funcionalidad Base
         self.btn_build = ttk.Button(button_frame, text="0. Compilar Proyecto (Maven)", command=lambda: self.start_task(self.build_project))
         self.btn_build.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        ttk.Checkbutton(button_frame, text="Limpia", variable=self.clean_build_var).pack(side=tk.LEFT)
 
         self.btn_process = ttk.Button(button_frame, text="1. Procesar Archivos (FileProcessor)", command=lambda: self.start_task(self.run_file_processor))
         self.btn_process.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        ttk.Checkbutton(button_frame, text="Vigilar cambios", variable=self.watch_var, command=self.toggle_watch).pack(side=tk.LEFT)
 
         self.btn_analyze = ttk.Button(button_frame, text="2. Analizar y Corregir (AIAnalyzer Original)", command=lambda: self.start_task(self.run_ai_analyzer))
         self.btn_analyze.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        self.btn_batch = ttk.Button(button_frame, text="3. Corregir lote", command=lambda: self.start_task(self.run_batch_correction))
+        self.btn_batch.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+        ttk.Label(button_frame, text="En paralelo:").pack(side=tk.LEFT)
+        ttk.Spinbox(button_frame, from_=1, to=32, width=4, textvariable=self.batch_parallel_var).pack(side=tk.LEFT, padx=5)
         
         # Fila 2: Roles Especialistas (Generadores de Guías)
         titulo_especialistas = "Especialistas - Generación de Guías de Aprendizaje"
@@ -181,27 +458,69 @@ class OrchestratorApp(tk.Tk):
         button_row1 = ttk.Frame(button_frame2)
         button_row1.pack(fill=tk.X, pady=5)
         
-        self.btn_analyze_dba = ttk.Button(button_row1, text="Ingeniero DBA", command=lambda: self.start_task(self.run_ai_analyzer_db))
+        self.btn_analyze_dba = ttk.Button(button_row1, text="Ingeniero DBA", command=lambda: self.start_specialist_task("dba"))
         self.btn_analyze_dba.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
 
-        self.btn_analyze_qa = ttk.Button(button_row1, text="Ingeniero QA", command=lambda: self.start_task(self.run_ai_analyzer_qa))
+        self.btn_analyze_qa = ttk.Button(button_row1, text="Ingeniero QA", command=lambda: self.start_specialist_task("qa"))
         self.btn_analyze_qa.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
         
-        self.btn_analyze_backend = ttk.Button(button_row1, text="Backend (Spring)", command=lambda: self.start_task(self.run_ai_analyzer_backend))
+        self.btn_analyze_backend = ttk.Button(button_row1, text="Backend (Spring)", command=lambda: self.start_specialist_task("backend"))
         self.btn_analyze_backend.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
         
         button_row2 = ttk.Frame(button_frame2)
         button_row2.pack(fill=tk.X, pady=5)
         
-        self.btn_analyze_frontend = ttk.Button(button_row2, text="Frontend (UI/UX)", command=lambda: self.start_task(self.run_ai_analyzer_frontend))
+        self.btn_analyze_frontend = ttk.Button(button_row2, text="Frontend (UI/UX)", command=lambda: self.start_specialist_task("frontend"))
         self.btn_analyze_frontend.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
         
-        self.btn_analyze_devops = ttk.Button(button_row2, text="DevOps (CI/CD)", command=lambda: self.start_task(self.run_ai_analyzer_devops))
+        self.btn_analyze_devops = ttk.Button(button_row2, text="DevOps (CI/CD)", command=lambda: self.start_specialist_task("devops"))
         self.btn_analyze_devops.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
         
-        self.btn_analyze_generic = ttk.Button(button_row2, text="Genérico (SOLID)", command=lambda: self.start_task(self.run_ai_analyzer_generic))
+        self.btn_analyze_generic = ttk.Button(button_row2, text="Genérico (SOLID)", command=lambda: self.start_specialist_task("generic"))
         self.btn_analyze_generic.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
 
+        # Fila 3: Ejecución concurrente de todos los especialistas
+        button_row3 = ttk.Frame(button_frame2)
+        button_row3.pack(fill=tk.X, pady=5)
+
+        self.btn_run_all = ttk.Button(button_row3, text="Ejecutar todos los especialistas", command=self.run_all_specialists)
+        self.btn_run_all.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        ttk.Label(button_row3, text="Concurrencia:").pack(side=tk.LEFT)
+        ttk.Spinbox(button_row3, from_=1, to=len(SPECIALISTS), width=4, textvariable=self.concurrency_var,
+                    command=self._apply_concurrency).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(button_row3, text="Límite (s):").pack(side=tk.LEFT)
+        ttk.Spinbox(button_row3, from_=0, to=86400, increment=60, width=6, textvariable=self.timeout_var).pack(side=tk.LEFT, padx=5)
+
+        ttk.Checkbutton(button_row3, text="Omitir caché", variable=self.bypass_cache_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_row3, text="Streaming", variable=self.stream_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_row3, text="Parche", variable=self.patch_var).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(button_row3, text="Traza", variable=self.trace_var).pack(side=tk.LEFT, padx=5)
+
+        self.btn_cancel_job = ttk.Button(button_row3, text="Cancelar seleccionado", command=self.cancel_selected_job)
+        self.btn_cancel_job.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        self.btn_cancel_all = ttk.Button(button_row3, text="Cancelar todos", command=self.scheduler.cancel_all)
+        self.btn_cancel_all.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        # Fila 4: Map-reduce para contextos que no caben en una petición
+        button_row4 = ttk.Frame(button_frame2)
+        button_row4.pack(fill=tk.X, pady=5)
+
+        ttk.Label(button_row4, text="Map-reduce - tokens por fragmento (0 = desactivado):").pack(side=tk.LEFT)
+        ttk.Spinbox(button_row4, from_=0, to=2000000, increment=10000, width=9, textvariable=self.shard_tokens_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(button_row4, text="Fragmentos en paralelo:").pack(side=tk.LEFT)
+        ttk.Spinbox(button_row4, from_=1, to=32, width=4, textvariable=self.fan_out_var).pack(side=tk.LEFT, padx=5)
+
+        # Estado por trabajo
+        self.jobs_tree = ttk.Treeview(button_frame2, columns=("rol", "destino", "estado", "duracion"), show="headings", height=6)
+        for column, heading, width in (("rol", "Rol", 160), ("destino", "Archivo destino", 260),
+                                       ("estado", "Estado", 100), ("duracion", "Duración (s)", 90)):
+            self.jobs_tree.heading(column, text=heading)
+            self.jobs_tree.column(column, width=width, anchor="w")
+        self.jobs_tree.pack(fill=tk.X, pady=5)
+
         # ------------------------------------
         # 3. Control del API
         # ------------------------------------
@@ -217,6 +536,19 @@ class OrchestratorApp(tk.Tk):
         self.api_status_var = tk.StringVar(value="API: Detenido")
         ttk.Label(api_frame, textvariable=self.api_status_var).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
 
+        # Worker JVM persistente: se inicia una vez junto al API y atiende todas las tareas Java
+        worker_frame = ttk.LabelFrame(main_frame, text="Worker JVM Persistente", padding="10")
+        worker_frame.pack(fill=tk.X, pady=10)
+
+        self.btn_start_worker = ttk.Button(worker_frame, text="Iniciar Worker JVM", command=self.start_worker, style='TButton')
+        self.btn_start_worker.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        self.btn_stop_worker = ttk.Button(worker_frame, text="Detener Worker", command=self.stop_worker, state=tk.DISABLED, style='TButton')
+        self.btn_stop_worker.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
+        self.worker_status_var = tk.StringVar(value="Worker: Detenido")
+        ttk.Label(worker_frame, textvariable=self.worker_status_var).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
+
         # ------------------------------------
         # 4. Control del Log (Botón de Ventana Flotante)
         # ------------------------------------
@@ -235,15 +567,55 @@ class OrchestratorApp(tk.Tk):
 
 
     def log_output(self, message, is_error=False):
-        """Añade un mensaje al área de texto de la ventana flotante."""
+        """Añade un mensaje al área de texto de la ventana flotante (con el rol del trabajo en curso)."""
+        self.engine.log_output(message, is_error)
+
+    def _append_log(self, message, is_error=False):
+        """Receptor de log del motor de tareas: encola el mensaje en la consola flotante."""
         if self.console_window:
             # Asegurar que la consola esté visible si se recibe un mensaje
             if not self.console_window.visible:
+                 self.console_window.visible = True
                  self.after(0, self.console_window.show_window)
-            
-            # Usar self.after para encolar la acción en el hilo principal de Tkinter
-            self.after(0, lambda: self.console_window.log(message, is_error))
-            self.update_idletasks() # Fuerza la actualización de la GUI
+
+            # La consola encola el mensaje; su callback periódico lo inserta en el hilo de Tkinter
+            self.console_window.log(message, is_error)
+
+    def _append_log_batch(self, entries):
+        """Receptor de lotes de salida del supervisor de procesos: los encola en la consola de una vez."""
+        if self.console_window:
+            if not self.console_window.visible:
+                self.console_window.visible = True
+                self.after(0, self.console_window.show_window)
+            self.console_window.log_batch(entries)
+
+    def _start_trace_run(self):
+        """Empieza una traza nueva si no hay otra ejecución en curso."""
+        if self.engine.trace and not self.scheduler.is_busy():
+            self.engine.tracer.clear()
+
+    def _finish_trace_run(self):
+        """Exporta la traza de la ejecución terminada y muestra su resumen (en el hilo de Tkinter)."""
+        path, rows = self.engine.export_trace()
+        if path is None:
+            return
+        self.log_output(f"🧭 Traza guardada en: {path}")
+        for line in format_trace_summary(rows):
+            self.log_output(f"   {line}")
+        TraceSummaryWindow(self, path, rows)
+
+    def _add_result_link(self, label, output_path):
+        """Receptor de resultados del motor: añade un enlace para abrir el archivo en el visor paginado."""
+        if self.console_window:
+            self.console_window.log_link(f"   ↳ Abrir en el visor de resultados: {os.path.basename(output_path)}",
+                                         lambda: self.open_result_viewer(output_path))
+
+    def open_result_viewer(self, output_path):
+        """Abre el archivo en el visor paginado (debe llamarse desde el hilo de Tkinter)."""
+        try:
+            ResultViewerWindow(self, output_path)
+        except OSError as e:
+            self.log_output(f"ERROR al abrir el visor para {output_path}: {e}", is_error=True)
 
 
     def enable_buttons(self, enable=True):
@@ -252,9 +624,10 @@ class OrchestratorApp(tk.Tk):
         self.btn_build.config(state=state)
         self.btn_process.config(state=state)
         self.btn_analyze.config(state=state)
+        self.btn_batch.config(state=state)
         
         # Control de los 6 botones de especialistas
-        self.btn_analyze_dba.config(state=state) 
+        self.btn_analyze_dba.config(state=state)
         self.btn_analyze_qa.config(state=state)
         self.btn_analyze_backend.config(state=state)
         self.btn_analyze_frontend.config(state=state)
@@ -271,77 +644,59 @@ class OrchestratorApp(tk.Tk):
                 self.after(0, lambda: self.log_output(f"ERROR FATAL en el hilo: {e}", is_error=True))
             finally:
                 self.after(0, lambda: self.enable_buttons(True))
+                if self.engine.trace:
+                    self.after(0, self._finish_trace_run)
 
         self.log_output(f"\n--- Iniciando tarea: {task_function.__name__} ---", is_error=False)
-        self.enable_buttons(False) 
+        self.enable_buttons(False)
+        self._apply_engine_settings()
+        self._start_trace_run()
         threading.Thread(target=task_wrapper, daemon=True).start()
 
-    def _read_stream(self, stream, is_error):
-        """Lee el stream de un proceso línea por línea y lo registra en el log."""
-        # Se asegura de usar la lógica de log_output, que gestiona el acceso al hilo de Tkinter
-        for line in iter(stream.readline, ''):
-            if line:
-                msg = line.strip()
-                if msg:
-                    self.log_output(msg, is_error=is_error)
-        
-    def run_command(self, command_parts, success_message, error_message, cwd=None):
-        """
-        Ejecuta un comando y registra su salida en el log en tiempo real.
-        """
-        self.log_output(f"Ejecutando: {' '.join(command_parts)}")
-
+    def start_specialist_task(self, key):
+        """Inicia el especialista indicado (clave de SPECIALISTS) como tarea individual."""
+        _, class_name, role_name, _ = next(s for s in SPECIALISTS if s[0] == key)
+        path = self.specialist_path_vars[key].get()
+        def run_specialist():
+            self.engine.execute_specialist(class_name, role_name, path)
+        run_specialist.__name__ = f"especialista_{key}"
+        self.start_task(run_specialist)
+
+    def _apply_engine_settings(self):
+        """Copia la configuración de la GUI al motor de tareas (en el hilo de Tkinter, antes de lanzar tareas)."""
+        engine = self.engine
+        engine.project_path = self.project_path_var.get()
+        engine.process_jvm_options = self._jvm_options(self.process_jvm_options_var)
+        engine.analysis_jvm_options = self._jvm_options(self.analysis_jvm_options_var)
         try:
-            process = subprocess.Popen(
-                command_parts,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1, # Line buffering
-                cwd=cwd
-            )
-            
-            stdout_thread = threading.Thread(target=self._read_stream, args=(process.stdout, False), daemon=True)
-            stderr_thread = threading.Thread(target=self._read_stream, args=(process.stderr, True), daemon=True)
-            
-            stdout_thread.start()
-            stderr_thread.start()
-
-            try:
-                process.wait(timeout=300)
-            except subprocess.TimeoutExpired:
-                process.terminate()
-                stdout_thread.join(timeout=1)
-                stderr_thread.join(timeout=1)
-                self.log_output("ERROR: El comando ha excedido el tiempo límite de 5 minutos. Proceso terminado.", is_error=True)
-                return False
-
-            stdout_thread.join()
-            stderr_thread.join()
-
-            if process.returncode != 0:
-                self.log_output(f"ERROR: Comando falló con código {process.returncode}", is_error=True)
-                self.log_output(error_message, is_error=True)
-                return False
-
-            self.log_output(success_message)
-            return True
-
-        except FileNotFoundError:
-            missing_tool = command_parts[0]
-            if missing_tool.endswith('mvn') or missing_tool.endswith('mvn.cmd'):
-                error_detail = "El comando 'mvn' (Maven) no fue encontrado. Asegúrate de que Maven esté instalado y configurado correctamente en la variable de entorno PATH."
-            elif missing_tool == "java":
-                error_detail = "El comando 'java' (Java Runtime) no fue encontrado. Asegúrate de que el JRE/JDK esté instalado y configurado correctamente en la variable de entorno PATH."
-            else:
-                error_detail = f"Comando '{missing_tool}' no encontrado. ¿Está instalado y en su PATH?"
-                
-            self.log_output(f"ERROR: {error_detail}", is_error=True)
-            return False
-        except Exception as e:
-            self.log_output(f"ERROR inesperado: {e}", is_error=True)
-            return False
-
+            engine.reader_threads = max(1, int(self.reader_threads_var.get()))
+        except (tk.TclError, ValueError):
+            engine.reader_threads = DEFAULT_READER_THREADS
+        try:
+            engine.max_file_kb = max(0, int(self.max_file_kb_var.get()))
+            engine.max_total_kb = max(0, int(self.max_total_kb_var.get()))
+        except (tk.TclError, ValueError):
+            engine.max_file_kb, engine.max_total_kb = DEFAULT_MAX_FILE_KB, DEFAULT_MAX_TOTAL_KB
+        engine.ignore_file = self.ignore_file_var.get().strip()
+        engine.use_gitignore = self.use_gitignore_var.get()
+        engine.clean_build = self.clean_build_var.get()
+        engine.bypass_cache = self.bypass_cache_var.get()
+        engine.stream = self.stream_var.get()
+        engine.patch_mode = self.patch_var.get()
+        engine.trace = self.trace_var.get()
+        try:
+            engine.shard_tokens = max(0, int(self.shard_tokens_var.get()))
+            engine.fan_out = max(1, int(self.fan_out_var.get()))
+        except (tk.TclError, ValueError):
+            engine.shard_tokens, engine.fan_out = DEFAULT_SHARD_TOKENS, DEFAULT_FAN_OUT
+        try:
+            engine.batch_parallel = max(1, int(self.batch_parallel_var.get()))
+        except (tk.TclError, ValueError):
+            engine.batch_parallel = DEFAULT_BATCH_PARALLEL
+        try:
+            engine.command_timeout = max(0, int(self.timeout_var.get()))
+        except (tk.TclError, ValueError):
+            engine.command_timeout = DEFAULT_COMMAND_TIMEOUT
 
     # ------------------------------------
     # Funciones de Lógica de Negocio (Inputs, Build, Process)
@@ -356,6 +711,15 @@ class OrchestratorApp(tk.Tk):
         if directory:
             self.project_path_var.set(directory)
 
+    def browse_directory(self, path_var):
+        """Abre un diálogo para seleccionar una carpeta (p. ej. el paquete a corregir por lotes)."""
+        directory = filedialog.askdirectory(
+            initialdir=os.getcwd(),
+            title="Seleccionar Carpeta de Archivos Java a Corregir"
+        )
+        if directory:
+            path_var.set(directory)
+
     def browse_file_path(self, path_var):
         """Abre un diálogo para seleccionar la ruta del archivo de salida/comparación (input/output para AIAnalyzer)."""
         filepath = filedialog.askopenfilename(
@@ -368,214 +732,136 @@ class OrchestratorApp(tk.Tk):
             path_var.set(filepath)
 
 
-    def _get_maven_command(self):
-        """Obtiene el comando 'mvn', usando MAVEN_HOME como fallback."""
-        mvn_command = ["mvn"]
-        if "MAVEN_HOME" in os.environ:
-            maven_home = os.environ["MAVEN_HOME"]
-            if sys.platform.startswith('win'):
-                mvn_cmd_path = os.path.join(maven_home, "bin", "mvn.cmd")
-                if os.path.exists(mvn_cmd_path):
-                    return [mvn_cmd_path]
-            mvn_path = os.path.join(maven_home, "bin", "mvn")
-            if os.path.exists(mvn_path):
-                return [mvn_path]
-        return mvn_command
+    def _jvm_options(self, options_var):
+        """Convierte el texto de una variable de opciones JVM en una lista de argumentos."""
+        try:
+            return parse_jvm_options(options_var.get())
+        except ValueError as e:
+            self.log_output(f"ERROR: Opciones JVM inválidas ({e}); se ignoran.", is_error=True)
+            return []
 
+    # Las tareas se delegan en el motor (task_engine.TaskEngine) con la configuración de la GUI
     def build_project(self):
-        """Ejecuta 'mvn clean install'."""
-        maven_cmd = self._get_maven_command()
-        command_parts = maven_cmd + ["clean", "install"]
-        self.run_command(
-            command_parts=command_parts,
-            success_message="✅ Proyecto Java/Maven compilado con éxito.",
-            error_message="❌ La compilación del proyecto falló."
-        )
+        return self.engine.build_project()
 
     def run_file_processor(self):
-        """Ejecuta com.myproject.core.FileProcessor."""
-        project_path = self.project_path_var.get()
-        if not project_path:
-            self.log_output("ERROR: La ruta base del proyecto no puede estar vacía.", is_error=True)
-            return
-            
-        success = self.run_command(
-            command_parts=[
-                JAVA_CMD,
-                "-cp", JAR_PATH,
-                FILE_PROCESSOR_CLASS,
-                project_path,
-                CONTEXT_FILE
-            ],
-            success_message=f"✅ FileProcessor finalizado. Contexto creado en: {CONTEXT_FILE}",
-            error_message="❌ Error al ejecutar FileProcessor."
-        )
-        if success:
-            self.log_output(f"El archivo {CONTEXT_FILE} se ha creado/sobrescrito con el contexto del proyecto.", is_error=False)
-
+        return self.engine.run_file_processor()
 
     def run_ai_analyzer(self):
-        """Ejecuta com.myproject.core.AIAnalyzer (modo original de corrección, usa la ruta compartida)."""
-        output_path = self.analyzer_path_var.get()
-        
-        if not output_path:
-            self.log_output("ERROR: La ruta de salida del analizador no puede estar vacía.", is_error=True)
-            return
+        return self.engine.run_ai_analyzer(self.analyzer_path_var.get())
 
-        # 1. Ejecutar el AIAnalyzer
-        success = self.run_command(
-            command_parts=[
-                JAVA_CMD,
-                "-cp", JAR_PATH,
-                AI_ANALYZER_CLASS,
-                CONTEXT_FILE,
-                output_path
-            ],
-            success_message=f"✅ AIAnalyzer finalizado. Resultado guardado en: {output_path}",
-            error_message="❌ Error al ejecutar AIAnalyzer."
-        )
+    def run_batch_correction(self):
+        return self.engine.run_batch_correction(self.batch_targets_var.get().strip())
 
-        # 2. Leer y mostrar el contenido del archivo de salida
-        if success:
-            try:
-                output_path_to_read = output_path
-                target_lower = output_path.lower()
-                
-                if target_lower.endswith(".java"):
-                    base_name, ext = os.path.splitext(output_path)
-                    output_path_to_read = base_name + "-corregido" + ext
-                
-                with open(output_path_to_read, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.log_output(f"\n--- Contenido del archivo de salida ({output_path_to_read}) ---\n", is_error=False)
-                self.log_output(content)
-                self.log_output("\n--- Fin del contenido ---", is_error=False)
-
-            except FileNotFoundError:
-                self.log_output(f"ERROR: Archivo de salida no encontrado en {output_path_to_read}", is_error=True)
-            except Exception as e:
-                self.log_output(f"ERROR al leer el archivo {output_path_to_read}: {e}", is_error=True)
-    
     # ------------------------------------
-    # Funciones de Especialistas (Generación de Guías)
+    # Modo vigilancia del contexto
     # ------------------------------------
-    
-    def _execute_specialist_logic(self, class_name, role_name, target_file_path):
-        """Función auxiliar para ejecutar cualquier clase Especialista (DBA, QA, Backend, etc.)."""
-        
-        if not target_file_path:
-            self.log_output(f"ERROR: La ruta del archivo para {role_name} no puede estar vacía.", is_error=True)
-            return
 
-        # 1. Ejecutar el Especialista
-        success = self.run_command(
-            command_parts=[
-                JAVA_CMD,
-                "-cp", JAR_PATH,
-                class_name,
-                CONTEXT_FILE,
-                target_file_path 
-            ],
-            success_message=f"✅ {role_name} finalizado. Guía de aprendizaje generada.",
-            error_message=f"❌ Error al ejecutar {role_name}."
-        )
-
-        # 2. Leer y mostrar el contenido del archivo de salida
-        if success:
-            output_path = target_file_path
-            target_lower = target_file_path.lower()
-            
-            if target_lower.endswith(".java"):
-                base_name, ext = os.path.splitext(target_file_path)
-                output_path = base_name + "-corregido" + ext
+    def toggle_watch(self):
+        """Activa o desactiva la vigilancia de la ruta del proyecto según la casilla."""
+        if self.watch_var.get():
+            self._apply_engine_settings()
+            project_path = self.project_path_var.get()
+            threading.Thread(target=self._start_watch, args=(project_path,), daemon=True).start()
+        else:
+            threading.Thread(target=self.engine.stop_watch, daemon=True).start()
 
-            try:
-                with open(output_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.log_output(f"\n--- Guía de {role_name} ({os.path.basename(output_path)}) ---\n", is_error=False)
-                self.log_output(content)
-                self.log_output("\n--- Fin de la Guía ---", is_error=False)
-
-            except FileNotFoundError:
-                self.log_output(f"ERROR: El archivo de salida esperado no se encontró: {output_path}", is_error=True)
-            except Exception as e:
-                self.log_output(f"ERROR al leer el archivo de salida {output_path}: {e}", is_error=True)
+    def _start_watch(self, project_path):
+        # Fuera del hilo de Tkinter: detener la vigilancia anterior espera a su actualización en curso
+        if not self.engine.start_watch(project_path):
+            self.after(0, lambda: self.watch_var.set(False))
 
-    # Métodos de ejecución para cada rol 
-    def run_ai_analyzer_db(self):
-        self._execute_specialist_logic(AI_ANALYZER_DB_CLASS, "Ingeniero DBA", self.dba_path_var.get())
+    def _on_project_path_change(self, *_):
+        """Con la vigilancia activa, la reinicia sobre la nueva ruta cuando se deja de editar."""
+        if not self.watch_var.get():
+            return
+        if self._watch_restart_id is not None:
+            self.after_cancel(self._watch_restart_id)
+        self._watch_restart_id = self.after(WATCH_RESTART_DELAY_MS, self._restart_watch)
 
-    def run_ai_analyzer_qa(self):
-        self._execute_specialist_logic(AI_ANALYZER_QA_CLASS, "Ingeniero QA", self.qa_path_var.get())
-        
-    def run_ai_analyzer_backend(self):
-        self._execute_specialist_logic(AI_ANALYZER_BACKEND_CLASS, "Backend (Spring)", self.backend_path_var.get())
+    def _restart_watch(self):
+        self._watch_restart_id = None
+        if self.watch_var.get():
+            self.toggle_watch()
 
-    def run_ai_analyzer_frontend(self):
-        self._execute_specialist_logic(AI_ANALYZER_FRONTEND_CLASS, "Frontend (UI/UX)", self.frontend_path_var.get())
+    # ------------------------------------
+    # Ejecución concurrente de especialistas (JobScheduler)
+    # ------------------------------------
 
-    def run_ai_analyzer_devops(self):
-        self._execute_specialist_logic(AI_ANALYZER_DEVOPS_CLASS, "DevOps (CI/CD)", self.devops_path_var.get())
+    def run_all_specialists(self):
+        """Encola los seis especialistas en el planificador; se ejecutan en paralelo hasta el límite configurado."""
+        self._apply_concurrency()
+        self._apply_engine_settings()
+        self._start_trace_run()
+        self.log_output(f"\n--- Encolando {len(SPECIALISTS)} especialistas (concurrencia: {self.concurrency_var.get()}) ---")
+        for key, class_name, role_name, _ in SPECIALISTS:
+            self.scheduler.submit(class_name, role_name, self.specialist_path_vars[key].get())
 
-    def run_ai_analyzer_generic(self):
-        self._execute_specialist_logic(AI_ANALYZER_GENERIC_CLASS, "Genérico (SOLID)", self.generic_path_var.get())
+    def _apply_concurrency(self):
+        try:
+            self.scheduler.set_max_concurrency(self.concurrency_var.get())
+        except (tk.TclError, ValueError):
+            self.concurrency_var.set(DEFAULT_SPECIALIST_CONCURRENCY)
+
+    def cancel_selected_job(self):
+        """Cancela los trabajos seleccionados en la tabla de estado."""
+        for item in self.jobs_tree.selection():
+            self.scheduler.cancel(int(item))
+
+    def _on_job_change(self, job):
+        """Refresca la fila del trabajo en la tabla (llamado desde cualquier hilo)."""
+        self.after(0, self._refresh_job_row, job)
+        if self.engine.trace and job.status in JOB_FINISHED_STATES and not self.scheduler.is_busy():
+            self.after(0, self._finish_trace_run)
+
+    def _refresh_job_row(self, job):
+        values = (job.role_name, job.target_file_path, job.status, f"{job.elapsed():.1f}")
+        iid = str(job.job_id)
+        if self.jobs_tree.exists(iid):
+            self.jobs_tree.item(iid, values=values)
+        else:
+            self.jobs_tree.insert("", tk.END, iid=iid, values=values)
+        if job.status == JOB_RUNNING:
+            # Actualizar la duración mientras el trabajo sigue en curso
+            self.after(1000, lambda: job.status == JOB_RUNNING and self._refresh_job_row(job))
 
     # ------------------------------------
-    # Control del API Web 
+    # Control del API Web
     # ------------------------------------
 
     def start_api(self):
-        """Inicia el Web API en un proceso separado."""
+        """Inicia el Web API como proceso supervisado (su salida llega al log por lotes)."""
         if self.api_process and self.api_process.poll() is None:
             self.log_output("El Web API ya está corriendo.", is_error=False)
             return
 
-        self.btn_start_api.config(state=tk.DISABLED)
-        self.api_status_var.set("API: Iniciando...")
         self.log_output("\n--- Iniciando Java Web API en segundo plano ---")
+        if not os.path.exists(JAR_PATH):
+            self.log_output(f"ERROR: JAR no encontrado en {JAR_PATH}. ¿Ha compilado el proyecto?", is_error=True)
+            return
 
-        threading.Thread(target=self._api_starter_logic, daemon=True).start()
-
-    def _api_starter_logic(self):
         try:
-            if not os.path.exists(JAR_PATH):
-                self.log_output(f"ERROR: JAR no encontrado en {JAR_PATH}. ¿Ha compilado el proyecto?", is_error=True)
-                return
-
-            self.api_process = subprocess.Popen(
+            self.api_process = self.engine.supervisor.start(
                 [JAVA_CMD, "-jar", JAR_PATH],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1 
+                self.engine.handle_output_batch,
+                on_exit=lambda process: self.after(0, self._on_api_exit, process)
             )
-            self.log_output(f"Web API iniciado con PID: {self.api_process.pid}")
-            self.api_status_var.set(f"API: Corriendo (PID: {self.api_process.pid})")
-            self.btn_stop_api.config(state=tk.NORMAL)
-            
-            stdout_thread = threading.Thread(target=self._read_stream, args=(self.api_process.stdout, False), daemon=True)
-            stderr_thread = threading.Thread(target=self._read_stream, args=(self.api_process.stderr, True), daemon=True)
-            stdout_thread.start()
-            stderr_thread.start()
-
-            self.api_process.wait()
-            return_code = self.api_process.returncode
-
-            stdout_thread.join()
-            stderr_thread.join()
-
-            self.log_output(f"Web API terminó con código: {return_code}", is_error=(return_code != 0))
-            self.api_status_var.set("API: Detenido")
-            self.btn_stop_api.config(state=tk.DISABLED)
-
         except Exception as e:
-            self.log_output(f"ERROR al iniciar/monitorear el API: {e}", is_error=True)
+            self.log_output(f"ERROR al iniciar el API: {e}", is_error=True)
             self.api_status_var.set("API: Error")
-        finally:
-            self.btn_start_api.config(state=tk.NORMAL)
+            return
 
+        self.log_output(f"Web API iniciado con PID: {self.api_process.pid}")
+        self.api_status_var.set(f"API: Corriendo (PID: {self.api_process.pid})")
+        self.btn_start_api.config(state=tk.DISABLED)
+        self.btn_stop_api.config(state=tk.NORMAL)
+
+    def _on_api_exit(self, process):
+        """Actualiza el estado al terminar el proceso del API (en el hilo de Tkinter)."""
+        self.log_output(f"Web API terminó con código: {process.returncode}", is_error=(process.returncode != 0))
+        self.api_status_var.set("API: Detenido")
+        self.btn_stop_api.config(state=tk.DISABLED)
+        self.btn_start_api.config(state=tk.NORMAL)
 
     def stop_api(self):
         """Detiene el proceso del Web API de forma controlada."""
@@ -609,13 +895,91 @@ class OrchestratorApp(tk.Tk):
             self.api_status_var.set("API: Detenido")
             self.btn_start_api.config(state=tk.NORMAL)
 
+    # ------------------------------------
+    # Control del Worker JVM
+    # ------------------------------------
+
+    def start_worker(self):
+        """Inicia el worker JVM persistente como proceso supervisado."""
+        if self.worker_process and self.worker_process.poll() is None:
+            self.log_output("El worker JVM ya está corriendo.", is_error=False)
+            return
+
+        self.log_output("\n--- Iniciando Worker JVM en segundo plano ---")
+        if not os.path.exists(JAR_PATH):
+            self.log_output(f"ERROR: JAR no encontrado en {JAR_PATH}. ¿Ha compilado el proyecto?", is_error=True)
+            return
+
+        try:
+            # Token de este arranque: el worker rechaza las peticiones de otros procesos locales
+            token = new_worker_token()
+            self.worker_process = self.engine.supervisor.start(
+                [JAVA_CMD, "-cp", JAR_PATH, JVM_WORKER_CLASS, str(self.engine.worker_port)],
+                self.engine.handle_output_batch,
+                on_exit=lambda process: self.after(0, self._on_worker_exit, process),
+                env=dict(os.environ, **{WORKER_TOKEN_ENV: token})
+            )
+            self.engine.worker_token = token
+        except Exception as e:
+            self.log_output(f"ERROR al iniciar el worker JVM: {e}", is_error=True)
+            self.worker_status_var.set("Worker: Error")
+            return
+
+        self.log_output(f"Worker JVM iniciado con PID: {self.worker_process.pid} (puerto {self.engine.worker_port})")
+        self.worker_status_var.set(f"Worker: Corriendo (PID: {self.worker_process.pid})")
+        self.btn_start_worker.config(state=tk.DISABLED)
+        self.btn_stop_worker.config(state=tk.NORMAL)
+
+    def _on_worker_exit(self, process):
+        """Actualiza el estado al terminar el worker JVM (en el hilo de Tkinter)."""
+        self.engine.worker_token = None
+        try:
+            os.remove(WORKER_TOKEN_FILE)
+        except OSError:
+            pass
+        self.log_output(f"Worker JVM terminó con código: {process.returncode}", is_error=(process.returncode not in (0, -15, 143)))
+        self.worker_status_var.set("Worker: Detenido")
+        self.btn_stop_worker.config(state=tk.DISABLED)
+        self.btn_start_worker.config(state=tk.NORMAL)
+
+    def stop_worker(self):
+        """Detiene el worker JVM; las tareas posteriores vuelven a lanzar procesos 'java' independientes."""
+        if not self.worker_process or self.worker_process.poll() is not None:
+            self.log_output("El worker JVM no está corriendo.", is_error=False)
+            self.btn_stop_worker.config(state=tk.DISABLED)
+            self.worker_status_var.set("Worker: Detenido")
+            return
+
+        self.log_output("\n--- Deteniendo Worker JVM ---", is_error=False)
+        self.btn_stop_worker.config(state=tk.DISABLED)
+        self.worker_status_var.set("Worker: Deteniendo...")
+        # La espera puede durar hasta 10 s mientras el worker termina sus tareas: fuera del hilo de Tkinter
+        threading.Thread(target=self._worker_stopper_logic, args=(self.worker_process,), daemon=True).start()
+
+    def _worker_stopper_logic(self, process):
+        """Termina el worker y, si no lo hace en 10 s, lo mata; _on_worker_exit actualiza el estado."""
+        try:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.log_output("El worker JVM no terminó de forma suave. Matándolo forzosamente.", is_error=True)
+                process.kill()
+        except Exception as e:
+            self.log_output(f"ERROR al detener el worker JVM: {e}", is_error=True)
+
     def on_closing(self):
         """Se asegura de que el API se detenga al cerrar la ventana principal."""
         
         # Cerrar también la ventana flotante
         if self.console_window:
             self.console_window.destroy()
-            
+
+        if self.worker_process and self.worker_process.poll() is None:
+            self.worker_process.terminate()
+
+        self.scheduler.cancel_all()
+
         if self.api_process and self.api_process.poll() is None:
             if messagebox.askyesno("Salir", "El Web API está corriendo. ¿Desea detenerlo y cerrar la aplicación?"):
                 threading.Thread(target=self._stop_and_close, daemon=True).start()
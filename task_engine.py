@@ -0,0 +1,1708 @@
+"""
+Motor de tareas del orquestador: compilación Maven, generación del contexto, análisis con IA y
+especialistas, sin dependencias de interfaz gráfica. Lo usan la GUI (main.py) y la CLI (cli.py).
+"""
+import asyncio
+import contextlib
+import subprocess
+import threading
+import socket
+import sys
+import os
+import time
+import collections
+import itertools
+import re
+import shlex
+import hashlib
+import secrets
+import json
+import ctypes
+import errno
+import select
+import struct
+import tempfile
+from xml.etree import ElementTree
+
+# --- Constantes del Proyecto ---
+JAVA_CMD = "java"
+JAR_PATH = os.path.join(".", "launcher-app", "target", "ourcrud-java-all-1.0-SNAPSHOT.jar")
+# Contexto comprimido e indexado (ContextArchive); para obtener el texto plano:
+# java -cp <jar> com.myproject.core.ContextArchive contexto.ctx contexto.txt
+CONTEXT_FILE = os.path.join(".", "contexto.ctx")
+
+# Clases de Funcionalidad Base
+FILE_PROCESSOR_CLASS = "com.myproject.core.FileProcessor"
+INCREMENTAL_CONTEXT_CLASS = "com.myproject.core.IncrementalContextBuilder"
+AI_ANALYZER_CLASS = "com.myproject.core.AIAnalyzer"
+BATCH_CORRECTOR_CLASS = "com.myproject.core.BatchCorrector"
+
+# Clases de Especialistas (extienden de Especialista.java)
+AI_ANALYZER_DB_CLASS = "com.myproject.core.AIAnalyzerDB"
+AI_ANALYZER_QA_CLASS = "com.myproject.core.AIAnalyzerQA"
+AI_ANALYZER_BACKEND_CLASS = "com.myproject.core.AIAnalyzerBackend" 
+AI_ANALYZER_FRONTEND_CLASS = "com.myproject.core.AIAnalyzerFrontend"
+AI_ANALYZER_DEVOPS_CLASS = "com.myproject.core.AIAnalyzerDevOps"
+AI_ANALYZER_GENERIC_CLASS = "com.myproject.core.AIAnalyzerGeneric"
+
+# Opciones JVM por defecto para cada tipo de tarea (heap y GC, p. ej. "-Xmx2g -XX:+UseG1GC"); editables desde la GUI
+DEFAULT_PROCESS_JVM_OPTIONS = ""
+DEFAULT_ANALYSIS_JVM_OPTIONS = ""
+
+# Rutas por defecto del proyecto a procesar y de la salida del AIAnalyzer original
+DEFAULT_PROJECT_PATH = "./gemini-tools-core"
+DEFAULT_ANALYZER_PATH = "./bbdd.txt"
+
+# Hilos de lectura en paralelo para la generación del contexto
+DEFAULT_READER_THREADS = min(8, os.cpu_count() or 1)
+
+# Tiempo límite por defecto de cada tarea, en segundos (0 = sin límite)
+DEFAULT_COMMAND_TIMEOUT = 300
+
+# Supervisor de procesos: intervalo y tamaño máximo de los lotes de salida, tamaño de lectura de las
+# tuberías, espera antes de forzar el cierre de un proceso que no termina y espera de las últimas líneas
+OUTPUT_BATCH_INTERVAL = 0.05
+OUTPUT_MAX_BATCH = 500
+OUTPUT_READ_BYTES = 64 * 1024
+PROCESS_KILL_GRACE_SECONDS = 5
+OUTPUT_DRAIN_SECONDS = 5
+
+# Trazas: prefijo de los eventos que emiten las clases Java con --trace, carpeta de los archivos de traza
+# e intervalo de muestreo de la memoria residente de los procesos hijos
+TRACE_PREFIX = "[TRACE] "
+TRACE_DIR = os.path.join(".", "trazas")
+RSS_SAMPLE_INTERVAL = 0.2
+
+# Modo vigilancia: espera sin eventos nuevos antes de actualizar el contexto (agrupa ráfagas de cambios),
+# intervalo del sondeo cuando inotify no está disponible y espera máxima de un análisis por el contexto
+WATCH_DEBOUNCE_SECONDS = 0.5
+WATCH_POLL_INTERVAL = 2.0
+WATCH_FLUSH_TIMEOUT = 120
+# Extensiones y directorios excluidos del contexto (los de ProjectWalker); el modo vigilancia los usa como
+# filtro previo y deja .gitignore, binarios y presupuestos a ProjectWalker
+CONTEXT_EXTENSIONS = (".java", ".xml", ".md", ".json", ".php", ".py", ".txt", ".csv")
+CONTEXT_EXCLUDED = ("target", ".git", "node_modules")
+
+# Selección de archivos del contexto: tamaño máximo por archivo y total en KB (0 = sin límite) y archivos
+# de exclusiones con sintaxis .gitignore (un cambio en ellos obliga a revisar el proyecto completo)
+DEFAULT_MAX_FILE_KB = 1024
+DEFAULT_MAX_TOTAL_KB = 0
+DEFAULT_IGNORE_FILE = ".contextignore"
+IGNORE_FILE_NAMES = (".gitignore", DEFAULT_IGNORE_FILE)
+
+# Worker JVM persistente (evita el arranque de la JVM en cada tarea)
+JVM_WORKER_CLASS = "com.myproject.core.JvmWorker"
+WORKER_HOST = "127.0.0.1"
+WORKER_PORT = int(os.environ.get("JVM_WORKER_PORT", "5055"))
+# Token por arranque del worker: se le pasa en JVM_WORKER_TOKEN y cada petición lo envía como primera línea.
+# La GUI lo guarda en un archivo legible solo por el usuario para que la CLI también pueda usar el worker
+WORKER_TOKEN_ENV = "JVM_WORKER_TOKEN"
+WORKER_TOKEN_FILE = os.path.join(".", ".jvm-worker.token")
+
+
+# Caché de compilación: módulos Maven (en orden del reactor) y registro de huellas del último JAR generado
+BUILD_MODULES = ["gemini-tools-core", "java-db-project", "launcher-app"]
+BUILD_FINGERPRINT_FILE = os.path.join(".", "launcher-app", "target", "build-fingerprint.json")
+BUILD_ROOT_KEY = "<root>"
+# Línea del resumen del reactor, p. ej. "[INFO] gemini-tools-core ...... SUCCESS [  1.234 s]"
+# Errores de Maven que indican que faltan artefactos en el repositorio local al compilar con -o
+MAVEN_OFFLINE_FAILURE = re.compile(
+    r"in offline mode|Could not resolve dependencies|Could not resolve plugin|"
+    r"Plugin .+ or one of its dependencies could not be resolved|has not been downloaded from it before"
+)
+MAVEN_REACTOR_LINE = re.compile(r"^\[INFO\] (.+?) \.+ ?(SUCCESS|FAILURE|SKIPPED)(?: \[\s*([\d.:]+) (s|min)\])?")
+
+# Prefijo de las líneas de texto parcial que emiten las clases de análisis en modo streaming
+STREAM_PREFIX = "[STREAM] "
+
+# Especialistas disponibles: (clave, clase Java, nombre del rol, ruta de destino por defecto)
+SPECIALISTS = [
+    ("dba", AI_ANALYZER_DB_CLASS, "Ingeniero DBA", "./ia_consultas/guide_dba.md"),
+    ("qa", AI_ANALYZER_QA_CLASS, "Ingeniero QA", "./ia_consultas/guide_qa.md"),
+    ("backend", AI_ANALYZER_BACKEND_CLASS, "Backend (Spring)", "./ia_consultas/guide_backend.md"),
+    ("frontend", AI_ANALYZER_FRONTEND_CLASS, "Frontend (UI/UX)", "./ia_consultas/guide_frontend.md"),
+    ("devops", AI_ANALYZER_DEVOPS_CLASS, "DevOps (CI/CD)", "./ia_consultas/guide_devops.md"),
+    ("generic", AI_ANALYZER_GENERIC_CLASS, "Genérico (SOLID)", "./ia_consultas/guide_solid.md"),
+]
+
+# Map-reduce de los especialistas (MapReduceAnalyzer): tamaño máximo de cada fragmento del contexto en
+# tokens estimados (0 = una sola petición siempre) y peticiones de fragmentos en paralelo
+DEFAULT_SHARD_TOKENS = 200000
+DEFAULT_FAN_OUT = 4
+
+# Corrección por lotes (BatchCorrector): correcciones enviadas en paralelo e informe del lote
+DEFAULT_BATCH_PARALLEL = 4
+BATCH_REPORT_FILE = os.path.join(".", "correccion-lote.md")
+
+# Concurrencia por defecto del planificador ("Ejecutar todos los especialistas")
+DEFAULT_SPECIALIST_CONCURRENCY = len(SPECIALISTS)
+
+# Estados de los trabajos del planificador
+JOB_QUEUED = "En cola"
+JOB_RUNNING = "Ejecutando"
+JOB_DONE = "Completado"
+JOB_FAILED = "Error"
+JOB_CANCELLED = "Cancelado"
+JOB_FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+# ====================================
+# PLANIFICADOR DE TRABAJOS
+# ====================================
+def new_worker_token(path=WORKER_TOKEN_FILE):
+    """Genera el token de un nuevo arranque del worker JVM y lo guarda con permisos 0600."""
+    token = secrets.token_hex(16)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    # Por si el archivo ya existía con otros permisos
+    os.chmod(path, 0o600)
+    return token
+
+
+def read_worker_token(path=WORKER_TOKEN_FILE):
+    """Token del worker JVM en marcha, o None si no se ha iniciado ninguno desde la GUI."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def cancel_worker_job(sock):
+    """
+    Pide al worker JVM que interrumpa la tarea de la conexión (línea CANCEL) y cierra la conexión;
+    el cierre también la cancela si la línea no llega a enviarse.
+    """
+    try:
+        sock.sendall(b"CANCEL\n")
+    except OSError:
+        pass
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class SpecialistJob:
+    """Trabajo de especialista gestionado por el JobScheduler."""
+    def __init__(self, job_id, class_name, role_name, target_file_path, timeout=None):
+        self.job_id = job_id
+        self.class_name = class_name
+        self.role_name = role_name
+        self.target_file_path = target_file_path
+        # Tiempo límite propio en segundos (None = el del motor de tareas)
+        self.timeout = timeout
+        self.status = JOB_QUEUED
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        # Recurso en curso (proceso supervisado o socket del worker), usado para la cancelación
+        self.process = None
+        self.socket = None
+
+    def elapsed(self):
+        """Segundos de ejecución (hasta ahora si sigue en curso)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def terminate(self):
+        """Interrumpe el proceso o la tarea del worker asociados al trabajo."""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        if self.socket:
+            cancel_worker_job(self.socket)
+
+
+class JobScheduler:
+    """
+    Planificador con cola FIFO y límite de concurrencia configurable.
+    Cada trabajo se ejecuta en su propio hilo; on_change se invoca en cada cambio de estado.
+    """
+    def __init__(self, run_job, on_change, max_concurrency=DEFAULT_SPECIALIST_CONCURRENCY):
+        self._run_job = run_job
+        self._on_change = on_change
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._pending = collections.deque()
+        self._jobs = {}
+        self._running = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._ids = itertools.count(1)
+
+    def set_max_concurrency(self, value):
+        """Cambia el límite de concurrencia; se aplica a los trabajos aún en cola."""
+        with self._lock:
+            self._max_concurrency = max(1, int(value))
+            started = self._dispatch_locked()
+        self._notify(started)
+
+    def submit(self, class_name, role_name, target_file_path, timeout=None):
+        """Encola un trabajo y lo inicia si hay hueco disponible. timeout: límite propio en segundos."""
+        with self._lock:
+            job = SpecialistJob(next(self._ids), class_name, role_name, target_file_path, timeout)
+            self._jobs[job.job_id] = job
+            self._pending.append(job)
+        self._on_change(job)
+        with self._lock:
+            started = self._dispatch_locked()
+        self._notify(started)
+        return job
+
+    def cancel(self, job_id):
+        """Cancela un trabajo en cola o en ejecución. Devuelve False si ya había terminado."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in JOB_FINISHED_STATES:
+                return False
+            job.cancel_event.set()
+            was_pending = job in self._pending
+            if was_pending:
+                self._pending.remove(job)
+                job.status = JOB_CANCELLED
+                self._idle.notify_all()
+        if was_pending:
+            self._on_change(job)
+        else:
+            job.terminate()
+        return True
+
+    def cancel_all(self):
+        """Cancela todos los trabajos pendientes y en ejecución."""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+
+    def is_busy(self):
+        with self._lock:
+            return self._running > 0 or bool(self._pending)
+
+    def wait_idle(self, timeout=None):
+        """Espera a que no queden trabajos en cola ni en ejecución. Devuelve False si vence el timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._running == 0 and not self._pending, timeout)
+
+    def _dispatch_locked(self):
+        started = []
+        while self._pending and self._running < self._max_concurrency:
+            job = self._pending.popleft()
+            self._running += 1
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            threading.Thread(target=self._execute, args=(job,), daemon=True).start()
+            started.append(job)
+        return started
+
+    def _notify(self, jobs):
+        for job in jobs:
+            self._on_change(job)
+
+    def _execute(self, job):
+        try:
+            success = self._run_job(job)
+            if job.cancel_event.is_set():
+                job.status = JOB_CANCELLED
+            else:
+                job.status = JOB_DONE if success else JOB_FAILED
+        except Exception:
+            job.status = JOB_FAILED
+            raise
+        finally:
+            job.finished_at = time.time()
+            job.process = None
+            job.socket = None
+            with self._lock:
+                self._running -= 1
+                started = self._dispatch_locked()
+                self._idle.notify_all()
+            self._on_change(job)
+            self._notify(started)
+
+
+# ====================================
+# CACHÉ DE COMPILACIÓN MAVEN
+# ====================================
+class BuildCache:
+    """
+    Huella de las fuentes de cada módulo Maven (archivos de src/ y pom.xml) asociada al último
+    JAR sombreado generado con éxito. Permite omitir la compilación si nada cambió y, si no,
+    limitarla a los módulos modificados y a los que dependen de ellos.
+    """
+    def __init__(self, root=".", modules=BUILD_MODULES, jar_path=JAR_PATH, cache_file=BUILD_FINGERPRINT_FILE):
+        self.root = root
+        self.modules = list(modules)
+        self.jar_path = jar_path
+        self.cache_file = cache_file
+
+    def _hash_file(self, digest, path):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(block)
+
+    def module_fingerprint(self, module):
+        """SHA-256 de las rutas y contenidos de src/ y pom.xml del módulo, en orden determinista."""
+        digest = hashlib.sha256()
+        module_dir = os.path.join(self.root, module)
+        files = [os.path.join(module_dir, "pom.xml")]
+        for dirpath, dirnames, filenames in os.walk(os.path.join(module_dir, "src")):
+            dirnames.sort()
+            files.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+        for path in files:
+            if not os.path.isfile(path):
+                continue
+            digest.update(os.path.relpath(path, module_dir).replace(os.sep, "/").encode("utf-8") + b"\0")
+            self._hash_file(digest, path)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def fingerprints(self):
+        """Huellas actuales: una por módulo, más la del pom.xml raíz (clave BUILD_ROOT_KEY)."""
+        result = {module: self.module_fingerprint(module) for module in self.modules}
+        digest = hashlib.sha256()
+        root_pom = os.path.join(self.root, "pom.xml")
+        if os.path.isfile(root_pom):
+            self._hash_file(digest, root_pom)
+        result[BUILD_ROOT_KEY] = digest.hexdigest()
+        return result
+
+    def _jar_stamp(self):
+        if not os.path.isfile(self.jar_path):
+            return None
+        stat = os.stat(self.jar_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, fingerprints):
+        """Registra las huellas tras una compilación correcta, junto con el sello del JAR generado."""
+        stamp = self._jar_stamp()
+        if stamp is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        temp = self.cache_file + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"jar": stamp, "modules": fingerprints}, f, indent=2)
+        os.replace(temp, self.cache_file)
+
+    def changed_modules(self, fingerprints):
+        """
+        Módulos cuyas fuentes cambiaron respecto a la última compilación correcta.
+        Devuelve None si hace falta una compilación completa (sin registro, JAR ausente o
+        modificado, o pom.xml raíz cambiado) y una lista vacía si no hay nada que compilar.
+        """
+        previous = self.load()
+        if not previous or previous.get("jar") != self._jar_stamp():
+            return None
+        modules = previous.get("modules", {})
+        if modules.get(BUILD_ROOT_KEY) != fingerprints.get(BUILD_ROOT_KEY):
+            return None
+        return [module for module in self.modules if modules.get(module) != fingerprints.get(module)]
+
+    def display_names(self):
+        """Nombre con el que Maven muestra cada módulo en el resumen del reactor (<name> o artifactId)."""
+        names = {}
+        for module in self.modules:
+            name = module
+            try:
+                tree = ElementTree.parse(os.path.join(self.root, module, "pom.xml"))
+                ns = {"m": "http://maven.apache.org/POM/4.0.0"}
+                element = tree.getroot().find("m:name", ns)
+                if element is not None and element.text:
+                    name = element.text.strip()
+            except (OSError, ElementTree.ParseError):
+                pass
+            names[name] = module
+        return names
+
+
+def parse_reactor_times(lines):
+    """
+    Extrae del resumen del reactor de Maven ("Reactor Summary") el estado y la duración
+    en segundos de cada módulo: {nombre: (estado, segundos o None)}.
+    """
+    times = {}
+    for line in lines:
+        match = MAVEN_REACTOR_LINE.match(line)
+        if not match:
+            continue
+        name, status, value, unit = match.groups()
+        seconds = None
+        if value:
+            if ":" in value:
+                minutes, secs = value.split(":")
+                seconds = int(minutes) * 60 + float(secs)
+            else:
+                seconds = float(value)
+            if unit == "min" and ":" not in value:
+                seconds *= 60
+        times[name.strip()] = (status, seconds)
+    return times
+
+
+def output_path_for(target_file_path):
+    """Archivo que generan las clases de análisis: para un destino .java, su copia '-corregido'."""
+    if target_file_path.lower().endswith(".java"):
+        base_name, ext = os.path.splitext(target_file_path)
+        return base_name + "-corregido" + ext
+    return target_file_path
+
+
+def parse_jvm_options(text):
+    """Convierte un texto de opciones JVM en una lista de argumentos. Lanza ValueError si es inválido."""
+    return shlex.split(text or "")
+
+
+# ====================================
+# TRAZAS DE TIEMPOS
+# ====================================
+class Tracer:
+    """
+    Recoge los tramos de tiempo de una ejecución, tanto los medidos en Python como los que emiten
+    las clases Java con --trace (líneas TRACE_PREFIX + JSON), y los exporta en formato Chrome trace
+    (chrome://tracing o https://ui.perfetto.dev). Los tiempos son microsegundos desde la época.
+    """
+    def __init__(self):
+        self.pid = os.getpid()
+        self._events = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now_us():
+        return time.time_ns() // 1000
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """Mide el bloque como un evento completo; el diccionario devuelto admite argumentos adicionales."""
+        start = self.now_us()
+        start_ns = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            self.add({"name": name, "cat": "python", "ph": "X", "ts": start,
+                      "dur": (time.perf_counter_ns() - start_ns) // 1000,
+                      "pid": self.pid, "tid": threading.get_native_id(), "args": args})
+
+    def add(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def add_json(self, text, **args):
+        """Añade un evento emitido por Java (JSON); args se agregan a los suyos. Devuelve el evento o None si es inválido."""
+        try:
+            event = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(event, dict) or "ts" not in event:
+            return None
+        event.setdefault("args", {}).update(args)
+        self.add(event)
+        return event
+
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def save(self, path):
+        """Escribe la traza en formato Chrome trace, con el nombre de cada proceso."""
+        events = self.events()
+        names = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                  "args": {"name": "Orquestador (Python)" if pid == self.pid else f"JVM {pid}"}}
+                 for pid in sorted({event.get("pid") for event in events if event.get("pid") is not None})]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return path
+
+    def summary(self):
+        """
+        Resumen por etapa: lista de dicts (name, cat, count, total_ms, max_ms, bytes, rss_kb) ordenada por
+        tiempo total. Los eventos de contador (memoria) aportan solo el pico de memoria residente.
+        """
+        rows = {}
+        for event in self.events():
+            if event.get("ph") not in ("X", "C"):
+                continue
+            key = (event.get("name"), event.get("cat"))
+            row = rows.setdefault(key, {"name": key[0], "cat": key[1], "count": 0, "total_ms": 0.0,
+                                        "max_ms": 0.0, "bytes": 0, "rss_kb": None})
+            args = event.get("args") or {}
+            row["count"] += 1
+            duration = event.get("dur", 0) / 1000.0
+            row["total_ms"] += duration
+            row["max_ms"] = max(row["max_ms"], duration)
+            if isinstance(args.get("bytes"), int):
+                row["bytes"] += args["bytes"]
+            rss = args.get("rss_pico_kb")
+            if isinstance(rss, int):
+                row["rss_kb"] = max(row["rss_kb"] or 0, rss)
+        return sorted(rows.values(), key=lambda row: row["total_ms"], reverse=True)
+
+
+def format_trace_summary(rows):
+    """Tabla de texto con el resumen de la traza (para el log y la CLI)."""
+    lines = [f"{'Etapa':<28} {'Origen':<7} {'Llamadas':>8} {'Total (ms)':>11} {'Máx (ms)':>10} {'Bytes':>12} {'Pico RSS (MB)':>13}"]
+    for row in rows:
+        rss = f"{row['rss_kb'] / 1024:.1f}" if row["rss_kb"] is not None else "-"
+        lines.append(f"{row['name']:<28} {row['cat']:<7} {row['count']:>8} {row['total_ms']:>11.1f} "
+                     f"{row['max_ms']:>10.1f} {row['bytes'] or '-':>12} {rss:>13}")
+    return lines
+
+
+def read_peak_rss_kb(pid):
+    """Pico de memoria residente (VmHWM) de un proceso en KB, o None si no está disponible (fuera de Linux)."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii", errors="replace") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+# ====================================
+# SUPERVISOR DE PROCESOS (ASYNCIO)
+# ====================================
+class SupervisedProcess:
+    """
+    Proceso hijo gestionado por el ProcessSupervisor. Ofrece la interfaz de subprocess.Popen que
+    usan las tareas (poll, wait, terminate, kill), segura para llamarse desde cualquier hilo.
+    """
+    def __init__(self, supervisor, args):
+        self.args = args
+        self.pid = None
+        self.returncode = None
+        self.timed_out = False
+        # Pico de memoria residente en KB (solo si se pidió el muestreo y el sistema lo permite)
+        self.peak_rss_kb = None
+        self._supervisor = supervisor
+        self._process = None
+        self._requested_signal = None
+        self._done = threading.Event()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def terminate(self):
+        self._supervisor.call_soon(self._send_signal, "terminate")
+
+    def kill(self):
+        self._supervisor.call_soon(self._send_signal, "kill")
+
+    def _send_signal(self, name):
+        # Se ejecuta en el hilo del bucle de eventos
+        if self._process is None:
+            self._requested_signal = name   # Aún no arrancó: se aplica al crearse
+            return
+        if self._process.returncode is None:
+            try:
+                getattr(self._process, name)()
+            except ProcessLookupError:
+                pass
+
+
+class ProcessSupervisor:
+    """
+    Supervisa todos los procesos hijos desde un único bucle asyncio en un hilo de fondo:
+    multiplexa su stdout y stderr sin hilos lectores, aplica un tiempo límite por proceso y
+    entrega la salida por lotes (cada OUTPUT_BATCH_INTERVAL segundos o cada OUTPUT_MAX_BATCH líneas)
+    a on_output(lines), donde lines es una lista de (línea, is_error).
+    """
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._tasks = set()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="process-supervisor", daemon=True)
+        self._thread.start()
+
+    def call_soon(self, callback, *args):
+        self._loop.call_soon_threadsafe(callback, *args)
+
+    def start(self, command_parts, on_output, cwd=None, timeout=None, on_exit=None, sample_rss=False, env=None):
+        """
+        Lanza un proceso y devuelve su SupervisedProcess en cuanto ha arrancado.
+        env (None = el del proceso actual) es el entorno completo del proceso hijo.
+        timeout (segundos, None o 0 = sin límite) termina el proceso si lo supera; on_exit(process)
+        se invoca desde el hilo del supervisor al terminar, tras entregar toda la salida.
+        Con sample_rss se registra el pico de memoria residente del proceso (peak_rss_kb).
+        Propaga FileNotFoundError si el ejecutable no existe.
+        """
+        process = SupervisedProcess(self, command_parts)
+        future = asyncio.run_coroutine_threadsafe(
+            self._spawn(process, command_parts, cwd, on_output, timeout or None, on_exit, sample_rss, env), self._loop)
+        future.result()
+        return process
+
+    def close(self):
+        """Detiene el bucle de eventos (los procesos en curso no se terminan)."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    async def _spawn(self, process, command_parts, cwd, on_output, timeout, on_exit, sample_rss, env):
+        child = await asyncio.create_subprocess_exec(
+            *command_parts, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd, env=env)
+        process._process = child
+        process.pid = child.pid
+        if process._requested_signal:
+            process._send_signal(process._requested_signal)
+        task = self._loop.create_task(self._supervise(process, on_output, timeout, on_exit, sample_rss))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _sample_rss(self, process):
+        # VmHWM ya es un pico: basta con quedarse con la última lectura antes de que termine el proceso
+        while True:
+            value = read_peak_rss_kb(process.pid)
+            if value is None:
+                return
+            process.peak_rss_kb = value
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+    async def _supervise(self, process, on_output, timeout, on_exit, sample_rss):
+        child = process._process
+        sampler = self._loop.create_task(self._sample_rss(process)) if sample_rss else None
+        batch = []
+        flush_timer = None
+
+        def flush():
+            nonlocal flush_timer
+            if flush_timer is not None:
+                flush_timer.cancel()
+                flush_timer = None
+            if batch:
+                lines = batch[:]
+                batch.clear()
+                try:
+                    on_output(lines)
+                except Exception as e:
+                    print(f"[ERROR] Fallo al entregar la salida de {process.args[0]}: {e}", file=sys.stderr)
+
+        def add(line, is_error):
+            nonlocal flush_timer
+            batch.append((line, is_error))
+            if len(batch) >= OUTPUT_MAX_BATCH:
+                flush()
+            elif flush_timer is None:
+                flush_timer = self._loop.call_later(OUTPUT_BATCH_INTERVAL, flush)
+
+        async def pump(stream, is_error):
+            # Lectura por bloques: una sola activación del bucle por bloque, no por línea
+            pending = bytearray()
+            while True:
+                chunk = await stream.read(OUTPUT_READ_BYTES)
+                if not chunk:
+                    break
+                pending += chunk
+                end = pending.rfind(b"\n")
+                if end == -1:
+                    continue
+                for line in bytes(pending[:end]).split(b"\n"):
+                    add(line.decode("utf-8", errors="replace") + "\n", is_error)
+                del pending[:end + 1]
+            if pending:
+                add(pending.decode("utf-8", errors="replace"), is_error)
+
+        readers = asyncio.gather(pump(child.stdout, False), pump(child.stderr, True))
+        try:
+            await asyncio.wait_for(asyncio.shield(child.wait()), timeout)
+        except asyncio.TimeoutError:
+            process.timed_out = True
+            child.terminate()
+            try:
+                await asyncio.wait_for(child.wait(), PROCESS_KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                child.kill()
+                await child.wait()
+        try:
+            # Tras la salida del proceso quedan por leer los últimos datos de las tuberías
+            await asyncio.wait_for(readers, OUTPUT_DRAIN_SECONDS)
+        except asyncio.TimeoutError:
+            pass   # Algún descendiente mantiene la tubería abierta; wait_for ya canceló la lectura
+
+        if sampler is not None:
+            sampler.cancel()
+        flush()
+        process.returncode = child.returncode
+        process._done.set()
+        if on_exit:
+            try:
+                on_exit(process)
+            except Exception as e:
+                print(f"[ERROR] Fallo al notificar el fin de {process.args[0]}: {e}", file=sys.stderr)
+
+
+# ====================================
+# MODO VIGILANCIA DEL CONTEXTO
+# ====================================
+def is_context_file(root, path):
+    """
+    Indica si un archivo puede formar parte del contexto: extensión incluida y ningún directorio excluido
+    por debajo de root (se compara el nombre completo: 'targeting' no se excluye).
+    """
+    return path.endswith(CONTEXT_EXTENSIONS) and not _is_excluded(root, os.path.dirname(path))
+
+
+def _is_excluded(root, path):
+    relative = os.path.relpath(path, root)
+    return any(part in CONTEXT_EXCLUDED for part in relative.split(os.sep))
+
+
+def _watched_dirs(root):
+    """Directorios del árbol, sin entrar en los excluidos del contexto."""
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in CONTEXT_EXCLUDED]
+        yield dirpath
+
+
+class InotifyWatcher:
+    """
+    Vigila un árbol de directorios con inotify (Linux), mediante ctypes y un hilo que espera con select.
+    on_change(paths) recibe las rutas de los archivos del contexto que han cambiado, o None si hay que
+    revisar el proyecto completo (directorios creados, movidos o eliminados, cambios en los archivos de
+    exclusiones o cola de eventos desbordada).
+    start() lanza OSError si inotify no está disponible o se agota el límite de vigilancias.
+    """
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, root, on_change):
+        self.root = root
+        self.on_change = on_change
+        self._fd = None
+        self._wake_r = self._wake_w = None
+        self._watches = {}
+        self._thread = None
+
+    def start(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify solo está disponible en Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self._fd = fd
+        try:
+            self._add_tree(self.root)
+        except OSError:
+            os.close(fd)
+            self._fd = None
+            raise
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="context-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        os.write(self._wake_w, b"x")
+        self._thread.join()
+        self._thread = None
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def _add_tree(self, top):
+        for directory in _watched_dirs(top):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code == errno.ENOSPC or directory == self.root:
+                    raise OSError(code, f"{os.strerror(code)} (inotify_add_watch {directory})")
+                continue   # El directorio desapareció o no es accesible
+            self._watches[wd] = directory
+
+    def _remove_tree(self, top):
+        prefix = top + os.sep
+        for wd, directory in list(self._watches.items()):
+            if directory == top or directory.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _run(self):
+        while True:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            try:
+                paths = self._parse(data)
+            except OSError as e:
+                print(f"[WATCH] Error al vigilar nuevos directorios: {e}", file=sys.stderr)
+                paths = None
+            if paths is None or paths:
+                self.on_change(paths)
+
+    def _parse(self, data):
+        """Procesa un bloque de eventos; devuelve los archivos cambiados o None (revisión completa)."""
+        paths = set()
+        full = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                full = True
+                continue
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & self.IN_ISDIR:
+                if _is_excluded(self.root, path):
+                    continue
+                # Los archivos de un directorio movido o creado no generan eventos propios
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_tree(path)
+                elif mask & self.IN_MOVED_FROM:
+                    self._remove_tree(path)
+                full = True
+            elif name in IGNORE_FILE_NAMES:
+                full = True
+            elif is_context_file(self.root, path):
+                paths.add(path)
+        return None if full else paths
+
+
+class PollingWatcher:
+    """
+    Alternativa a InotifyWatcher para otros sistemas: compara cada WATCH_POLL_INTERVAL segundos el
+    mtime y el tamaño de los archivos del contexto y entrega a on_change(paths) los que cambiaron
+    (None si cambió un archivo de exclusiones).
+    """
+    def __init__(self, root, on_change, interval=WATCH_POLL_INTERVAL):
+        self.root = root
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = {}
+
+    def start(self):
+        self._snapshot = self._scan()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="context-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _scan(self):
+        snapshot = {}
+        for directory in _watched_dirs(self.root):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file() and (entry.name in IGNORE_FILE_NAMES or is_context_file(self.root, entry.path)):
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            current = self._scan()
+            previous, self._snapshot = self._snapshot, current
+            changed = [path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path)]
+            if any(os.path.basename(path) in IGNORE_FILE_NAMES for path in changed):
+                self.on_change(None)
+            elif changed:
+                self.on_change(changed)
+
+
+class ContextWatcher:
+    """
+    Modo vigilancia: mantiene el contexto al día mientras se edita el proyecto. Los eventos de
+    InotifyWatcher (o PollingWatcher si inotify no está disponible) se agrupan hasta que pasan
+    debounce segundos sin cambios, y se aplican en segundo plano con update(paths), que recibe las
+    rutas relativas a la raíz modificadas, o None para revisar el proyecto completo, y devuelve True si
+    terminó bien. Al arrancar se hace una revisión completa.
+    """
+    def __init__(self, root, update, on_log=None, debounce=WATCH_DEBOUNCE_SECONDS, poll_interval=WATCH_POLL_INTERVAL):
+        self.root = root
+        self.update = update
+        self.on_log = on_log or (lambda message, is_error=False: None)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.mode = None
+        self._watcher = None
+        self._thread = None
+        self._cond = threading.Condition()
+        self._pending = set()
+        self._full = False
+        self._last_event = 0.0
+        self._flush_now = False
+        self._stopped = False
+        # Número de lotes de cambios recibidos y aplicados; flush() espera a que se igualen
+        self._requested = 0
+        self._applied = 0
+        self._last_ok = True
+
+    def start(self):
+        try:
+            self._watcher = InotifyWatcher(self.root, self._on_change)
+            self._watcher.start()
+            self.mode = "inotify"
+        except OSError as e:
+            self.on_log(f"[WATCH] inotify no disponible ({e}); se comprueban los cambios cada {self.poll_interval:g} s.")
+            self._watcher = PollingWatcher(self.root, self._on_change, self.poll_interval)
+            self._watcher.start()
+            self.mode = "sondeo"
+        self._on_change(None)
+        self._thread = threading.Thread(target=self._run, name="context-update", daemon=True)
+        self._thread.start()
+        self.on_log(f"👁️ [WATCH] Vigilando {self.root} ({self.mode}).")
+
+    def stop(self):
+        """Detiene la vigilancia; una actualización en curso termina antes de volver."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def flush(self, timeout=None):
+        """
+        Aplica de inmediato los cambios pendientes (sin esperar al debounce) y espera a que el contexto
+        los refleje. Devuelve False si se agotó el tiempo o la última actualización falló.
+        """
+        with self._cond:
+            target = self._requested
+            if self._applied < target:
+                self._flush_now = True
+                self._cond.notify_all()
+            done = self._cond.wait_for(lambda: self._applied >= target or self._stopped, timeout)
+            return done and self._applied >= target and self._last_ok
+
+    def _on_change(self, paths):
+        with self._cond:
+            if paths is None:
+                self._full = True
+            else:
+                self._pending.update(os.path.relpath(path, self.root) for path in paths)
+            self._requested += 1
+            self._last_event = time.monotonic()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and self._applied == self._requested:
+                    self._cond.wait()
+                # Debounce: se espera a que pasen self.debounce segundos sin eventos nuevos
+                while not self._stopped and not self._flush_now:
+                    remaining = self._last_event + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+                paths = None if self._full else sorted(self._pending)
+                target = self._requested
+                self._pending = set()
+                self._full = False
+                self._flush_now = False
+
+            try:
+                ok = bool(self.update(paths))
+            except Exception as e:
+                self.on_log(f"[WATCH] ERROR al actualizar el contexto: {e}", is_error=True)
+                ok = False
+
+            with self._cond:
+                self._applied = max(self._applied, target)
+                self._last_ok = ok
+                self._cond.notify_all()
+
+
+# ====================================
+# MOTOR DE TAREAS
+# ====================================
+class TaskEngine:
+    """
+    Ejecuta las tareas del orquestador (compilación, generación del contexto, análisis y
+    especialistas) sin depender de ninguna interfaz. Los mensajes se entregan a on_log(message, is_error)
+    y cada archivo generado a on_result(label, path); ambos pueden llamarse desde cualquier hilo.
+    La salida de los procesos llega por lotes a on_log_batch([(message, is_error), ...]) si se indica
+    (por defecto, mensaje a mensaje a on_log). La configuración se lee de los atributos públicos
+    en el momento de lanzar cada tarea.
+    """
+    def __init__(self, on_log=None, on_result=None, on_log_batch=None):
+        self.on_log = on_log or (lambda message, is_error=False: None)
+        self.on_result = on_result
+        self.on_log_batch = on_log_batch
+        # Un único bucle asyncio supervisa todos los procesos hijos
+        self.supervisor = ProcessSupervisor()
+
+        self.project_path = DEFAULT_PROJECT_PATH
+        self.reader_threads = DEFAULT_READER_THREADS
+        # Selección de archivos del contexto (ProjectWalker): presupuestos en KB (0 = sin límite),
+        # archivo de exclusiones propio (vacío = .contextignore en la raíz, si existe) y uso de .gitignore
+        self.max_file_kb = DEFAULT_MAX_FILE_KB
+        self.max_total_kb = DEFAULT_MAX_TOTAL_KB
+        self.ignore_file = ""
+        self.use_gitignore = True
+        # Opciones JVM por tarea (se aplican al lanzar un proceso 'java' dedicado)
+        self.process_jvm_options = []
+        self.analysis_jvm_options = []
+        # Forzar 'mvn clean install' completo en lugar de la compilación incremental con caché
+        self.clean_build = False
+        # Omitir la caché de respuestas de Gemini y mostrar la respuesta a medida que se genera
+        self.bypass_cache = False
+        self.stream = False
+        # Corrección de .java en modo parche (diff aplicado localmente); False regenera el archivo completo
+        self.patch_mode = True
+        # Map-reduce de los especialistas cuando el contexto supera shard_tokens
+        self.shard_tokens = DEFAULT_SHARD_TOKENS
+        self.fan_out = DEFAULT_FAN_OUT
+        # Archivo de contexto que generan y leen las tareas
+        self.context_file = CONTEXT_FILE
+        # Puerto y token del worker JVM (token None = el de WORKER_TOKEN_FILE, si la GUI inició uno)
+        self.worker_port = WORKER_PORT
+        self.worker_token = None
+        # Correcciones en paralelo del modo por lotes
+        self.batch_parallel = DEFAULT_BATCH_PARALLEL
+        # Tiempo límite de cada tarea en segundos (0 = sin límite); un trabajo puede fijar el suyo
+        self.command_timeout = DEFAULT_COMMAND_TIMEOUT
+        # Trazas de tiempos por etapa (Python y Java, con --trace) de la ejecución en curso
+        self.trace = False
+        self.tracer = Tracer()
+        # Modo vigilancia (ContextWatcher): mantiene context_file al día en segundo plano
+        self.watcher = None
+        self._watch_lock = threading.Lock()
+        # Las actualizaciones del contexto (manuales o del modo vigilancia) no se solapan
+        self._context_lock = threading.Lock()
+
+        self._job_context = threading.local()
+
+    # ------------------------------------
+    # Registro de salida
+    # ------------------------------------
+
+    def log_output(self, message, is_error=False):
+        """Entrega un mensaje al receptor de log, con el rol del trabajo en curso como prefijo."""
+        job = self.current_job()
+        if job is not None:
+            message = f"[{job.role_name}] {message}"
+        self.on_log(message, is_error)
+
+    def log_result(self, label, output_path):
+        """
+        Registra un resumen del archivo generado, sin leer su contenido, y lo notifica a on_result.
+        Devuelve False si el archivo no existe.
+        """
+        with self.span("leer_salida", ruta=output_path) as span:
+            try:
+                size = os.path.getsize(output_path)
+            except OSError:
+                return False
+            span["bytes"] = size
+        self.log_output(f"📄 {label}: {output_path} ({size:,} bytes)")
+        if self.on_result:
+            self.on_result(label, output_path)
+        return True
+
+    def current_job(self):
+        """Trabajo del planificador asociado al hilo actual (None para tareas individuales)."""
+        return getattr(self._job_context, "job", None)
+
+    def span(self, name, **args):
+        """Tramo de la traza si las trazas están activas (si no, solo devuelve los argumentos)."""
+        if self.trace:
+            return self.tracer.span(name, **args)
+        return contextlib.nullcontext(args)
+
+    def export_trace(self, path=None):
+        """
+        Guarda la traza de la ejecución (por defecto en TRACE_DIR con la fecha y hora) y la vacía.
+        Devuelve (ruta, resumen), o (None, []) si no hay eventos.
+        """
+        rows = self.tracer.summary()
+        if not rows:
+            return None, []
+        path = path or os.path.join(TRACE_DIR, f"traza-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        self.tracer.save(path)
+        self.tracer.clear()
+        return path, rows
+
+    def _output_entry(self, line, is_error, on_output, job, on_trace=None):
+        """
+        Convierte una línea de salida de una tarea en una entrada de log (mensaje, is_error), o None si está vacía.
+        Las líneas de texto en streaming se muestran tal cual llegan (conservando sangría y líneas vacías),
+        para ver la respuesta mientras se genera. on_output (opcional) recibe cada línea no vacía,
+        para que la tarea pueda extraer datos de la salida. Los eventos de traza no se muestran:
+        se añaden a la traza y se entregan a on_trace (opcional).
+        """
+        if line.startswith(TRACE_PREFIX):
+            extra = {"rol": job.role_name} if job is not None else {}
+            event = self.tracer.add_json(line[len(TRACE_PREFIX):], **extra)
+            if event is not None and on_trace:
+                on_trace(event)
+            return None
+        if line.startswith(STREAM_PREFIX):
+            msg = line[len(STREAM_PREFIX):].rstrip("\r\n")
+        else:
+            msg = line.strip()
+            if not msg:
+                return None
+            if on_output:
+                on_output(msg)
+        if job is not None:
+            msg = f"[{job.role_name}] {msg}"
+        return msg, is_error
+
+    def handle_output_line(self, line, is_error, on_output=None):
+        """Registra una línea de salida de la tarea del hilo actual."""
+        entry = self._output_entry(line, is_error, on_output, self.current_job())
+        if entry:
+            self.on_log(*entry)
+
+    def handle_output_batch(self, lines, job=None, on_output=None, on_trace=None):
+        """Registra un lote de líneas (línea, is_error) entregado por el supervisor de procesos."""
+        entries = [entry for entry in (self._output_entry(line, is_error, on_output, job, on_trace)
+                                       for line, is_error in lines) if entry]
+        if not entries:
+            return
+        if self.on_log_batch:
+            self.on_log_batch(entries)
+        else:
+            for message, is_error in entries:
+                self.on_log(message, is_error)
+
+    def _timeout_for(self, job):
+        """Tiempo límite aplicable a la tarea del hilo actual (None = sin límite)."""
+        timeout = job.timeout if job is not None and job.timeout is not None else self.command_timeout
+        return timeout or None
+
+    # ------------------------------------
+    # Ejecución de procesos y clases Java
+    # ------------------------------------
+
+    def run_command(self, command_parts, success_message, error_message, cwd=None, on_output=None, jvm_options=None):
+        """
+        Ejecuta un comando bajo el supervisor de procesos y registra su salida en el log en tiempo real.
+        jvm_options (opcional) se insertan tras el ejecutable 'java' (p. ej. ["-Xmx2g", "-XX:+UseG1GC"]).
+        """
+        if jvm_options and command_parts and command_parts[0] == JAVA_CMD:
+            command_parts = [command_parts[0]] + list(jvm_options) + list(command_parts[1:])
+
+        self.log_output(f"Ejecutando: {' '.join(command_parts)}")
+
+        job = self.current_job()
+        timeout = self._timeout_for(job)
+        with self.span("run_command", comando=" ".join(command_parts[:4])) as span:
+            return self._run_supervised(command_parts, success_message, error_message, cwd, on_output, job, timeout, span)
+
+    def _run_supervised(self, command_parts, success_message, error_message, cwd, on_output, job, timeout, span):
+        # Inicio del evento Java más temprano del proceso: delimita el arranque de la JVM
+        java_start = []
+        def on_trace(event):
+            if not java_start or event["ts"] < java_start[0]:
+                java_start[:] = [event["ts"]]
+
+        try:
+            spawn_ts = Tracer.now_us()
+            process = self.supervisor.start(
+                command_parts,
+                lambda lines: self.handle_output_batch(lines, job, on_output, on_trace),
+                cwd=cwd,
+                timeout=timeout,
+                sample_rss=self.trace
+            )
+
+            if job is not None:
+                job.process = process
+                if job.cancel_event.is_set():
+                    job.terminate()
+
+            process.wait()
+            span["codigo"] = process.returncode
+            if process.peak_rss_kb is not None:
+                span["rss_pico_kb"] = process.peak_rss_kb
+            if java_start and self.trace:
+                self.tracer.add({"name": "arranque_jvm", "cat": "python", "ph": "X", "ts": spawn_ts,
+                                 "dur": max(0, java_start[0] - spawn_ts), "pid": self.tracer.pid,
+                                 "tid": threading.get_native_id(), "args": {"pid_jvm": process.pid}})
+
+            if process.timed_out:
+                self.log_output(f"ERROR: El comando ha excedido el tiempo límite de {timeout:g} s. Proceso terminado.", is_error=True)
+                return False
+
+            if job is not None and job.cancel_event.is_set():
+                self.log_output("Tarea cancelada por el usuario. Proceso terminado.", is_error=True)
+                return False
+
+            if process.returncode != 0:
+                self.log_output(f"ERROR: Comando falló con código {process.returncode}", is_error=True)
+                self.log_output(error_message, is_error=True)
+                return False
+
+            self.log_output(success_message)
+            return True
+
+        except FileNotFoundError:
+            missing_tool = command_parts[0]
+            if missing_tool.endswith('mvn') or missing_tool.endswith('mvn.cmd'):
+                error_detail = "El comando 'mvn' (Maven) no fue encontrado. Asegúrate de que Maven esté instalado y configurado correctamente en la variable de entorno PATH."
+            elif missing_tool == "java":
+                error_detail = "El comando 'java' (Java Runtime) no fue encontrado. Asegúrate de que el JRE/JDK esté instalado y configurado correctamente en la variable de entorno PATH."
+            else:
+                error_detail = f"Comando '{missing_tool}' no encontrado. ¿Está instalado y en su PATH?"
+                
+            self.log_output(f"ERROR: {error_detail}", is_error=True)
+            return False
+        except Exception as e:
+            self.log_output(f"ERROR inesperado: {e}", is_error=True)
+            return False
+
+    def _run_in_worker(self, class_name, args, on_output=None):
+        """
+        Envía una tarea al worker JVM persistente y registra su salida en tiempo real.
+        Devuelve el código de salida, o None si el worker no está disponible, rechaza el token o la
+        clase no implementa WorkerJob (en esos casos se ejecuta en un proceso independiente).
+        """
+        token = self.worker_token or read_worker_token()
+        if not token:
+            return None
+        try:
+            sock = socket.create_connection((WORKER_HOST, self.worker_port), timeout=2)
+        except OSError:
+            return None
+
+        self.log_output(f"Ejecutando en worker JVM: {class_name} {' '.join(args)}")
+        job = self.current_job()
+        timeout = self._timeout_for(job)
+        if job is not None:
+            job.socket = sock
+            if job.cancel_event.is_set():
+                job.terminate()
+        return_code = None
+        with sock:
+            try:
+                # El tiempo límite es total: antes de cada lectura se reduce al tiempo restante
+                deadline = time.monotonic() + timeout if timeout else None
+                sock.settimeout(timeout)
+                sock.sendall((token + "\n" + "\t".join([class_name] + list(args)) + "\n").encode("utf-8"))
+                with sock.makefile("r", encoding="utf-8") as reader:
+                    for line in reader:
+                        if deadline is not None:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise socket.timeout()
+                            sock.settimeout(remaining)
+                        line = line.rstrip("\n")
+                        if line.startswith("OUT ") or line.startswith("ERR "):
+                            self.handle_output_line(line[4:], line.startswith("ERR "), on_output)
+                        elif line.startswith("EXIT "):
+                            return_code = int(line[5:])
+                        elif line == "DENIED":
+                            self.log_output("El worker JVM rechazó el token; se lanza un proceso independiente.", is_error=True)
+                            return None
+                        elif line == "UNSUPPORTED":
+                            self.log_output(f"{class_name} no puede ejecutarse en el worker JVM; se lanza en un proceso independiente.")
+                            return None
+            except socket.timeout:
+                cancel_worker_job(sock)
+                self.log_output(f"ERROR: La tarea en el worker ha excedido el tiempo límite de {timeout:g} s.", is_error=True)
+                return 1
+            except OSError as e:
+                if job is not None and job.cancel_event.is_set():
+                    self.log_output("Tarea cancelada por el usuario.", is_error=True)
+                else:
+                    self.log_output(f"ERROR: Conexión con el worker interrumpida: {e}", is_error=True)
+                return 1
+
+        if job is not None and job.cancel_event.is_set():
+            self.log_output("Tarea cancelada por el usuario.", is_error=True)
+            return 1
+
+        if return_code is None:
+            self.log_output("ERROR: El worker cerró la conexión sin devolver un código de salida.", is_error=True)
+            return 1
+        return return_code
+
+    def run_java_class(self, class_name, args, success_message, error_message, on_output=None, jvm_options=None):
+        """
+        Ejecuta una clase Java del proyecto: primero en el worker persistente y,
+        si no está disponible, lanzando un proceso 'java -cp' independiente.
+        Si la tarea define opciones JVM propias (heap, GC), se ejecuta siempre en un proceso dedicado,
+        ya que el worker no puede aplicarlas.
+        """
+        return_code = None
+        if jvm_options:
+            self.log_output(f"Opciones JVM de la tarea: {' '.join(jvm_options)} (proceso dedicado)")
+        else:
+            with self.span("run_worker", clase=class_name) as span:
+                return_code = self._run_in_worker(class_name, args, on_output=on_output)
+                span["codigo"] = return_code
+        if return_code is None:
+            return self.run_command(
+                command_parts=[JAVA_CMD, "-cp", JAR_PATH, class_name] + list(args),
+                success_message=success_message,
+                error_message=error_message,
+                on_output=on_output,
+                jvm_options=jvm_options
+            )
+
+        if return_code != 0:
+            self.log_output(f"ERROR: La tarea falló en el worker con código {return_code}", is_error=True)
+            self.log_output(error_message, is_error=True)
+            return False
+
+        self.log_output(success_message)
+        return True
+
+    # ------------------------------------
+    # Compilación, contexto y análisis
+    # ------------------------------------
+
+    def get_maven_command(self):
+        """Obtiene el comando 'mvn', usando MAVEN_HOME como fallback."""
+        mvn_command = ["mvn"]
+        if "MAVEN_HOME" in os.environ:
+            maven_home = os.environ["MAVEN_HOME"]
+            if sys.platform.startswith('win'):
+                mvn_cmd_path = os.path.join(maven_home, "bin", "mvn.cmd")
+                if os.path.exists(mvn_cmd_path):
+                    return [mvn_cmd_path]
+            mvn_path = os.path.join(maven_home, "bin", "mvn")
+            if os.path.exists(mvn_path):
+                return [mvn_path]
+        return mvn_command
+
+    def build_project(self, clean=None):
+        """
+        Compila el proyecto usando la caché de huellas (BuildCache): si ninguna fuente cambió desde
+        el último JAR generado con éxito no se compila; si no, se ejecuta 'mvn -o -T 1C install'
+        limitado a los módulos modificados y sus dependientes. Con clean=True (por defecto, el
+        atributo clean_build) se ejecuta 'mvn clean install' completo.
+        """
+        maven_cmd = self.get_maven_command()
+        cache = BuildCache()
+        fingerprints = cache.fingerprints()
+        clean = self.clean_build if clean is None else clean
+        changed = None if clean else cache.changed_modules(fingerprints)
+
+        if changed == []:
+            self.log_output(f"✅ Sin cambios en las fuentes desde la última compilación; se conserva {JAR_PATH}.")
+            return True
+
+        if clean:
+            command_parts = maven_cmd + ["-B", "-T", "1C", "clean", "install"]
+        else:
+            command_parts = maven_cmd + ["-B", "-o", "-T", "1C", "install"]
+            if changed:
+                self.log_output(f"Módulos modificados: {', '.join(changed)} (se recompilan también sus dependientes).")
+                command_parts += ["-pl", ",".join(changed), "-amd"]
+            else:
+                self.log_output("No hay una compilación previa válida; se compilan todos los módulos.")
+
+        output = []
+        success = self.run_command(
+            command_parts=command_parts,
+            success_message="✅ Proyecto Java/Maven compilado con éxito.",
+            error_message="❌ La compilación del proyecto falló.",
+            on_output=output.append
+        )
+        if not success and "-o" in command_parts and any(MAVEN_OFFLINE_FAILURE.search(line) for line in output):
+            # En modo offline fallan las dependencias que aún no están en el repositorio local;
+            # cualquier otro error (p. ej. de compilación) se repetiría igual en línea
+            self.log_output("Reintentando la compilación sin el modo offline (-o)...")
+            command_parts.remove("-o")
+            output = []
+            success = self.run_command(
+                command_parts=command_parts,
+                success_message="✅ Proyecto Java/Maven compilado con éxito.",
+                error_message="❌ La compilación del proyecto falló.",
+                on_output=output.append
+            )
+
+        self._log_module_times(output, cache, changed)
+        if success:
+            cache.save(fingerprints)
+        return success
+
+    def _log_module_times(self, output, cache, changed):
+        """Registra la duración de cada módulo según el resumen del reactor de Maven."""
+        times = parse_reactor_times(output)
+        if not times and changed is not None and len(changed) == 1:
+            # Con un solo módulo en el reactor Maven no imprime el resumen, solo el tiempo total
+            for line in output:
+                match = re.search(r"Total time:\s+([\d.]+) s", line)
+                if match:
+                    times = {changed[0]: ("SUCCESS", float(match.group(1)))}
+        if not times:
+            return
+        names = cache.display_names()
+        self.log_output("⏱️ Tiempo de compilación por módulo:")
+        for name, (status, seconds) in times.items():
+            label = names.get(name, name)
+            duration = f"{seconds:.2f} s" if seconds is not None else "-"
+            self.log_output(f"   {label}: {status} ({duration})")
+
+    def run_file_processor(self, project_path=None, changed_paths=None):
+        """
+        Actualiza el contexto con com.myproject.core.IncrementalContextBuilder: solo se releen
+        los archivos modificados (según el índice de context_file) y, si no hay cambios, no se reescribe.
+        changed_paths (opcional) limita la revisión a esas rutas relativas al proyecto (modo vigilancia).
+        """
+        project_path = project_path or self.project_path
+        if not project_path:
+            self.log_output("ERROR: La ruta base del proyecto no puede estar vacía.", is_error=True)
+            return False
+
+        with self._context_lock:
+            if changed_paths is None:
+                return self._run_file_processor(project_path, [])
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".txt", delete=False) as changes:
+                changes.write("\n".join(changed_paths) + "\n")
+            try:
+                return self._run_file_processor(project_path, [f"--changed-list={os.path.abspath(changes.name)}"])
+            finally:
+                os.unlink(changes.name)
+
+    def context_args(self):
+        """Opciones de selección de archivos del contexto según los atributos del motor."""
+        args = [f"--max-file-kb={max(0, int(self.max_file_kb))}", f"--max-total-kb={max(0, int(self.max_total_kb))}"]
+        if self.ignore_file:
+            args.append(f"--ignore-file={self.ignore_file}")
+        if not self.use_gitignore:
+            args.append("--no-gitignore")
+        return args
+
+    def _run_file_processor(self, project_path, extra_args):
+        stats = {}
+        def collect_stats(line):
+            match = re.search(r"reutilizados: (\d+) \| Archivos releídos: (\d+) \| Archivos eliminados: (\d+)", line)
+            if match:
+                stats["reused"], stats["reread"], stats["removed"] = (int(g) for g in match.groups())
+
+        threads = max(1, int(self.reader_threads))
+        success = self.run_java_class(
+            INCREMENTAL_CONTEXT_CLASS,
+            [project_path, self.context_file, f"--threads={threads}"] + self.context_args() + extra_args,
+            success_message=f"✅ FileProcessor finalizado. Contexto actualizado en: {self.context_file}",
+            error_message="❌ Error al ejecutar FileProcessor.",
+            on_output=collect_stats,
+            jvm_options=self.process_jvm_options
+        )
+        if success and stats:
+            if stats["reread"] == 0 and stats["removed"] == 0:
+                self.log_output(f"El contexto {self.context_file} ya estaba al día: {stats['reused']} archivos reutilizados, ninguno releído.", is_error=False)
+            else:
+                self.log_output(f"El archivo {self.context_file} se ha actualizado: {stats['reused']} archivos reutilizados, {stats['reread']} releídos.", is_error=False)
+        return success
+
+    # ------------------------------------
+    # Modo vigilancia del contexto
+    # ------------------------------------
+
+    def start_watch(self, project_path=None):
+        """
+        Activa el modo vigilancia sobre project_path (por defecto, el del motor): cada ráfaga de
+        cambios se aplica al contexto en segundo plano, solo con los archivos modificados.
+        """
+        with self._watch_lock:
+            self._stop_watch_locked()
+            project_path = project_path or self.project_path
+            if not project_path or not os.path.isdir(project_path):
+                self.log_output(f"ERROR: No se puede vigilar '{project_path}': no es un directorio.", is_error=True)
+                return False
+            watcher = ContextWatcher(
+                project_path,
+                lambda paths: self._apply_watch_changes(project_path, paths),
+                on_log=self.log_output
+            )
+            watcher.start()
+            self.watcher = watcher
+            return True
+
+    def stop_watch(self):
+        """Desactiva el modo vigilancia (espera a que termine la actualización en curso)."""
+        with self._watch_lock:
+            self._stop_watch_locked()
+
+    def _stop_watch_locked(self):
+        watcher, self.watcher = self.watcher, None
+        if watcher is not None:
+            watcher.stop()
+            self.log_output(f"[WATCH] Vigilancia de {watcher.root} detenida.")
+
+    def _apply_watch_changes(self, project_path, paths):
+        if paths is None:
+            self.log_output("[WATCH] Revisando el proyecto completo...")
+        else:
+            self.log_output(f"[WATCH] {len(paths)} archivo(s) modificado(s): {', '.join(paths[:5])}{' ...' if len(paths) > 5 else ''}")
+        return self.run_file_processor(project_path, changed_paths=paths)
+
+    def sync_context(self):
+        """
+        Con el modo vigilancia activo, aplica los cambios pendientes y espera a que el contexto esté al día
+        antes de un análisis. Sin vigilancia no hace nada.
+        """
+        watcher = self.watcher
+        if watcher is None:
+            return
+        with self.span("esperar_contexto"):
+            if not watcher.flush(WATCH_FLUSH_TIMEOUT):
+                self.log_output(f"⚠️ [WATCH] El contexto puede no reflejar los últimos cambios; se usa {self.context_file} tal como está.", is_error=True)
+
+    def run_ai_analyzer(self, output_path):
+        """Ejecuta com.myproject.core.AIAnalyzer (modo original de corrección)."""
+        if not output_path:
+            self.log_output("ERROR: La ruta de salida del analizador no puede estar vacía.", is_error=True)
+            return False
+
+        self.sync_context()
+
+        # 1. Ejecutar el AIAnalyzer
+        success = self.run_java_class(
+            AI_ANALYZER_CLASS,
+            [self.context_file, output_path] + self.analysis_args(),
+            success_message=f"✅ AIAnalyzer finalizado. Resultado guardado en: {output_path}",
+            error_message="❌ Error al ejecutar AIAnalyzer.",
+            jvm_options=self.analysis_jvm_options
+        )
+
+        # 2. Mostrar un resumen del archivo de salida
+        if success:
+            output_path_to_read = output_path_for(output_path)
+            if not self.log_result("Archivo de salida", output_path_to_read):
+                self.log_output(f"ERROR: Archivo de salida no encontrado en {output_path_to_read}", is_error=True)
+                return False
+        return success
+
+    def run_batch_correction(self, targets, report_path=BATCH_REPORT_FILE):
+        """
+        Ejecuta com.myproject.core.BatchCorrector: corrige todos los .java de un directorio o patrón glob
+        en una sola ejecución, cargando el contexto una vez. Cada archivo genera su -corregido.java y el
+        resumen por archivo (resultado y latencia) queda en report_path.
+        """
+        if not targets:
+            self.log_output("ERROR: El directorio o patrón de archivos a corregir no puede estar vacío.", is_error=True)
+            return False
+
+        self.sync_context()
+
+        success = self.run_java_class(
+            BATCH_CORRECTOR_CLASS,
+            [self.context_file, targets, f"--parallel={max(1, int(self.batch_parallel))}", f"--report={report_path}"]
+            + self.analysis_args(),
+            success_message="✅ Corrección por lotes finalizada.",
+            error_message="❌ La corrección por lotes terminó con errores (ver el informe).",
+            jvm_options=self.analysis_jvm_options
+        )
+        # El informe se escribe también cuando algún archivo falla
+        self.log_result("Informe del lote", report_path)
+        return success
+
+    # ------------------------------------
+    # Especialistas (Generación de Guías)
+    # ------------------------------------
+
+    def analysis_args(self):
+        """Opciones para las clases de análisis según los atributos bypass_cache, stream, patch_mode y trace."""
+        args = []
+        if self.bypass_cache:
+            args.append("--no-cache")
+        if self.stream:
+            args.append("--stream")
+        if not self.patch_mode:
+            args.append("--no-patch")
+        if self.trace:
+            args.append("--trace")
+        return args
+
+    def specialist_args(self):
+        """Opciones del map-reduce de los especialistas según los atributos shard_tokens y fan_out."""
+        return [f"--shard-tokens={max(0, int(self.shard_tokens))}", f"--fan-out={max(1, int(self.fan_out))}"]
+
+    def execute_specialist(self, class_name, role_name, target_file_path):
+        """Ejecuta cualquier clase Especialista (DBA, QA, Backend, etc.). Devuelve True si terminó bien."""
+        with self.span("especialista", rol=role_name) as span:
+            span["ok"] = self._execute_specialist(class_name, role_name, target_file_path)
+            return span["ok"]
+
+    def _execute_specialist(self, class_name, role_name, target_file_path):
+        if not target_file_path:
+            self.log_output(f"ERROR: La ruta del archivo para {role_name} no puede estar vacía.", is_error=True)
+            return False
+
+        self.sync_context()
+
+        cache_status = []
+        def collect_cache_status(line):
+            match = re.match(r"\[CACHE\] (HIT|MISS|BYPASS)", line)
+            if match:
+                cache_status.append(match.group(1))
+
+        # 1. Ejecutar el Especialista
+        success = self.run_java_class(
+            class_name,
+            [self.context_file, target_file_path] + self.analysis_args() + self.specialist_args(),
+            success_message=f"✅ {role_name} finalizado. Guía de aprendizaje generada.",
+            error_message=f"❌ Error al ejecutar {role_name}.",
+            on_output=collect_cache_status,
+            jvm_options=self.analysis_jvm_options
+        )
+        if cache_status:
+            self.log_output(f"Caché de respuestas ({role_name}): {cache_status[-1]}", is_error=False)
+
+        # 2. Mostrar un resumen de la guía generada
+        if success:
+            output_path = output_path_for(target_file_path)
+            if not self.log_result(f"Guía de {role_name}", output_path):
+                self.log_output(f"ERROR: El archivo de salida esperado no se encontró: {output_path}", is_error=True)
+                return False
+
+        return success
+
+    def run_scheduled_job(self, job):
+        """Ejecuta un trabajo del planificador en su hilo, asociándolo al contexto de log y cancelación."""
+        self._job_context.job = job
+        try:
+            return self.execute_specialist(job.class_name, job.role_name, job.target_file_path)
+        except Exception as e:
+            self.log_output(f"ERROR FATAL en el trabajo: {e}", is_error=True)
+            return False
+        finally:
+            self._job_context.job = None
@@ -0,0 +1,675 @@
+"""
+Banco de pruebas de extremo a extremo del orquestador, sin interfaz gráfica ni red.
+
+Genera un proyecto Java sintético del tamaño indicado, arranca en el mismo proceso el servidor
+simulado de Gemini (tools/mock_gemini_server.py) con la latencia y el tamaño de respuesta elegidos, y
+ejecuta con el motor de task_engine.py las etapas compilación -> contexto -> especialistas -> map-reduce
+(contra un servidor que rechaza las peticiones mayores que un fragmento), además de la canalización de log (supervisor de procesos y, si hay pantalla, la consola de la GUI) y el
+benchmark de GeminiJson. De cada etapa registra el tiempo total, el rendimiento, el pico de memoria y
+el desglose por tramos de la traza (Python y Java con --trace), y lo guarda en un JSON que se puede
+comparar con el de otro commit.
+
+El contexto y las guías se escriben en el directorio de trabajo del benchmark, no en el del proyecto,
+y las tareas nunca se envían a un worker JVM abierto por la GUI (usaría la API real).
+
+Uso:
+  python tools/benchmark.py --files 1000
+  python tools/benchmark.py --files 100000 --steps process --output bench-results/100k.json
+  python tools/benchmark.py --files 5000 --latency 1.5 --response-kb 64 --compare bench-results/base.json
+  python tools/benchmark.py --compare-only bench-results/base.json bench-results/nuevo.json
+
+Códigos de salida: 0 si todas las etapas terminan bien (y no hay regresiones al comparar), 1 si alguna
+falla o supera el umbral de regresión y 2 si los argumentos son inválidos.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage no se mide la memoria residente
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+
+import task_engine  # noqa: E402
+from task_engine import SPECIALISTS, DEFAULT_SPECIALIST_CONCURRENCY, TaskEngine  # noqa: E402
+import cli  # noqa: E402
+import mock_gemini_server  # noqa: E402
+
+RESULTS_VERSION = 1
+
+STEP_GENERATE = "generate"
+STEP_BUILD = "build"
+STEP_PROCESS = "process"
+STEP_PROCESS_WARM = "process_warm"
+STEP_SPECIALISTS = "specialists"
+STEP_MAP_REDUCE = "map_reduce"
+STEP_LOG = "log"
+STEP_JSON = "json"
+STEPS = (STEP_BUILD, STEP_PROCESS, STEP_PROCESS_WARM, STEP_SPECIALISTS, STEP_MAP_REDUCE, STEP_LOG, STEP_JSON)
+DEFAULT_STEPS = list(STEPS)
+
+DEFAULT_FILES = 1000
+DEFAULT_FILE_LINES = 80
+DEFAULT_SEED = 42
+DEFAULT_LATENCY = 0.5
+DEFAULT_RESPONSE_KB = 16
+DEFAULT_LOG_LINES = 200000
+DEFAULT_JSON_CONTEXT_MB = 16
+# Tamaño de fragmento de la etapa map_reduce; el servidor de esa etapa admite además el prompt del rol
+DEFAULT_SHARD_TOKENS = 20000
+MAP_REDUCE_PROMPT_TOKENS = 2000
+DEFAULT_WORK_DIR = os.path.join(REPO_ROOT, "bench-work")
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, "bench-results")
+# Variación (en %) a partir de la cual la comparación marca una regresión
+DEFAULT_THRESHOLD = 10.0
+# Filas del desglose de la traza que se guardan por etapa
+BREAKDOWN_ROWS = 15
+
+# Archivos por paquete del proyecto sintético y sufijos de clase (los perfiles de los especialistas los reconocen)
+FILES_PER_PACKAGE = 500
+CLASS_KINDS = ("Controller", "Service", "Repository", "Entity", "Dto", "Config", "Test")
+# Descripción del proyecto generado, junto a su directorio (fuera del contexto)
+PROJECT_MARKER_SUFFIX = ".bench.json"
+# Extensiones que ProjectWalker incluye en el contexto (INCLUDED_EXTENSIONS); solo esos archivos cuentan
+# para el rendimiento de las etapas de contexto
+WALKER_EXTENSIONS = (".java", ".xml", ".md", ".json", ".php", ".py", ".txt", ".csv")
+
+GEMINI_JSON_BENCHMARK_CLASS = "com.myproject.core.bench.GeminiJsonBenchmark"
+# Especialista de la etapa map_reduce (su perfil no excluye ninguna sección) y línea con el número de fragmentos
+MAP_REDUCE_CLASS = "com.myproject.core.AIAnalyzerGeneric"
+MAP_REDUCE_LINE = re.compile(r"Map-reduce: (\d+) fragmentos")
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+class BenchmarkLog:
+    """Receptor de log del motor: cuenta los mensajes y muestra solo los errores (o todo con verbose)."""
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, message, is_error=False):
+        with self._lock:
+            self.messages += 1
+            if self.verbose or is_error:
+                print(message, file=sys.stderr if is_error else sys.stdout, flush=True)
+
+    def batch(self, entries):
+        for message, is_error in entries:
+            self(message, is_error)
+
+
+# ====================================
+# Proyecto sintético
+# ====================================
+
+def _java_source(rng, package, name, kind, lines):
+    """Clase Java plausible de unas 'lines' líneas: campos, métodos con lógica sencilla y comentarios."""
+    out = [f"package {package};", "", "import java.util.ArrayList;", "import java.util.List;", ""]
+    if kind == "Controller":
+        out.append('@RestController\n@RequestMapping("/api/' + name.lower() + '")')
+    elif kind == "Repository":
+        out.append("@Repository")
+    elif kind == "Entity":
+        out.append('@Entity\n@Table(name = "' + name.lower() + '")')
+    elif kind == "Service":
+        out.append("@Service")
+    out.append(f"public class {name} {{")
+    fields = rng.randint(2, 6)
+    for f in range(fields):
+        out.append(f"    private {rng.choice(('String', 'long', 'int', 'List<String>'))} campo{f};")
+    out.append("")
+    method = 0
+    while len(out) < lines - 2:
+        out.append(f"    /** Operación {method} de {name}: valida la entrada y acumula el resultado. */")
+        out.append(f"    public int operacion{method}(int valor) {{")
+        out.append("        List<Integer> valores = new ArrayList<>();")
+        for step in range(rng.randint(2, 8)):
+            out.append(f"        if (valor % {step + 2} == 0) valores.add(valor * {rng.randint(1, 99)});")
+        if kind == "Repository":
+            out.append(f'        String sql = "SELECT * FROM {name.lower()} WHERE id = " + valor;')
+        out.append("        return valores.size();")
+        out.append("    }")
+        out.append("")
+        method += 1
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+
+def generate_project(root, files, file_lines, seed, log=print):
+    """
+    Genera (o reutiliza, si ya existe con los mismos parámetros) un proyecto Maven sintético con 'files'
+    clases Java repartidas en paquetes. Devuelve un dict con los archivos y los bytes que entran en el
+    contexto (WALKER_EXTENSIONS) y si se generó.
+    """
+    params = {"files": files, "file_lines": file_lines, "seed": seed}
+    marker = root.rstrip(os.sep) + PROJECT_MARKER_SUFFIX
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing.get("params") == params:
+            log(f"♻️  Proyecto sintético reutilizado: {root} ({existing['files']:,} archivos)")
+            return dict(existing, generated=False)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Sin la descripción, una generación interrumpida no se reutiliza
+    if os.path.exists(marker):
+        os.remove(marker)
+    shutil.rmtree(root, ignore_errors=True)
+    rng = random.Random(seed)
+    total_files = files
+    total_bytes = 0
+    source_root = os.path.join(root, "src", "main", "java", "com", "bench")
+    for index in range(files):
+        package_index = index // FILES_PER_PACKAGE
+        kind = CLASS_KINDS[index % len(CLASS_KINDS)]
+        name = f"Modulo{index}{kind}"
+        package_dir = os.path.join(source_root, f"m{package_index}")
+        if index % FILES_PER_PACKAGE == 0:
+            os.makedirs(package_dir, exist_ok=True)
+        lines = max(12, int(file_lines * rng.uniform(0.5, 1.5)))
+        data = _java_source(rng, f"com.bench.m{package_index}", name, kind, lines).encode("utf-8")
+        with open(os.path.join(package_dir, f"{name}.java"), "wb") as f:
+            f.write(data)
+        total_bytes += len(data)
+
+    resources = os.path.join(root, "src", "main", "resources")
+    os.makedirs(resources, exist_ok=True)
+    for path, text in ((os.path.join(resources, "application.properties"), "spring.datasource.url=jdbc:h2:mem:bench\n"),
+                       (os.path.join(root, "pom.xml"), "<project><artifactId>bench</artifactId></project>\n")):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        if path.endswith(WALKER_EXTENSIONS):
+            total_files += 1
+            total_bytes += len(text.encode("utf-8"))
+
+    info = {"params": params, "files": total_files, "bytes": total_bytes}
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    return dict(info, generated=True)
+
+
+def synthetic_response(size_kb):
+    """Guía de ejemplo en Markdown de aproximadamente size_kb KB."""
+    lines = ["# Guía generada por el benchmark", ""]
+    size = 0
+    index = 1
+    while size < size_kb * 1024:
+        line = f"{index}. Recomendación {index}: revisa las dependencias del módulo y añade pruebas de los casos límite."
+        lines.append(line)
+        size += len(line) + 1
+        index += 1
+    return "\n".join(lines) + "\n"
+
+
+# ====================================
+# Servidor simulado y entorno
+# ====================================
+
+def start_mock_server(latency, chunk_delay, chunks, response_kb, max_input_tokens=0):
+    """
+    Arranca el servidor simulado en un puerto libre, en un hilo. Devuelve (servidor, URL base).
+    Con max_input_tokens rechaza con 400 las peticiones mayores, como el modelo real.
+    """
+    config = mock_gemini_server.parse_args(["--port", "0", "--quiet", "--latency", str(latency),
+                                            "--chunk-delay", str(chunk_delay), "--chunks", str(chunks),
+                                            "--max-input-tokens", str(max_input_tokens)])
+    config.response_text = synthetic_response(response_kb)
+    server = mock_gemini_server.create_server(config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit():
+    """Commit actual (con '-dirty' si hay cambios sin confirmar), o None fuera de un repositorio git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_kb():
+    """
+    Picos de memoria residente (KB) del orquestador y del mayor proceso hijo terminado (Linux: ru_maxrss en KB).
+    Devuelve None si la plataforma no tiene el módulo resource (Windows).
+    """
+    if resource is None:
+        return None
+    return {"orquestador": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "procesos_hijos": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss}
+
+
+# ====================================
+# Etapas
+# ====================================
+
+class Benchmark:
+    """Ejecuta las etapas con un TaskEngine configurado para el benchmark y recoge sus métricas."""
+
+    def __init__(self, args, log):
+        self.args = args
+        self.log = log
+        self.work_dir = os.path.abspath(args.work_dir)
+        self.project_dir = os.path.join(self.work_dir, f"proyecto-{args.files}")
+        self.project = None
+        self.server = None
+
+        engine = TaskEngine(on_log=log, on_log_batch=log.batch)
+        engine.project_path = self.project_dir
+        engine.trace = True
+        engine.bypass_cache = not args.use_cache
+        engine.command_timeout = args.timeout
+        engine.reader_threads = args.reader_threads
+        # Sin límites de tamaño: se mide el proyecto completo
+        engine.max_file_kb = 0
+        engine.max_total_kb = 0
+        self.engine = engine
+
+    def run(self, steps):
+        """Ejecuta las etapas en orden. Devuelve (etapas, correcto)."""
+        os.makedirs(self.work_dir, exist_ok=True)
+        # El contexto va al directorio de trabajo y las tareas nunca se envían a un worker de la GUI
+        self.engine.context_file = os.path.join(self.work_dir, "contexto.ctx")
+        self.engine.worker_port = _unused_port()
+
+        stages = {}
+        start = time.perf_counter()
+        self.project = generate_project(self.project_dir, self.args.files, self.args.file_lines, self.args.seed, self._info)
+        if self.project["generated"]:
+            seconds = time.perf_counter() - start
+            stages[STEP_GENERATE] = {"ok": True, "wall_s": round(seconds, 3), "peak_rss_kb": None,
+                                     "throughput": {"archivos_s": round(self.project["files"] / seconds, 1)},
+                                     "breakdown": []}
+
+        self.server, base_url = start_mock_server(self.args.latency, self.args.chunk_delay, self.args.chunks, self.args.response_kb)
+        saved_env = {key: os.environ.get(key) for key in ("GEMINI_API_BASE_URL", "GEMINI_API_KEY")}
+        os.environ["GEMINI_API_BASE_URL"] = base_url
+        os.environ["GEMINI_API_KEY"] = "mock"
+        ok = True
+        try:
+            for step in steps:
+                self._info(f"\n--- Etapa: {step} ---")
+                stages[step] = self._run_stage(step)
+                symbol = "✅" if stages[step]["ok"] else "❌"
+                self._info(f"{symbol} {step}: {stages[step]['wall_s']:.2f} s {stages[step]['throughput']}")
+                if not stages[step]["ok"]:
+                    ok = False
+                    if not self.args.keep_going:
+                        break
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+            self.engine.supervisor.close()
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        return stages, ok
+
+    def _info(self, message):
+        print(message, flush=True)
+
+    def _run_stage(self, step):
+        runner = {
+            STEP_BUILD: self._build,
+            STEP_PROCESS: lambda: self._process(cold=True),
+            STEP_PROCESS_WARM: lambda: self._process(cold=False),
+            STEP_SPECIALISTS: self._specialists,
+            STEP_MAP_REDUCE: self._map_reduce,
+            STEP_LOG: self._log_pipeline,
+            STEP_JSON: self._gemini_json,
+        }[step]
+        self.engine.tracer.clear()
+        start = time.perf_counter()
+        try:
+            ok, throughput = runner()
+        except Exception as e:
+            self.log(f"ERROR en la etapa {step}: {e}", True)
+            ok, throughput = False, {}
+        seconds = time.perf_counter() - start
+        rows = self.engine.tracer.summary()
+        peaks = [row["rss_kb"] for row in rows if row["rss_kb"] is not None]
+        return {
+            "ok": bool(ok),
+            "wall_s": round(seconds, 3),
+            "peak_rss_kb": max(peaks) if peaks else None,
+            "throughput": throughput,
+            "breakdown": [{"name": row["name"], "cat": row["cat"], "count": row["count"],
+                           "total_ms": round(row["total_ms"], 1), "max_ms": round(row["max_ms"], 1)}
+                          for row in rows if row["count"] and row["total_ms"]][:BREAKDOWN_ROWS],
+        }
+
+    def _build(self):
+        return self.engine.build_project(), {}
+
+    def _process(self, cold):
+        """Genera el contexto; en frío desde cero y en caliente reutilizando el anterior (sin cambios)."""
+        if cold:
+            # También el manifiesto de IncrementalContextBuilder, que permitiría reutilizar archivos
+            for path in (self.engine.context_file, self.engine.context_file + ".manifest"):
+                if os.path.exists(path):
+                    os.remove(path)
+        start = time.perf_counter()
+        ok = self.engine.run_file_processor(self.project_dir)
+        seconds = max(time.perf_counter() - start, 1e-6)
+        context_bytes = os.path.getsize(self.engine.context_file) if os.path.exists(self.engine.context_file) else 0
+        return ok, {"archivos_s": round(self.project["files"] / seconds, 1),
+                    "mb_s": round(self.project["bytes"] / seconds / 1e6, 2),
+                    "contexto_bytes": context_bytes}
+
+    def _specialists(self):
+        targets = {key: os.path.join(self.work_dir, f"guide_{key}.md") for key, _, _, _ in SPECIALISTS}
+        requests_before = self.server.request_count
+        start = time.perf_counter()
+        ok = cli.run_specialists(self.engine, targets, self.args.jobs, self.log)
+        seconds = max(time.perf_counter() - start, 1e-6)
+        requests = self.server.request_count - requests_before
+        return ok, {"especialistas": len(targets), "peticiones": requests, "peticiones_s": round(requests / seconds, 2)}
+
+    def _map_reduce(self):
+        """
+        Guía de un especialista con la selección de contexto por defecto y --shard-tokens. Un segundo servidor
+        simulado rechaza con 400 las peticiones mayores que un fragmento, así que la etapa solo termina bien si
+        el contexto se divide de verdad (al menos dos fragmentos) y las fases map y reduce caben en él.
+        """
+        if not os.path.exists(self.engine.context_file):
+            self.log("ERROR: No hay contexto para el map-reduce; ejecuta antes la etapa process.", True)
+            return False, {}
+        shard_tokens = self.args.shard_tokens
+        fragments = []
+        def collect(line):
+            match = MAP_REDUCE_LINE.search(line)
+            if match:
+                fragments.append(int(match.group(1)))
+
+        server, base_url = start_mock_server(self.args.latency, self.args.chunk_delay, self.args.chunks,
+                                             self.args.response_kb, max_input_tokens=shard_tokens + MAP_REDUCE_PROMPT_TOKENS)
+        saved_url = os.environ["GEMINI_API_BASE_URL"]
+        os.environ["GEMINI_API_BASE_URL"] = base_url
+        target = os.path.join(self.work_dir, "guide_map_reduce.md")
+        start = time.perf_counter()
+        try:
+            ok = self.engine.run_java_class(
+                MAP_REDUCE_CLASS,
+                [self.engine.context_file, target] + self.engine.analysis_args()
+                + [f"--shard-tokens={shard_tokens}", f"--fan-out={max(1, int(self.engine.fan_out))}"],
+                "✅ Guía generada por map-reduce.", "❌ Error en la guía por map-reduce.",
+                on_output=collect)
+        finally:
+            os.environ["GEMINI_API_BASE_URL"] = saved_url
+            server.shutdown()
+            server.server_close()
+        seconds = max(time.perf_counter() - start, 1e-6)
+        count = fragments[0] if fragments else 0
+        if ok and count < 2:
+            self.log(f"ERROR: El contexto no se dividió en fragmentos de ~{shard_tokens:,} tokens (fragmentos: {count}).", True)
+            ok = False
+        return ok, {"fragmentos": count, "peticiones": server.request_count,
+                    "peticiones_s": round(server.request_count / seconds, 2)}
+
+    def _log_pipeline(self):
+        """
+        Canalización de log: un proceso que escribe N líneas pasa por el supervisor y el motor hasta el receptor
+        de lotes; después, si hay pantalla, las mismas líneas se insertan en la consola de la GUI.
+        """
+        lines = self.args.log_lines
+        received = []
+        engine = TaskEngine(on_log=lambda message, is_error=False: received.append(1),
+                            on_log_batch=lambda entries: received.append(len(entries)))
+        engine.command_timeout = self.args.timeout
+        script = f"import sys\nfor i in range({lines}): sys.stdout.write('[INFO] línea de prueba %d del benchmark\\n' % i)\n"
+        start = time.perf_counter()
+        try:
+            ok = engine.run_command([sys.executable, "-c", script], "✅ Salida recibida.", "❌ Error en el proceso de log.")
+        finally:
+            engine.supervisor.close()
+        seconds = max(time.perf_counter() - start, 1e-6)
+        throughput = {"lineas": lines, "supervisor_lineas_s": round(lines / seconds)}
+        console = _console_throughput(lines)
+        if console is None:
+            throughput["consola_gui"] = "omitida (sin pantalla)"
+        else:
+            throughput["consola_lineas_s"] = round(console)
+        return ok and sum(received) >= lines, throughput
+
+    def _gemini_json(self):
+        results = {}
+        def collect(line):
+            # "✅ <nombre> <ms> ms -> <MB/s> MB/s, ..."
+            parts = line.split("->")
+            if line.startswith("✅") and len(parts) == 2 and "MB/s" in parts[1]:
+                name = parts[0][1:].rsplit(None, 2)[0].strip()
+                results[name] = float(parts[1].split("MB/s")[0].strip().replace(",", "."))
+        ok = self.engine.run_java_class(GEMINI_JSON_BENCHMARK_CLASS, [f"--context-mb={self.args.json_context_mb}"],
+                                        "✅ Benchmark de GeminiJson finalizado.", "❌ Error en el benchmark de GeminiJson.",
+                                        on_output=collect)
+        return ok, {f"{name} (MB/s)": value for name, value in results.items()}
+
+
+def _console_throughput(lines):
+    """
+    Inserta las líneas en la consola real de la GUI (main.ConsoleWindow) y devuelve líneas por segundo,
+    o None si no hay pantalla disponible para Tk.
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    try:
+        import main
+        root.withdraw()
+        console = main.ConsoleWindow(root)
+        console.withdraw()
+        batch = 500
+        start = time.perf_counter()
+        for first in range(0, lines, batch):
+            console.log_batch([(f"[INFO] línea de prueba {i} del benchmark", False)
+                               for i in range(first, min(lines, first + batch))])
+        # El callback periódico de la consola vacía la cola por lotes
+        console.wait_until_idle()
+        return lines / max(time.perf_counter() - start, 1e-6)
+    finally:
+        root.destroy()
+
+
+# ====================================
+# Resultados y comparación
+# ====================================
+
+def build_results(args, project, stages, total_seconds):
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpu_count": os.cpu_count()},
+        "config": {"files": args.files, "file_lines": args.file_lines, "seed": args.seed, "latency": args.latency,
+                   "chunk_delay": args.chunk_delay, "chunks": args.chunks, "response_kb": args.response_kb,
+                   "jobs": args.jobs, "reader_threads": args.reader_threads, "use_cache": args.use_cache,
+                   "log_lines": args.log_lines, "json_context_mb": args.json_context_mb,
+                   "shard_tokens": args.shard_tokens},
+        "project": {"files": project["files"], "bytes": project["bytes"]} if project else None,
+        "total_wall_s": round(total_seconds, 3),
+        "peak_rss_kb": _peak_rss_kb(),
+        "stages": stages,
+    }
+
+
+def default_output_path(results):
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.path.join(DEFAULT_RESULTS_DIR, f"{stamp}-{results['commit'] or 'sin-commit'}-{results['config']['files']}.json")
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"versión de resultados no soportada en {path}: {results.get('version')}")
+    return results
+
+
+def _change(base, new):
+    return (new - base) / base * 100.0 if base else 0.0
+
+
+def compare_results(base, new, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara dos resultados etapa a etapa: tiempo total, tasas de rendimiento y pico de memoria.
+    Devuelve (líneas de texto, regresiones). Una regresión es un tiempo mayor o un rendimiento menor
+    que el de la base en más de 'threshold' %.
+    """
+    lines = [f"Base: {base.get('commit')} ({base.get('timestamp')})  Nuevo: {new.get('commit')} ({new.get('timestamp')})"]
+    if base.get("config") != new.get("config"):
+        lines.append("⚠️  La configuración de las dos ejecuciones es distinta; la comparación es orientativa.")
+    lines.append(f"{'Etapa':<16} {'Métrica':<28} {'Base':>12} {'Nuevo':>12} {'Cambio':>9}")
+    regressions = []
+    for step, new_stage in new["stages"].items():
+        base_stage = base["stages"].get(step)
+        if not base_stage:
+            continue
+        metrics = [("wall_s", base_stage["wall_s"], new_stage["wall_s"], False)]
+        for name, value in new_stage.get("throughput", {}).items():
+            base_value = base_stage.get("throughput", {}).get(name)
+            # Solo las tasas (por segundo); los recuentos se guardan como referencia
+            is_rate = name.endswith("_s") or name.endswith("(MB/s)")
+            if is_rate and isinstance(value, (int, float)) and isinstance(base_value, (int, float)):
+                metrics.append((name, base_value, value, True))
+        if new_stage.get("peak_rss_kb") and base_stage.get("peak_rss_kb"):
+            metrics.append(("peak_rss_kb", base_stage["peak_rss_kb"], new_stage["peak_rss_kb"], False))
+        for name, base_value, value, higher_is_better in metrics:
+            change = _change(base_value, value)
+            worse = change < -threshold if higher_is_better else change > threshold
+            if worse:
+                regressions.append((step, name, change))
+            lines.append(f"{step:<16} {name:<28} {base_value:>12,.2f} {value:>12,.2f} {change:>+8.1f}%{'  ❌' if worse else ''}")
+    return lines, regressions
+
+
+# ====================================
+# Línea de comandos
+# ====================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de extremo a extremo del orquestador con un proyecto sintético y Gemini simulado.")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help=f"Archivos Java del proyecto sintético (por defecto {DEFAULT_FILES}).")
+    parser.add_argument("--file-lines", type=int, default=DEFAULT_FILE_LINES, help="Líneas medias por archivo.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla del generador (resultados reproducibles).")
+    parser.add_argument("--steps", default=",".join(DEFAULT_STEPS), help=f"Etapas separadas por comas ({', '.join(STEPS)}).")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Latencia del servidor simulado en segundos.")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="Segundos entre fragmentos en streaming.")
+    parser.add_argument("--chunks", type=int, default=20, help="Fragmentos de cada respuesta en streaming.")
+    parser.add_argument("--response-kb", type=int, default=DEFAULT_RESPONSE_KB, help="Tamaño de cada respuesta simulada en KB.")
+    parser.add_argument("--shard-tokens", type=int, default=DEFAULT_SHARD_TOKENS,
+                        help=f"Tokens por fragmento de la etapa map_reduce (por defecto {DEFAULT_SHARD_TOKENS}).")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_SPECIALIST_CONCURRENCY, help="Especialistas en paralelo.")
+    parser.add_argument("--reader-threads", type=int, default=task_engine.DEFAULT_READER_THREADS, help="Hilos de lectura del contexto.")
+    parser.add_argument("--log-lines", type=int, default=DEFAULT_LOG_LINES, help="Líneas de la etapa de log.")
+    parser.add_argument("--json-context-mb", type=int, default=DEFAULT_JSON_CONTEXT_MB, help="Contexto del benchmark de GeminiJson en MB.")
+    parser.add_argument("--timeout", type=float, default=0, help="Tiempo límite de cada tarea en segundos (0 = sin límite).")
+    parser.add_argument("--use-cache", action="store_true", help="Usar la caché de respuestas (por defecto se omite).")
+    parser.add_argument("--keep-going", action="store_true", help="Continuar con las demás etapas si una falla.")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR, help="Directorio del proyecto sintético, el contexto y las guías.")
+    parser.add_argument("--output", help="Archivo JSON de resultados (por defecto en bench-results/).")
+    parser.add_argument("--compare", metavar="BASE.json", help="Comparar los resultados con los de otra ejecución.")
+    parser.add_argument("--compare-only", nargs=2, metavar=("BASE.json", "NUEVO.json"), help="Solo comparar dos resultados guardados.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Variación en %% que se considera regresión.")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar toda la salida de las tareas.")
+    return parser.parse_args(argv)
+
+
+def _print_comparison(base, new, threshold):
+    lines, regressions = compare_results(base, new, threshold)
+    print("\n--- Comparación ---")
+    for line in lines:
+        print(line)
+    if regressions:
+        print(f"❌ {len(regressions)} regresión(es) de más del {threshold:g}%.")
+    return not regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare_only:
+        try:
+            base, new = (load_results(path) for path in args.compare_only)
+        except (OSError, ValueError) as e:
+            print(f"❌ ERROR: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        return EXIT_OK if _print_comparison(base, new, args.threshold) else EXIT_FAILED
+
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown or not steps or args.files < 1 or args.shard_tokens < 1:
+        print(f"❌ ERROR: Etapas desconocidas: {', '.join(unknown) or '(ninguna)'}. Disponibles: {', '.join(STEPS)}.", file=sys.stderr)
+        return EXIT_USAGE
+    base = None
+    if args.compare:
+        try:
+            base = load_results(args.compare)
+        except (OSError, ValueError) as e:
+            print(f"❌ ERROR: {e}", file=sys.stderr)
+            return EXIT_USAGE
+
+    # Las rutas del motor (JAR, módulos) son relativas a la raíz del repositorio
+    os.chdir(REPO_ROOT)
+    log = BenchmarkLog(args.verbose)
+    benchmark = Benchmark(args, log)
+    start = time.perf_counter()
+    try:
+        stages, ok = benchmark.run(steps)
+    except KeyboardInterrupt:
+        print("Benchmark interrumpido por el usuario.", file=sys.stderr)
+        return EXIT_FAILED
+    results = build_results(args, benchmark.project, stages, time.perf_counter() - start)
+    path = save_results(results, args.output or default_output_path(results))
+
+    print("\n--- Resumen del benchmark ---")
+    for step, stage in stages.items():
+        rss = f"{stage['peak_rss_kb'] / 1024:.0f} MB" if stage["peak_rss_kb"] else "-"
+        print(f"{'✅' if stage['ok'] else '❌'} {step:<14} {stage['wall_s']:>9.2f} s  pico RSS {rss:>7}  {stage['throughput']}")
+    print(f"📊 Resultados guardados en: {path}")
+
+    if base is not None and not _print_comparison(base, results, args.threshold):
+        ok = False
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Servidor HTTP local que simula la API de Gemini (v1beta) para probar AIAnalyzer y los
+especialistas sin red ni cuota.
+
+Atiende:
+  POST /v1beta/models/<modelo>:generateContent              -> respuesta JSON completa
+  POST /v1beta/models/<modelo>:streamGenerateContent?alt=sse -> fragmentos Server-Sent Events
+
+Para probar los reintentos y el limitador de peticiones puede responder 429 (las primeras N
+peticiones, un porcentaje al azar o las que superen un límite de peticiones por minuto), con
+latencia variable. Usa HTTP/1.1 con keep-alive, así que al detenerlo informa de cuántas conexiones
+se abrieron para cuántas peticiones.
+
+Para probar el map-reduce de los especialistas, --max-input-tokens rechaza con 400 las peticiones
+que superan ese tamaño (como el modelo real) y --echo-files añade a cada respuesta los archivos del
+contexto recibido, de modo que la guía final muestra qué fragmentos se analizaron.
+
+Uso:
+  python tools/mock_gemini_server.py --port 8089 --latency 0.5 --chunk-delay 0.2
+  python tools/mock_gemini_server.py --rpm 30 --fail-rate 0.2 --retry-after 2 --latency-jitter 0.5
+  python tools/mock_gemini_server.py --max-input-tokens 20000 --echo-files   # con --shard-tokens=15000
+  GEMINI_API_BASE_URL=http://127.0.0.1:8089/v1beta GEMINI_API_KEY=mock java -cp <jar> ... --stream
+"""
+import argparse
+import collections
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8089
+
+# Estimación de tokens igual que ContextSelector (4 caracteres por token) y cabecera de sección del contexto
+CHARS_PER_TOKEN = 4
+SECTION_HEADER = re.compile(r"^// ===== Archivo: (.+?) =====$", re.MULTILINE)
+
+DEFAULT_RESPONSE = """# Guía generada por el servidor simulado
+
+Esta respuesta la produce `tools/mock_gemini_server.py` y no proviene del modelo real.
+
+## Recomendaciones
+
+1. Revisa la separación de responsabilidades entre controladores y repositorios.
+2. Usa sentencias preparadas para todos los accesos a la base de datos.
+3. Añade pruebas automatizadas para los casos límite de la lectura de perfiles.
+"""
+
+
+def split_chunks(text, count):
+    """Divide el texto en 'count' fragmentos de tamaño similar, cortando en espacios cuando es posible."""
+    count = max(1, count)
+    size = max(1, len(text) // count)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            space = text.rfind(" ", start + 1, end)
+            if space != -1:
+                end = space + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def request_text(request):
+    """Texto de las partes de usuario de la petición (el contexto y la instrucción de la tarea)."""
+    texts = []
+    for content in request.get("contents") or []:
+        for part in content.get("parts") or []:
+            if isinstance(part.get("text"), str):
+                texts.append(part["text"])
+    return "".join(texts)
+
+
+def candidate(text, finish_reason=None):
+    """Estructura de un candidato tal como la devuelve la API."""
+    value = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish_reason:
+        value["finishReason"] = finish_reason
+    return {"candidates": [value]}
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    """Manejador de las peticiones simuladas; la configuración se lee del servidor."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connection_count += 1
+
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            request = json.loads(body.decode("utf-8") or "{}")
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "JSON inválido", "status": "INVALID_ARGUMENT"}})
+            return
+        user_text = request_text(request)
+        tokens = (len(user_text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        if config.max_input_tokens and tokens > config.max_input_tokens:
+            message = (f"The input token count ({tokens}) exceeds the maximum number of tokens allowed "
+                       f"({config.max_input_tokens}).")
+            self._send_json(400, {"error": {"code": 400, "message": message, "status": "INVALID_ARGUMENT"}})
+            return
+
+        if self._rate_limited(config):
+            with self.server.stats_lock:
+                self.server.rejected_count += 1
+            headers = {"Retry-After": f"{config.retry_after:g}"} if config.retry_after > 0 else {}
+            self._send_json(429, {"error": {"code": 429, "message": "Cuota agotada (simulada)", "status": "RESOURCE_EXHAUSTED"}},
+                            headers=headers)
+            return
+        if config.status != 200:
+            self._send_json(config.status, {"error": {"code": config.status, "message": "Error simulado", "status": "MOCK"}})
+            return
+
+        time.sleep(config.latency + random.uniform(0, config.latency_jitter))
+        text = config.response_text
+        if config.echo_files:
+            files = SECTION_HEADER.findall(user_text)
+            text += f"\n\n_Petición de ~{tokens:,} tokens; archivos recibidos ({len(files)}): {', '.join(files) or 'ninguno'}._\n"
+        if ":streamGenerateContent" in self.path:
+            self._send_stream(config, text)
+        elif ":generateContent" in self.path:
+            self._send_json(200, candidate(text, "STOP"), indent=2)
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": f"Ruta no soportada: {self.path}", "status": "NOT_FOUND"}})
+
+    def _rate_limited(self, config):
+        """Decide si la petición recibe un 429: las primeras --fail-first, un --fail-rate al azar y las que superan --rpm."""
+        now = time.monotonic()
+        with self.server.stats_lock:
+            self.server.request_count += 1
+            if self.server.request_count <= config.fail_first:
+                return True
+            if config.fail_rate > 0 and random.random() < config.fail_rate:
+                return True
+            if config.rpm > 0:
+                window = self.server.accepted_times
+                while window and now - window[0] >= 60:
+                    window.popleft()
+                if len(window) >= config.rpm:
+                    return True
+                window.append(now)
+        return False
+
+    def _send_json(self, status, payload, indent=None, headers=None):
+        data = json.dumps(payload, ensure_ascii=False, indent=indent).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, config, text):
+        # Sin Content-Length: la respuesta termina al cerrar la conexión, que no se reutiliza
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunks = split_chunks(text, config.chunks)
+        for i, chunk in enumerate(chunks):
+            finish = "STOP" if i == len(chunks) - 1 else None
+            event = "data: " + json.dumps(candidate(chunk, finish), ensure_ascii=False) + "\r\n\r\n"
+            self.wfile.write(event.encode("utf-8"))
+            self.wfile.flush()
+            if finish is None:
+                time.sleep(config.chunk_delay)
+
+    def log_message(self, format, *args):
+        if not self.server.config.quiet:
+            sys.stderr.write("[mock-gemini] " + (format % args) + "\n")
+
+
+def create_server(config, host="127.0.0.1"):
+    """Crea el servidor (sin arrancarlo); útil para usarlo desde otros scripts."""
+    server = ThreadingHTTPServer((host, config.port), MockGeminiHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.stats_lock = threading.Lock()
+    server.request_count = 0
+    server.rejected_count = 0
+    server.connection_count = 0
+    server.accepted_times = collections.deque()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor simulado de la API de Gemini.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.5, help="Segundos antes del primer byte de la respuesta.")
+    parser.add_argument("--chunk-delay", type=float, default=0.2, help="Segundos entre fragmentos en streaming.")
+    parser.add_argument("--chunks", type=int, default=20, help="Número de fragmentos en streaming.")
+    parser.add_argument("--response-file", help="Archivo con el texto a devolver (por defecto, una guía de ejemplo).")
+    parser.add_argument("--status", type=int, default=200, help="Código HTTP a devolver (p. ej. 503 para simular caídas).")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Latencia adicional aleatoria, entre 0 y este valor.")
+    parser.add_argument("--fail-first", type=int, default=0, help="Responder 429 a las primeras N peticiones.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probabilidad (0-1) de responder 429 a una petición.")
+    parser.add_argument("--rpm", type=int, default=0, help="Límite de peticiones por minuto; las que lo superan reciben 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Valor de Retry-After (segundos) en los 429; 0 lo omite.")
+    parser.add_argument("--max-input-tokens", type=int, default=0,
+                        help="Rechazar con 400 las peticiones de más de N tokens estimados (0 = sin límite).")
+    parser.add_argument("--echo-files", action="store_true",
+                        help="Añadir a cada respuesta los archivos del contexto recibido.")
+    parser.add_argument("--quiet", action="store_true", help="No registrar cada petición.")
+    config = parser.parse_args(argv)
+    if config.response_file:
+        with open(config.response_file, "r", encoding="utf-8") as f:
+            config.response_text = f.read()
+    else:
+        config.response_text = DEFAULT_RESPONSE
+    return config
+
+
+def main(argv=None):
+    config = parse_args(argv)
+    server = create_server(config)
+    print(f"✅ Servidor Gemini simulado en http://127.0.0.1:{config.port}/v1beta (Ctrl+C para detener)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Peticiones: {server.request_count} ({server.rejected_count} con 429), conexiones: {server.connection_count}")
+
+
+if __name__ == "__main__":
+    main()